@@ -0,0 +1,10 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from PyExpress import _lazy
+
+__getattr__, __dir__, __all__ = _lazy.attach(__name__,
+                                             submodules = ['raster_io', 'gridding', 'palette', 'indices', 'zonal', 'cwsi',
+                                                           'histogram', 'pointcloud', 'change_detection', 'dem_cube'],
+                                             attributes = ['raster_io', 'gridding', 'palette', 'indices', 'zonal', 'cwsi',
+                                                           'histogram', 'pointcloud', 'change_detection', 'dem_cube'])
@@ -0,0 +1,288 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import os
+    import shutil
+    import numpy                             as np
+    import pandas                            as pd
+    import PyExpress.DataAnalysis.pointcloud as pcl
+    import PyExpress.DataAnalysis.gridding   as grd
+    import PyExpress.DataAnalysis.raster_io  as rio
+    from sklearn.neighbors  import KDTree
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['CHANGE_DTYPE', 'iter_precision_map', 'detect_changes', 'PRECISION_COLUMNS']
+
+###############################################################################
+# change detection between point cloud epochs (C2C and M3C2)
+
+CHANGE_DTYPE = np.dtype([('x',           np.float64), ('y',  np.float64), ('z',  np.float64),
+                         ('nx',          np.float32), ('ny', np.float32), ('nz', np.float32),
+                         ('c2c',         np.float32),     # signed distance to the nearest point of the compared epoch
+                         ('m3c2',        np.float32),     # distance along the normal (NaN without points in both cylinders)
+                         ('lod',         np.float32),     # level of detection (95 %)
+                         ('significant', np.bool_),
+                         ('n1',          np.int32),       # points in the cylinder of the reference epoch
+                         ('n2',          np.int32)])      # points in the cylinder of the compared epoch
+
+# precision map columns used as level of detection: X, Y, Z, covXX, covXY, covXZ, covYY, covYZ, covZZ
+PRECISION_COLUMNS = [0, 1, 2, 6, 7, 8, 9, 10, 11]
+
+def iter_precision_map(path: str, chunk_size: int = 1000000):
+
+    '''
+    Reads a precision map of Export.precision_map (txt/csv, npy or parquet) in chunks.
+
+    *args:
+        path: precision map file\n
+        chunk_size: number of points per chunk
+
+    Returns:
+        Generator of arrays of shape (n, 9): X, Y, Z, covXX, covXY, covXZ, covYY, covYZ, covZZ
+    '''
+
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.npy':
+        rows = np.load(path, mmap_mode='r')
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            yield np.column_stack([chunk[name] for name in chunk.dtype.names]).astype(np.float64)[:, PRECISION_COLUMNS]
+
+    elif extension == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas().to_numpy(dtype=np.float64)[:, PRECISION_COLUMNS]
+
+    else:
+        for chunk in pd.read_csv(path, sep='\t', chunksize=chunk_size):
+            yield chunk.to_numpy(dtype=np.float64)[:, PRECISION_COLUMNS]
+
+def _normals(points: np.ndarray, core: np.ndarray, k: int):
+
+    ''' Normals of core points from the PCA of their k nearest points, oriented upwards. '''
+
+    k          = min(k, len(points))
+    _, index   = KDTree(points).query(core, k=k)
+    neighbours = points[index] - points[index].mean(axis=1, keepdims=True)
+    covariance = np.einsum('nki,nkj->nij', neighbours, neighbours)
+    normals    = np.linalg.eigh(covariance)[1][:, :, 0]
+
+    return normals * np.where(normals[:, 2:3] < 0, -1, 1)
+
+def _cylinder_statistics(points: np.ndarray, core: np.ndarray, normals: np.ndarray, radius: float, depth: float):
+
+    ''' Count, mean and standard deviation of the positions along the normal of points within cylinders around core points. '''
+
+    count = np.zeros(len(core), dtype=np.int64)
+    mean  = np.full(len(core), np.nan)
+    std   = np.full(len(core), np.nan)
+
+    if len(points) == 0:
+        return count, mean, std
+
+    # candidates within the sphere around the cylinder, as flat arrays of (core point, point)
+    index    = KDTree(points).query_radius(core, r=np.hypot(radius, depth))
+    sizes    = np.fromiter((len(i) for i in index), dtype=np.int64, count=len(index))
+    core_id  = np.repeat(np.arange(len(core)), sizes)
+    vectors  = points[np.concatenate(index).astype(np.int64)] - core[core_id] if sizes.sum() else np.empty((0, 3))
+    along    = np.einsum('ni,ni->n', vectors, normals[core_id])
+    inside   = (np.einsum('ni,ni->n', vectors, vectors) - along ** 2 <= radius ** 2) & (np.abs(along) <= depth)
+
+    core_id, along = core_id[inside], along[inside]
+    count          = np.bincount(core_id, minlength=len(core))
+    total          = np.bincount(core_id, weights=along, minlength=len(core))
+    squares        = np.bincount(core_id, weights=along ** 2, minlength=len(core))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(count > 0, total / count, np.nan)
+        std  = np.where(count > 1, np.sqrt(np.maximum(squares / count - mean ** 2, 0) * count / np.maximum(count - 1, 1)), np.nan)
+
+    return count, mean, std
+
+def _normal_variance(precision: np.ndarray, core: np.ndarray, normals: np.ndarray):
+
+    ''' Variance along the normal from the covariance of the nearest precision map point (NaN without points). '''
+
+    if len(precision) == 0:
+        return np.full(len(core), np.nan)
+
+    _, index = KDTree(precision[:, :3]).query(core, k=1)
+    c        = precision[index[:, 0], 3:]
+    cov      = np.stack([c[:, [0, 1, 2]], c[:, [1, 3, 4]], c[:, [2, 4, 5]]], axis=1)
+
+    return np.einsum('ni,nij,nj->n', normals, cov, normals)
+
+def _change_tile(tile:               tuple,
+                 tile_size:          float,
+                 reference_dir:      str,
+                 compared_dir:       str,
+                 precision_dirs:     tuple,
+                 core_spacing:       float,
+                 normal_k:           int,
+                 cylinder_radius:    float,
+                 max_depth:          float,
+                 registration_error: float):
+
+    ''' Change detection of one tile (worker of detect_changes). '''
+
+    buffer    = np.hypot(cylinder_radius, max_depth)
+    reference = pcl.load_tile(reference_dir, tile, buffer=buffer)[:, :3]
+    compared  = pcl.load_tile(compared_dir,  tile, buffer=buffer)[:, :3]
+    inside    = np.all(np.floor(reference[:, :2] / tile_size) == tile, axis=1)
+    core      = reference[inside]
+
+    if core_spacing:
+        _, first = np.unique(np.floor(core / core_spacing).astype(np.int64), axis=0, return_index=True)
+        core     = core[np.sort(first)]
+
+    result = np.zeros(len(core), dtype=CHANGE_DTYPE)
+
+    if len(core) == 0:
+        return result
+
+    normals          = _normals(reference, core, normal_k)
+    n1, mean1, std1  = _cylinder_statistics(reference, core, normals, cylinder_radius, max_depth)
+    n2, mean2, std2  = _cylinder_statistics(compared,  core, normals, cylinder_radius, max_depth)
+
+    # level of detection: precision maps projected on the normal, otherwise roughness of the cylinders (Lague et al. 2013)
+    variance = np.full(len(core), np.nan)
+    if precision_dirs is not None:
+        variance = sum(_normal_variance(pcl.load_tile(directory, tile, buffer=buffer), core, normals)
+                       for directory in precision_dirs)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roughness = np.square(std1) / n1 + np.square(std2) / n2
+    variance = np.where(np.isfinite(variance), variance, roughness)
+
+    result['x'], result['y'], result['z'] = core.T
+    result['nx'], result['ny'], result['nz'] = normals.T
+    result['m3c2'] = np.where((n1 > 0) & (n2 > 0), mean2 - mean1, np.nan)
+    result['lod']  = 1.96 * np.sqrt(variance) + registration_error
+    result['n1']   = n1
+    result['n2']   = n2
+    result['significant'] = np.abs(result['m3c2']) > result['lod']
+    result['c2c']  = np.nan
+
+    if len(compared):
+        distance, index = KDTree(compared).query(core, k=1)
+        sign            = np.sign(np.einsum('ni,ni->n', compared[index[:, 0]] - core, normals))
+        result['c2c']   = np.where(sign == 0, 1, sign) * distance[:, 0]
+
+    return result
+
+def detect_changes(clouds:             list,
+                   out_dir:            str,
+                   precision_maps:     list  = None,
+                   pairs:              list  = None,
+                   tile_size:          float = 10.0,
+                   core_spacing:       float = 0.05,
+                   normal_k:           int   = 16,
+                   cylinder_radius:    float = 0.05,
+                   max_depth:          float = 0.5,
+                   registration_error: float = 0.0,
+                   grid_cell_size:     float = None,
+                   epsg:               int   = None,
+                   workers:            int   = None,
+                   chunk_size:         int   = 1000000,
+                   min_confidence:     float = None,
+                   keep_tiles:         bool  = False):
+
+    '''
+    Detects changes between point cloud epochs, e.g. the PLY exports of Export.point_cloud per time stamp.
+    Each cloud is streamed once into spatial tiles; the tiles of all epoch pairs are then processed in
+    parallel processes with KD-trees (scikit-learn), so memory is bounded by a few tiles per process.
+
+    For core points of the reference epoch (subsampled to core_spacing), the following is computed:
+        - c2c: signed distance to the nearest point of the compared epoch (cloud to cloud)\n
+        - m3c2: distance of the mean positions of both epochs along the normal within a cylinder
+          (M3C2, Lague et al. 2013); normals from the PCA of the normal_k nearest reference points\n
+        - lod: level of detection 1.96 * sqrt(sigma1² + sigma2²) + registration_error; sigmas along the normal
+          from the covariances of the nearest precision map points (M3C2-PM, James et al. 2017),
+          otherwise from the roughness within the cylinders
+
+    *args:
+        clouds: point clouds (binary or ASCII PLY, OBJ) in chronological order\n
+        out_dir: output directory: {reference}__{compared}_changes.npy per pair (CHANGE_DTYPE)
+                 and optionally GeoTIFF grids of the mean m3c2 and c2c distances\n
+        precision_maps: precision maps of Export.precision_map per cloud, same coordinate system as the clouds\n
+        pairs: list of (reference index, compared index); default: consecutive epochs\n
+        tile_size: tile edge length\n
+        core_spacing: spacing of the core points; None: all reference points\n
+        normal_k: number of neighbours for the normals\n
+        cylinder_radius: radius of the M3C2 cylinders\n
+        max_depth: maximum distance along the normal within the cylinders\n
+        registration_error: registration error added to the level of detection\n
+        grid_cell_size: cell size of the distance grids; None: no grids\n
+        epsg: EPSG code of the coordinate system of the grids\n
+        workers: number of processes; default: os.cpu_count()\n
+        chunk_size: number of points read at once\n
+        min_confidence: minimum confidence of the cloud points (PLY exports with confidence); None: all points\n
+        keep_tiles: whether to keep the tile files in out_dir/tiles
+
+    Returns:
+        {(reference, compared): path of the changes}
+    '''
+
+    pairs     = pairs if pairs is not None else [(i, i + 1) for i in range(len(clouds) - 1)]
+    names     = [os.path.splitext(os.path.basename(cloud))[0] for cloud in clouds]
+    tile_root = os.path.join(out_dir, 'tiles')
+    used      = sorted(set(i for pair in pairs for i in pair))
+    tiles     = dict()
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    # stream each epoch once into tiles
+    for i in used:
+        tiles[i] = pcl.tile_points((pcl.coordinates(chunk) for chunk in pcl.iter_points(clouds[i], chunk_size, fields=['x', 'y', 'z'],
+                                                                                                   min_confidence=min_confidence)),
+                                   tile_size = tile_size,
+                                   out_dir   = os.path.join(tile_root, f'cloud_{i}'))
+        if precision_maps is not None:
+            pcl.tile_points(iter_precision_map(precision_maps[i], chunk_size),
+                            tile_size = tile_size,
+                            out_dir   = os.path.join(tile_root, f'precision_{i}'))
+
+    results = {pair: [] for pair in pairs}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = dict()
+
+        for reference, compared in pairs:
+            precision_dirs = None if precision_maps is None else (os.path.join(tile_root, f'precision_{reference}'),
+                                                                  os.path.join(tile_root, f'precision_{compared}'))
+            for tile in tiles[reference]:
+                future = pool.submit(_change_tile, tile, tile_size,
+                                     os.path.join(tile_root, f'cloud_{reference}'),
+                                     os.path.join(tile_root, f'cloud_{compared}'),
+                                     precision_dirs, core_spacing, normal_k, cylinder_radius, max_depth, registration_error)
+                futures[future] = (reference, compared)
+
+        for future in as_completed(futures):
+            results[futures[future]].append(future.result())
+
+    paths = dict()
+
+    for (reference, compared), parts in results.items():
+        changes  = np.concatenate(parts) if parts else np.zeros(0, dtype=CHANGE_DTYPE)
+        changes  = changes[np.lexsort((changes['x'], changes['y']))]
+        savename = os.path.join(out_dir, f'{names[reference]}__{names[compared]}')
+
+        np.save(f'{savename}_changes.npy', changes)
+        paths[(names[reference], names[compared])] = f'{savename}_changes.npy'
+
+        if grid_cell_size and len(changes):
+            for field in ['m3c2', 'c2c']:
+                valid        = np.isfinite(changes[field])
+                grid, origin = grd.grid_statistic(changes['x'][valid], changes['y'][valid], changes[field][valid],
+                                                  cell_size=grid_cell_size, statistic='mean')
+                rio.write_geotiff(f'{savename}_{field}.tif', grid.astype(np.float32), origin=origin,
+                                  cell_size=grid_cell_size, epsg=epsg)
+
+    if not keep_tiles:
+        shutil.rmtree(tile_root, ignore_errors=True)
+
+    return paths
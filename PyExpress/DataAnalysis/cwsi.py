@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import os
+    import functools
+    import numpy                            as np
+    import PyExpress.DataAnalysis.raster_io as rio
+    import PyExpress.DataAnalysis.zonal     as zonal
+    from PyExpress.DataAnalysis.palette import METASHAPE_NODATA
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['DRY_OFFSET', 'cwsi_index', 'reference_temperatures', 'compute_cwsi']
+
+###############################################################################
+# crop water stress index (CWSI) of thermal orthomosaics
+
+# temperature offset of non-transpiring canopy above air temperature, used if t_dry is unknown
+DRY_OFFSET = 5.0
+
+def cwsi_index(t_canopy: np.ndarray, t_wet: float, t_dry: float, clip: bool = True):
+
+    '''
+    Crop water stress index from canopy temperatures: (Tc - Twet) / (Tdry - Twet).
+
+    *args:
+        t_canopy: canopy temperatures\n
+        t_wet: temperature of well-watered, fully transpiring canopy\n
+        t_dry: temperature of non-transpiring canopy\n
+        clip: whether to clip the index to [0, 1]
+
+    Returns:
+        float32 array
+    '''
+
+    if t_dry <= t_wet:
+        raise ValueError(f't_dry ({t_dry}) has to be larger than t_wet ({t_wet})')
+
+    index = (np.asarray(t_canopy, dtype=np.float32) - np.float32(t_wet)) / np.float32(t_dry - t_wet)
+
+    return np.clip(index, 0, 1) if clip else index
+
+def reference_temperatures(path:        str,
+                           t_air:       float = None,
+                           t_dry:       float = None,
+                           t_wet:       float = None,
+                           percentiles: tuple = (5, 95),
+                           nodata:      float = None,
+                           max_samples: int   = 1000000):
+
+    '''
+    Completes the reference temperatures of the CWSI. Missing values are estimated from percentiles
+    of the canopy temperatures of the thermal raster (wet: lower, dry: upper percentile);
+    with an air temperature, a missing t_dry is t_air + DRY_OFFSET.
+
+    *args:
+        path: thermal raster (GeoTIFF)\n
+        t_air: air temperature during the flight\n
+        t_dry, t_wet: reference temperatures; None: estimated\n
+        percentiles: (wet, dry) percentiles of the canopy temperatures\n
+        nodata: nodata value of the thermal raster\n
+        max_samples: number of sampled pixels for the percentiles
+
+    Returns:
+        (t_wet, t_dry)
+    '''
+
+    if t_dry is None and t_air is not None:
+        t_dry = t_air + DRY_OFFSET
+
+    if t_wet is None or t_dry is None:
+        samples = rio.sample_raster(path, max_samples=max_samples, nodata=nodata)
+        if len(samples) == 0:
+            raise ValueError(f'no valid temperatures in {path}')
+        wet, dry = np.percentile(samples, percentiles)
+        t_wet    = float(wet) if t_wet is None else t_wet
+        t_dry    = float(dry) if t_dry is None else t_dry
+
+    return t_wet, t_dry
+
+def _cwsi_tile(tile: np.ndarray, t_wet: float, t_dry: float, clip: bool, nodata_in: float, nodata: float):
+
+    ''' CWSI of one tile of a thermal raster (worker of compute_cwsi). '''
+
+    tile  = tile[..., 0] if tile.ndim == 3 else tile
+    valid = np.isfinite(tile) if nodata_in is None else np.isfinite(tile) & (tile != nodata_in)
+
+    return [np.where(valid, cwsi_index(tile, t_wet, t_dry, clip=clip), np.float32(nodata)).astype(np.float32)]
+
+def compute_cwsi(thermal_path: str,
+                 output_path:  str   = None,
+                 t_air:        float = None,
+                 t_dry:        float = None,
+                 t_wet:        float = None,
+                 percentiles:  tuple = (5, 95),
+                 clip:         bool  = True,
+                 zones:        dict  = None,
+                 nodata:       float = METASHAPE_NODATA,
+                 workers:      int   = None,
+                 tile:         tuple = (256, 256)):
+
+    '''
+    Computes the crop water stress index of a thermal orthomosaic (temperatures in °C of band 1)
+    tile by tile in a process pool and writes it as tiled GeoTIFF. Optionally, CWSI statistics
+    are computed per area of interest in a second streaming pass over the result.
+
+    *args:
+        thermal_path: thermal raster (GeoTIFF)\n
+        output_path: CWSI raster; default: thermal raster name with suffix _cwsi\n
+        t_air, t_dry, t_wet: reference temperatures, see reference_temperatures()\n
+        percentiles: (wet, dry) percentiles for missing reference temperatures\n
+        clip: whether to clip the index to [0, 1]\n
+        zones: areas of interest, see zonal.zonal_statistics(), or a GeoJSON file\n
+        nodata: nodata value of the CWSI raster\n
+        workers: number of processes; default: os.cpu_count()\n
+        tile: tile size of processing and output
+
+    Returns:
+        Dictionary with path, t_wet, t_dry and statistics ({zone: {statistic: value}}, empty without zones)
+    '''
+
+    output_path  = output_path or '{}_cwsi{}'.format(*os.path.splitext(thermal_path))
+    nodata_in    = rio.raster_info(thermal_path)['nodata']
+    nodata_in    = nodata_in if nodata_in is not None else METASHAPE_NODATA
+    t_wet, t_dry = reference_temperatures(thermal_path, t_air=t_air, t_dry=t_dry, t_wet=t_wet,
+                                          percentiles=percentiles, nodata=nodata_in)
+
+    if t_dry <= t_wet:
+        raise ValueError(f't_dry ({t_dry}) has to be larger than t_wet ({t_wet})')
+
+    rio.map_tiles(thermal_path,
+                  functools.partial(_cwsi_tile, t_wet=t_wet, t_dry=t_dry, clip=clip, nodata_in=nodata_in, nodata=nodata),
+                  outputs  = [{'path': output_path, 'dtype': np.float32, 'nodata': nodata}],
+                  workers  = workers,
+                  tile     = tile,
+                  executor = 'process')
+
+    if isinstance(zones, str):
+        zones = zonal.read_zones(zones)
+
+    statistics = dict()
+
+    if zones:
+        statistics = zonal.zonal_statistics(output_path, zones,
+                                            value_range = (0.0, 1.0) if clip else (-1.0, 2.0),
+                                            nodata      = nodata)
+
+    return {'path': output_path, 't_wet': t_wet, 't_dry': t_dry, 'statistics': statistics}
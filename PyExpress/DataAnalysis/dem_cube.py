@@ -0,0 +1,395 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import os
+    import json
+    import warnings
+    import numpy                            as np
+    import PyExpress.DataAnalysis.raster_io as rio
+    from numpy.lib.stride_tricks import sliding_window_view
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['ROLLING_STATISTICS', 'DemCube']
+
+###############################################################################
+# time series of DEMs on a common grid
+
+ROLLING_STATISTICS = ['mean', 'std', 'min', 'max', 'median']
+
+def _resample_rows(path: str, grid: dict, rows: int):
+
+    '''
+    Resamples a north-up raster bilinearly onto a grid in one streaming pass. Source rows are kept in a sliding
+    window, so memory is bounded by the rows covering one band of the grid. Nodata neighbours are left out
+    of the interpolation weights; pixels without valid neighbours are NaN.
+
+    Returns:
+        Generator of float32 bands of shape (rows, grid columns)
+    '''
+
+    info                   = rio.raster_info(path)
+    nodata                 = info['nodata']
+    x0, y0, size_x, size_y = rio.raster_origin(path)
+
+    # fractional source columns of the grid columns (pixel centers)
+    x      = grid['origin'][0] + (np.arange(grid['cols']) + 0.5) * grid['cell_size']
+    col_f  = (x - x0) / size_x - 0.5
+    col0   = np.floor(col_f).astype(np.int64)
+    wx     = (col_f - col0).astype(np.float32)
+    cols   = np.stack([col0, col0 + 1])
+    inside = (cols >= 0) & (cols < info['width'])
+    cols   = np.clip(cols, 0, info['width'] - 1)
+
+    source = rio.iter_row_bands(path, rows=256)
+    window = np.empty((0, info['width']), dtype=np.float32)
+    first  = 0                                                 # source row of window[0]
+
+    for start in range(0, grid['rows'], rows):
+
+        y      = grid['origin'][1] - (np.arange(start, min(start + rows, grid['rows'])) + 0.5) * grid['cell_size']
+        row_f  = (y0 - y) / size_y - 0.5
+        row0   = np.floor(row_f).astype(np.int64)
+        wy     = (row_f - row0).astype(np.float32)
+        needed = min(int(row0.max()) + 2, info['height'])
+
+        # band entirely above or below the source raster
+        if row0.max() + 1 < 0 or row0.min() >= info['height']:
+            yield np.full((len(y), grid['cols']), np.nan, dtype=np.float32)
+            continue
+
+        # extend the window until it covers the needed source rows and drop rows above
+        while first + len(window) < needed:
+            _, band = next(source)
+            band    = (band[..., 0] if band.ndim == 3 else band).astype(np.float32)
+            if nodata is not None:
+                band[band == nodata] = np.nan
+            window  = np.concatenate([window, band])
+
+        lowest = max(int(row0.min()), 0)
+        if lowest > first:
+            window = window[lowest - first:]
+            first  = lowest
+
+        values  = np.zeros((len(y), grid['cols']), dtype=np.float32)
+        weights = np.zeros((len(y), grid['cols']), dtype=np.float32)
+
+        for dy, weight_y in [(0, 1 - wy), (1, wy)]:
+            row       = row0 + dy
+            row_valid = (row >= 0) & (row < info['height'])
+            rows_     = np.clip(row, first, first + len(window) - 1) - first
+
+            for dx, weight_x in [(0, 1 - wx), (1, wx)]:
+                sample = window[rows_][:, cols[dx]]
+                weight = np.outer(weight_y * row_valid, weight_x * inside[dx]) * np.isfinite(sample)
+                values  += np.where(weight > 0, sample, 0) * weight
+                weights += weight
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            yield np.where(weights > 0, values / weights, np.nan).astype(np.float32)
+
+class DemCube():
+
+    '''
+    Memory-mapped time series of DEMs (time x y x x) on a common grid with a timestamp index.
+    Epochs are resampled once when they are appended; afterwards, per-pixel time series, rolling statistics
+    and difference rasters are computed from the cube without reading the source rasters again.
+
+    The cube directory contains:
+        cube.dat: float32 values (NaN: no data) in chunks of one epoch and tile x tile pixels, appended per epoch\n
+        index.json: grid, georeferencing and epochs (timestamp, source, slot in cube.dat) sorted by timestamp
+
+    *args:
+        path: cube directory of DemCube.create()
+    '''
+
+    def __init__(self, path: str):
+
+        self.path = path
+
+        with open(os.path.join(path, 'index.json'), 'r') as file:
+            self.index = json.load(file)
+
+        grid        = self.index['grid']
+        self.tile   = tuple(self.index['tile'])
+        self.tiles  = (-(-grid['rows'] // self.tile[0]), -(-grid['cols'] // self.tile[1]))
+
+    @staticmethod
+    def create(path: str, reference: str, cell_size: float = None, tile: tuple = (256, 256)):
+
+        '''
+        Creates an empty cube with the grid of a reference raster (extent and georeferencing).
+
+        *args:
+            path: cube directory (must not contain a cube)\n
+            reference: reference raster (GeoTIFF), e.g. the DEM of the first epoch\n
+            cell_size: cell size of the grid; default: pixel size of the reference\n
+            tile: chunk size of the cube
+
+        Returns:
+            DemCube
+        '''
+
+        if os.path.exists(os.path.join(path, 'index.json')):
+            raise FileExistsError(f'{path} already contains a DEM cube')
+
+        info                   = rio.raster_info(reference)
+        x0, y0, size_x, size_y = rio.raster_origin(reference)
+        cell_size              = cell_size or size_x
+        geokeys                = [tag for tag in rio.read_geotiff_tags(reference)
+                                  if tag[0] not in rio.GEOTIFF_TAG_CODES[:3]]
+
+        index = {'grid':    {'origin':    [x0, y0],
+                             'cell_size': cell_size,
+                             'rows':      int(np.ceil(info['height'] * size_y / cell_size)),
+                             'cols':      int(np.ceil(info['width'] * size_x / cell_size))},
+                 'tile':    list(tile),
+                 'geokeys': [list(tag[:3]) + [tag[3] if isinstance(tag[3], str) else list(tag[3])] for tag in geokeys],
+                 'epochs':  []}
+
+        os.makedirs(path, exist_ok=True)
+        open(os.path.join(path, 'cube.dat'), 'wb').close()
+        DemCube._write_index(path, index)
+
+        return DemCube(path)
+
+    @staticmethod
+    def _write_index(path: str, index: dict):
+
+        ''' Writes the index atomically. '''
+
+        with open(os.path.join(path, 'index.json.tmp'), 'w') as file:
+            json.dump(index, file, indent=1)
+        os.replace(os.path.join(path, 'index.json.tmp'), os.path.join(path, 'index.json'))
+
+    def _memmap(self, mode: str = 'r'):
+
+        ''' The cube file as array of shape (slots, tiles y, tiles x, tile y, tile x). '''
+
+        slots = os.path.getsize(os.path.join(self.path, 'cube.dat')) // (4 * np.prod(self.tiles) * np.prod(self.tile))
+
+        return np.memmap(os.path.join(self.path, 'cube.dat'), dtype=np.float32, mode=mode,
+                         shape=(int(slots),) + self.tiles + self.tile)
+
+    @property
+    def timestamps(self):
+
+        ''' Timestamps of the epochs in chronological order. '''
+
+        return [epoch['timestamp'] for epoch in self.index['epochs']]
+
+    def geotiff_tags(self):
+
+        ''' GeoTIFF tags of the grid for derived rasters. '''
+
+        grid = self.index['grid']
+
+        return [(rio.MODEL_PIXEL_SCALE, 'd', 3, (grid['cell_size'], grid['cell_size'], 0.0), True),
+                (rio.MODEL_TIEPOINT,    'd', 6, (0.0, 0.0, 0.0, grid['origin'][0], grid['origin'][1], 0.0), True)] + \
+               [(code, dtype, count, value if isinstance(value, str) else tuple(value), True)
+                for code, dtype, count, value in self.index['geokeys']]
+
+    def append(self, dem_path: str, timestamp: str, replace: bool = False):
+
+        '''
+        Resamples a DEM onto the grid of the cube and appends it as new epoch, streaming row band by row band.
+
+        *args:
+            dem_path: DEM (GeoTIFF)\n
+            timestamp: timestamp of the epoch, e.g. ISO date string; epochs are sorted by timestamp\n
+            replace: whether to overwrite an existing epoch with the same timestamp (otherwise it is skipped)
+
+        Returns:
+            True if the epoch was written
+        '''
+
+        timestamp = str(timestamp)
+        existing  = [epoch for epoch in self.index['epochs'] if epoch['timestamp'] == timestamp]
+
+        if existing and not replace:
+            return False
+
+        # the epoch is written into a new slot at the end of the file, which is removed again on failure;
+        # a replaced epoch is copied into its previous slot afterwards
+        cube_path = os.path.join(self.path, 'cube.dat')
+        slot_size = 4 * int(np.prod(self.tiles)) * int(np.prod(self.tile))
+        size      = os.path.getsize(cube_path)
+        new_slot  = size // slot_size
+
+        with open(cube_path, 'r+b') as file:
+            file.truncate((new_slot + 1) * slot_size)
+
+        try:
+            cube = self._memmap(mode='r+')
+
+            for ti, band in enumerate(_resample_rows(dem_path, self.index['grid'], rows=self.tile[0])):
+                padded = np.full((self.tile[0], self.tiles[1] * self.tile[1]), np.nan, dtype=np.float32)
+                padded[:len(band), :band.shape[1]] = band
+                cube[new_slot, ti] = padded.reshape(self.tile[0], self.tiles[1], self.tile[1]).transpose(1, 0, 2)
+
+            if existing:
+                cube[existing[0]['slot']] = cube[new_slot]
+
+            cube.flush()
+            del cube
+
+        except BaseException:
+            cube = None                                        # release the memory map before shrinking the file
+            with open(cube_path, 'r+b') as file:
+                file.truncate(size)
+            raise
+
+        if existing:
+            with open(cube_path, 'r+b') as file:
+                file.truncate(size)
+
+        slot = existing[0]['slot'] if existing else int(new_slot)
+
+        epochs = [epoch for epoch in self.index['epochs'] if epoch['timestamp'] != timestamp]
+        epochs.append({'timestamp': timestamp, 'source': os.path.abspath(dem_path), 'slot': slot})
+        self.index['epochs'] = sorted(epochs, key=lambda epoch: epoch['timestamp'])
+        DemCube._write_index(self.path, self.index)
+
+        return True
+
+    def pixel(self, x: object, y: object):
+
+        '''
+        Converts coordinates into (row, column) of the grid.
+
+        *args:
+            x, y: coordinates in the coordinate system of the cube
+
+        Returns:
+            (rows, columns) as integer arrays
+        '''
+
+        grid = self.index['grid']
+        col  = np.floor((np.asarray(x, dtype=np.float64) - grid['origin'][0]) / grid['cell_size']).astype(np.int64)
+        row  = np.floor((grid['origin'][1] - np.asarray(y, dtype=np.float64)) / grid['cell_size']).astype(np.int64)
+
+        return row, col
+
+    def series(self, rows: object, cols: object):
+
+        '''
+        Extracts the time series of pixels.
+
+        *args:
+            rows, cols: pixel indices of the grid (scalars or arrays), e.g. from pixel()
+
+        Returns:
+            Array of shape (epochs,) or (epochs, pixels) in chronological order
+        '''
+
+        rows, cols = np.asarray(rows), np.asarray(cols)
+        slots      = np.array([epoch['slot'] for epoch in self.index['epochs']], dtype=np.int64)
+        cube       = self._memmap()
+        values     = cube[slots[:, None], (rows // self.tile[0]).ravel()[None], (cols // self.tile[1]).ravel()[None],
+                          (rows % self.tile[0]).ravel()[None], (cols % self.tile[1]).ravel()[None]]
+
+        return values[:, 0] if rows.ndim == 0 else np.asarray(values)
+
+    def _iter_tile_blocks(self, epochs: list = None):
+
+        ''' Yields (tile y, tile x, block of shape (epochs, tile y, tile x)) in chronological order. '''
+
+        slots = [epoch['slot'] for epoch in (epochs if epochs is not None else self.index['epochs'])]
+        cube  = self._memmap()
+
+        for ti in range(self.tiles[0]):
+            for tj in range(self.tiles[1]):
+                yield ti, tj, np.asarray(cube[slots, ti, tj])
+
+    def _write_raster(self, path: str, tiles: object):
+
+        ''' Writes tiles of the cube layout (row by row) as GeoTIFF with the grid of the cube. '''
+
+        grid = self.index['grid']
+
+        rio.write_tiles(path, tiles,
+                        shape     = (grid['rows'], grid['cols']),
+                        dtype     = np.float32,
+                        tile      = self.tile,
+                        extratags = self.geotiff_tags() + [(rio.GDAL_NODATA, 's', 0, 'nan', True)])
+
+        return path
+
+    def difference(self, start: str, end: str, path: str):
+
+        '''
+        Writes the elevation difference end - start of two epochs as tiled GeoTIFF directly from the cube chunks.
+
+        *args:
+            start, end: timestamps of the epochs\n
+            path: output GeoTIFF
+
+        Returns:
+            path
+        '''
+
+        epochs = {epoch['timestamp']: epoch for epoch in self.index['epochs']}
+        blocks = self._iter_tile_blocks([epochs[str(start)], epochs[str(end)]])
+
+        return self._write_raster(path, (block[1] - block[0] for _, _, block in blocks))
+
+    def rolling(self, window: int, statistic: str = 'mean', path: str = None):
+
+        '''
+        Computes a rolling statistic over a window of consecutive epochs (NaN-aware) into a new cube with the
+        same grid; epoch i of the result covers the epochs i - window + 1 ... i. Processed chunk by chunk.
+
+        *args:
+            window: number of epochs\n
+            statistic: ['mean', 'std', 'min', 'max', 'median']\n
+            path: directory of the result cube; default: *cube*_rolling_{statistic}{window}
+
+        Returns:
+            DemCube of the result (epochs from the window-th epoch on)
+        '''
+
+        if statistic not in ROLLING_STATISTICS:
+            raise ValueError(f'statistic {statistic!r} not in {ROLLING_STATISTICS}')
+
+        epochs = self.index['epochs']
+        path   = path or f'{self.path.rstrip(os.sep)}_rolling_{statistic}{window}'
+        count  = max(len(epochs) - window + 1, 0)
+
+        os.makedirs(path, exist_ok=True)
+        index  = dict(self.index, epochs=[{'timestamp': epoch['timestamp'], 'source': self.path, 'slot': i}
+                                          for i, epoch in enumerate(epochs[window - 1:])])
+
+        output = np.memmap(os.path.join(path, 'cube.dat'), dtype=np.float32, mode='w+',
+                           shape=(max(count, 1),) + self.tiles + self.tile) if count else None
+        reduce = {'mean': np.nanmean, 'std': np.nanstd, 'min': np.nanmin, 'max': np.nanmax, 'median': np.nanmedian}[statistic]
+
+        if count:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                for ti, tj, block in self._iter_tile_blocks():
+                    output[:, ti, tj] = reduce(sliding_window_view(block, window, axis=0), axis=-1)
+            output.flush()
+        else:
+            open(os.path.join(path, 'cube.dat'), 'wb').close()
+
+        DemCube._write_index(path, index)
+
+        return DemCube(path)
+
+    def export(self, timestamp: str, path: str):
+
+        '''
+        Writes one epoch of the cube as tiled GeoTIFF.
+
+        *args:
+            timestamp: timestamp of the epoch\n
+            path: output GeoTIFF
+
+        Returns:
+            path
+        '''
+
+        epochs = {epoch['timestamp']: epoch for epoch in self.index['epochs']}
+
+        return self._write_raster(path, (block[0] for _, _, block in self._iter_tile_blocks([epochs[str(timestamp)]])))
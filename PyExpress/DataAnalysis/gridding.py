@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import numpy as np
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['GRID_STATISTICS', 'grid_statistic']
+
+###############################################################################
+# binning of point values into regular grids
+
+GRID_STATISTICS = ['mean', 'median', 'min', 'max', 'count']
+
+def grid_statistic(x:         np.ndarray,
+                   y:         np.ndarray,
+                   values:    np.ndarray,
+                   cell_size: float,
+                   statistic: str   = 'mean',
+                   bounds:    tuple = None,
+                   nodata:    float = np.nan):
+
+    '''
+    Bins point values into a north-up regular grid and computes a statistic per cell.
+    All statistics are vectorized: mean and count via np.bincount, min/max via reduceat on values
+    grouped by cell and the median on values sorted within each cell.
+
+    *args:
+        x, y: point coordinates\n
+        values: point values of shape (n,) or (n, k) for k value columns\n
+        cell_size: grid cell size in units of x and y\n
+        statistic: ['mean', 'median', 'min', 'max', 'count']\n
+        bounds: (xmin, ymin, xmax, ymax) of the grid; default: extent of the points\n
+        nodata: value of empty cells
+
+    Returns:
+        (grid, origin) - grid of shape (rows, cols) or (k, rows, cols) and (x, y) of the upper left corner
+    '''
+
+    if statistic not in GRID_STATISTICS:
+        raise ValueError(f'statistic {statistic!r} not in {GRID_STATISTICS}')
+
+    x      = np.asarray(x, dtype=np.float64)
+    y      = np.asarray(y, dtype=np.float64)
+    values = np.asarray(values)
+    single = values.ndim == 1
+    values = values.reshape(len(x), -1)
+
+    if bounds is None:
+        bounds = (x.min(), y.min(), x.max(), y.max()) if len(x) else (0.0, 0.0, cell_size, cell_size)
+
+    xmin, ymin, xmax, ymax = bounds
+    cols   = max(int(np.floor((xmax - xmin) / cell_size)) + 1, 1)
+    rows   = max(int(np.floor((ymax - ymin) / cell_size)) + 1, 1)
+    origin = (xmin, ymax)
+
+    # cell index of each point (rows counted from ymax downwards); points outside the bounds are dropped
+    col    = np.floor((x - xmin) / cell_size).astype(np.int64)
+    row    = np.floor((ymax - y) / cell_size).astype(np.int64)
+    inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+    index  = row[inside] * cols + col[inside]
+    values = values[inside]
+
+    count  = np.bincount(index, minlength=rows * cols)
+    filled = count > 0
+    grid   = np.full((values.shape[1], rows * cols), nodata, dtype=np.float64)
+
+    if statistic == 'count':
+        grid[:] = count
+
+    elif statistic == 'mean':
+        for k in range(values.shape[1]):
+            grid[k, filled] = np.bincount(index, weights=values[:, k], minlength=rows * cols)[filled] / count[filled]
+
+    else:
+        cells  = np.flatnonzero(filled)
+        starts = np.concatenate([[0], np.cumsum(count[cells])[:-1]])
+        order  = np.argsort(index, kind='stable')
+
+        for k in range(values.shape[1]):
+
+            if statistic in ['min', 'max']:
+                # values grouped by cell, reduced per group
+                reduce         = np.minimum if statistic == 'min' else np.maximum
+                grid[k, cells] = reduce.reduceat(values[order, k], starts)
+            else:
+                # sort by the combined key (cell, value rank): values are sorted within each cell
+                n        = len(index)
+                by_value = np.argsort(values[:, k])
+                rank     = np.empty(n, dtype=np.int64)
+                rank[by_value] = np.arange(n)
+                ordered  = values[by_value[np.sort(index * n + rank) % n], k]
+                lower    = starts + (count[cells] - 1) // 2
+                upper    = starts + count[cells] // 2
+                grid[k, cells] = (ordered[lower].astype(np.float64) + ordered[upper]) / 2
+
+    grid = grid.reshape(-1, rows, cols)
+
+    return (grid[0] if single else grid), origin
@@ -0,0 +1,144 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import numpy                            as np
+    import PyExpress.DataAnalysis.raster_io as rio
+    from PyExpress.DataAnalysis.palette import METASHAPE_NODATA
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['StreamingHistogram', 'raster_percentiles']
+
+###############################################################################
+# fixed-memory histograms of value streams
+
+class StreamingHistogram():
+
+    '''
+    Histogram of a value stream with a fixed number of bins and an unknown value range.
+    The first values define the range; values outside double the bin width (merging pairs of bins)
+    towards their side until they fit. Memory is independent of the number of values and the
+    resolution is at least (max - min) / (bins / 2).
+
+    *args:
+        bins: number of bins (even)
+    '''
+
+    def __init__(self, bins: int = 4096):
+
+        self.bins   = bins + bins % 2
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.lower  = None
+        self.width  = None
+        self.count  = 0
+        self.min    = np.inf
+        self.max    = -np.inf
+
+    def _expand(self, below: bool):
+
+        ''' Doubles the bin width; the current bins become the upper (below=True) or lower half. '''
+
+        merged      = self.counts.reshape(-1, 2).sum(axis=1)
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+
+        if below:
+            self.counts[self.bins // 2:] = merged
+            self.lower                  -= self.width * self.bins
+        else:
+            self.counts[:self.bins // 2] = merged
+
+        self.width *= 2
+
+    def update(self, values: np.ndarray):
+
+        '''
+        Adds values to the histogram; NaN and infinite values are ignored.
+
+        *args:
+            values: array of any shape
+        '''
+
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+
+        if len(values) == 0:
+            return
+
+        vmin, vmax = values.min(), values.max()
+
+        if self.lower is None:
+            self.lower = vmin
+            self.width = (vmax - vmin) / (self.bins - 1) or max(abs(vmin), 1.0) * 1e-9
+
+        while vmin < self.lower:
+            self._expand(below=True)
+
+        while vmax >= self.lower + self.width * self.bins:
+            self._expand(below=False)
+
+        index        = np.minimum(((values - self.lower) / self.width).astype(np.int64), self.bins - 1)
+        self.counts += np.bincount(index, minlength=self.bins)
+        self.count  += len(values)
+        self.min     = min(self.min, vmin)
+        self.max     = max(self.max, vmax)
+
+    def percentiles(self, q: object):
+
+        '''
+        Estimates percentiles by linear interpolation within the bins.
+
+        *args:
+            q: percentile or sequence of percentiles in [0, 100]
+
+        Returns:
+            float or array of percentiles (NaN without values)
+        '''
+
+        q = np.asarray(q, dtype=np.float64)
+
+        if self.count == 0:
+            return np.full(q.shape, np.nan)[()]
+
+        cumulative = np.cumsum(self.counts)
+        target     = q / 100 * self.count
+        index      = np.minimum(np.searchsorted(cumulative, target, side='left'), self.bins - 1)
+        before     = np.where(index > 0, cumulative[index - 1], 0)
+        fraction   = np.clip((target - before) / np.maximum(self.counts[index], 1), 0, 1)
+        values     = self.lower + (index + fraction) * self.width
+
+        return np.clip(values, self.min, self.max)[()]
+
+def raster_percentiles(path:        object,
+                       percentiles: tuple = (2, 98),
+                       band:        int   = 0,
+                       nodata:      float = None,
+                       bins:        int   = 4096):
+
+    '''
+    Estimates percentiles of a raster band from a StreamingHistogram over row bands of tiles,
+    so the raster is never loaded into memory completely. Several rasters (e.g. one per frame)
+    are combined into one histogram.
+
+    *args:
+        path: raster (GeoTIFF) or list of rasters\n
+        percentiles: percentiles in [0, 100], e.g. (2, 98) for a display or palette range\n
+        band: band of the raster\n
+        nodata: nodata value besides NaN; default: nodata tag of each raster or METASHAPE_NODATA\n
+        bins: number of histogram bins
+
+    Returns:
+        Array of percentiles
+    '''
+
+    histogram = StreamingHistogram(bins=bins)
+
+    for path_ in ([path] if isinstance(path, str) else path):
+        nodata_ = nodata if nodata is not None else rio.raster_info(path_)['nodata']
+        nodata_ = nodata_ if nodata_ is not None else METASHAPE_NODATA
+
+        for row, values in rio.iter_row_bands(path_, rows=256):
+            values = values[..., band] if values.ndim == 3 else values
+            histogram.update(values[values != nodata_])
+
+    return np.atleast_1d(histogram.percentiles(percentiles))
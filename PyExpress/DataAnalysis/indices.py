@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import os
+    import re
+    import ast
+    import functools
+    import numpy                            as np
+    import PyExpress.DataAnalysis.raster_io as rio
+    from PyExpress.DataAnalysis.palette import METASHAPE_NODATA
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['INDEX_FUNCTIONS', 'compile_index', 'evaluate_index', 'index_name', 'compute_indices']
+
+###############################################################################
+# vegetation indices of multiband rasters
+
+# functions allowed in index formulas besides + - * / ** and band names B1, B2, ...
+INDEX_FUNCTIONS = {'abs': np.abs, 'sqrt': np.sqrt, 'log': np.log, 'exp': np.exp,
+                   'min': np.minimum, 'max': np.maximum}
+
+_INDEX_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+                ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd)
+
+@functools.lru_cache(maxsize=None)
+def compile_index(formula: str):
+
+    '''
+    Compiles a raster transformation formula of Metashape syntax, e.g. '(B5-B3)/(B5+B3)', into a
+    vectorized expression. Only band names, numbers, arithmetic operators and INDEX_FUNCTIONS are allowed.
+
+    *args:
+        formula: index formula with bands B1, B2, ... (1-based as in Metashape)
+
+    Returns:
+        (code, bands) - compiled expression for evaluate_index() and sorted list of used band numbers
+    '''
+
+    try:
+        tree = ast.parse(formula.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f'invalid index formula {formula!r}: {e.msg}') from None
+
+    bands = set()
+
+    for node in ast.walk(tree):
+
+        if not isinstance(node, _INDEX_NODES):
+            raise ValueError(f'invalid index formula {formula!r}: {type(node).__name__} not allowed')
+
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in INDEX_FUNCTIONS or node.keywords:
+                raise ValueError(f'invalid index formula {formula!r}: functions are limited to {list(INDEX_FUNCTIONS)}')
+
+        elif isinstance(node, ast.Name) and node.id not in INDEX_FUNCTIONS:
+            match = re.fullmatch(r'B(\d+)', node.id)
+            if match is None or int(match.group(1)) < 1:
+                raise ValueError(f'invalid index formula {formula!r}: unknown name {node.id!r}')
+            bands.add(int(match.group(1)))
+
+        elif isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f'invalid index formula {formula!r}: {node.value!r} is not a number')
+
+    return compile(tree, f'<index {formula}>', 'eval'), sorted(bands)
+
+def evaluate_index(code: object, bands: dict):
+
+    '''
+    Evaluates a compiled index formula on band arrays.
+
+    *args:
+        code: compiled formula from compile_index()\n
+        bands: {band number: array}
+
+    Returns:
+        float32 array; divisions by zero give non-finite values
+    '''
+
+    namespace = dict(INDEX_FUNCTIONS, **{f'B{band}': values for band, values in bands.items()})
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return np.asarray(eval(code, {'__builtins__': {}}, namespace), dtype=np.float32)
+
+def index_name(formula: str):
+
+    '''
+    File name of an index formula, e.g. '(B5-B3)/(B5+B3)' -> 'B5mB3dB5pB3'.
+    '''
+
+    name = formula.translate(str.maketrans({'+': 'p', '-': 'm', '*': 'x', '/': 'd', '.': '_'}))
+
+    return re.sub(r'[^A-Za-z0-9_]+', '', name) or 'index'
+
+def _index_tile(tile:     np.ndarray,
+                formulas: list,
+                samples:  int,
+                alpha:    bool,
+                nodata:   float):
+
+    ''' Computes all index formulas on one tile of a multiband raster (worker of compute_indices). '''
+
+    tile     = tile.reshape(tile.shape[:2] + (-1,))
+    compiled = [compile_index(formula) for formula in formulas]
+    used     = sorted(set(band for _, bands in compiled for band in bands))
+    bands    = {band: tile[..., band - 1].astype(np.float32) for band in used}
+    valid    = tile[..., samples - 1] > 0 if alpha else np.ones(tile.shape[:2], dtype=bool)
+    results  = []
+
+    for code, _ in compiled:
+        values = evaluate_index(code, bands)
+        results.append(np.where(valid & np.isfinite(values), values, np.float32(nodata)).astype(np.float32))
+
+    return results
+
+def compute_indices(raster_path: str,
+                    formulas:    object,
+                    output_dir:  str   = None,
+                    prefix:      str   = '',
+                    alpha:       bool  = None,
+                    nodata:      float = METASHAPE_NODATA,
+                    workers:     int   = None,
+                    tile:        tuple = (256, 256)):
+
+    '''
+    Computes vegetation indices of a multiband raster, e.g. an orthomosaic exported without raster
+    transformation, and writes one float32 GeoTIFF per index. The raster is read once, tile by tile
+    (memory-mapped if uncompressed), and all formulas are evaluated per tile in parallel threads.
+
+    *args:
+        raster_path: multiband raster (GeoTIFF), band i is Bi of the formulas\n
+        formulas: list of formulas, e.g. vegetation.indexMulti, or {name: formula}\n
+        output_dir: directory of the index rasters; default: directory of the raster\n
+        prefix: file name prefix of the index rasters; default: name of the raster\n
+        alpha: whether the last band is an alpha band masking nodata pixels; default: detected from the TIFF\n
+        nodata: nodata value of the index rasters\n
+        workers: number of threads; default: os.cpu_count()\n
+        tile: tile size of processing and output
+
+    Returns:
+        {name: path} of the index rasters
+    '''
+
+    if not isinstance(formulas, dict):
+        formulas = {index_name(formula): formula for formula in formulas}
+
+    info    = rio.raster_info(raster_path)
+    samples = info['samples']
+    alpha   = info['alpha'] if alpha is None else alpha
+    bands   = samples - 1 if alpha else samples
+
+    for name, formula in formulas.items():
+        used = compile_index(formula)[1]
+        if used and used[-1] > bands:
+            raise ValueError(f'index {name!r} ({formula}) uses band B{used[-1]}, the raster has {bands} bands')
+
+    output_dir = output_dir or os.path.dirname(raster_path) or '.'
+    prefix     = prefix or os.path.splitext(os.path.basename(raster_path))[0]
+    paths      = {name: os.path.join(output_dir, f'{prefix}_{name}.tif') for name in formulas}
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    rio.map_tiles(raster_path,
+                  functools.partial(_index_tile, formulas=list(formulas.values()), samples=samples,
+                                    alpha=alpha, nodata=nodata),
+                  outputs = [{'path': path, 'dtype': np.float32, 'nodata': nodata} for path in paths.values()],
+                  workers = workers,
+                  tile    = tile)
+
+    return paths
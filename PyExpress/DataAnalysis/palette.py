@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import numpy                           as np
+    import PyExpress.DataAnalysis.raster_io as rio
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['METASHAPE_NODATA', 'palette_lut', 'rescale_palette', 'apply_palette', 'export_palette_raster']
+
+###############################################################################
+# palette colouring of value rasters (raster transformation)
+
+# nodata value of Metashape raster exports (exportRaster, nodata_value)
+METASHAPE_NODATA = -32767
+
+def palette_lut(palette: dict):
+
+    '''
+    Sorts a raster transformation palette into value stops and colors.
+
+    *args:
+        palette: {value: (R, G, B)}, e.g. vegetation.palette of the configuration file
+                 or chunk.raster_transform.palette
+
+    Returns:
+        (stops, colors) - arrays of shape (n,) and (n, 3)
+    '''
+
+    items  = sorted((float(value), tuple(color)[:3]) for value, color in palette.items())
+    stops  = np.array([value for value, _ in items], dtype=np.float64)
+    colors = np.array([color for _, color in items], dtype=np.float64)
+
+    return stops, colors
+
+def rescale_palette(palette: dict, value_range: tuple):
+
+    '''
+    Rescales the value stops of a palette linearly onto a new value range, e.g. a range
+    calibrated from the raster histogram, keeping the relative position of all colors.
+
+    *args:
+        palette: {value: (R, G, B)}\n
+        value_range: (lowest value, highest value) of the rescaled palette
+
+    Returns:
+        Rescaled palette {value: (R, G, B)}
+    '''
+
+    stops      = sorted(float(value) for value in palette)
+    lower      = stops[0]
+    span       = stops[-1] - stops[0]
+    low, high  = float(value_range[0]), float(value_range[1])
+
+    if span == 0:
+        return {low: tuple(color) for color in palette.values()}
+
+    return {low + (float(value) - lower) / span * (high - low): tuple(color) for value, color in palette.items()}
+
+def apply_palette(values:      np.ndarray,
+                  stops:       np.ndarray,
+                  colors:      np.ndarray,
+                  interpolate: bool  = True,
+                  nodata:      float = None,
+                  alpha:       bool  = False):
+
+    '''
+    Colours a value array with a palette. Values between two stops get linearly interpolated colors
+    (interpolate=True) or the color of the lower stop; values outside the stops get the end colors.
+
+    *args:
+        values: value array of shape (rows, cols)\n
+        stops, colors: palette from palette_lut()\n
+        interpolate: whether to interpolate colors between stops\n
+        nodata: nodata value; nodata and NaN pixels are black (and transparent with alpha)\n
+        alpha: whether to add an alpha band
+
+    Returns:
+        uint8 array of shape (rows, cols, 3) or (rows, cols, 4)
+    '''
+
+    values  = np.asarray(values, dtype=np.float64)
+    invalid = ~np.isfinite(values)
+
+    if nodata is not None:
+        invalid |= values == nodata
+
+    values  = np.where(invalid, stops[0], values)
+    rgb     = np.empty(values.shape + (4 if alpha else 3,), dtype=np.uint8)
+
+    if interpolate:
+        for c in range(3):
+            rgb[..., c] = np.rint(np.interp(values, stops, colors[:, c]))
+    else:
+        index         = np.clip(np.searchsorted(stops, values, side='right') - 1, 0, len(stops) - 1)
+        rgb[..., :3]  = colors[index]
+
+    rgb[invalid, :3] = 0
+
+    if alpha:
+        rgb[..., 3] = np.where(invalid, 0, 255)
+
+    return rgb
+
+def export_palette_raster(value_path:   str,
+                          palette_path: str,
+                          palette:      dict,
+                          interpolate:  bool  = True,
+                          band:         int   = 0,
+                          nodata:       float = None,
+                          alpha:        bool  = False,
+                          tile:         tuple = (256, 256)):
+
+    '''
+    Derives the palette raster (RGB) from an exported value raster, e.g. of Metashape.RasterTransformValue,
+    in a single streaming pass over row bands of tiles. The georeferencing is copied from the value raster.
+
+    *args:
+        value_path: value raster (GeoTIFF)\n
+        palette_path: output palette raster (GeoTIFF)\n
+        palette: {value: (R, G, B)}\n
+        interpolate: whether to interpolate colors between palette stops\n
+        band: band of the value raster to colour\n
+        nodata: nodata value; default: nodata tag of the value raster or METASHAPE_NODATA\n
+        alpha: whether to add an alpha band for nodata pixels\n
+        tile: tile size of the palette raster
+
+    Returns:
+        Path of the palette raster
+    '''
+
+    info          = rio.raster_info(value_path)
+    nodata        = nodata if nodata is not None else (info['nodata'] if info['nodata'] is not None else METASHAPE_NODATA)
+    stops, colors = palette_lut(palette)
+
+    def tiles():
+        for row, values in rio.iter_row_bands(value_path, rows=tile[0]):
+            values = values[..., band] if values.ndim == 3 else values
+            yield from rio.iter_tiles(apply_palette(values, stops, colors, interpolate=interpolate,
+                                                    nodata=nodata, alpha=alpha), tile=tile)
+
+    rio.write_tiles(palette_path, tiles(),
+                    shape     = (info['height'], info['width'], 4 if alpha else 3),
+                    dtype     = np.uint8,
+                    tile      = tile,
+                    extratags = rio.read_geotiff_tags(value_path))
+
+    return palette_path
@@ -0,0 +1,444 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import os
+    import glob
+    import itertools
+    import json
+    import shutil
+    import tempfile
+    import numpy as np
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['CONFIDENCE_FIELD', 'PLY_TYPES', 'read_ply_header', 'read_ply', 'iter_obj_points', 'iter_points',
+           'coordinates', 'write_ply', 'voxel_downsample', 'downsample_cloud', 'tile_points', 'load_tile']
+
+###############################################################################
+# point cloud files (PLY, OBJ)
+
+# point property with the confidence of Metashape exports (save_point_confidence)
+CONFIDENCE_FIELD = 'confidence'
+
+# PLY property types and their NumPy types
+PLY_TYPES = {'char':  'i1', 'int8':    'i1', 'uchar':  'u1', 'uint8':   'u1',
+             'short': 'i2', 'int16':   'i2', 'ushort': 'u2', 'uint16':  'u2',
+             'int':   'i4', 'int32':   'i4', 'uint':   'u4', 'uint32':  'u4',
+             'float': 'f4', 'float32': 'f4', 'double': 'f8', 'float64': 'f8'}
+
+def read_ply_header(path: str):
+
+    '''
+    Parses the header of a PLY file into NumPy structured dtypes per element.
+
+    *args:
+        path: PLY file
+
+    Returns:
+        Dictionary with format ('ascii', 'binary_little_endian', 'binary_big_endian'), header_size (bytes)
+        and elements: list of (name, count, dtype); dtype is None for elements with list properties
+    '''
+
+    elements = []
+
+    with open(path, 'rb') as file:
+        if file.readline().strip() != b'ply':
+            raise ValueError(f'{path} is not a PLY file')
+
+        fmt = None
+
+        while True:
+            line = file.readline()
+            if not line:
+                raise ValueError(f'{path}: PLY header without end_header')
+
+            words = line.decode('ascii', errors='replace').split()
+
+            if not words or words[0] in ['comment', 'obj_info']:
+                continue
+            if words[0] == 'end_header':
+                break
+            if words[0] == 'format':
+                fmt = words[1]
+            elif words[0] == 'element':
+                elements.append([words[1], int(words[2]), []])
+            elif words[0] == 'property':
+                if words[1] == 'list':
+                    elements[-1][2] = None
+                elif elements[-1][2] is not None:
+                    elements[-1][2].append((words[2], PLY_TYPES[words[1]]))
+
+        header_size = file.tell()
+
+    order = '>' if fmt == 'binary_big_endian' else '<'
+
+    return {'format':      fmt,
+            'header_size': header_size,
+            'elements':    [(name, count, None if fields is None else np.dtype([(field, order + type_) for field, type_ in fields]))
+                            for name, count, fields in elements]}
+
+def read_ply(path: str, element: str = 'vertex'):
+
+    '''
+    Reads an element of a PLY file, e.g. the points. Binary files are memory-mapped (read-only),
+    so only the accessed parts are loaded; ASCII files are parsed into memory.
+
+    *args:
+        path: PLY file\n
+        element: PLY element
+
+    Returns:
+        Structured array (numpy.memmap for binary files) with the element properties as fields
+    '''
+
+    header = read_ply_header(path)
+    offset = header['header_size']
+
+    for name, count, dtype in header['elements']:
+
+        if name == element:
+            if dtype is None:
+                raise ValueError(f'{path}: element {element!r} with list properties is not supported')
+            if header['format'] == 'ascii':
+                return np.loadtxt(path, dtype=dtype, skiprows=_ascii_skiprows(path, header, element), max_rows=count, ndmin=1)
+            return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=(count,))
+
+        if dtype is None and header['format'] != 'ascii':
+            raise ValueError(f'{path}: element {element!r} follows an element with list properties')
+        offset += count * (dtype.itemsize if dtype is not None else 0)
+
+    raise ValueError(f'{path}: no element {element!r}')
+
+def _ascii_skiprows(path: str, header: dict, element: str):
+
+    ''' Number of lines before the first line of an element in an ASCII PLY file. '''
+
+    with open(path, 'rb') as file:
+        lines = file.read(header['header_size']).count(b'\n')
+
+    for name, count, _ in header['elements']:
+        if name == element:
+            return lines
+        lines += count
+
+def iter_obj_points(path: str, chunk_size: int = 1000000, block_size: int = 1 << 24):
+
+    '''
+    Iterates the vertices of an OBJ point cloud (lines 'v x y z [r g b]', e.g. exports of
+    Export.point_cloud) in chunks of a fixed number of points. The file is read in blocks of bytes,
+    so memory is bounded by block_size and chunk_size; other lines (faces, normals) are skipped.
+
+    *args:
+        path: OBJ file\n
+        chunk_size: number of points per chunk\n
+        block_size: number of bytes read at once
+
+    Returns:
+        Generator of structured arrays with x, y, z (float64) and red, green, blue (uint8) if the vertices have colors
+    '''
+
+    dtype   = None
+    pending = []
+    count   = 0
+    rest    = b''
+
+    with open(path, 'rb') as file:
+        while True:
+            block = file.read(block_size)
+            lines = (rest + block).split(b'\n')
+            rest  = lines.pop() if block else b''
+
+            vertices = [line[2:] for line in lines if line.startswith(b'v ')]
+
+            if vertices:
+                columns = len(vertices[0].split())
+                values  = np.array(b' '.join(vertices).split(), dtype=np.float64).reshape(-1, columns)
+
+                if dtype is None:
+                    dtype = np.dtype([('x', 'f8'), ('y', 'f8'), ('z', 'f8')] +
+                                     ([('red', 'u1'), ('green', 'u1'), ('blue', 'u1')] if columns >= 6 else []))
+
+                points = np.empty(len(values), dtype=dtype)
+                for i, field in enumerate(dtype.names):
+                    points[field] = values[:, i] if i < 3 else np.clip(np.round(values[:, i] * 255), 0, 255)
+
+                pending.append(points)
+                count += len(points)
+
+            while count >= chunk_size or (not block and count):
+                points  = np.concatenate(pending)
+                pending = [points[chunk_size:]]
+                count   = len(pending[0])
+                yield points[:chunk_size]
+
+            if not block:
+                break
+
+def iter_points(path: str, chunk_size: int = 1000000, fields: list = None, min_confidence: float = None):
+
+    '''
+    Iterates the points of a PLY or OBJ file in chunks of a fixed number of points (copies of the memory-mapped
+    PLY file), so memory stays bounded independent of the file size.
+
+    *args:
+        path: PLY or OBJ file\n
+        chunk_size: number of points per chunk (before filtering)\n
+        fields: properties to read, e.g. ['x', 'y', 'z']; default: all\n
+        min_confidence: minimum confidence of the points (property CONFIDENCE_FIELD); None: no filter
+
+    Returns:
+        Generator of structured arrays
+    '''
+
+    if os.path.splitext(path)[1].lower() == '.obj':
+        chunks = iter_obj_points(path, chunk_size)
+    else:
+        points = read_ply(path)
+        chunks = (points[start:start + chunk_size] for start in range(0, len(points), chunk_size))
+
+    for chunk in chunks:
+        if min_confidence is not None:
+            if CONFIDENCE_FIELD not in chunk.dtype.names:
+                raise ValueError(f'{path}: no point property {CONFIDENCE_FIELD!r} for the confidence filter')
+            chunk = chunk[chunk[CONFIDENCE_FIELD] >= min_confidence]
+        yield np.array(chunk[fields] if fields else chunk)
+
+def coordinates(points: np.ndarray):
+
+    ''' Returns the x, y, z fields of structured points as float64 array of shape (n, 3). '''
+
+    return np.column_stack([points['x'], points['y'], points['z']]).astype(np.float64)
+
+def write_ply(path: str, chunks: object, comments: list = None):
+
+    '''
+    Writes point chunks as binary little endian PLY in one streaming pass. The number of points
+    is written into the header at the end (fixed-width field), so the chunks are never held in memory together.
+
+    *args:
+        path: PLY file\n
+        chunks: iterator of structured arrays with the same dtype\n
+        comments: header comments
+
+    Returns:
+        Number of points
+    '''
+
+    names  = {np.dtype(type_).str[1:]: name for name, type_ in PLY_TYPES.items() if not name[-1].isdigit()}
+    chunks = iter(chunks)
+    first  = next(chunks, np.empty(0, dtype=[('x', 'f8'), ('y', 'f8'), ('z', 'f8')]))
+    dtype  = np.dtype([(field, '<' + first.dtype[field].str[1:]) for field in first.dtype.names])
+    head   = ['ply', 'format binary_little_endian 1.0'] + [f'comment {comment}' for comment in comments or []] + ['element vertex ']
+    tail   = [' ' * 20] + [f'property {names[dtype[field].str[1:]]} {field}' for field in dtype.names] + ['end_header\n']
+    count  = 0
+
+    with open(path, 'wb') as file:
+        file.write('\n'.join(head).encode('ascii'))
+        offset = file.tell()
+        file.write('\n'.join(tail).encode('ascii'))
+
+        for chunk in itertools.chain([first], chunks):
+            chunk.astype(dtype).tofile(file)
+            count += len(chunk)
+
+        # number of points into the fixed-width field of the header
+        file.seek(offset)
+        file.write(str(count).ljust(20).encode('ascii'))
+
+    return count
+
+###############################################################################
+# voxel-grid downsampling
+
+def voxel_downsample(points: np.ndarray, voxel_size: float):
+
+    '''
+    Reduces points to one point per occupied voxel of a regular 3D grid (voxel indices floor(xyz / voxel_size)).
+    All properties are averaged per voxel, i.e. the coordinates become the centroid; averaged normals
+    (nx, ny, nz) are normalized again.
+
+    *args:
+        points: structured array with x, y, z or array of shape (n, k) with x, y, z in the first columns\n
+        voxel_size: voxel edge length in units of the coordinates
+
+    Returns:
+        Array of the same type with one point per voxel
+    '''
+
+    structured = points.dtype.names is not None
+    xyz        = coordinates(points) if structured else np.asarray(points[:, :3], dtype=np.float64)
+
+    if len(points) == 0:
+        return points[:0]
+
+    _, inverse, counts = np.unique(np.floor(xyz / voxel_size).astype(np.int64), axis=0, return_inverse=True, return_counts=True)
+    inverse = inverse.ravel()
+
+    def mean(values):
+        return np.bincount(inverse, weights=values, minlength=len(counts)) / counts
+
+    if not structured:
+        return np.column_stack([mean(points[:, i].astype(np.float64)) for i in range(points.shape[1])]).astype(points.dtype)
+
+    result = np.empty(len(counts), dtype=points.dtype)
+
+    for field in points.dtype.names:
+        values        = mean(points[field].astype(np.float64))
+        kind          = points.dtype[field].kind
+        result[field] = np.round(values) if kind in 'iu' else values
+
+    if all(field in points.dtype.names for field in ['nx', 'ny', 'nz']):
+        normals = np.column_stack([result['nx'], result['ny'], result['nz']]).astype(np.float64)
+        normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+        result['nx'], result['ny'], result['nz'] = normals.T
+
+    return result
+
+def downsample_cloud(path:           str,
+                     out_path:       str,
+                     voxel_size:     float,
+                     min_confidence: float = None,
+                     tile_size:      float = None,
+                     chunk_size:     int   = 1000000):
+
+    '''
+    Voxel-grid downsampling of a PLY or OBJ point cloud with bounded memory: the (confidence-filtered) points
+    are streamed into spatial tiles (tile_points) whose edges coincide with voxel edges, then each tile is
+    downsampled on its own and streamed into a binary PLY. Memory is bounded by chunk_size and the points of one tile.
+
+    *args:
+        path: PLY or OBJ file\n
+        out_path: binary PLY file\n
+        voxel_size: voxel edge length in units of the coordinates\n
+        min_confidence: minimum confidence of the points; None: no filter\n
+        tile_size: tile edge length (rounded to a multiple of voxel_size); default: 256 voxels\n
+        chunk_size: number of points read at once
+
+    Returns:
+        Dictionary with the numbers of points read (after filtering) and written
+    '''
+
+    tile_size = voxel_size * max(round((tile_size or 256 * voxel_size) / voxel_size), 1)
+    tile_dir  = tempfile.mkdtemp(prefix='tiles_', dir=os.path.dirname(os.path.abspath(out_path)))
+
+    try:
+        counts  = tile_points(iter_points(path, chunk_size, min_confidence=min_confidence), tile_size, tile_dir,
+                              voxel_size=voxel_size)
+        written = write_ply(out_path, (voxel_downsample(load_tile(tile_dir, tile), voxel_size) for tile in sorted(counts)),
+                            comments=[f'voxel downsampled ({voxel_size}) from {os.path.basename(path)}'])
+    finally:
+        shutil.rmtree(tile_dir, ignore_errors=True)
+
+    return {'read': sum(counts.values()), 'written': written}
+
+###############################################################################
+# spatial tiling of point streams
+
+def tile_points(chunks:     object,
+                tile_size:  float,
+                out_dir:    str,
+                dtype:      object = np.float64,
+                voxel_size: float  = None):
+
+    '''
+    Distributes point chunks into square tiles of the XY plane in one streaming pass. The points
+    of each tile are appended to a raw binary file {i}_{j}.bin (tile indices floor(x / tile_size),
+    floor(y / tile_size)), so equal tile indices cover the same area for all clouds. With voxel_size, the
+    tile indices are derived from the voxel indices (floor(x / voxel_size) // voxels per tile), so the points
+    of a voxel always end up in the same tile despite rounding of the coordinates at the tile edges.
+
+    *args:
+        chunks: iterator of arrays of shape (n, k) with x, y, z in the first columns
+                or of structured arrays with x, y, z fields (stored with all fields)\n
+        tile_size: tile edge length in units of the coordinates\n
+        out_dir: directory of the tile files (created; existing tile files are replaced)\n
+        dtype: data type of the tile files for arrays of shape (n, k)\n
+        voxel_size: voxel edge length of a subsequent voxel_downsample(); tile_size must be a multiple of it
+
+    Returns:
+        {(i, j): number of points}
+    '''
+
+    os.makedirs(out_dir, exist_ok=True)
+
+    for path in glob.glob(os.path.join(out_dir, '*.bin')):
+        os.remove(path)
+
+    counts  = dict()
+    columns = 3
+
+    for chunk in chunks:
+
+        if chunk.dtype.names is None:
+            chunk   = np.asarray(chunk, dtype=dtype)
+            columns = chunk.shape[1]
+            xy      = chunk[:, :2]
+        else:
+            dtype   = chunk.dtype
+            columns = 0
+            xy      = np.column_stack([chunk['x'], chunk['y']])
+
+        if voxel_size is None:
+            tiles = np.floor(xy / tile_size).astype(np.int64)
+        else:
+            tiles = np.floor(xy / voxel_size).astype(np.int64) // max(int(round(tile_size / voxel_size)), 1)
+
+        keys, inverse = np.unique(tiles, axis=0, return_inverse=True)
+        order   = np.argsort(inverse.ravel(), kind='stable')
+        splits  = np.cumsum(np.bincount(inverse.ravel(), minlength=len(keys)))[:-1]
+
+        for (i, j), part in zip(keys.tolist(), np.split(chunk[order], splits)):
+            with open(os.path.join(out_dir, f'{i}_{j}.bin'), 'ab') as file:
+                part.tofile(file)
+            counts[(i, j)] = counts.get((i, j), 0) + len(part)
+
+    # structured tiles (columns 0) store their fields as compact JSON
+    with open(os.path.join(out_dir, 'tiles.txt'), 'w') as file:
+        dtype = np.dtype(dtype)
+        file.write(f'{tile_size} {columns} {json.dumps(dtype.descr, separators=(",", ":")) if dtype.names else dtype.str}\n')
+
+    return counts
+
+def load_tile(tile_dir: str, tile: tuple, buffer: float = 0.0):
+
+    '''
+    Loads the points of a tile of tile_points(), including the points of the neighbouring tiles
+    within a buffer around the tile.
+
+    *args:
+        tile_dir: directory of tile_points()\n
+        tile: (i, j) tile indices\n
+        buffer: buffer around the tile in units of the coordinates (at most one tile size)
+
+    Returns:
+        Array of shape (n, k) or structured array
+    '''
+
+    with open(os.path.join(tile_dir, 'tiles.txt'), 'r') as file:
+        tile_size, columns, dtype = file.read().split(maxsplit=2)
+
+    tile_size, columns = float(tile_size), int(columns)
+    dtype              = np.dtype([tuple(field) for field in json.loads(dtype)]) if columns == 0 else np.dtype(dtype.strip())
+    i, j   = tile
+    reach  = 1 if buffer > 0 else 0
+    parts  = []
+
+    for di in range(-reach, reach + 1):
+        for dj in range(-reach, reach + 1):
+            path = os.path.join(tile_dir, f'{i + di}_{j + dj}.bin')
+            if os.path.exists(path):
+                parts.append(np.fromfile(path, dtype=dtype) if columns == 0 else np.fromfile(path, dtype=dtype).reshape(-1, columns))
+
+    if not parts:
+        return np.empty(0, dtype=dtype) if columns == 0 else np.empty((0, columns), dtype=dtype)
+
+    points = np.concatenate(parts)
+
+    if reach:
+        x, y       = (points['x'], points['y']) if columns == 0 else (points[:, 0], points[:, 1])
+        xmin, ymin = i * tile_size - buffer, j * tile_size - buffer
+        xmax, ymax = (i + 1) * tile_size + buffer, (j + 1) * tile_size + buffer
+        points     = points[(x >= xmin) & (x < xmax) & (y >= ymin) & (y < ymax)]
+
+    return points
@@ -0,0 +1,474 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import os
+    import re
+    import queue
+    import numpy    as np
+    import tifffile
+    from collections        import deque
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['crs_to_epsg', 'geotiff_tags', 'write_geotiff', 'raster_info', 'read_geotiff_tags',
+           'iter_row_bands', 'iter_tiles', 'write_tiles', 'map_tiles', 'raster_origin', 'sample_raster',
+           'GDAL_NODATA', 'GEOTIFF_TAG_CODES', 'GEO_KEY_DIRECTORY', 'MODEL_PIXEL_SCALE', 'MODEL_TIEPOINT']
+
+###############################################################################
+# GeoTIFF input/output with tifffile
+
+# GeoTIFF tag codes
+MODEL_PIXEL_SCALE = 33550
+MODEL_TIEPOINT    = 33922
+GEO_KEY_DIRECTORY = 34735
+GDAL_NODATA       = 42113
+
+def crs_to_epsg(crs: object):
+
+    '''
+    Derives the EPSG code of a coordinate system, e.g. project.chunk.crs.
+
+    *args:
+        crs: Metashape.CoordinateSystem, 'EPSG::25833' or an EPSG code
+
+    Returns:
+        (epsg, geographic) - EPSG code (None if unknown) and whether it is a geographic coordinate system
+    '''
+
+    if crs is None:
+        return None, False
+
+    if isinstance(crs, int):
+        return crs, crs == 4326
+
+    authority = getattr(crs, 'authority', None) or getattr(crs, 'name', None) or str(crs)
+    wkt       = getattr(crs, 'wkt', '') or ''
+    match     = re.search(r'EPSG:+(\d+)', str(authority)) or re.search(r'EPSG:+(\d+)', wkt)
+    epsg      = int(match.group(1)) if match else None
+
+    if wkt.lstrip().upper().startswith(('PROJCS', 'PROJCRS', 'LOCAL_CS')):
+        geographic = False
+    elif wkt.lstrip().upper().startswith(('GEOGCS', 'GEOGCRS')):
+        geographic = True
+    else:
+        geographic = epsg == 4326
+
+    return epsg, geographic
+
+def geotiff_tags(origin: tuple, cell_size: float, epsg: int = None, geographic: bool = False, nodata: float = None):
+
+    '''
+    Creates the GeoTIFF tags of a north-up raster for tifffile (extratags).
+
+    *args:
+        origin: (x, y) coordinates of the upper left raster corner\n
+        cell_size: pixel size in units of the coordinate system (float or (x, y))\n
+        epsg: EPSG code of the coordinate system\n
+        geographic: whether the EPSG code refers to a geographic coordinate system\n
+        nodata: nodata value (GDAL tag)
+
+    Returns:
+        List of extratags
+    '''
+
+    size_x, size_y = cell_size if isinstance(cell_size, (tuple, list)) else (cell_size, cell_size)
+
+    # GeoKeyDirectory: header, GTModelType, GTRasterType (PixelIsArea), CRS key
+    keys = [1, 1, 0, 2,
+            1024, 0, 1, 2 if geographic else 1,
+            1025, 0, 1, 1]
+
+    if epsg is not None:
+        keys[3] += 1
+        keys    += [2048 if geographic else 3072, 0, 1, int(epsg)]
+
+    tags = [(MODEL_PIXEL_SCALE, 'd', 3, (float(size_x), float(size_y), 0.0), True),
+            (MODEL_TIEPOINT,    'd', 6, (0.0, 0.0, 0.0, float(origin[0]), float(origin[1]), 0.0), True),
+            (GEO_KEY_DIRECTORY, 'H', len(keys), tuple(keys), True)]
+
+    if nodata is not None:
+        tags.append((GDAL_NODATA, 's', 0, str(nodata), True))
+
+    return tags
+
+def write_geotiff(path:        str,
+                  data:        np.ndarray,
+                  origin:      tuple,
+                  cell_size:   float,
+                  epsg:        int   = None,
+                  geographic:  bool  = False,
+                  nodata:      float = np.nan,
+                  tile:        tuple = (256, 256),
+                  compression: str   = 'zlib'):
+
+    '''
+    Writes a tiled, compressed GeoTIFF.
+
+    *args:
+        path: output file\n
+        data: raster of shape (rows, cols) or (bands, rows, cols)\n
+        origin: (x, y) coordinates of the upper left raster corner\n
+        cell_size: pixel size in units of the coordinate system\n
+        epsg: EPSG code of the coordinate system\n
+        geographic: whether the EPSG code refers to a geographic coordinate system\n
+        nodata: nodata value\n
+        tile: tile size (multiples of 16)\n
+        compression: tifffile compression, e.g. 'zlib' or None
+    '''
+
+    data = np.asarray(data)
+
+    tifffile.imwrite(path, data,
+                     tile         = tile,
+                     compression  = compression,
+                     photometric  = 'minisblack',
+                     planarconfig = 'separate' if data.ndim == 3 else None,
+                     metadata     = None,
+                     extratags    = geotiff_tags(origin, cell_size, epsg=epsg, geographic=geographic, nodata=nodata))
+
+###############################################################################
+# streaming access to large rasters
+
+# GeoTIFF tags copied to derived rasters: ModelPixelScale, ModelTiepoint, ModelTransformation,
+# GeoKeyDirectory, GeoDoubleParams, GeoAsciiParams
+GEOTIFF_TAG_CODES = [MODEL_PIXEL_SCALE, MODEL_TIEPOINT, 34264, GEO_KEY_DIRECTORY, 34736, 34737]
+
+def raster_info(path: str):
+
+    '''
+    Reads the raster properties of the first page of a TIFF without reading pixel data.
+
+    *args:
+        path: TIFF file
+
+    Returns:
+        Dictionary with height, width, samples, dtype, tile (tile size or None), nodata (None if not set)
+        and alpha (whether the last sample is an alpha band)
+    '''
+
+    with tifffile.TiffFile(path) as tif:
+        page   = tif.pages[0]
+        nodata = page.tags.get(GDAL_NODATA)
+
+        return {'height':  page.imagelength,
+                'width':   page.imagewidth,
+                'samples': page.samplesperpixel,
+                'dtype':   page.dtype,
+                'tile':    (page.tilelength, page.tilewidth) if page.is_tiled else None,
+                'nodata':  float(nodata.value.strip('\x00 ')) if nodata is not None else None,
+                'alpha':   len(page.extrasamples) > 0 and int(page.extrasamples[-1]) in (1, 2)}
+
+def read_geotiff_tags(path: str):
+
+    '''
+    Reads the georeferencing tags of a TIFF as tifffile extratags, e.g. to write a derived raster
+    with the same georeferencing (the nodata tag is not included).
+
+    *args:
+        path: TIFF file
+
+    Returns:
+        List of extratags
+    '''
+
+    dtypes = {2: 's', 3: 'H', 12: 'd'}
+    tags   = []
+
+    with tifffile.TiffFile(path) as tif:
+        for code in GEOTIFF_TAG_CODES:
+            tag = tif.pages[0].tags.get(code)
+            if tag is None or int(tag.dtype) not in dtypes:
+                continue
+            value = tag.value if isinstance(tag.value, (str, tuple)) else tuple(np.atleast_1d(tag.value).tolist())
+            tags.append((code, dtypes[int(tag.dtype)], 0 if isinstance(value, str) else len(value), value, True))
+
+    return tags
+
+def raster_origin(path: str):
+
+    '''
+    Reads the georeferencing of a north-up GeoTIFF (ModelTiepoint and ModelPixelScale).
+
+    *args:
+        path: TIFF file
+
+    Returns:
+        (x, y, size_x, size_y) - coordinates of the upper left raster corner and pixel size;
+        pixel coordinates (0, 0, 1, 1) without georeferencing
+    '''
+
+    with tifffile.TiffFile(path) as tif:
+        tags  = tif.pages[0].tags
+        scale = tags.get(MODEL_PIXEL_SCALE)
+        tie   = tags.get(MODEL_TIEPOINT)
+
+        if scale is None or tie is None:
+            return 0.0, 0.0, 1.0, 1.0
+
+        i, j, _, x, y, _ = tie.value[:6]
+        size_x, size_y   = scale.value[:2]
+
+        return x - i * size_x, y + j * size_y, size_x, size_y
+
+def sample_raster(path: str, max_samples: int = 1000000, band: int = 0, nodata: float = None):
+
+    '''
+    Reads a regular subsample of the valid pixels of a raster band in one streaming pass,
+    e.g. to estimate percentiles of rasters that do not fit into memory.
+
+    *args:
+        path: TIFF file\n
+        max_samples: upper limit of sampled pixels (before removing nodata)\n
+        band: band to sample\n
+        nodata: nodata value besides NaN; default: nodata tag of the raster
+
+    Returns:
+        1D array of sampled values
+    '''
+
+    info    = raster_info(path)
+    nodata  = nodata if nodata is not None else info['nodata']
+    stride  = max(int(np.ceil(np.sqrt(info['height'] * info['width'] / max_samples))), 1)
+    samples = []
+
+    for row, values in iter_row_bands(path, rows=256):
+        values = values[..., band] if values.ndim == 3 else values
+        offset = (-row) % stride
+        values = values[offset::stride, ::stride].astype(np.float64).ravel()
+        valid  = np.isfinite(values) if nodata is None else np.isfinite(values) & (values != nodata)
+        samples.append(values[valid])
+
+    return np.concatenate(samples) if samples else np.empty(0)
+
+def iter_row_bands(path: str, rows: int = 256):
+
+    '''
+    Reads a TIFF in bands of full width, decoding one strip or one row of tiles at a time,
+    so memory stays bounded by a few bands independent of the raster size.
+    Uncompressed rasters are memory-mapped and read without decoding.
+
+    *args:
+        path: TIFF file\n
+        rows: number of rows per band (the last band may be smaller)
+
+    Returns:
+        Generator of (first row, band) with band shape (rows, width) or (rows, width, samples)
+    '''
+
+    with tifffile.TiffFile(path) as tif:
+        page    = tif.pages[0]
+        height  = page.imagelength
+        width   = page.imagewidth
+        samples = page.samplesperpixel
+        squeeze = (lambda band: band[..., 0]) if samples == 1 else (lambda band: band)
+
+        # uncompressed rasters are mapped directly; separate sample planes are not decoded
+        # band-wise and get decoded into a temporary file instead
+        planar = samples > 1 and page.planarconfig != 1
+
+        if page.is_memmappable or planar:
+            data = page.asarray(out='memmap')
+            for row in range(0, height, rows):
+                band = data[:, row:row + rows] if planar else data[row:row + rows]
+                yield row, np.moveaxis(np.asarray(band), 0, -1) if planar else np.asarray(band)
+            return
+
+        parts     = []        # decoded rows not yet yielded
+        available = 0
+        row       = 0
+        segment_y = None
+        pending   = None
+
+        def complete(band):
+            nonlocal available
+            parts.append(band)
+            available += len(band)
+
+        for segment, index, shape in page.segments():
+
+            y, x = index[2], index[3]
+            data = segment[0]
+
+            # strips and tile rows are assembled to full width rows
+            if y != segment_y:
+                if pending is not None:
+                    complete(pending)
+                segment_y = y
+                pending   = np.empty((min(data.shape[0], height - y), width, samples), dtype=page.dtype)
+
+            columns = min(data.shape[1], width - x)
+            pending[:, x:x + columns] = data[:len(pending), :columns]
+
+            while available >= rows:
+                block     = np.concatenate(parts) if len(parts) > 1 else parts[0]
+                parts     = [block[rows:]] if len(block) > rows else []
+                available = len(block) - rows
+                yield row, squeeze(block[:rows])
+                row      += rows
+
+        if pending is not None:
+            complete(pending)
+
+        while available > 0:
+            block     = np.concatenate(parts) if len(parts) > 1 else parts[0]
+            parts     = [block[rows:]] if len(block) > rows else []
+            available = max(len(block) - rows, 0)
+            yield row, squeeze(block[:rows])
+            row      += rows
+
+def iter_tiles(band: np.ndarray, tile: tuple = (256, 256)):
+
+    '''
+    Splits a band of rows into tiles padded to the full tile size, as expected by write_tiles().
+
+    *args:
+        band: array of shape (rows <= tile height, width) or (rows, width, samples)\n
+        tile: tile size
+
+    Returns:
+        Generator of tiles from left to right
+    '''
+
+    for col in range(0, band.shape[1], tile[1]):
+        part = band[:, col:col + tile[1]]
+
+        if part.shape[:2] != tuple(tile):
+            padded = np.zeros(tuple(tile) + band.shape[2:], dtype=band.dtype)
+            padded[:part.shape[0], :part.shape[1]] = part
+            part   = padded
+
+        yield part
+
+def write_tiles(path:        str,
+                tiles:       object,
+                shape:       tuple,
+                dtype:       object,
+                tile:        tuple = (256, 256),
+                extratags:   list  = None,
+                photometric: str   = None,
+                compression: str   = 'zlib'):
+
+    '''
+    Writes a tiled TIFF from a tile iterator (row by row, left to right), so the raster is never
+    held in memory completely.
+
+    *args:
+        path: output file\n
+        tiles: iterator of tiles of the full tile size, e.g. from iter_tiles()\n
+        shape: raster shape (height, width) or (height, width, samples)\n
+        dtype: data type\n
+        tile: tile size (multiples of 16)\n
+        extratags: e.g. GeoTIFF tags from read_geotiff_tags() or geotiff_tags()\n
+        photometric: e.g. 'rgb' or 'minisblack'; default: 'rgb' for 3/4 samples of uint8\n
+        compression: tifffile compression, e.g. 'zlib' or None
+    '''
+
+    if photometric is None:
+        photometric = 'rgb' if len(shape) == 3 and shape[2] in (3, 4) and np.dtype(dtype) == np.uint8 else 'minisblack'
+
+    tifffile.imwrite(path, tiles,
+                     shape        = shape,
+                     dtype        = dtype,
+                     tile         = tile,
+                     compression  = compression,
+                     photometric  = photometric,
+                     planarconfig = 'contig' if len(shape) == 3 else None,
+                     extrasamples = ['unassalpha'] if len(shape) == 3 and shape[2] == 4 else None,
+                     metadata     = None,
+                     extratags    = extratags or [])
+
+def _put(tiles: object, item: object, writer: object):
+
+    ''' Puts a tile into the queue of a writer thread, without blocking on a failed writer. '''
+
+    while True:
+        try:
+            tiles.put(item, timeout=1)
+            return
+        except queue.Full:
+            if writer.done():
+                writer.result()
+                raise RuntimeError('tile writer stopped early')
+
+def _drain(tiles: object):
+
+    ''' Yields tiles from a queue until None. '''
+
+    while (item := tiles.get()) is not None:
+        yield item
+
+def map_tiles(path:     str,
+              func:     object,
+              outputs:  list,
+              workers:  int   = None,
+              tile:     tuple = (256, 256),
+              executor: str   = 'thread'):
+
+    '''
+    Applies a function to all tiles of a raster and writes its results as tiled GeoTIFFs in a single
+    streaming pass: row bands are read in the main thread, tiles are processed in parallel and each
+    output is compressed and written by its own thread. At most a few rows of tiles are held in memory.
+
+    *args:
+        path: input raster (TIFF)\n
+        func: function of a tile array (tile height, tile width[, samples]) returning one array per output
+              of shape (tile height, tile width[, samples]); edge tiles are zero padded.
+              Must be picklable (module level function or functools.partial) for executor='process'\n
+        outputs: list of dictionaries per output with path, dtype, samples (default: 1) and nodata (default: None)\n
+        workers: number of parallel workers; default: os.cpu_count()\n
+        tile: tile size of the processing and the outputs (multiples of 16)\n
+        executor: ['thread', 'process'] - threads for NumPy operations that release the GIL,
+                  processes for Python level work per tile
+
+    Returns:
+        List of output paths
+    '''
+
+    info      = raster_info(path)
+    geotags   = read_geotiff_tags(path)
+    workers   = workers or os.cpu_count() or 1
+    ahead     = 4 * workers
+    pool_type = ProcessPoolExecutor if executor == 'process' else ThreadPoolExecutor
+
+    def tiles():
+        for row, band in iter_row_bands(path, rows=tile[0]):
+            yield from iter_tiles(band, tile=tile)
+
+    def results(pool):
+        pending = deque()
+        for part in tiles():
+            pending.append(pool.submit(func, part))
+            if len(pending) >= ahead:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    queues = [queue.Queue(maxsize=ahead) for _ in outputs]
+
+    with ThreadPoolExecutor(max_workers=len(outputs)) as writers, pool_type(max_workers=workers) as pool:
+
+        futures = []
+        for output, tiles_ in zip(outputs, queues):
+            samples = output.get('samples', 1)
+            nodata  = output.get('nodata')
+            futures.append(writers.submit(write_tiles, output['path'], _drain(tiles_),
+                                          shape     = (info['height'], info['width']) + ((samples,) if samples > 1 else ()),
+                                          dtype     = output['dtype'],
+                                          tile      = tile,
+                                          extratags = geotags + ([(GDAL_NODATA, 's', 0, str(nodata), True)] if nodata is not None else [])))
+
+        try:
+            for result in results(pool):
+                for part, tiles_, writer in zip(result, queues, futures):
+                    _put(tiles_, part, writer)
+        finally:
+            for tiles_, writer in zip(queues, futures):
+                if not writer.done():
+                    _put(tiles_, None, writer)
+
+        for writer in futures:
+            writer.result()
+
+    return [output['path'] for output in outputs]
@@ -0,0 +1,183 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import json
+    import numpy                            as np
+    import PyExpress.DataAnalysis.raster_io as rio
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['ZONAL_STATISTICS', 'read_zones', 'polygon_mask', 'zonal_statistics']
+
+###############################################################################
+# statistics of raster values within areas of interest (AOI)
+
+ZONAL_STATISTICS = ['count', 'mean', 'std', 'min', 'max', 'p10', 'median', 'p90']
+
+def read_zones(path: str, name_field: str = 'name'):
+
+    '''
+    Reads polygons of areas of interest from a GeoJSON file (Polygon and MultiPolygon features).
+    The coordinates have to be in the coordinate system of the raster.
+
+    *args:
+        path: GeoJSON file\n
+        name_field: feature property used as zone name; default name: feature index
+
+    Returns:
+        {name: list of rings}, each ring an array of shape (n, 2)
+    '''
+
+    with open(path, 'r') as file:
+        data = json.load(file)
+
+    features = data['features'] if data.get('type') == 'FeatureCollection' else [data]
+    zones    = dict()
+
+    for i, feature in enumerate(features):
+        geometry = feature.get('geometry', feature)
+        name     = str((feature.get('properties') or {}).get(name_field, i))
+
+        if geometry['type'] == 'Polygon':
+            polygons = [geometry['coordinates']]
+        elif geometry['type'] == 'MultiPolygon':
+            polygons = geometry['coordinates']
+        else:
+            continue
+
+        zones[name] = [np.asarray(ring, dtype=np.float64)[:, :2] for polygon in polygons for ring in polygon]
+
+    return zones
+
+def polygon_mask(x: np.ndarray, y: np.ndarray, rings: list):
+
+    '''
+    Vectorized point in polygon test (even-odd rule, so inner rings are holes).
+
+    *args:
+        x, y: point coordinates\n
+        rings: list of rings of shape (n, 2), or (xmin, ymin, xmax, ymax) for a rectangle
+
+    Returns:
+        Boolean array of the shape of x
+    '''
+
+    if len(rings) == 4 and np.isscalar(rings[0]):
+        xmin, ymin, xmax, ymax = rings
+        return (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+
+    inside = np.zeros(np.shape(x), dtype=bool)
+
+    for ring in rings:
+        x0, y0 = ring[:, 0], ring[:, 1]
+        x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+
+        for xa, ya, xb, yb in zip(x0, y0, x1, y1):
+            if ya == yb:
+                continue
+            crosses = (ya > y) != (yb > y)
+            inside ^= crosses & (x < xa + (y - ya) * (xb - xa) / (yb - ya))
+
+    return inside
+
+def zonal_statistics(path:        str,
+                     zones:       dict,
+                     value_range: tuple = (0.0, 1.0),
+                     bins:        int   = 1000,
+                     band:        int   = 0,
+                     nodata:      float = None):
+
+    '''
+    Computes statistics of raster values per area of interest in one streaming pass over row bands.
+    Count, mean, std, min and max are exact; percentiles come from a fixed histogram over value_range
+    (resolution (max - min) / bins, values outside are counted in the end bins).
+
+    *args:
+        path: raster (GeoTIFF)\n
+        zones: {name: rings} from read_zones() or {name: (xmin, ymin, xmax, ymax)} in raster coordinates\n
+        value_range: histogram range for percentiles\n
+        bins: number of histogram bins\n
+        band: band of the raster\n
+        nodata: nodata value besides NaN; default: nodata tag of the raster
+
+    Returns:
+        {name: {statistic: value}} with ZONAL_STATISTICS
+    '''
+
+    info                   = rio.raster_info(path)
+    nodata                 = nodata if nodata is not None else info['nodata']
+    x0, y0, size_x, size_y = rio.raster_origin(path)
+    x                      = x0 + (np.arange(info['width']) + 0.5) * size_x
+    edges                  = np.linspace(value_range[0], value_range[1], bins + 1)
+
+    # bounding boxes of the zones restrict the point in polygon tests to candidate pixels
+    boxes  = dict()
+    for name, rings in zones.items():
+        if len(rings) == 4 and np.isscalar(rings[0]):
+            boxes[name] = tuple(rings)
+        else:
+            points      = np.concatenate(rings)
+            boxes[name] = (*points.min(axis=0), *points.max(axis=0))
+
+    sums   = {name: np.zeros(3) for name in zones}                    # count, sum, sum of squares
+    ranges = {name: [np.inf, -np.inf] for name in zones}
+    hists  = {name: np.zeros(bins, dtype=np.int64) for name in zones}
+
+    for row, values in rio.iter_row_bands(path, rows=256):
+
+        values = values[..., band] if values.ndim == 3 else values
+        y      = y0 - (row + np.arange(len(values)) + 0.5) * size_y
+
+        for name, rings in zones.items():
+            xmin, ymin, xmax, ymax = boxes[name]
+            rows_   = np.flatnonzero((y >= ymin) & (y <= ymax))
+            cols_   = np.flatnonzero((x >= xmin) & (x <= xmax))
+
+            if len(rows_) == 0 or len(cols_) == 0:
+                continue
+
+            block   = values[rows_[0]:rows_[-1] + 1, cols_[0]:cols_[-1] + 1].astype(np.float64)
+            yy, xx  = np.meshgrid(y[rows_[0]:rows_[-1] + 1], x[cols_[0]:cols_[-1] + 1], indexing='ij')
+            mask    = polygon_mask(xx, yy, rings) & np.isfinite(block)
+
+            if nodata is not None:
+                mask &= block != nodata
+
+            inside  = block[mask]
+
+            if len(inside) == 0:
+                continue
+
+            sums[name]   += (len(inside), inside.sum(), np.square(inside).sum())
+            ranges[name]  = [min(ranges[name][0], inside.min()), max(ranges[name][1], inside.max())]
+            index         = np.clip(np.searchsorted(edges, inside, side='right') - 1, 0, bins - 1)
+            hists[name]  += np.bincount(index, minlength=bins)
+
+    statistics = dict()
+
+    for name in zones:
+        count, total, squares = sums[name]
+
+        if count == 0:
+            statistics[name] = dict({key: np.nan for key in ZONAL_STATISTICS}, count=0)
+            continue
+
+        mean       = total / count
+        cumulative = np.cumsum(hists[name])
+
+        def percentile(q):
+            i     = min(int(np.searchsorted(cumulative, q / 100 * count)), bins - 1)
+            value = (edges[i] + edges[i + 1]) / 2
+            return float(np.clip(value, ranges[name][0], ranges[name][1]))
+
+        statistics[name] = {'count':  int(count),
+                            'mean':   float(mean),
+                            'std':    float(np.sqrt(max(squares / count - mean ** 2, 0.0))),
+                            'min':    float(ranges[name][0]),
+                            'max':    float(ranges[name][1]),
+                            'p10':    percentile(10),
+                            'median': percentile(50),
+                            'p90':    percentile(90)}
+
+    return statistics
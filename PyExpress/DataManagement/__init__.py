@@ -1,5 +1,11 @@
 # SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from .local import *
-from .minIO import *
\ No newline at end of file
+from PyExpress import _lazy
+
+__getattr__, __dir__, __all__ = _lazy.attach(__name__,
+                                             submodules = ['local', 'minIO', 'compression', 'manifest', 'catalog',
+                                                           'calibration_cache'],
+                                             attributes = ['local', 'minIO', 'compression', 'manifest', 'catalog',
+                                                           'calibration_cache'],
+                                             legacy     = ['local', 'minIO'])
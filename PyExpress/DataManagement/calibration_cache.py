@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, re, json, time, hashlib
+
+__all__ = ['CALIBRATION_INDEX', 'CALIBRATION_STAGES', 'sensor_key', 'key_id', 'CalibrationCache']
+
+# index file of a calibration cache directory
+CALIBRATION_INDEX = 'calibration_index.json'
+
+# workflow stages (run record stages) whose execution time depends on the initial calibration
+CALIBRATION_STAGES = ['alignCameras', 'Reference.optimize_cameras']
+
+def sensor_key(model: str, serial: str = None, lens: str = None, sensor: str = None,
+               width: int = None, height: int = None, focal_length: float = None):
+
+    '''
+    Identifies a physical camera/lens combination independent of the project.
+
+    *args:
+        model: camera make and model, e.g. 'DJI M3T'\n
+        serial: serial number of the camera body\n
+        lens: lens model or description\n
+        sensor: sensor label, e.g. the band of a multispectral camera\n
+        width, height: image size in pixels\n
+        focal_length: nominal focal length in mm
+
+    Returns:
+        Dictionary of the key fields
+    '''
+
+    return {'model':        model  or '',
+            'serial':       serial or '',
+            'lens':         lens   or '',
+            'sensor':       sensor or '',
+            'width':        int(width  or 0),
+            'height':       int(height or 0),
+            'focal_length': round(float(focal_length or 0), 3)}
+
+def key_id(key: dict):
+
+    ''' File name safe ID of a sensor key: readable prefix and a short hash of all key fields. '''
+
+    prefix = re.sub(r'[^A-Za-z0-9]+', '_', f"{key['model']}_{key['serial']}_{key['sensor']}").strip('_')
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()[:10]
+
+    return f'{prefix}_{digest}' if prefix else digest
+
+class CalibrationCache():
+
+    def __init__(self, cache_dir: str):
+
+        '''
+        Store of optimized lens calibrations shared between projects (*cache_dir*/calibration_index.json and
+        one calibration file per camera). Entries are keyed by camera model, serial number and lens (see sensor_key)
+        and record the alignment/optimization times of the runs that used them, either starting from the stored
+        calibration (warm start) or from the default calibration (cold start).
+
+        *args:
+            cache_dir: directory of the calibration cache, e.g. shared by all projects of a camera fleet
+        '''
+
+        self.cache_dir = cache_dir
+        self.path      = os.path.join(cache_dir, CALIBRATION_INDEX)
+        self.data      = {'entries': dict()}
+
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as file:
+                self.data.update(json.load(file))
+
+    def save(self):
+
+        ''' Writes the index atomically. '''
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        with open(self.path + '.tmp', 'w') as file:
+            json.dump(self.data, file, indent=1, sort_keys=True)
+
+        os.replace(self.path + '.tmp', self.path)
+
+    def calibration_path(self, key: dict):
+
+        ''' Path of the calibration file of a sensor key. '''
+
+        return os.path.join(self.cache_dir, f'{key_id(key)}.xml')
+
+    def lookup(self, key: dict):
+
+        '''
+        *args:
+            key: sensor key, see sensor_key()
+
+        Returns:
+            Path of the stored calibration or None
+        '''
+
+        entry = self.data['entries'].get(key_id(key))
+
+        if entry is None or not os.path.exists(os.path.join(self.cache_dir, entry['file'])):
+            return None
+
+        return os.path.join(self.cache_dir, entry['file'])
+
+    def store(self, key: dict, write: object, project_ID: str = None, aligned: float = None):
+
+        '''
+        Stores a calibration of a sensor key; the previous calibration is replaced only after the new file
+        was written completely.
+
+        *args:
+            key: sensor key, see sensor_key()\n
+            write: function writing the calibration to the path passed to it, e.g. Metashape.Calibration.save\n
+            project_ID: project the calibration was optimized in\n
+            aligned: fraction of aligned cameras of the project
+
+        Returns:
+            Path of the stored calibration
+        '''
+
+        path = self.calibration_path(key)
+        temp = path[:-4] + '.tmp.xml'
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        write(temp)
+        os.replace(temp, path)
+
+        entry = self.data['entries'].setdefault(key_id(key), {'key': key, 'runs': []})
+        entry.update({'file':       os.path.basename(path),
+                      'project_ID': project_ID,
+                      'aligned':    aligned,
+                      'updated':    time.strftime('%Y-%m-%dT%H:%M:%S')})
+        self.save()
+
+        return path
+
+    def add_run(self, key: dict, project_ID: str, run_id: str, warm_start: bool, cameras: int, timings: dict):
+
+        '''
+        Records the alignment/optimization times of a run; a repeated record of the same run replaces the previous one.
+
+        *args:
+            key: sensor key, see sensor_key()\n
+            project_ID: project ID\n
+            run_id: ID of the run, see hlp.run_id()\n
+            warm_start: whether the run started from the stored calibration\n
+            cameras: number of cameras of the project (times are compared per camera)\n
+            timings: {stage: wall time in seconds}, see CALIBRATION_STAGES
+        '''
+
+        entry = self.data['entries'].setdefault(key_id(key), {'key': key, 'runs': []})
+        runs  = [run for run in entry['runs'] if (run['project_ID'], run['run_id']) != (project_ID, run_id)]
+
+        runs.append({'project_ID': project_ID,
+                     'run_id':     run_id,
+                     'warm_start': bool(warm_start),
+                     'cameras':    int(cameras),
+                     'timings':    {stage: round(float(value), 4) for stage, value in timings.items()},
+                     'date':       time.strftime('%Y-%m-%dT%H:%M:%S')})
+
+        entry['runs'] = runs
+        self.save()
+
+    def savings(self, key: dict = None):
+
+        '''
+        Compares the alignment/optimization times per camera of warm and cold started runs.
+
+        *args:
+            key: sensor key; default: all runs of the cache
+
+        Returns:
+            {stage: {cold_s_per_camera, warm_s_per_camera, saved_percent, cold_runs, warm_runs}};
+            times are None without runs of the respective kind
+        '''
+
+        entries = self.data['entries'].values() if key is None else [self.data['entries'].get(key_id(key), {'runs': []})]
+        runs    = [run for entry in entries for run in entry['runs'] if run['cameras'] > 0]
+        result  = dict()
+
+        for stage in sorted({stage for run in runs for stage in run['timings']}):
+            per_camera = {True: [], False: []}
+            for run in runs:
+                if stage in run['timings']:
+                    per_camera[run['warm_start']].append(run['timings'][stage] / run['cameras'])
+
+            cold = sum(per_camera[False]) / len(per_camera[False]) if per_camera[False] else None
+            warm = sum(per_camera[True])  / len(per_camera[True])  if per_camera[True]  else None
+
+            result[stage] = {'cold_s_per_camera': cold,
+                             'warm_s_per_camera': warm,
+                             'saved_percent':     100 * (cold - warm) / cold if cold and warm is not None else None,
+                             'cold_runs':         len(per_camera[False]),
+                             'warm_runs':         len(per_camera[True])}
+
+        return result
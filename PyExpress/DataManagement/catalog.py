@@ -0,0 +1,390 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, re, json, glob, time, sqlite3, datetime
+import PyExpress.DataManagement as adm
+import PyExpress.UtilityTools   as hlp
+
+__all__ = ['PRODUCT_PATTERNS', 'product_type', 'Catalog', 'SCHEMA']
+
+# product types of exported files without manifest entry (first matching pattern of the path)
+PRODUCT_PATTERNS = [(r'indices[\\/]',              'indices'),
+                    (r'_cwsi',                     'cwsi'),
+                    (r'dem_cube[\\/]',             'dem_cube'),
+                    (r'changes[\\/]',              'change_detection'),
+                    (r'precision_maps?[\\/._]',    'precision_map'),
+                    (r'point_clouds?[\\/._]',      'point_cloud'),
+                    (r'dem_transform|dem_trafo',   'dem_trafo'),
+                    (r'ortho_transform|_pal\.tif', 'ortho_trafo'),
+                    (r'(^|[\\/_])dem[^\\/]*\.tif', 'dem'),
+                    (r'ortho[^\\/]*\.tif',         'ortho'),
+                    (r'report\.pdf$',              'report'),
+                    (r'marker',                    'marker'),
+                    (r'camera',                    'camera'),
+                    (r'tiled',                     'tiled_model'),
+                    (r'model',                     'model'),
+                    (r'\.tiff?$',                  'raster')]
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS projects (project_id   TEXT PRIMARY KEY,
+                                     project_type TEXT,
+                                     date_start   TEXT,
+                                     date_end     TEXT,
+                                     time         TEXT,
+                                     location     TEXT,
+                                     platform     TEXT,
+                                     sensor       TEXT,
+                                     info         TEXT,
+                                     campaign     TEXT,
+                                     parameters   TEXT,
+                                     project_dir  TEXT,
+                                     config_path  TEXT,
+                                     signature    TEXT,
+                                     imported     TEXT);
+CREATE TABLE IF NOT EXISTS products (path         TEXT PRIMARY KEY,
+                                     project_id   TEXT REFERENCES projects(project_id) ON DELETE CASCADE,
+                                     chunk        TEXT,
+                                     product_type TEXT,
+                                     size         INTEGER,
+                                     mtime        REAL,
+                                     hash         TEXT);
+CREATE TABLE IF NOT EXISTS timings  (project_id   TEXT REFERENCES projects(project_id) ON DELETE CASCADE,
+                                     run_id       TEXT,
+                                     stage        TEXT,
+                                     chunk        TEXT,
+                                     status       TEXT,
+                                     start        TEXT,
+                                     wall_s       REAL,
+                                     cpu_s        REAL,
+                                     PRIMARY KEY (project_id, run_id, stage, start));
+CREATE INDEX IF NOT EXISTS projects_location ON projects (location, date_start, date_end);
+CREATE INDEX IF NOT EXISTS projects_sensor   ON projects (sensor, date_start, date_end);
+CREATE INDEX IF NOT EXISTS projects_date     ON projects (date_start, date_end);
+CREATE INDEX IF NOT EXISTS products_type     ON products (product_type, project_id);
+CREATE INDEX IF NOT EXISTS products_project  ON products (project_id, chunk);
+'''
+
+def _date(value: object):
+
+    ''' Converts dates (YYYYMMDD, YYYY-MM-DD, datetime.date) into ISO strings YYYY-MM-DD. '''
+
+    if value is None or value == '':
+        return None
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.strftime('%Y-%m-%d')
+
+    digits = re.sub(r'\D', '', str(value))
+
+    return f'{digits[:4]}-{digits[4:6] or "01"}-{digits[6:8] or "01"}'
+
+def _date_range(value: object):
+
+    ''' First and last date of a campaign date, e.g. '20240501' or a period '20240501-20240531'. '''
+
+    dates = re.findall(r'\d{4}-?\d{2}-?\d{2}', str(value or ''))
+
+    if not dates:
+        return None, None
+
+    return _date(dates[0]), _date(dates[-1])
+
+def _as_dict(config: object):
+
+    ''' Converts the configuration objects of a project into dictionaries. '''
+
+    if hasattr(config, '__dict__'):
+        return {key: _as_dict(value) for key, value in vars(config).items()}
+
+    return config
+
+def product_type(path: str):
+
+    '''
+    Product type of an exported file from its path (see PRODUCT_PATTERNS).
+
+    *args:
+        path: path of the file, relative to the export directory of the project
+
+    Returns:
+        Product type or 'other'
+    '''
+
+    lower = path.lower()
+
+    return next((name for pattern, name in PRODUCT_PATTERNS if re.search(pattern, lower)), 'other')
+
+class Catalog():
+
+    def __init__(self, path: str):
+
+        '''
+        SQLite catalog of Metashape projects and their products across campaigns and epochs.
+        For every projectID it records the campaign metadata (date, location, platform, sensor), the processing
+        parameters, the timings of the workflow steps (run records) and the exported products with type, size and
+        hash, so products are found by indexed queries instead of walking project directories.
+
+        *args:
+            path: SQLite database file (created if it does not exist)
+        '''
+
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.connection = sqlite3.connect(path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA foreign_keys=ON')
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+
+        ''' Closes the database connection. '''
+
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_project(self,
+                    project_id:  str,
+                    config_data: dict,
+                    export_dir:  str,
+                    project_dir: str = None,
+                    config_path: str = None,
+                    signature:   str = ''):
+
+        '''
+        Adds or replaces a project with its campaign metadata, parameters, timings and products.
+        Product types and hashes are taken from the manifest of the export directory (DataManagement.Manifest)
+        where registered; all other files are classified by their path (product_type) and stored without hash.
+
+        *args:
+            project_id: projectID of the project\n
+            config_data: content of the project configuration file\n
+            export_dir: export directory of the project (export_data/*projectID*)\n
+            project_dir: Metashape project directory (metashape_prj)\n
+            config_path: project configuration file\n
+            signature: state of the project files for incremental imports
+
+        Returns:
+            Number of products
+        '''
+
+        campaign             = (config_data.get('input') or {}).get('campaign') or {}
+        project_type         = ((config_data.get('input') or {}).get('project') or {}).get('type')
+        date_start, date_end = _date_range(campaign.get('date'))
+
+        # the manifest is only read: hashes of unchanged files are taken over, other files are not hashed
+        manifest = adm.Manifest(export_dir)
+        files    = manifest.snapshot() if os.path.isdir(export_dir) else dict()
+        owners   = {key: product for product, entry in manifest.data['products'].items() for key in entry['files']}
+        products = []
+
+        for key, (size, mtime_ns) in files.items():
+            parts  = [part for part in re.split(r'[\\/]', key) if part not in ['', '.']]
+            record = manifest.data['files'].get(key, {})
+            if key in owners:
+                chunk, type_ = owners[key].split('/', 1) if '/' in owners[key] else (None, owners[key])
+            else:
+                chunk, type_ = parts[0] if len(parts) > 1 else None, product_type(key)
+            products.append((os.path.normpath(os.path.join(export_dir, key)), project_id, chunk, type_, size, mtime_ns / 1e9,
+                             record.get('hash') if (record.get('size'), record.get('mtime_ns')) == (size, mtime_ns) else None))
+
+        timings = [(project_id, record.get('run_id'), record.get('stage'), record.get('chunk'), record.get('status'),
+                    record.get('start'), record.get('wall_s'), record.get('cpu_s'))
+                   for record in (hlp.load_run_records(os.path.join(export_dir, hlp.RUN_RECORD_FILE))
+                                  if os.path.exists(os.path.join(export_dir, hlp.RUN_RECORD_FILE)) else [])]
+
+        with self.connection:
+            self.connection.execute('DELETE FROM projects WHERE project_id = ?', (project_id,))
+            self.connection.execute('INSERT INTO projects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                    (project_id, project_type, date_start, date_end,
+                                     str(campaign.get('time') or '') or None,
+                                     campaign.get('location'),
+                                     campaign.get('drone') or campaign.get('cameraID'),
+                                     campaign.get('sensor') or campaign.get('channel'),
+                                     campaign.get('ID_info'),
+                                     json.dumps(campaign, default=str),
+                                     json.dumps(config_data.get('metashape') or {}, default=str),
+                                     project_dir, config_path, signature,
+                                     time.strftime('%Y-%m-%dT%H:%M:%S')))
+            self.connection.executemany('INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?, ?, ?, ?)', products)
+            self.connection.executemany('INSERT OR REPLACE INTO timings VALUES (?, ?, ?, ?, ?, ?, ?, ?)', timings)
+
+        return len(products)
+
+    def register_project(self, project: object):
+
+        '''
+        Adds or replaces a project from an open Metashape project (e.g. at the end of a workflow).
+
+        *args:
+            project: your Metashape project
+
+        Returns:
+            Number of products
+        '''
+
+        return self.add_project(project_id  = project.project_ID,
+                                config_data = _as_dict(project.config),
+                                export_dir  = project.export_dir,
+                                project_dir = project.project_dir,
+                                config_path = project.config_name)
+
+    def import_tree(self, root: str, full: bool = False):
+
+        '''
+        Imports existing project trees (created by create_UAV_project / create_stereo_project): every
+        metashape_prj directory below root with its configuration file copy and one project per projectID
+        in export_data. Incremental: projects whose configuration, manifest, run records and export directories
+        (added or removed files) are unchanged since the last import are skipped.
+
+        *args:
+            root: directory of the project trees, e.g. the input.project.path of the configuration files\n
+            full: whether to import all projects again
+
+        Returns:
+            Dictionary with numbers of imported and skipped projects
+        '''
+
+        imported, skipped = 0, 0
+
+        for directory, subdirs, _ in os.walk(root):
+
+            # project trees: no need to descend into images or Metashape data
+            subdirs[:] = [subdir for subdir in subdirs if subdir not in ['image_data', 'project_data', 'export_data']]
+
+            if os.path.basename(directory) != 'metashape_prj':
+                continue
+
+            configs = sorted(glob.glob(os.path.join(directory, '*.yaml')) + glob.glob(os.path.join(directory, '*.yml')) +
+                             glob.glob(os.path.join(directory, '*.json')), key=os.path.getmtime)
+
+            if not configs:
+                continue
+
+            config_path = configs[-1]
+            export_root = os.path.join(directory, 'export_data')
+            ids         = {os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(directory, 'project_data', '*.psx'))}
+            ids        |= {name for name in (os.listdir(export_root) if os.path.isdir(export_root) else [])
+                           if os.path.isdir(os.path.join(export_root, name))}
+
+            for project_id in sorted(ids):
+                export_dir = os.path.join(export_root, project_id)
+                folders    = max([os.path.getmtime(path) for path, _, _ in os.walk(export_dir)], default=None)
+                signature  = json.dumps([folders] + [os.path.getmtime(path) if os.path.exists(path) else None
+                                                     for path in [config_path,
+                                                                  os.path.join(export_dir, adm.MANIFEST_FILE),
+                                                                  os.path.join(export_dir, hlp.RUN_RECORD_FILE)]])
+
+                row = self.connection.execute('SELECT signature FROM projects WHERE project_id = ?', (project_id,)).fetchone()
+
+                if not full and row is not None and row['signature'] == signature:
+                    skipped += 1
+                    continue
+
+                self.add_project(project_id  = project_id,
+                                 config_data = hlp.open_parameters(config_path),
+                                 export_dir  = export_dir,
+                                 project_dir = directory,
+                                 config_path = config_path,
+                                 signature   = signature)
+                imported += 1
+
+        return {'imported': imported, 'skipped': skipped}
+
+    def _where(self, location=None, start=None, end=None, sensor=None, platform=None, project_type=None):
+
+        ''' SQL conditions and parameters of the project filters. '''
+
+        conditions, parameters = [], []
+
+        for column, value in [('location', location), ('sensor', sensor), ('platform', platform), ('project_type', project_type)]:
+            if value is not None:
+                conditions.append(f'p.{column} = ?')
+                parameters.append(value)
+
+        # campaigns overlapping the period [start, end]
+        if start is not None:
+            conditions.append('p.date_end >= ?')
+            parameters.append(_date(start))
+        if end is not None:
+            conditions.append('p.date_start <= ?')
+            parameters.append(_date(end))
+
+        return conditions, parameters
+
+    def projects(self, location: str = None, start: object = None, end: object = None, sensor: str = None,
+                 platform: str = None, project_type: str = None):
+
+        '''
+        Finds projects by campaign metadata.
+
+        *args:
+            location, sensor, platform (drone or camera ID), project_type ('UAV', 'stereo'): exact values; None: any\n
+            start, end: period (YYYYMMDD, YYYY-MM-DD or datetime.date) overlapping the campaign dates
+
+        Returns:
+            List of dictionaries (rows of the projects table)
+        '''
+
+        conditions, parameters = self._where(location, start, end, sensor, platform, project_type)
+        query = 'SELECT p.* FROM projects p' + (' WHERE ' + ' AND '.join(conditions) if conditions else '') + ' ORDER BY p.date_start'
+
+        return [dict(row) for row in self.connection.execute(query, parameters)]
+
+    def products(self, product_type: str = None, location: str = None, start: object = None, end: object = None,
+                 sensor: str = None, platform: str = None, project_type: str = None, chunk: str = None):
+
+        '''
+        Finds products, e.g. all orthomosaics of a location between two dates:
+        catalog.products('ortho', location='X', start='20240501', end='20240531').
+
+        *args:
+            product_type: e.g. 'dem', 'ortho', 'point_cloud' (export types of Export.export_from_list); None: any\n
+            location, start, end, sensor, platform, project_type: see Catalog.projects\n
+            chunk: chunk label
+
+        Returns:
+            List of dictionaries with product and campaign columns, ordered by date
+        '''
+
+        conditions, parameters = self._where(location, start, end, sensor, platform, project_type)
+
+        for column, value in [('product_type', product_type), ('chunk', chunk)]:
+            if value is not None:
+                conditions.append(f'r.{column} = ?')
+                parameters.append(value)
+
+        query = ('SELECT r.*, p.date_start, p.date_end, p.time, p.location, p.platform, p.sensor, p.project_type '
+                 'FROM products r JOIN projects p ON p.project_id = r.project_id' +
+                 (' WHERE ' + ' AND '.join(conditions) if conditions else '') + ' ORDER BY p.date_start, r.path')
+
+        return [dict(row) for row in self.connection.execute(query, parameters)]
+
+    def timings(self, project_id: str = None, stage: str = None):
+
+        '''
+        Execution times of the workflow steps (run records of hlp.instrument).
+
+        *args:
+            project_id: projectID; None: all projects\n
+            stage: workflow step, e.g. 'Export.raster'; None: all steps
+
+        Returns:
+            List of dictionaries (rows of the timings table)
+        '''
+
+        conditions, parameters = [], []
+
+        for column, value in [('project_id', project_id), ('stage', stage)]:
+            if value is not None:
+                conditions.append(f'{column} = ?')
+                parameters.append(value)
+
+        query = 'SELECT * FROM timings' + (' WHERE ' + ' AND '.join(conditions) if conditions else '') + ' ORDER BY start'
+
+        return [dict(row) for row in self.connection.execute(query, parameters)]
@@ -0,0 +1,203 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, time, itertools
+import numpy as np
+from   concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import laspy
+except ImportError:
+    laspy = None
+
+__all__ = ['COMPRESSION_FORMATS', 'Compression']
+
+# compressed formats: file extension appended to (zstd) or replacing (laz) the source extension
+COMPRESSION_FORMATS = {'zstd': '.zst', 'laz': '.laz'}
+
+class Compression():
+
+    def output_path(path: str, fmt: str):
+
+        ''' Default path of the compressed file of a source file. '''
+
+        if fmt == 'zstd':
+            return path + COMPRESSION_FORMATS['zstd']
+
+        return os.path.splitext(path)[0] + COMPRESSION_FORMATS[fmt]
+
+    def zstd(path: str, out_path: str = None, level: int = 3, chunk_size: int = 1 << 24):
+
+        '''
+        Compresses a file with Zstandard in one streaming pass (e.g. a PLY point cloud to *.ply.zst).
+        Memory is bounded by chunk_size; the compressor releases the GIL, so several files can be
+        compressed concurrently in threads.
+
+        *args:
+            path: source file\n
+            out_path: compressed file; default: path + '.zst'\n
+            level: compression level (1 - 22)\n
+            chunk_size: number of bytes read at once
+
+        Returns:
+            Path of the compressed file
+        '''
+
+        if zstandard is None:
+            raise ImportError('Compression: zstd output requires zstandard (pip install zstandard or PyExpress[compression])')
+
+        out_path   = out_path or Compression.output_path(path, 'zstd')
+        compressor = zstandard.ZstdCompressor(level=level)
+
+        with open(path, 'rb') as source, open(out_path, 'wb') as target:
+            compressor.copy_stream(source, target, read_size=chunk_size, write_size=zstandard.COMPRESSION_RECOMMENDED_OUTPUT_SIZE)
+
+        return out_path
+
+    def laz(path: str, out_path: str = None, scale: float = 0.001, chunk_size: int = 1000000):
+
+        '''
+        Converts a PLY or OBJ point cloud into LAZ (LAS 1.4, compressed) chunk by chunk. Colors are kept
+        (scaled to 16 bit), other float properties of PLY files (e.g. confidence, normals) are stored as extra bytes.
+
+        *args:
+            path: PLY or OBJ point cloud\n
+            out_path: LAZ file; default: path with extension .laz\n
+            scale: coordinate resolution in units of the coordinate system\n
+            chunk_size: number of points read at once
+
+        Returns:
+            Path of the compressed file
+        '''
+
+        if laspy is None:
+            raise ImportError('Compression: LAZ output requires laspy with a LAZ backend (pip install "laspy[lazrs]" or PyExpress[compression])')
+
+        import PyExpress.DataAnalysis as pda
+
+        out_path = out_path or Compression.output_path(path, 'laz')
+        chunks   = pda.iter_points(path, chunk_size)
+        first    = next(chunks, None)
+
+        if first is None:
+            raise ValueError(f'{path} contains no points')
+
+        colors = all(field in first.dtype.names for field in ['red', 'green', 'blue'])
+        extra  = [field for field in first.dtype.names
+                  if field not in ['x', 'y', 'z', 'red', 'green', 'blue'] and first.dtype[field].kind in 'iuf']
+
+        header         = laspy.LasHeader(point_format=2 if colors else 0, version='1.4')
+        header.scales  = np.array([scale, scale, scale])
+        header.offsets = np.floor(pda.coordinates(first).min(axis=0))
+
+        for field in extra:
+            header.add_extra_dim(laspy.ExtraBytesParams(name=field, type=first.dtype[field].newbyteorder('=')))
+
+        with laspy.open(out_path, mode='w', header=header, do_compress=True) as writer:
+            for chunk in itertools.chain([first], chunks):
+                record = laspy.ScaleAwarePointRecord.zeros(len(chunk), header=header)
+                record.x, record.y, record.z = chunk['x'], chunk['y'], chunk['z']
+
+                if colors:
+                    for field in ['red', 'green', 'blue']:
+                        values = chunk[field].astype(np.uint16)
+                        record[field] = values * 257 if chunk.dtype[field].itemsize == 1 else values
+
+                for field in extra:
+                    record[field] = chunk[field]
+
+                writer.write_points(record)
+
+        return out_path
+
+    def compress(path: str, fmt: str = 'zstd', **kwargs):
+
+        '''
+        Compresses a file into a format of COMPRESSION_FORMATS and measures the compression.
+
+        *args:
+            path: source file (PLY or OBJ point cloud for LAZ)\n
+            fmt: ['zstd', 'laz']
+
+        **kwargs:
+            see Compression.zstd and Compression.laz
+
+        Returns:
+            Dictionary with source, path, format, size_in, size_out (bytes), ratio (size_in / size_out),
+            seconds and throughput (MB/s of the source)
+        '''
+
+        if fmt not in COMPRESSION_FORMATS:
+            raise ValueError(f'Compression: unknown format {fmt!r}, use one of {list(COMPRESSION_FORMATS)}')
+
+        start    = time.perf_counter()
+        out_path = getattr(Compression, fmt)(path, **kwargs)
+        seconds  = time.perf_counter() - start
+        size_in  = os.path.getsize(path)
+        size_out = os.path.getsize(out_path)
+
+        return {'source':     path,
+                'path':       out_path,
+                'format':     fmt,
+                'size_in':    size_in,
+                'size_out':   size_out,
+                'ratio':      size_in / max(size_out, 1),
+                'seconds':    seconds,
+                'throughput': size_in / 1e6 / max(seconds, 1e-9)}
+
+    def compress_and_upload(filelist: list,
+                            fmt:      str    = 'zstd',
+                            upload:   object = None,
+                            workers:  int    = None,
+                            remove:   bool   = False,
+                            **kwargs):
+
+        '''
+        Compresses files on worker threads and hands every finished file to an upload function on a
+        separate thread, so uploads of earlier files overlap with the compression of later ones.
+
+        *args:
+            filelist: source files\n
+            fmt: ['zstd', 'laz']\n
+            upload: function called with the path of each compressed file, e.g. an object storage upload; None: no upload\n
+            workers: number of compression threads; default: min(4, number of CPUs)\n
+            remove: whether to delete each compressed file after its upload
+
+        **kwargs:
+            see Compression.zstd and Compression.laz
+
+        Returns:
+            List of dictionaries per file (see Compression.compress) in order of the file list,
+            with upload_seconds if uploaded
+        '''
+
+        workers = workers or min(4, os.cpu_count() or 1)
+        results = dict()
+
+        def _upload(stats):
+            start = time.perf_counter()
+            upload(stats['path'])
+            stats['upload_seconds'] = time.perf_counter() - start
+            if remove:
+                os.remove(stats['path'])
+            return stats
+
+        with ThreadPoolExecutor(max_workers=workers) as compressors, ThreadPoolExecutor(max_workers=1) as uploader:
+            futures = {compressors.submit(Compression.compress, path, fmt, **kwargs): path for path in filelist}
+            uploads = []
+
+            for future in as_completed(futures):
+                stats = future.result()
+                results[futures[future]] = stats
+                if upload is not None:
+                    uploads.append(uploader.submit(_upload, stats))
+
+            for future in uploads:
+                future.result()
+
+        return [results[path] for path in filelist]
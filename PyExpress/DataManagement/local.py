@@ -3,6 +3,8 @@
 
 import glob, os, shutil
 
+__all__ = ['Local']
+
 class Local():
         
     def get_filelist(file_dir: str, ext: str, recursive=False):
@@ -0,0 +1,379 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, json, time, hashlib, contextlib
+from   concurrent.futures import ThreadPoolExecutor
+
+__all__ = ['MANIFEST_FILE', 'hash_file', 'hash_files', 'input_fingerprint', 'Manifest', 'MANIFEST_IGNORE']
+
+# manifest file in the export directory
+MANIFEST_FILE = 'manifest.json'
+
+# bookkeeping files of a project in the export directory, not registered as products
+MANIFEST_IGNORE = ('process_log', 'run_record.jsonl', 'progress_status', MANIFEST_FILE)
+
+def hash_file(path: str, algorithm: str = 'sha256', chunk_size: int = 1 << 23):
+
+    '''
+    Computes the content hash of a file in one streaming pass. hashlib releases the GIL
+    for large buffers, so several files are hashed in parallel in threads (see hash_files).
+
+    *args:
+        path: file\n
+        algorithm: hashlib algorithm\n
+        chunk_size: number of bytes read at once
+
+    Returns:
+        Hexadecimal digest
+    '''
+
+    digest = hashlib.new(algorithm)
+
+    with open(path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+def hash_files(paths: list, algorithm: str = 'sha256', workers: int = None):
+
+    '''
+    Computes the content hashes of files in a thread pool.
+
+    *args:
+        paths: files\n
+        algorithm: hashlib algorithm\n
+        workers: number of threads; default: min(8, number of CPUs + 4)
+
+    Returns:
+        {path: hexadecimal digest}
+    '''
+
+    workers = workers or min(8, (os.cpu_count() or 1) + 4)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(lambda path: hash_file(path, algorithm), paths)))
+
+def input_fingerprint(*parts):
+
+    '''
+    Fingerprint of the inputs and parameters of a product: hash of the JSON representation of all parts
+    (dictionaries with sorted keys, other objects as strings).
+
+    *args:
+        parts: e.g. product type, processing parameters, input file list
+
+    Returns:
+        Hexadecimal digest
+    '''
+
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+class Manifest():
+
+    def __init__(self, export_dir: str, algorithm: str = 'sha256', workers: int = None):
+
+        '''
+        Content-addressed manifest of the products in an export directory (*export_dir*/manifest.json).
+        The manifest is the JSON index of all product files with size, modification time and content hash,
+        and records for each product (e.g. an export type of a chunk) the input fingerprint and its files,
+        and for each uploaded object the hash of the uploaded file. Identical products are recognised without
+        re-hashing as long as size and modification time of their files are unchanged.
+
+        *args:
+            export_dir: export directory of a project\n
+            algorithm: hashlib algorithm of the content hashes\n
+            workers: number of hashing threads
+        '''
+
+        self.export_dir = export_dir
+        self.path       = os.path.join(export_dir, MANIFEST_FILE)
+        self.algorithm  = algorithm
+        self.workers    = workers
+        self.data       = {'algorithm': algorithm, 'files': dict(), 'products': dict(), 'uploads': dict()}
+        self._changed   = {'files': set(), 'products': set(), 'uploads': set()}
+        self._deleted   = set()
+
+        if os.path.exists(self.path):
+            with self._lock():
+                self.data.update(self._load())
+
+    def _load(self):
+
+        ''' Content of the manifest file (empty without file). '''
+
+        if not os.path.exists(self.path):
+            return dict()
+
+        with open(self.path, 'r') as file:
+            return json.load(file)
+
+    @contextlib.contextmanager
+    def _lock(self, timeout: float = 120.0, stale: float = 600.0):
+
+        '''
+        Exclusive lock of the manifest file between processes (*export_dir*/manifest.json.lock), e.g. of the
+        chunk workers of Parallel.process_chunks exporting into the same export directory.
+        Locks older than *stale* seconds are left over from killed processes and removed.
+        '''
+
+        lock     = self.path + '.lock'
+        deadline = time.monotonic() + timeout
+
+        while True:
+            try:
+                descriptor = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except (FileExistsError, PermissionError):
+                try:
+                    if time.time() - os.path.getmtime(lock) > stale:
+                        os.remove(lock)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f'Manifest: {lock} is locked by another process')
+                time.sleep(0.01)
+
+        try:
+            yield
+        finally:
+            os.close(descriptor)
+            os.remove(lock)
+
+    def save(self):
+
+        '''
+        Writes the manifest atomically. Other processes may have written the manifest since it was read,
+        so only the entries changed by this instance are written over the current file, under the manifest lock.
+        '''
+
+        os.makedirs(self.export_dir, exist_ok=True)
+
+        with self._lock():
+            data = dict(self.data, **{section: dict(entries) for section, entries in self._load().items()
+                                      if isinstance(entries, dict)})
+
+            for section, keys in self._changed.items():
+                data.setdefault(section, dict())
+                for key in keys:
+                    data[section][key] = self.data[section][key]
+
+            for key in self._deleted:
+                data['files'].pop(key, None)
+
+            temp = f'{self.path}.{os.getpid()}.tmp'
+
+            with open(temp, 'w') as file:
+                json.dump(data, file, indent=1, sort_keys=True)
+
+            os.replace(temp, self.path)
+
+        self.data     = data
+        self._changed = {section: set() for section in self._changed}
+        self._deleted = set()
+
+    def _key(self, path: str):
+
+        ''' Key of a file: path relative to the export directory. '''
+
+        return os.path.relpath(os.path.abspath(path), os.path.abspath(self.export_dir))
+
+    def snapshot(self, paths: list = None):
+
+        '''
+        Lists the files of the export directory with size and modification time (without bookkeeping files).
+
+        *args:
+            paths: directories (or path prefixes) within the export directory, e.g. the output directory
+                   of a chunk; default: all files
+
+        Returns:
+            {relative path: (size, modification time in ns)}
+        '''
+
+        prefixes = None if paths is None else tuple(self._key(path) + separator for path in paths for separator in ['/', '\\'])
+        files    = dict()
+
+        for root, _, names in os.walk(self.export_dir):
+            for name in names:
+                if name.startswith(MANIFEST_IGNORE) or name.endswith('.tmp'):
+                    continue
+                path = os.path.join(root, name)
+                key  = self._key(path)
+                if prefixes is not None and not key.startswith(prefixes):
+                    continue
+                stat = os.stat(path)
+                files[key] = (stat.st_size, stat.st_mtime_ns)
+
+        return files
+
+    def changed(self, before: dict, after: dict = None):
+
+        '''
+        Files that are new or modified between two snapshots.
+
+        *args:
+            before: snapshot before a product was written\n
+            after: snapshot afterwards; default: current state
+
+        Returns:
+            List of relative paths
+        '''
+
+        after = after if after is not None else self.snapshot()
+
+        return sorted(key for key, stat in after.items() if tuple(before.get(key, ())) != tuple(stat))
+
+    def update_files(self, keys: list = None):
+
+        '''
+        Updates the file entries (size, modification time, hash) of the given files or of the complete export
+        directory; only files with changed size or modification time are hashed again (in parallel).
+        Entries of deleted files are removed.
+
+        *args:
+            keys: relative paths; default: all files of the export directory
+
+        Returns:
+            List of re-hashed relative paths
+        '''
+
+        complete = keys is None
+
+        if complete:
+            current = self.snapshot()
+            keys    = list(current)
+        else:
+            current = dict()
+            for key in keys:
+                if os.path.exists(os.path.join(self.export_dir, key)):
+                    stat         = os.stat(os.path.join(self.export_dir, key))
+                    current[key] = (stat.st_size, stat.st_mtime_ns)
+
+        files  = self.data['files']
+        stale  = [key for key in keys if key in current and
+                  (files.get(key, {}).get('size'), files.get(key, {}).get('mtime_ns')) != current[key]]
+        hashes = hash_files([os.path.join(self.export_dir, key) for key in stale], self.algorithm, self.workers)
+
+        for key in stale:
+            files[key] = {'size':     current[key][0],
+                          'mtime_ns': current[key][1],
+                          'hash':     hashes[os.path.join(self.export_dir, key)]}
+            self._changed['files'].add(key)
+
+        for key in [key for key in (list(files) if complete else keys) if key in files and key not in current]:
+            del files[key]
+            self._deleted.add(key)
+
+        return stale
+
+    def index(self):
+
+        '''
+        Updates the manifest with all files of the export directory and writes it, e.g. as index for consumers.
+
+        Returns:
+            {relative path: {size, mtime_ns, hash}}
+        '''
+
+        self.update_files()
+        self.save()
+
+        return self.data['files']
+
+    def register(self, product: str, fingerprint: str, keys: list, save: bool = True):
+
+        '''
+        Registers the files of a product with its input fingerprint and writes the manifest.
+
+        *args:
+            product: product name, e.g. 'chunk/ortho'\n
+            fingerprint: input fingerprint, see input_fingerprint()\n
+            keys: relative paths of the product files, e.g. from changed()\n
+            save: whether to write the manifest
+        '''
+
+        self.update_files(keys)
+        self.data['products'][product] = {'fingerprint': fingerprint,
+                                          'files':       sorted(keys),
+                                          'updated':     time.strftime('%Y-%m-%dT%H:%M:%S')}
+        self._changed['products'].add(product)
+
+        if save:
+            self.save()
+
+    def is_current(self, product: str, fingerprint: str):
+
+        '''
+        Whether a product was registered with the same input fingerprint and its files are unchanged
+        (same size and modification time, or the same content hash after a modification).
+
+        *args:
+            product: product name\n
+            fingerprint: input fingerprint of the new run
+
+        Returns:
+            True if the product can be skipped
+        '''
+
+        entry = self.data['products'].get(product)
+
+        if entry is None or entry['fingerprint'] != fingerprint or not entry['files']:
+            return False
+
+        for key in entry['files']:
+            path   = os.path.join(self.export_dir, key)
+            record = self.data['files'].get(key)
+            if record is None or not os.path.exists(path):
+                return False
+            stat = os.stat(path)
+            if (stat.st_size, stat.st_mtime_ns) != (record['size'], record['mtime_ns']):
+                if stat.st_size != record['size'] or hash_file(path, self.algorithm) != record['hash']:
+                    return False
+
+        return True
+
+    def file_hash(self, path: str):
+
+        ''' Content hash of a file, from the manifest if size and modification time are unchanged. '''
+
+        key    = self._key(path)
+        stat   = os.stat(path)
+        record = self.data['files'].get(key)
+
+        if record is not None and (record['size'], record['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            return record['hash']
+
+        return hash_file(path, self.algorithm)
+
+    def needs_upload(self, path: str, target: str):
+
+        '''
+        Whether a file differs from the file last uploaded to a target (e.g. bucket/object name).
+
+        *args:
+            path: local file\n
+            target: upload target
+        '''
+
+        return self.data['uploads'].get(target, {}).get('hash') != self.file_hash(path)
+
+    def uploaded(self, path: str, target: str, save: bool = True):
+
+        '''
+        Records the upload of a file to a target.
+
+        *args:
+            path: local file\n
+            target: upload target\n
+            save: whether to write the manifest
+        '''
+
+        self.data['uploads'][target] = {'hash':    self.file_hash(path),
+                                        'source':  self._key(path),
+                                        'updated': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        self._changed['uploads'].add(target)
+
+        if save:
+            self.save()
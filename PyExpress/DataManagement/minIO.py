@@ -6,6 +6,8 @@ from   minio import Minio
 import PyExpress.DataManagement as adm
 import PyExpress.UtilityTools   as hlp
 
+__all__ = ['MinIO']
+
 class MinIO():
     
     def __init__(self, config_MinIO: str, temp_dir: str='./', get_filelist=True):
@@ -180,26 +182,98 @@ class MinIO():
             self.client.fget_object(bucket_name=self.bucket, 
                                     object_name=file, file_path=destination)
 
-    def upload_to_minio(self, filelist: list, directory: str):
+    def _object_name(self, file: str, directory: str):
+
+        ''' Object path of a local file in a target directory of the bucket. '''
+
+        directory = os.path.normpath(f'/{directory}')
+        directory = directory.replace('\\', '/')
+
+        path = os.path.normpath(file)
+        path = path.replace('\\', '/')
+
+        return f'{directory}/{os.path.basename(path)}'
+
+    def upload_to_minio(self, filelist: list, directory: str, manifest: object=None):
         
         '''
         Uploads data to a new object path, created dynamically.
         
         *args:
             filelist: list of file names\n
-            directory: name of target directory, created dynamically
+            directory: name of target directory, created dynamically\n
+            manifest: DataManagement.Manifest of the files; files uploaded before with the same content hash are skipped
+
+        Returns:
+            List of uploaded files
         '''
         
-        directory = os.path.normpath(f'/{directory}')
-        directory = directory.replace('\\', '/')
-        
+        uploaded = []
+
         for file in filelist:
             
-            path = os.path.normpath(file)
-            path = path.replace('\\', '/')
-            
-            obj  = f'{directory}/{os.path.basename(path)}'
-            
+            obj = self._object_name(file, directory)
+
+            if manifest is not None and not manifest.needs_upload(file, f'{self.bucket}{obj}'):
+                continue
+
             self.client.fput_object(bucket_name = self.bucket, 
                                     object_name = obj, 
-                                    file_path   = path)
\ No newline at end of file
+                                    file_path   = os.path.normpath(file).replace('\\', '/'))
+            uploaded.append(file)
+
+            if manifest is not None:
+                manifest.uploaded(file, f'{self.bucket}{obj}', save=False)
+
+        if manifest is not None:
+            manifest.save()
+
+        return uploaded
+
+    def upload_compressed(self, filelist: list, directory: str, fmt: str='zstd', workers: int=None, remove: bool=True,
+                          manifest: object=None, **kwargs):
+
+        '''
+        Compresses files (e.g. exported point clouds) and uploads the compressed files to a new object path.
+        Compression runs on worker threads; each finished file is uploaded while later files are still
+        compressed (see DataManagement.Compression.compress_and_upload).
+
+        *args:
+            filelist: list of file names\n
+            directory: name of target directory, created dynamically\n
+            fmt: ['zstd', 'laz'] - zstd-compressed file (*.zst) or LAZ point cloud (from PLY/OBJ)\n
+            workers: number of compression threads\n
+            remove: whether to delete the local compressed files after the upload\n
+            manifest: DataManagement.Manifest of the source files; sources uploaded before with the same
+                      content hash are neither compressed nor uploaded again
+
+        **kwargs:
+            see DataManagement.Compression.zstd and DataManagement.Compression.laz
+
+        Returns:
+            List of compression statistics per compressed file (ratio, throughput, upload_seconds, ...)
+        '''
+
+        targets = {file: f'{self.bucket}{self._object_name(adm.Compression.output_path(file, fmt), directory)}' for file in filelist}
+
+        if manifest is not None:
+            filelist = [file for file in filelist if manifest.needs_upload(file, targets[file])]
+
+        def upload(path):
+            self.client.fput_object(bucket_name = self.bucket,
+                                    object_name = self._object_name(path, directory),
+                                    file_path   = path)
+
+        results = adm.Compression.compress_and_upload(filelist = filelist,
+                                                      fmt      = fmt,
+                                                      upload   = upload,
+                                                      workers  = workers,
+                                                      remove   = remove,
+                                                      **kwargs)
+
+        if manifest is not None:
+            for stats in results:
+                manifest.uploaded(stats['source'], targets[stats['source']], save=False)
+            manifest.save()
+
+        return results
@@ -1,4 +1,9 @@
 # SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from .checkup import *
\ No newline at end of file
+from PyExpress import _lazy
+
+__getattr__, __dir__, __all__ = _lazy.attach(__name__,
+                                             submodules = ['checkup'],
+                                             attributes = ['checkup'],
+                                             legacy     = ['checkup'])
@@ -2,11 +2,15 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 
 try:
+    import sys
     import Metashape
     import warnings
+    import PyExpress.UtilityTools as hlp
 except Exception as e:
     print("Some modules are missing {}".format(e))
 
+__all__ = ['metashape_initial_check']
+
 def metashape_initial_check(version_GUI: str,
                             enable_GPU:  bool,
                             enable_CPU:  bool):
@@ -22,6 +26,7 @@ def metashape_initial_check(version_GUI: str,
     *raises:
             UserWarning: If the installed GUI and API versions differ.
             UserWarning: If API version is lower then v.2.0.0.
+            HeadlessPromptError: If a prompt has no configured answer in headless mode.
     '''
     
     # enable your GPU for processing and enable CPU if needed / wished
@@ -40,14 +45,18 @@ def metashape_initial_check(version_GUI: str,
                       'To ensure optimal performance of PyExpress, please upgrade to version 2.0.0 or higher.',
                       UserWarning, stacklevel=2)
         
-        input('Continue processing anyway [y,n]?: ')
+        # interactive runs continue after the prompt in any case; headless runs stop unless the answer is 'y'
+        if hlp.ask('Continue processing anyway [y,n]?: ', key='continue_old_version') != 'y' and hlp.is_headless():
+            sys.exit('Processing stopped: Metashape version 1.x.y is not supported.')
 
     if Metashape.app.activated == False:
         warnings.warn('Your Metashape API is not activated yet. This will cause errors.'
                       'Please copy the Metashape license file to your working directory.',
                       UserWarning, stacklevel=2)    
                 
-        input('Continue processing anyway [y,n]?: ')
+        # interactive runs continue after the prompt in any case; headless runs stop unless the answer is 'y'
+        if hlp.ask('Continue processing anyway [y,n]?: ', key='continue_unactivated') != 'y' and hlp.is_headless():
+            sys.exit('Processing stopped: Metashape API is not activated.')
     
     print(f'Metashape features: Version API: {Metashape.app.version}\n'
           f"{' ' * 20}Version GUI: {version_GUI}\n"
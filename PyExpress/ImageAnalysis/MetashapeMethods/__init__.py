@@ -1,5 +1,9 @@
 # SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from .main_workflow    import *
-from .optional_methods import *
\ No newline at end of file
+from PyExpress import _lazy
+
+__getattr__, __dir__, __all__ = _lazy.attach(__name__,
+                                             submodules = ['main_workflow', 'optional_methods', 'parallel_methods'],
+                                             attributes = ['main_workflow', 'optional_methods', 'parallel_methods'],
+                                             legacy     = ['main_workflow', 'optional_methods'])
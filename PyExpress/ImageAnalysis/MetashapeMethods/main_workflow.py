@@ -10,10 +10,14 @@ try:
 except Exception as e:
     print("Some modules are missing {}".format(e))
 
+__all__ = ['matchPhotos', 'alignCameras', 'buildDepthMaps', 'buildPointCloud', 'buildModel', 'buildDem',
+           'buildUV', 'buildOrthoProjection']
+
 
 ##########################################################################################
 # 1. MATCH PHOTOS
 
+@hlp.instrument
 def matchPhotos(project:      object,
                 save_project: tuple = (False, ''),
                 **kwargs):
@@ -54,11 +58,13 @@ def matchPhotos(project:      object,
     project.logging(f'Matching Photos:\n{arguments_string}')
 
     # match photos
-    if project.stereo_RGB == True or project.stereo_IR == True:  
-        for frame in project.chunk.frames:
-            frame.matchPhotos(**kwargs)    
-    else:
-        project.chunk.matchPhotos(**kwargs)
+    with hlp.ProgressTracker(project, stage='matchPhotos') as progress:
+        if project.stereo_RGB == True or project.stereo_IR == True:  
+            frames = project.chunk.frames
+            for i, frame in enumerate(frames):
+                frame.matchPhotos(progress=progress.part(i, len(frames)), **kwargs)    
+        else:
+            project.chunk.matchPhotos(progress=progress, **kwargs)
 
     hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
     
@@ -72,6 +78,7 @@ def matchPhotos(project:      object,
 ##########################################################################################
 # 2. ALIGN CAMERAS
 
+@hlp.instrument
 def alignCameras(project:      object, 
                  save_project: tuple = (False, ''),
                  **kwargs):
@@ -112,7 +119,8 @@ def alignCameras(project:      object,
     project.logging(f'Aligning Cameras:\n{arguments_string}')
 
     # align cameras
-    project.chunk.alignCameras(**kwargs)
+    with hlp.ProgressTracker(project, stage='alignCameras') as progress:
+        project.chunk.alignCameras(progress=progress, **kwargs)
         
     hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
 
@@ -126,6 +134,7 @@ def alignCameras(project:      object,
 ##########################################################################################
 # 3. BUILD DEPTH MAP
 
+@hlp.instrument
 def buildDepthMaps(project:      object, 
                    save_project: tuple = (False, ''),
                    **kwargs):
@@ -166,11 +175,13 @@ def buildDepthMaps(project:      object,
     project.logging(f'Building DepthMap:\n{arguments_string}') 
     
     # create depth map
-    if project.stereo_RGB == True or project.stereo_IR == True:        
-        for frame in project.chunk.frames:
-            frame.buildDepthMaps(**kwargs)            
-    else:
-        project.chunk.buildDepthMaps(**kwargs)
+    with hlp.ProgressTracker(project, stage='buildDepthMaps') as progress:
+        if project.stereo_RGB == True or project.stereo_IR == True:        
+            frames = project.chunk.frames
+            for i, frame in enumerate(frames):
+                frame.buildDepthMaps(progress=progress.part(i, len(frames)), **kwargs)            
+        else:
+            project.chunk.buildDepthMaps(progress=progress, **kwargs)
         
     hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
     
@@ -184,6 +195,7 @@ def buildDepthMaps(project:      object,
 ##########################################################################################
 # 4. BUILD DENSE/POINT CLOUD
 
+@hlp.instrument
 def buildPointCloud(project:      object,
                     save_project: tuple = (False, ''),
                     **kwargs):
@@ -225,11 +237,12 @@ def buildPointCloud(project:      object,
     project.logging(f'Building PointCloud (MS: 2.x.x) / DenseCloud (MS: 1.x.x)\n{arguments_string}')
 
     # create dense cloud
-    if str(Metashape.version)[0] == '1':
-        project.chunk.buildDenseCloud(**kwargs)
-            
-    if str(Metashape.version)[0] == '2':
-        project.chunk.buildPointCloud(**kwargs)
+    with hlp.ProgressTracker(project, stage='buildPointCloud') as progress:
+        if str(Metashape.version)[0] == '1':
+            project.chunk.buildDenseCloud(progress=progress, **kwargs)
+                
+        if str(Metashape.version)[0] == '2':
+            project.chunk.buildPointCloud(progress=progress, **kwargs)
 
     hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
     
@@ -243,6 +256,7 @@ def buildPointCloud(project:      object,
 ##########################################################################################
 # 5. BUILD 3D MODEL
 
+@hlp.instrument
 def buildModel(project:      object,
                save_project: tuple = (False, ''),
                **kwargs):
@@ -283,11 +297,13 @@ def buildModel(project:      object,
     project.logging(f'Building 3D Model:\n{arguments_string}')
 
     # generate a model   
-    if project.stereo_RGB == True or project.stereo_IR == True:      
-        for frame in project.chunk.frames:
-            frame.buildModel(**kwargs)            
-    else:
-        project.chunk.buildModel(**kwargs)
+    with hlp.ProgressTracker(project, stage='buildModel') as progress:
+        if project.stereo_RGB == True or project.stereo_IR == True:      
+            frames = project.chunk.frames
+            for i, frame in enumerate(frames):
+                frame.buildModel(progress=progress.part(i, len(frames)), **kwargs)            
+        else:
+            project.chunk.buildModel(progress=progress, **kwargs)
 
     hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
     
@@ -301,6 +317,7 @@ def buildModel(project:      object,
 ##########################################################################################
 # 6. BUILD DEM
 
+@hlp.instrument
 def buildDem(project:      object,
              save_project: tuple = (False, ''),
              **kwargs):
@@ -341,7 +358,8 @@ def buildDem(project:      object,
     project.logging(f'Building 3D Model:\n{arguments_string}')
 
     # build the DEM
-    project.chunk.buildDem(**kwargs)
+    with hlp.ProgressTracker(project, stage='buildDem') as progress:
+        project.chunk.buildDem(progress=progress, **kwargs)
         
     hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
     
@@ -355,6 +373,7 @@ def buildDem(project:      object,
 ##########################################################################################
 # 7. BUILD UV
 
+@hlp.instrument
 def buildUV(project:      object,
             save_project: tuple = (False, ''),
             **kwargs):
@@ -397,7 +416,8 @@ def buildUV(project:      object,
     project.logging(f'Building uv mapping for the model:\n{arguments_string}')
 
     # build the UV mapping
-    project.chunk.buildUV(**kwargs)
+    with hlp.ProgressTracker(project, stage='buildUV') as progress:
+        project.chunk.buildUV(progress=progress, **kwargs)
             
     hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
     
@@ -411,6 +431,7 @@ def buildUV(project:      object,
 ##########################################################################################
 # 8. BUILD ORTHO PHOTOS
 
+@hlp.instrument
 def buildOrthoProjection(project:      object,
                          coord_system:     object,
                          save_project: tuple = (False, ''),
@@ -475,7 +496,8 @@ def buildOrthoProjection(project:      object,
             raise ValueError('Coordinate system missing. Please define (project.chunk.crs = ...)')
 
     # build ortho mosaic
-    project.chunk.buildOrthomosaic(projection=projection, **kwargs)
+    with hlp.ProgressTracker(project, stage='buildOrthomosaic') as progress:
+        project.chunk.buildOrthomosaic(projection=projection, progress=progress, **kwargs)
         
     hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
     
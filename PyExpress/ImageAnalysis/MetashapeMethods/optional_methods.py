@@ -4,42 +4,336 @@
 from PyExpress.ImageAnalysis import _MetashapeProject
 
 try:
-    import time, os, csv, math
+    import time, os, csv, copy, glob, shutil, hashlib, itertools
+    import multiprocessing          as mp
     import Metashape
-    import pandas                  as pd
-    import numpy                   as np
-    import PyExpress.ImageAnalysis as ppp
-    import PyExpress.UtilityTools  as hlp
+    import numpy                    as np
+    import PyExpress.ImageAnalysis  as ppp
+    import PyExpress.UtilityTools   as hlp
+    import PyExpress.DataAnalysis   as pda
+    import PyExpress.DataManagement as adm
+    from   concurrent.futures       import ProcessPoolExecutor, as_completed
 except Exception as e:
     print("Some modules are missing {}".format(e))
 
+__all__ = ['Export', 'PointCloud', 'TiePointCloud', 'TIE_POINT_DTYPE', 'BBox', 'Reference', 'Calibration',
+           'EXPORT_TYPES']
+
 
 ###############################################################################
 # Export results of photogrammetric processing
 
+# export types of Export.export_from_list in execution order
+EXPORT_TYPES = ['dem', 'dem_cube', 'ortho', 'dem_trafo', 'ortho_trafo', 'indices', 'cwsi', 'model', 'tiled_model',
+                'camera', 'point_cloud', 'precision_map', 'report', 'marker']
+
+def _range_percentiles(project: object):
+
+    '''
+    Percentiles of the raster transformation range calibrated from the ortho_trafo value rasters
+    (vegetation.rangeAuto and vegetation.rangePercentiles of drone projects); None: no calibration.
+    '''
+
+    vegetation  = getattr(project.config.metashape, 'vegetation', None)
+    percentiles = getattr(vegetation, 'rangePercentiles', None)
+
+    if not hasattr(project, 'calibrateVegetationIndexRange') or getattr(vegetation, 'rangeAuto', False) != True or not percentiles:
+        return None
+
+    return tuple(percentiles)
+
+def _export_by_name(project: object, name: str):
+
+    ''' Runs a single export of Export.export_from_list with its default parameters. '''
+
+    if name == 'dem':
+        ppp.Export.raster(project      = project, 
+                          export_type  = 'dem'.upper(),
+                          source_data  = Metashape.DataSource.ElevationData,
+                          image_format = Metashape.ImageFormatTIFF)
+
+    elif name == 'dem_cube':
+        ppp.Export.dem_cube(project = project)
+
+    elif name == 'ortho':
+        ppp.Export.raster(project      = project, 
+                          export_type  = 'ortho',
+                          source_data  = Metashape.DataSource.OrthomosaicData, 
+                          image_format = Metashape.ImageFormatTIFF) 
+
+    elif name == 'dem_trafo':
+
+        # ppp.Export.raster(project          = project, 
+        #                   export_type      = 'dem'.upper()+'_transform_val',
+        #                   save_alpha       = False,
+        #                   raster_transform = Metashape.RasterTransformValue, 
+        #                   source_data      = Metashape.DataSource.ElevationData,
+        #                   image_format     = Metashape.ImageFormatTIFF)
+
+        ppp.Export.raster(project          = project, 
+                          export_type      = 'dem'.upper()+'_transform_pal',
+                          save_alpha       = False,
+                          raster_transform = Metashape.RasterTransformPalette, 
+                          source_data      = Metashape.DataSource.ElevationData,
+                          image_format     = Metashape.ImageFormatTIFF)
+
+    elif name == 'ortho_trafo' and getattr(project.config.metashape.export, 'trafo_single_pass', False):
+        ppp.Export.raster_transform(project           = project,
+                                    export_type       = 'ortho',
+                                    range_percentiles = _range_percentiles(project),
+                                    source_data       = Metashape.DataSource.OrthomosaicData)
+
+    elif name == 'ortho_trafo':
+
+        # if project.drone_RGB == True or project.stereo_RGB == True:
+        #     trafo_color = Metashape.RasterTransformPalette
+        # else:
+        #     trafo_color = Metashape.RasterTransformValue
+
+        paths = ppp.Export.raster(project          = project, 
+                                  export_type      = 'ortho_transform_val',
+                                  raster_transform = Metashape.RasterTransformValue,
+                                  save_alpha       = False,
+                                  source_data      = Metashape.DataSource.OrthomosaicData,
+                                  image_format     = Metashape.ImageFormatTIFF)
+
+        # range calibration deferred by applyVegetationIndex, from the value rasters exported anyway
+        if _range_percentiles(project):
+            project.calibrateVegetationIndexRange(percentiles=_range_percentiles(project), raster_paths=paths)
+
+        ppp.Export.raster(project          = project, 
+                          export_type      = 'ortho_transform_pal',
+                          raster_transform = Metashape.RasterTransformPalette,
+                          save_alpha       = False,
+                          source_data      = Metashape.DataSource.OrthomosaicData,
+                          image_format     = Metashape.ImageFormatTIFF)
+
+    elif name == 'indices':
+        ppp.Export.vegetation_indices(project = project)
+
+    elif name == 'cwsi':
+        ppp.Export.cwsi(project = project)
+
+    elif name == 'model':
+        ppp.Export.model(project = project,
+                         format  = Metashape.ModelFormatOBJ)
+
+    elif name == 'tiled_model':
+        ppp.Export.tiled_model(project = project,
+                               format  = Metashape.ModelFormatOBJ)
+
+    elif name == 'camera':
+        ppp.Export.camera(project = project,
+                          format  = Metashape.CamerasFormatXML)
+
+    elif name == 'point_cloud':
+        if str(Metashape.version)[0] == '1':
+            ppp.Export.point_cloud(project         = project,
+                                   source_data     = Metashape.DataSource.DenseCloudData,
+                                   format          = Metashape.PointsFormatOBJ,
+                                   save_colors     = True, 
+                                   colors_rgb_8bit = True)
+        if str(Metashape.version)[0] == '2':        
+            ppp.Export.point_cloud(project          = project,
+                                   source_data      = Metashape.DataSource.PointCloudData,
+                                   format           = Metashape.PointCloudFormatOBJ,
+                                   save_point_color = True, 
+                                   colors_rgb_8bit  = True)
+
+        if getattr(project.config.metashape.export, 'voxel_size', None):
+            ppp.Export.downsample_point_cloud(project    = project,
+                                              voxel_size = project.config.metashape.export.voxel_size)
+
+        if getattr(project.config.metashape.export, 'compression', None):
+            ppp.Export.compress_point_cloud(project = project)
+
+    elif name == 'precision_map':
+        ppp.Export.precision_map(project = project, 
+                                 format  = 'txt')
+
+    elif name == 'report':
+        ppp.Export.report(project = project)
+
+    elif name == 'marker':
+        ppp.Export.marker(project       = project, 
+                          export_format = 'xml')
+
+def _config_dict(config: object):
+
+    ''' Converts the configuration objects of a project back into dictionaries. '''
+
+    if hasattr(config, '__dict__'):
+        return {key: _config_dict(value) for key, value in vars(config).items()}
+
+    return config
+
+def _product_state(product: object):
+
+    ''' Key and processing metadata (e.g. 'BuildDem/interpolation') of a chunk product; None if it does not exist. '''
+
+    if product is None:
+        return None
+
+    meta = getattr(product, 'meta', None) or {}
+
+    return (getattr(product, 'key', None), getattr(product, 'label', None),
+            sorted((str(key), str(meta[key])) for key in meta.keys()))
+
+def _chunk_state(chunk: object):
+
+    '''
+    Processing state of a chunk: alignment (see _tie_point_fingerprint), the keys and processing metadata of
+    the point cloud, model, tiled model, DEM and orthomosaic, the marker references/projections and the raster
+    transform. Re-processing a product with other parameters (e.g. in the workflow scripts), re-alignment or
+    edited markers change the state.
+    '''
+
+    markers = [(marker.label,
+                None if marker.reference.location is None else tuple(marker.reference.location),
+                sorted((camera.key, tuple(marker.projections[camera].coord)) for camera in marker.projections.keys()))
+               for marker in chunk.markers]
+
+    raster_transform = getattr(chunk, 'raster_transform', None)
+
+    return {'alignment':        _tie_point_fingerprint(chunk),
+            'products':         {name: _product_state(getattr(chunk, name, None))
+                                 for name in ['point_cloud', 'model', 'tiled_model', 'elevation', 'orthomosaic']},
+            'markers':          markers,
+            'raster_transform': None if raster_transform is None else
+                                (repr(raster_transform.formula), repr(raster_transform.range))}
+
+def _export_fingerprint(project: object, name: str, chunk_state: dict = None):
+
+    '''
+    Input fingerprint of an export of Export.export_from_list: export type, chunk, Metashape version,
+    processing parameters (metashape section of the configuration file without the export list, workers
+    and bookkeeping options), the processing state of the chunk (see _chunk_state) and the source images (path, size,
+    modification time). chunk_state: result of _chunk_state, to compute it once for several exports.
+    '''
+
+    parameters = _config_dict(project.config.metashape)
+
+    for key in ['type', 'workers', 'skip_unchanged', 'catalog']:
+        parameters.get('export', {}).pop(key, None)
+
+    images = []
+
+    for camera in project.chunk.cameras:
+        path = camera.photo.path if camera.photo is not None else camera.label
+        stat = os.stat(path) if os.path.exists(path) else None
+        images.append((path, stat.st_size, stat.st_mtime_ns) if stat else (path,))
+
+    return adm.input_fingerprint(name, project.chunk.label, str(Metashape.version), parameters,
+                                 chunk_state or _chunk_state(project.chunk), sorted(images))
+
+def _export_outputs(project: object, names: list):
+
+    '''
+    Output directories of exports of the active chunk: *export_dir*/*chunk* and the DEM cube directory.
+    Files of other chunks (e.g. written by the chunk workers of Parallel.process_chunks) are outside of them.
+    '''
+
+    outputs = [f'{project.export_dir}\\{project.chunk.label}']
+
+    if 'dem_cube' in names:
+        outputs.append(getattr(project.config.metashape.export, 'dem_cube', None) or f'{project.export_dir}\\dem_cube')
+
+    return outputs
+
+def _export_owner(key: str, names: list):
+
+    ''' Export of export_from_list a file of concurrent exports belongs to (see DataManagement.product_type). '''
+
+    owner = adm.product_type(key)
+
+    return owner if owner in names else None
+
+def _export_worker(project_class: type,
+                   config_data:   dict,
+                   project_dir:   str,
+                   image_dir:     str,
+                   config_name:   str,
+                   chunk_index:   int,
+                   name:          str):
+
+    '''
+    Worker process: opens the saved document read-only and runs a single export of the designated chunk.
+
+    Returns:
+        (export name, execution time in seconds, process ID)
+    '''
+
+    start = time.perf_counter()
+
+    # the read-only prompt of the project class must not block the worker
+    os.environ['PYEXPRESS_HEADLESS']                = '1'
+    os.environ['PYEXPRESS_ANSWER_DISABLE_READ_ONLY'] = 'n'
+
+    # log lines go into the log files of the main process, which alone rotates them
+    os.environ[hlp.WORKER_LOG_ENV] = '1'
+
+    config_data = copy.deepcopy(config_data)
+    config_data['input']['general']['new_project']      = False
+    config_data['metashape']['document']['read_only']   = True
+    config_data['metashape']['document']['ignore_lock'] = True
+    config_data['metashape']['chunk']['ID_active']      = chunk_index
+
+    project = project_class(config_data = config_data,
+                            project_dir = project_dir,
+                            image_dir   = image_dir,
+                            config_name = config_name)
+
+    _export_by_name(project, name)
+
+    project.doc.clear()
+    hlp.flush_process_logs()
+
+    return name, time.perf_counter() - start, os.getpid()
+
+
 class Export():
 
-    def export_from_list(project: object,
-                         export_list: list):
+    @hlp.instrument
+    def export_from_list(project:     object,
+                         export_list: list,
+                         workers:     int  = None,
+                         config_data: dict = None):
 
         ''' 
         Exports Metashape results from the active chunk specified by a list.\n
         The export uses default parameters without any keyword argument specifications.\n
         For more specific export options, please use the corresponding methods in the Export class.
         
+        With more than one worker, the exports run concurrently in worker processes. Each worker opens
+        the saved document read-only and runs one export; the project is saved beforehand, so the workers see
+        the current state. Read-only documents cannot be saved and are exported sequentially. The execution time of every export is
+        logged in both modes.
+
+        The files of the export directory are indexed in its manifest (DataManagement.Manifest, manifest.json) with their content hashes.
+        With metashape.export.skip_unchanged, every export is also registered with the fingerprint of its inputs (processing parameters,
+        processing state of the chunk, source images) and the files it wrote, and exports with an unchanged fingerprint
+        whose files are unchanged are skipped. Concurrent exports write at the same time; their files are assigned to the
+        exports by their product type (DataManagement.product_type).
+        With metashape.export.catalog, the project and its products are registered in the SQLite catalog (DataManagement.Catalog).
+        
         *args:
             project: your Metashape project\n
             export (case insensitive):\n
-            ['camera', 'dem', 'dem_trafo', 'marker', 'model', 'ortho', 'ortho_trafo', 'point_cloud', 'precision_map', 'report', 'tiled_model'] \n
+            ['camera', 'cwsi', 'dem', 'dem_cube', 'dem_trafo', 'indices', 'marker', 'model', 'ortho', 'ortho_trafo', 'point_cloud', 'precision_map', 'report', 'tiled_model'] \n
+            workers: number of concurrent exports; default: metashape.export.workers or 1\n
+            config_data: content of the project configuration file; required for workers > 1
         
         *export_formats:
             Camera: XML\n
+            CWSI: TIFF of the crop water stress index and CSV of statistics per area of interest\n
             DEM: TIFF\n
+            DEM_cube: TIFF per frame appended to the memory-mapped DEM time series (dem_cube/cube.dat, index.json)\n
             DEM_trafo: basic raster transformed by value (_val.TIFF) and palette (_pal.TIFF)\n
+            Indices: one TIFF per vegetation index computed from the orthomosaic bands\n
             3DModel: OBJ\n
             Orthomosaic: TIFF\n
             Orthomosaic_trafo: basic raster transformed by value (_val.TIFF) and palette (_pal.TIFF)\n
-            PointCloud: OBJ\n
+            PointCloud: OBJ (and _voxel.PLY with metashape.export.voxel_size, LAZ or OBJ.ZST with metashape.export.compression)\n
             PrecisionMap: TXT\n
             Report: PDF\n
             TiledModel: OBJ\n
@@ -52,96 +346,97 @@ class Export():
         print('Metashape workflow: (OPT) exporting results from list')
 
         # export data according to entrys of the list 'export'
-        
-        if any(s.lower() == 'dem' for s in export_list):
-            ppp.Export.raster(project      = project, 
-                              export_type  = 'dem'.upper(),
-                              source_data  = Metashape.DataSource.ElevationData,
-                              image_format = Metashape.ImageFormatTIFF)
-        
-        if any(s.lower() == 'ortho' for s in export_list):
-            ppp.Export.raster(project      = project, 
-                              export_type  = 'ortho',
-                              source_data  = Metashape.DataSource.OrthomosaicData, 
-                              image_format = Metashape.ImageFormatTIFF) 
-
-        if any(s.lower() == 'dem_trafo' for s in export_list):
-
-            # ppp.Export.raster(project          = project, 
-            #                   export_type      = 'dem'.upper()+'_transform_val',
-            #                   save_alpha       = False,
-            #                   raster_transform = Metashape.RasterTransformValue, 
-            #                   source_data      = Metashape.DataSource.ElevationData,
-            #                   image_format     = Metashape.ImageFormatTIFF)
+        names   = [name for name in EXPORT_TYPES if any(s.lower() == name for s in export_list)]
+        workers = workers or getattr(project.config.metashape.export, 'workers', 1) or 1
+        workers = min(workers, len(names))
+        
+        # products with unchanged inputs and files are skipped (content-addressed manifest of the export directory)
+        manifest       = adm.Manifest(project.export_dir)
+        skip_unchanged = getattr(project.config.metashape.export, 'skip_unchanged', False)
+
+        if skip_unchanged:
+            chunk_state  = _chunk_state(project.chunk)
+            fingerprints = {name: _export_fingerprint(project, name, chunk_state) for name in names}
+            outputs      = _export_outputs(project, names)
+            skipped      = [name for name in names if manifest.is_current(f'{project.chunk.label}/{name}', fingerprints[name])]
+            names   = [name for name in names if name not in skipped]
+            workers = min(workers, max(len(names), 1))
+
+            for name in skipped:
+                project.logging(f'Export: {name} skipped, inputs and products unchanged')
+
+        # workers reopen the saved document: the in-memory state of a read-only document (e.g. a raster transform)
+        # cannot be saved for them, so its exports run sequentially
+        if workers > 1 and (getattr(project, 'read_only', False) or getattr(project.doc, 'read_only', False)):
+            print('Metashape workflow: (OPT) read-only document, exports run sequentially')
+            project.logging('Export: read-only document, concurrent exports replaced by sequential exports')
+            workers = 1
+
+        before = manifest.snapshot(outputs) if skip_unchanged else None
+
+        if workers <= 1:
+            for name in names:
+                start = time.perf_counter()
+                _export_by_name(project, name)
+                project.logging(f'Export: {name} finished in {time.perf_counter() - start:.1f} s')
+
+                if skip_unchanged:
+                    after  = manifest.snapshot(outputs)
+                    manifest.register(f'{project.chunk.label}/{name}', fingerprints[name], manifest.changed(before, after),
+                                      save=False)
+                    before = after
+        else:
+            if config_data is None:
+                raise ValueError('Export: config_data is required for concurrent exports (workers > 1).')
+            
+            print(f'Metashape workflow: (OPT) {len(names)} exports with {workers} worker processes')
+            project.logging(f'Export: {names} with {workers} workers')
+            
+            # workers start from the saved state of the document
+            project.saveMetashapeProject(active_chunk=project.chunk.label)
+            
+            hlp.flush_process_logs()
+            
+            ctx = mp.get_context('spawn')
+            
+            # worker records and logs are written under the run ID of the main process
+            with hlp.environment_variables(PYEXPRESS_RUN_ID=hlp.run_id()), \
+                 ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+                futures = [executor.submit(_export_worker,
+                                           type(project), config_data,
+                                           project.project_dir, project.image_dir, project.config_name,
+                                           project.doc.chunks.index(project.chunk), name)
+                           for name in names]
                 
-            ppp.Export.raster(project          = project, 
-                              export_type      = 'dem'.upper()+'_transform_pal',
-                              save_alpha       = False,
-                              raster_transform = Metashape.RasterTransformPalette, 
-                              source_data      = Metashape.DataSource.ElevationData,
-                              image_format     = Metashape.ImageFormatTIFF)
-            
-        if any(s.lower() == 'ortho_trafo' for s in export_list):
-
-            # if project.drone_RGB == True or project.stereo_RGB == True:
-            #     trafo_color = Metashape.RasterTransformPalette
-            # else:
-            #     trafo_color = Metashape.RasterTransformValue
-
-            ppp.Export.raster(project          = project, 
-                              export_type      = 'ortho_transform_val',
-                              raster_transform = Metashape.RasterTransformValue,
-                              save_alpha       = False,
-                              source_data      = Metashape.DataSource.OrthomosaicData,
-                              image_format     = Metashape.ImageFormatTIFF)
-
-            ppp.Export.raster(project          = project, 
-                              export_type      = 'ortho_transform_pal',
-                              raster_transform = Metashape.RasterTransformPalette,
-                              save_alpha       = False,
-                              source_data      = Metashape.DataSource.OrthomosaicData,
-                              image_format     = Metashape.ImageFormatTIFF)
-            
-        if any(s.lower() == 'model' for s in export_list):
-            ppp.Export.model(project = project,
-                             format  = Metashape.ModelFormatOBJ)
-        
-        if any(s.lower() == 'tiled_model' for s in export_list):
-            ppp.Export.tiled_model(project = project,
-                                   format  = Metashape.ModelFormatOBJ)
-        
-        if any(s.lower() == 'camera' for s in export_list):
-            ppp.Export.camera(project = project,
-                              format  = Metashape.CamerasFormatXML)
-        
-        if any(s.lower() == 'point_cloud' for s in export_list):
-            if str(Metashape.version)[0] == '1':
-                ppp.Export.point_cloud(project         = project,
-                                       source_data     = Metashape.DataSource.DenseCloudData,
-                                       format          = Metashape.PointsFormatOBJ,
-                                       save_colors     = True, 
-                                       colors_rgb_8bit = True)
-            if str(Metashape.version)[0] == '2':        
-                ppp.Export.point_cloud(project          = project,
-                                       source_data      = Metashape.DataSource.PointCloudData,
-                                       format           = Metashape.PointCloudFormatOBJ,
-                                       save_point_color = True, 
-                                       colors_rgb_8bit  = True)
-        
-        if any(s.lower() == 'precision_map' for s in export_list):
-            ppp.Export.precision_map(project = project, 
-                                     format  = 'txt')
-
-        if any(s.lower() == 'report' for s in export_list):
-            ppp.Export.report(project = project)
-        
-        if any(s.lower() == 'marker' for s in export_list):
-            ppp.Export.marker(project       = project, 
-                              export_format = 'xml')
+                # re-raises the first worker exception after all exports have finished
+                for future in as_completed(futures):
+                    if future.exception() is None:
+                        name, seconds, pid = future.result()
+                        project.logging(f'Export: {name} finished in {seconds:.1f} s (worker {pid})')
+                
+                for future in futures:
+                    future.result()
+
+            # concurrent exports write at the same time, so their files are assigned by product type
+            if skip_unchanged:
+                changed = manifest.changed(before, manifest.snapshot(outputs))
+                for name in names:
+                    manifest.register(f'{project.chunk.label}/{name}', fingerprints[name],
+                                      [key for key in changed if _export_owner(key, names) == name], save=False)
+
+        manifest.index()
+
+        # campaign/product catalog across projects
+        catalog = getattr(project.config.metashape.export, 'catalog', None)
+        if catalog:
+            with adm.Catalog(catalog) as database:
+                database.register_project(project)
+            project.logging(f'Export: products registered in catalog {catalog}')
 
         hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
         
 
+    @hlp.instrument
     def marker(project: object, export_format='xml', **kwargs):
         
         '''
@@ -215,6 +510,7 @@ class Export():
         print('Metashape workflow: (OPT) exporting markers')
         project.logging(f'Export: marker in {export_format} format')
 
+    @hlp.instrument
     def camera(project: object, **kwargs):
 
         '''
@@ -235,12 +531,14 @@ class Export():
         savepath = f'{project.export_dir}\\{project.chunk.label}'        
         os.makedirs(savepath, exist_ok=True)        
         
-        project.chunk.exportCameras(path=f'{savepath}\\cameras.{extens_.lower()}', **kwargs)
+        with hlp.ProgressTracker(project, stage='Export.camera') as progress:
+            project.chunk.exportCameras(path=f'{savepath}\\cameras.{extens_.lower()}', progress=progress, **kwargs)
 
         # process logging and console output
         print('Metashape workflow: (OPT) exporting cameras')            
         project.logging(f'Export: cameras in {extens_} format')
             
+    @hlp.instrument
     def tiled_model(project: object, pattern: str='', string: str='', **kwargs):
         
         '''
@@ -269,33 +567,37 @@ class Export():
         format_  = kwargs.get('format', Metashape.ModelFormatOBJ)       # dummy
         extens_  = str(format_).split('.')[-1].split('Format')[-1]                
                 
-        for i, frame in enumerate(project.chunk.frames):
+        frames = project.chunk.frames
+
+        with hlp.ProgressTracker(project, stage='Export.tiled_model') as progress:
+            for i, frame in enumerate(frames):
             
-            if project.stereo_RGB == True or project.stereo_IR == True:
-                savepath_ = f'{savepath}\\tiled_models'
-                os.makedirs(savepath, exist_ok=True)
+                if project.stereo_RGB == True or project.stereo_IR == True:
+                    savepath_ = f'{savepath}\\tiled_models'
+                    os.makedirs(savepath, exist_ok=True)
                 
-                name     = frame.cameras[0].photo.path            
-                if pattern != '' and string == '':
-                    name     = hlp.extract_date_stamps([name], pattern=pattern)
-                    savename = f'{savepath_}\\{name[0]}'
-                elif pattern == '' and string != '':
-                    savename = f'{savepath_}\\{string}_{i}'
-                elif pattern != '' and string != '':
-                    name     = hlp.extract_date_stamps([name], pattern=pattern)
-                    savename = f'{savepath_}\\{name[0]}_{string}'
+                    name     = frame.cameras[0].photo.path            
+                    if pattern != '' and string == '':
+                        name     = hlp.extract_date_stamps([name], pattern=pattern)
+                        savename = f'{savepath_}\\{name[0]}'
+                    elif pattern == '' and string != '':
+                        savename = f'{savepath_}\\{string}_{i}'
+                    elif pattern != '' and string != '':
+                        name     = hlp.extract_date_stamps([name], pattern=pattern)
+                        savename = f'{savepath_}\\{name[0]}_{string}'
+                    else:
+                        name     = os.path.basename(name).split('.')[0]
+                        savename = f'{savepath_}\\{name}'
                 else:
-                    name     = os.path.basename(name).split('.')[0]
-                    savename = f'{savepath_}\\{name}'
-            else:
-                savename = f'{savepath}\\tiled_model'            
+                    savename = f'{savepath}\\tiled_model'            
             
-            frame.exportTiledModel(path=f'{savename}.{extens_.lower()}', **kwargs)
+                frame.exportTiledModel(path=f'{savename}.{extens_.lower()}', progress=progress.part(i, len(frames)), **kwargs)
 
         # process logging and console output
         print('Metashape workflow: (OPT) exporting tiled model')
         project.logging(f'Export: tiled model in {extens_} format')
         
+    @hlp.instrument
     def model(project: object, pattern: str='', string: str='', **kwargs):
         
         '''
@@ -324,33 +626,37 @@ class Export():
         format_  = kwargs.get('format', Metashape.ModelFormatOBJ)       # dummy
         extens_  = str(format_).split('.')[-1].split('Format')[-1]
                 
-        for i, frame in enumerate(project.chunk.frames):
+        frames = project.chunk.frames
+
+        with hlp.ProgressTracker(project, stage='Export.model') as progress:
+            for i, frame in enumerate(frames):
             
-            if project.stereo_RGB == True or project.stereo_IR == True:
-                savepath_ = f'{savepath}\\3DModels'
-                os.makedirs(savepath, exist_ok=True)
+                if project.stereo_RGB == True or project.stereo_IR == True:
+                    savepath_ = f'{savepath}\\3DModels'
+                    os.makedirs(savepath, exist_ok=True)
                 
-                name     = frame.cameras[0].photo.path            
-                if pattern != '' and string == '':
-                    name     = hlp.extract_date_stamps([name], pattern=pattern)
-                    savename = f'{savepath_}\\{name[0]}'
-                elif pattern == '' and string != '':
-                    savename = f'{savepath_}\\{string}'
-                elif pattern != '' and string != '':
-                    name     = hlp.extract_date_stamps([name], pattern=pattern)
-                    savename = f'{savepath_}\\{name[0]}_{string}'
+                    name     = frame.cameras[0].photo.path            
+                    if pattern != '' and string == '':
+                        name     = hlp.extract_date_stamps([name], pattern=pattern)
+                        savename = f'{savepath_}\\{name[0]}'
+                    elif pattern == '' and string != '':
+                        savename = f'{savepath_}\\{string}'
+                    elif pattern != '' and string != '':
+                        name     = hlp.extract_date_stamps([name], pattern=pattern)
+                        savename = f'{savepath_}\\{name[0]}_{string}'
+                    else:
+                        name     = os.path.basename(name).split('.')[0]
+                        savename = f'{savepath_}\\{name}'
                 else:
-                    name     = os.path.basename(name).split('.')[0]
-                    savename = f'{savepath_}\\{name}'
-            else:
-                savename = f'{savepath}\\3DModel'
+                    savename = f'{savepath}\\3DModel'
 
-            frame.exportModel(path=f'{savename}.{extens_.lower()}', **kwargs)
+                frame.exportModel(path=f'{savename}.{extens_.lower()}', progress=progress.part(i, len(frames)), **kwargs)
             
         # process logging and console output
         print('Metashape workflow: (OPT) exporting model')
         project.logging(f'Export: 3D model in {extens_} format')
         
+    @hlp.instrument
     def raster(project: object, export_type: str, pattern: str='', string: str='', **kwargs):
         
         '''
@@ -372,6 +678,9 @@ class Export():
             Get further information in the user manual:\n
             https://www.agisoft.com/downloads/user-manuals/\n\n
             --> class Metashape.Chunk.exportRaster
+        
+        Returns:
+            List of exported files (one per frame)
         '''
         
         savepath = f'{project.export_dir}\\{project.chunk.label}'
@@ -381,33 +690,428 @@ class Export():
         extens_  = str(format_).split('.')[-1].split('Format')[-1]
         
         # export raster to your export directory from each frame in a chunk
-        for i, frame in enumerate(project.chunk.frames):
+        frames = project.chunk.frames
+        paths  = []
 
-            if project.stereo_RGB == True or project.stereo_IR == True:
-                savepath_ = f'{savepath}\\raster'
-                os.makedirs(savepath, exist_ok=True)
+        with hlp.ProgressTracker(project, stage='Export.raster') as progress:
+            for i, frame in enumerate(frames):
+
+                if project.stereo_RGB == True or project.stereo_IR == True:
+                    savepath_ = f'{savepath}\\raster'
+                    os.makedirs(savepath, exist_ok=True)
                 
-                name     = frame.cameras[0].photo.path            
-                if pattern != '' and string == '':
-                    name     = hlp.extract_date_stamps([name], pattern=pattern)
-                    savename = f'{savepath_}\\{export_type}_{name[0]}'
-                elif pattern == '' and string != '':
-                    savename = f'{savepath_}\\{export_type}_{string}'
-                elif pattern != '' and string != '':
-                    name     = hlp.extract_date_stamps([name], pattern=pattern)
-                    savename = f'{savepath_}\\{name[0]}_{string}'
+                    name     = frame.cameras[0].photo.path            
+                    if pattern != '' and string == '':
+                        name     = hlp.extract_date_stamps([name], pattern=pattern)
+                        savename = f'{savepath_}\\{export_type}_{name[0]}'
+                    elif pattern == '' and string != '':
+                        savename = f'{savepath_}\\{export_type}_{string}'
+                    elif pattern != '' and string != '':
+                        name     = hlp.extract_date_stamps([name], pattern=pattern)
+                        savename = f'{savepath_}\\{name[0]}_{string}'
+                    else:
+                        name     = os.path.basename(name).split('.')[0]
+                        savename = f'{savepath_}\\{name}'
                 else:
-                    name     = os.path.basename(name).split('.')[0]
-                    savename = f'{savepath_}\\{name}'
-            else:
-                savename = f'{savepath}\\{export_type}'
+                    savename = f'{savepath}\\{export_type}'
 
-            frame.exportRaster(path=f'{savename}.{extens_.lower()}', **kwargs)
+                frame.exportRaster(path=f'{savename}.{extens_.lower()}', progress=progress.part(i, len(frames)), **kwargs)
+                paths.append(f'{savename}.{extens_.lower()}')
 
         # process logging and console output
         print(f'Metashape workflow: (OPT) exporting raster in {extens_} format')
         project.logging(f'Export: raster as {export_type} in {extens_} format')
+
+        return paths
+
+    @hlp.instrument
+    def raster_transform(project: object, export_type: str, alpha: bool = False, range_percentiles: tuple = None, **kwargs):
+
+        '''
+        Exports the raster transformation of the active chunk as value raster (Metashape.RasterTransformValue)
+        and derives the palette raster from it in PyExpress, instead of a second export with
+        Metashape.RasterTransformPalette. Metashape renders the raster once; the palette colours are
+        applied in a single streaming pass over the tiles of the value raster, using the palette
+        of chunk.raster_transform (set by applyVegetationIndex from vegetation.palette).
+        
+        *args:
+            project: your Metashape project\n
+            export_type: prefix of the exported files, e.g. 'ortho' -> ortho_transform_val / ortho_transform_pal\n
+            alpha: whether the palette raster gets an alpha band for nodata pixels\n
+            range_percentiles: (lower, upper) percentiles of the exported values; if set, the raster transformation
+                               range is calibrated from them and the palette rescaled before deriving the palette rasters
+        
+        **kwargs:
+            see Export.raster, e.g. source_data, pattern, string
+        
+        Returns:
+            List of (value raster, palette raster) per frame
+        '''
+        
+        value_type   = f'{export_type}_transform_val'
+        palette_type = f'{export_type}_transform_pal'
+        
+        paths = ppp.Export.raster(project          = project,
+                                  export_type      = value_type,
+                                  raster_transform = Metashape.RasterTransformValue,
+                                  save_alpha       = False,
+                                  image_format     = Metashape.ImageFormatTIFF,
+                                  **kwargs)
+        
+        # the value rasters are also the input of the range calibration, so Metashape renders only once
+        if range_percentiles:
+            project.calibrateVegetationIndexRange(percentiles=tuple(range_percentiles), raster_paths=paths)
+        
+        raster_transform = project.chunk.raster_transform
+        palette          = {float(value): tuple(color) for value, color in raster_transform.palette.items()}
+        interpolate      = getattr(raster_transform, 'interpolation', True)
+        results          = []
+        
+        for value_path in paths:
+            dirname, basename = os.path.split(value_path)
+            root, ext         = os.path.splitext(basename)
+            
+            if value_type in root:
+                palette_path = os.path.join(dirname, root.replace(value_type, palette_type) + ext)
+            else:
+                palette_path = os.path.join(dirname, f'{root}_pal{ext}')
+            
+            pda.export_palette_raster(value_path   = value_path,
+                                      palette_path = palette_path,
+                                      palette      = palette,
+                                      interpolate  = interpolate,
+                                      alpha        = alpha)
+            results.append((value_path, palette_path))
+        
+        # process logging and console output
+        print(f'Metashape workflow: (OPT) deriving palette raster from {value_type}')
+        project.logging(f'Export: raster as {palette_type} derived from {value_type} in TIFF format')
+        
+        return results
     
+    @hlp.instrument
+    def vegetation_indices(project: object, formulas: object = None, workers: int = None, **kwargs):
+
+        '''
+        Exports the orthomosaic once with its spectral bands (without raster transformation) and computes
+        all vegetation indices from it, one float32 GeoTIFF per index. Metashape's raster transformation
+        holds only one formula per chunk, so this replaces one orthomosaic export per index.
+        The indices are computed tile by tile in parallel threads (DataAnalysis.compute_indices).
+
+        *args:
+            project: your Metashape project\n
+            formulas: list of formulas or {name: formula}; default: vegetation.indexIR (IR projects)
+                      or vegetation.indexMulti\n
+            workers: number of threads; default: number of CPUs
+
+        **kwargs:
+            see Export.raster, e.g. pattern, string
+
+        Returns:
+            List of {index name: path} per frame
+        '''
+
+        if formulas is None:
+            vegetation = project.config.metashape.vegetation
+            formulas   = vegetation.indexIR if project.drone_IR == True or project.stereo_IR == True else vegetation.indexMulti
+
+        if not formulas:
+            print('Metashape workflow: (OPT) no vegetation indices defined')
+            project.logging('Export: no vegetation indices defined')
+            return []
+
+        paths = ppp.Export.raster(project          = project,
+                                  export_type      = 'ortho_bands',
+                                  raster_transform = Metashape.RasterTransformNone,
+                                  save_alpha       = True,
+                                  source_data      = Metashape.DataSource.OrthomosaicData,
+                                  image_format     = Metashape.ImageFormatTIFF,
+                                  **kwargs)
+
+        results = []
+
+        for path in paths:
+            dirname, basename = os.path.split(path)
+            results.append(pda.compute_indices(raster_path = path,
+                                               formulas    = formulas,
+                                               output_dir  = f'{dirname}\\indices',
+                                               prefix      = os.path.splitext(basename)[0].replace('ortho_bands', 'index'),
+                                               workers     = workers))
+
+        # process logging and console output
+        print('Metashape workflow: (OPT) computing vegetation indices from the orthomosaic bands')
+        project.logging(f'Export: vegetation indices {list(results[0]) if results else []} in TIFF format')
+
+        return results
+
+    @hlp.instrument
+    def cwsi(project:     object,
+             t_air:       float = None,
+             t_dry:       float = None,
+             t_wet:       float = None,
+             percentiles: list  = None,
+             aoi_path:    str   = None,
+             workers:     int   = None,
+             **kwargs):
+
+        '''
+        Exports the thermal orthomosaic (without raster transformation) and computes the crop water stress
+        index (CWSI) from it: (Tc - Twet) / (Tdry - Twet). The index is computed tile by tile in a process pool
+        and written as tiled GeoTIFF; with areas of interest, their CWSI statistics are written as CSV.
+        Unset reference temperatures are estimated from percentiles of the canopy temperatures
+        (see DataAnalysis.compute_cwsi).
+
+        *args:
+            project: your Metashape project\n
+            t_air, t_dry, t_wet: air and reference temperatures; default: cwsi section of the configuration file\n
+            percentiles: [wet, dry] percentiles for unset reference temperatures; default: cwsi.percentiles or [5, 95]\n
+            aoi_path: GeoJSON file of areas of interest; default: cwsi.aoi_path\n
+            workers: number of processes; default: number of CPUs
+
+        **kwargs:
+            see Export.raster, e.g. pattern, string
+
+        Returns:
+            List of results per frame, see DataAnalysis.compute_cwsi
+        '''
+
+        config      = getattr(project.config.metashape, 'cwsi', None)
+        t_air       = t_air       if t_air       is not None else getattr(config, 't_air', None)
+        t_dry       = t_dry       if t_dry       is not None else getattr(config, 't_dry', None)
+        t_wet       = t_wet       if t_wet       is not None else getattr(config, 't_wet', None)
+        percentiles = percentiles if percentiles is not None else getattr(config, 'percentiles', None) or [5, 95]
+        aoi_path    = aoi_path    if aoi_path    is not None else getattr(config, 'aoi_path', None)
+
+        paths = ppp.Export.raster(project          = project,
+                                  export_type      = 'thermal',
+                                  raster_transform = Metashape.RasterTransformNone,
+                                  save_alpha       = False,
+                                  source_data      = Metashape.DataSource.OrthomosaicData,
+                                  image_format     = Metashape.ImageFormatTIFF,
+                                  **kwargs)
+
+        results = []
+
+        for path in paths:
+            root, ext = os.path.splitext(path)
+            result    = pda.compute_cwsi(thermal_path = path,
+                                         output_path  = f'{root}_cwsi{ext}',
+                                         t_air        = t_air,
+                                         t_dry        = t_dry,
+                                         t_wet        = t_wet,
+                                         percentiles  = tuple(percentiles),
+                                         zones        = aoi_path or None,
+                                         workers      = workers)
+
+            if result['statistics']:
+                import pandas as pd
+                pd.DataFrame.from_dict(result['statistics'], orient='index').rename_axis('aoi').to_csv(f'{root}_cwsi_stats.csv')
+
+            project.logging(f'CWSI: {os.path.basename(path)} with t_wet = {result["t_wet"]:.2f}, t_dry = {result["t_dry"]:.2f}')
+            results.append(result)
+
+        # process logging and console output
+        print('Metashape workflow: (OPT) computing crop water stress index from the thermal orthomosaic')
+        project.logging('Export: crop water stress index in TIFF format')
+
+        return results
+
+    @hlp.instrument
+    def change_detection(project: object, pairs: list = None, use_precision: bool = True, workers: int = None, **kwargs):
+
+        '''
+        Detects changes between the point cloud epochs exported by Export.point_cloud (PLY or OBJ, one file per frame)
+        with DataAnalysis.detect_changes: cloud-to-cloud (C2C) and M3C2 distances at core points of each
+        reference epoch. The precision maps of Export.precision_map with the same file names serve as level of
+        detection. Epochs are ordered by file name (e.g. time stamps of the pattern of the exports).
+        Results are written into *export_dir*/*chunk*/changes.
+
+        *args:
+            project: your Metashape project\n
+            pairs: list of (reference index, compared index) of the sorted epochs; default: consecutive epochs\n
+            use_precision: whether to use the exported precision maps as level of detection\n
+            workers: number of processes; default: number of CPUs
+
+        **kwargs:
+            see DataAnalysis.detect_changes, e.g. tile_size, core_spacing, cylinder_radius, max_depth,
+            registration_error, grid_cell_size
+
+        Returns:
+            {(reference, compared): path of the changes}
+        '''
+
+        savepath = f'{project.export_dir}\\{project.chunk.label}'
+        exports  = [path for path in sorted(glob.glob(f'{savepath}\\point_clouds\\*.*')) if '_voxel' not in os.path.basename(path)]
+        clouds   = [path for path in exports if path.lower().endswith('.ply')] or [path for path in exports if path.lower().endswith('.obj')]
+
+        if len(clouds) < 2:
+            print('Metashape workflow: (OPT) change detection requires at least two exported PLY/OBJ point clouds')
+            project.logging('Change detection: less than two PLY/OBJ point clouds exported')
+            return dict()
+
+        precision_maps = None
+
+        if use_precision:
+            names      = [os.path.splitext(os.path.basename(cloud))[0] for cloud in clouds]
+            candidates = [[f'{savepath}\\precision_maps\\{name}.{extension}' for extension in ['txt', 'csv', 'npy', 'parquet']]
+                          for name in names]
+            found      = [next((path for path in paths if os.path.exists(path)), None) for paths in candidates]
+            precision_maps = found if all(found) else None
+
+        epsg, _ = pda.crs_to_epsg(project.chunk.crs)
+        paths   = pda.detect_changes(clouds         = clouds,
+                                     out_dir        = f'{savepath}\\changes',
+                                     precision_maps = precision_maps,
+                                     pairs          = pairs,
+                                     epsg           = epsg,
+                                     workers        = workers,
+                                     **kwargs)
+
+        # process logging and console output
+        print('Metashape workflow: (OPT) detecting changes between point cloud epochs')
+        project.logging(f'Change detection: {len(paths)} epoch pairs, level of detection from '
+                        f'{"precision maps" if precision_maps else "point cloud roughness"}')
+
+        return paths
+
+    @hlp.instrument
+    def compress_point_cloud(project: object, fmt: str = None, minio_config: str = None, directory: str = None,
+                             workers: int = None, **kwargs):
+
+        '''
+        Compresses the point clouds exported by Export.point_cloud into LAZ or zstd-compressed files
+        (DataManagement.Compression) on worker threads. With a MinIO configuration, each compressed file is
+        uploaded while the following files are still compressed, and the local compressed files are removed
+        after the upload; point clouds uploaded before with the same content hash (manifest of the export directory)
+        are skipped. Compression ratio and throughput are logged per point cloud.
+
+        *args:
+            project: your Metashape project\n
+            fmt: ['zstd', 'laz']; default: metashape.export.compression of the configuration file or 'zstd'\n
+            minio_config: MinIO configuration file for the upload; None: no upload\n
+            directory: target directory in the bucket; default: projectID/chunk label/point_clouds\n
+            workers: number of compression threads
+
+        **kwargs:
+            see DataManagement.Compression.zstd and DataManagement.Compression.laz
+
+        Returns:
+            List of compression statistics per point cloud
+        '''
+
+        fmt      = fmt or getattr(project.config.metashape.export, 'compression', None) or 'zstd'
+        savepath = f'{project.export_dir}\\{project.chunk.label}'
+        clouds   = [path for path in sorted(glob.glob(f'{savepath}\\point_clouds\\*.*') + glob.glob(f'{savepath}\\point_cloud.*'))
+                    if os.path.splitext(path)[1].lower() in ['.ply', '.obj']]
+
+        if minio_config is None:
+            results = adm.Compression.compress_and_upload(clouds, fmt=fmt, workers=workers, **kwargs)
+        else:
+            directory = directory or f'{project.project_ID}/{project.chunk.label}/point_clouds'
+            results   = adm.MinIO(config_MinIO=minio_config, get_filelist=False).upload_compressed(clouds, directory, fmt=fmt,
+                                                                                                   workers=workers,
+                                                                                                   manifest=adm.Manifest(project.export_dir),
+                                                                                                   **kwargs)
+
+        for stats in results:
+            upload = f', upload {stats["upload_seconds"]:.1f} s' if 'upload_seconds' in stats else ''
+            project.logging(f'Point cloud compression: {os.path.basename(stats["source"])} to {fmt}, '
+                            f'{stats["size_in"] / 1e6:.1f} MB -> {stats["size_out"] / 1e6:.1f} MB (ratio {stats["ratio"]:.2f}), '
+                            f'{stats["throughput"]:.1f} MB/s{upload}')
+
+        # process logging and console output
+        print(f'Metashape workflow: (OPT) compressing point clouds ({fmt}){" and uploading to MinIO" if minio_config else ""}')
+        project.logging(f'Export: {len(results)} point clouds compressed to {fmt}')
+
+        return results
+
+    @hlp.instrument
+    def downsample_point_cloud(project: object, voxel_size: float, min_confidence: float = None, tile_size: float = None):
+
+        '''
+        Voxel-grid downsampling of the point clouds exported by Export.point_cloud (PLY or OBJ) with
+        DataAnalysis.downsample_cloud: points are streamed in chunks, optionally filtered by confidence (PLY exports
+        with save_point_confidence), tiled on disk and reduced to one averaged point per voxel, so memory stays
+        bounded for clouds of any size. Results are written next to the exports as *name*_voxel*size*.ply.
+
+        *args:
+            project: your Metashape project\n
+            voxel_size: voxel edge length in units of the chunk coordinate system\n
+            min_confidence: minimum point confidence; None: all points\n
+            tile_size: tile edge length of the processing; default: 256 voxels
+
+        Returns:
+            List of downsampled PLY files
+        '''
+
+        savepath = f'{project.export_dir}\\{project.chunk.label}'
+        clouds   = [path for path in sorted(glob.glob(f'{savepath}\\point_clouds\\*.*') + glob.glob(f'{savepath}\\point_cloud.*'))
+                    if os.path.splitext(path)[1].lower() in ['.ply', '.obj'] and '_voxel' not in os.path.basename(path)]
+        paths    = []
+
+        for cloud in clouds:
+            path   = f'{os.path.splitext(cloud)[0]}_voxel{voxel_size:g}.ply'
+            counts = pda.downsample_cloud(cloud, path, voxel_size, min_confidence=min_confidence, tile_size=tile_size)
+            project.logging(f'Point cloud downsampling: {os.path.basename(cloud)} from {counts["read"]} to {counts["written"]} points')
+            paths.append(path)
+
+        # process logging and console output
+        print(f'Metashape workflow: (OPT) downsampling point clouds to voxels of {voxel_size:g}')
+        project.logging(f'Export: {len(paths)} point clouds downsampled to voxels of {voxel_size:g} in PLY format')
+
+        return paths
+
+    @hlp.instrument
+    def dem_cube(project: object, cube_dir: str = None, cell_size: float = None, replace: bool = False, **kwargs):
+
+        '''
+        Exports the DEM of each frame and appends it to a memory-mapped DEM time series (DataAnalysis.DemCube).
+        The DEMs are resampled once onto the grid of the cube; time series, rolling statistics and difference
+        rasters are then computed from the cube. The cube grows incrementally: epochs with a timestamp already
+        in the cube are skipped, so repeated campaigns (e.g. drone projects) can share one cube.
+
+        Timestamps are the exported file names without the export type (e.g. the time stamps of a pattern)
+        for multiframe projects and the projectID otherwise.
+
+        *args:
+            project: your Metashape project\n
+            cube_dir: cube directory; default: export.dem_cube of the configuration file or *export_dir*/dem_cube\n
+            cell_size: cell size of a new cube; default: resolution of the first DEM\n
+            replace: whether to replace epochs with existing timestamps
+
+        **kwargs:
+            see Export.raster, e.g. pattern, string
+
+        Returns:
+            DataAnalysis.DemCube
+        '''
+
+        cube_dir = cube_dir or getattr(project.config.metashape.export, 'dem_cube', None) or f'{project.export_dir}\\dem_cube'
+        paths    = ppp.Export.raster(project      = project,
+                                     export_type  = 'DEM',
+                                     source_data  = Metashape.DataSource.ElevationData,
+                                     image_format = Metashape.ImageFormatTIFF,
+                                     **kwargs)
+
+        if os.path.exists(os.path.join(cube_dir, 'index.json')):
+            cube = pda.DemCube(cube_dir)
+        else:
+            cube = pda.DemCube.create(cube_dir, reference=paths[0], cell_size=cell_size)
+
+        appended = 0
+
+        for path in paths:
+            name      = os.path.splitext(os.path.basename(path.replace('\\', os.sep)))[0]
+            timestamp = name.replace('DEM_', '', 1) if len(paths) > 1 else project.project_ID
+            appended += cube.append(path, timestamp, replace=replace)
+
+        # process logging and console output
+        print('Metashape workflow: (OPT) appending DEMs to the DEM time series')
+        project.logging(f'DEM cube: {appended} of {len(paths)} epochs appended, {len(cube.timestamps)} epochs in {cube_dir}')
+
+        return cube
+
+    @hlp.instrument
     def report(project: object, **kwargs):
         
         ''' 
@@ -426,12 +1130,14 @@ class Export():
         savepath = f'{project.export_dir}\\{project.chunk.label}'
         os.makedirs(savepath, exist_ok=True)
         
-        project.chunk.exportReport(path=f'{savepath}\\report.pdf', **kwargs)
+        with hlp.ProgressTracker(project, stage='Export.report') as progress:
+            project.chunk.exportReport(path=f'{savepath}\\report.pdf', progress=progress, **kwargs)
         
         # process logging and console output
         print('Metashape workflow: (OPT) exporting report')
         project.logging('Export: processing report in PDF format')
         
+    @hlp.instrument
     def point_cloud(project: object, pattern: str='', string: str='', **kwargs):
         
         ''' 
@@ -460,38 +1166,43 @@ class Export():
         format_  = kwargs.get('format', Metashape.PointCloudFormatOBJ)      # dummy
         extens_  = str(format_).split('.')[-1].split('Format')[-1]
         
-        for i, frame in enumerate(project.chunk.frames):
+        frames = project.chunk.frames
+
+        with hlp.ProgressTracker(project, stage='Export.point_cloud') as progress:
+            for i, frame in enumerate(frames):
             
-            if project.stereo_RGB == True or project.stereo_IR == True:
-                savepath_ = f'{savepath}\\point_clouds'
-                os.makedirs(savepath, exist_ok=True)
+                if project.stereo_RGB == True or project.stereo_IR == True:
+                    savepath_ = f'{savepath}\\point_clouds'
+                    os.makedirs(savepath, exist_ok=True)
                 
-                name     = frame.cameras[0].photo.path            
-                if pattern != '' and string == '':
-                    name     = hlp.extract_date_stamps([name], pattern=pattern)
-                    savename = f'{savepath_}\\{name[0]}'
-                elif pattern == '' and string != '':
-                    name     = string
-                    savename = f'{savepath_}\\{name}'
-                elif pattern != '' and string != '':
-                    name     = hlp.extract_date_stamps([name], pattern=pattern)
-                    savename = f'{savepath_}\\{name[0]}_{string}'
+                    name     = frame.cameras[0].photo.path            
+                    if pattern != '' and string == '':
+                        name     = hlp.extract_date_stamps([name], pattern=pattern)
+                        savename = f'{savepath_}\\{name[0]}'
+                    elif pattern == '' and string != '':
+                        name     = string
+                        savename = f'{savepath_}\\{name}'
+                    elif pattern != '' and string != '':
+                        name     = hlp.extract_date_stamps([name], pattern=pattern)
+                        savename = f'{savepath_}\\{name[0]}_{string}'
+                    else:
+                        name     = os.path.basename(name).split('.')[0]
+                        savename = f'{savepath_}\\{name}'
                 else:
-                    name     = os.path.basename(name).split('.')[0]
-                    savename = f'{savepath_}\\{name}'
-            else:
-                savename = f'{savepath}\\point_cloud'
+                    savename = f'{savepath}\\point_cloud'
                 
-            if str(Metashape.version)[0] == '1':
-                frame.exportPoints(path=f'{savename}.{extens_.lower()}', **kwargs)        
-            if str(Metashape.version)[0] == '2': 
-                frame.exportPointCloud(path=f'{savename}.{extens_.lower()}', **kwargs)
+                if str(Metashape.version)[0] == '1':
+                    frame.exportPoints(path=f'{savename}.{extens_.lower()}', progress=progress.part(i, len(frames)), **kwargs)        
+                if str(Metashape.version)[0] == '2': 
+                    frame.exportPointCloud(path=f'{savename}.{extens_.lower()}', progress=progress.part(i, len(frames)), **kwargs)
 
         # process logging and console output
         print('Metashape workflow: (OPT) exporting point cloud')                
         project.logging(f'Export: point cloud in {extens_} format')
 
-    def precision_map(project: object, pattern: str='', string: str='', export_format: str='txt', **kwargs):
+    @hlp.instrument
+    def precision_map(project: object, pattern: str='', string: str='', export_format: str='txt',
+                      batch_size: int = 250000, grid_cell_size: float = None, grid_statistic: str = 'mean', **kwargs):
 
         '''
         Exports the presicion map as text file from the active chunk.
@@ -502,6 +1213,11 @@ class Export():
         
         --> visit http://tinyurl.com/sfmgeoref for more information.
         
+        Tie points are read from the extraction of TiePointCloud.extract() and processed batch-wise:
+        coordinates and covariances are transformed with matrix products and streamed to the output file.
+        Optionally, the precisions sX/sY/sZ are binned into regular grids and written as tiled
+        GeoTIFFs (*_sX.tif, *_sY.tif, *_sZ.tif) in the coordinate system of the chunk.
+        
         NOTE for multiframe projects (e.g. class StereoProject): 
             exported file names are choosable from:
                 - pattern: extracting a string from a time pattern in the source file name\n
@@ -512,14 +1228,19 @@ class Export():
             project: your Metashape project\n
             pattern: re.pattern for time stamp extraction from a filename\n
             string: designated filename for export\n
-            export_format: export text file format
+            export_format: ['txt', 'csv', 'npy', 'parquet'] - tab separated text file, NumPy structured
+                           array or Parquet table (requires pyarrow); None: precision grids only\n
+            batch_size: number of tie points processed at once\n
+            grid_cell_size: cell size of the precision grids in units of the chunk coordinate system;
+                            None: no grids\n
+            grid_statistic: ['mean', 'median', 'min', 'max', 'count'] - statistic per grid cell
         '''
 
 
         savepath = f'{project.export_dir}\\{project.chunk.label}'
         os.makedirs(savepath, exist_ok=True)
 
-        extens_  = export_format
+        extens_  = export_format.lower() if export_format else None
 
         # transform coordinate system to local coordinates
         # NOTE: region will be reseted to default - was nicht stimmt
@@ -533,6 +1254,9 @@ class Export():
             R = s * T.rotation()
         else:
             R = T.rotation()
+
+        M_ = _matrix_to_array(M, 4)
+        R_ = _matrix_to_array(R, 3)
     
         for i, frame in enumerate(project.chunk.frames):
             
@@ -556,49 +1280,224 @@ class Export():
 
             else:
                 savename = f'{savepath}\\precision_map'
-                
-            with open(f'{savename}.{extens_.lower()}', 'w') as fid:
-                # define a writer generator and line parameters
-                fwriter = csv.writer(fid, delimiter='\t', lineterminator='\n')
-                # write header into file
-                fwriter.writerow(['X(m)', 'Y(m)', 'Z(m)', 
-                                  'sX(mm)', 'sY(mm)', 'sZ(mm)', 
-                                  'covXX(m2)', 'covXY(m2)', 'covXZ(m2)', 
-                                  'covYY(m2)', 'covYZ(m2)', 'covZZ(m2)'])
-                
-                # iterate through the tie point cloud      
-                for j, point in enumerate(frame.tie_points.points):
-            
-                    # check if the point is usable
-                    if not point.valid: continue
-                
+
+            writer = _PrecisionMapWriter(path=f'{savename}.{extens_}', export_format=extens_) if extens_ else None
+            xy, sigmas = [], []
+
+            points = TiePointCloud.extract(project, frame=frame, track_lengths=False)
+
+            try:
+                for start in range(0, len(points), batch_size):
+
+                    # use valid points only
+                    batch  = points[start:start + batch_size]
+                    batch  = batch[batch['valid']]
+                    covs   = batch['cov']
+
                     # transform point coordinates into output coordinate system
-                    if project.chunk.crs: 
-                        V = M * (point.coord)
-                        V.size = 3
-                        pt_coord = project.chunk.crs.project(V)
-                    
-                    # transform point covariance matrix into output coordinate system
-                    pt_covars = R * point.cov * R.t()
-            
-                    # write into the output file
-                    fwriter.writerow([
-                        '{0:0.5f}'.format(pt_coord[0]), 
-                        '{0:0.5f}'.format(pt_coord[1]), 
-                        '{0:0.5f}'.format(pt_coord[2]),
-                        '{0:0.7f}'.format(math.sqrt(pt_covars[0, 0]) * 1000),
-                        '{0:0.7f}'.format(math.sqrt(pt_covars[1, 1]) * 1000),
-                        '{0:0.7f}'.format(math.sqrt(pt_covars[2, 2]) * 1000),
-                        '{0:0.9f}'.format(pt_covars[0, 0]), 
-                        '{0:0.9f}'.format(pt_covars[0, 1]),
-                        '{0:0.9f}'.format(pt_covars[0, 2]),
-                        '{0:0.9f}'.format(pt_covars[1, 1]), 
-                        '{0:0.9f}'.format(pt_covars[1, 2]),
-                        '{0:0.9f}'.format(pt_covars[2, 2])])
+                    coords = batch['coord'] @ M_[:3, :3].T + M_[:3, 3]
+                    if project.chunk.crs:
+                        coords = _project_points(project.chunk.crs, coords)
+
+                    # transform point covariance matrices into output coordinate system
+                    covs = np.einsum('ij,njk,lk->nil', R_, covs, R_)
+
+                    rows = np.column_stack([coords,
+                                            np.sqrt(covs[:, [0, 1, 2], [0, 1, 2]]) * 1000,
+                                            covs[:, 0, 0], covs[:, 0, 1], covs[:, 0, 2],
+                                            covs[:, 1, 1], covs[:, 1, 2], covs[:, 2, 2]])
+
+                    if writer is not None:
+                        writer.write(rows)
+
+                    # keep only planimetric coordinates and sigmas for gridding
+                    if grid_cell_size:
+                        xy.append(rows[:, :2].copy())
+                        sigmas.append(rows[:, 3:6].astype(np.float32))
+            finally:
+                if writer is not None:
+                    writer.close()
+
+            if grid_cell_size:
+                _write_precision_grids(savename  = savename,
+                                       xy        = np.concatenate(xy) if xy else np.empty((0, 2)),
+                                       sigmas    = np.concatenate(sigmas) if sigmas else np.empty((0, 3), np.float32),
+                                       cell_size = grid_cell_size,
+                                       statistic = grid_statistic,
+                                       crs       = project.chunk.crs)
 
         # process logging and console output       
-        print('Metashape workflow: (OPT) exporting precision map')                
-        project.logging(f'Export: precision map in {extens_.upper()} format')
+        print('Metashape workflow: (OPT) exporting precision map')
+        if extens_:
+            project.logging(f'Export: precision map in {extens_.upper()} format')
+        if grid_cell_size:
+            project.logging(f'Export: precision grids ({grid_statistic}, cell size {grid_cell_size}) in TIFF format')
+
+###############################################################################
+# Array based tie point processing (extraction, precision maps)
+
+def _matrix_to_array(matrix: object, size: int):
+
+    ''' Converts a square Metashape.Matrix into a NumPy array. '''
+
+    return np.array([[matrix[r, c] for c in range(size)] for r in range(size)], dtype=np.float64)
+
+TIE_POINT_DTYPE = np.dtype([('coord',        np.float64, (3,)),
+                            ('cov',          np.float64, (3, 3)),
+                            ('track_id',     np.int64),
+                            ('track_length', np.int32),
+                            ('valid',        np.bool_)])
+
+def _tie_point_validity(frame: object):
+
+    ''' Reads the validity flags of the tie points of a chunk or frame into a boolean array. '''
+
+    tie_points = frame.tie_points
+    points     = tie_points.points if tie_points is not None else []
+
+    return np.fromiter((point.valid for point in points), dtype=np.bool_, count=len(points))
+
+def _tie_point_fingerprint(frame: object, valid: np.ndarray = None):
+
+    '''
+    Returns a hash of the alignment state of a chunk or frame: number of tie points and tracks, the validity
+    flags of the tie points and the camera poses. Any alignment, optimization or removal of tie points
+    (which only invalidates them) changes at least one of them. valid: result of _tie_point_validity,
+    to read the flags only once.
+    '''
+
+    tie_points = frame.tie_points
+    digest     = hashlib.sha1()
+
+    if tie_points is not None:
+        points = tie_points.points
+        valid  = valid if valid is not None else _tie_point_validity(frame)
+        digest.update(repr((len(points), len(tie_points.tracks))).encode())
+        digest.update(np.packbits(valid).tobytes())
+
+    for camera in frame.cameras:
+        transform = camera.transform
+        digest.update(repr((camera.key, None if transform is None else
+                            [transform[r, c] for r in range(4) for c in range(4)])).encode())
+
+    return digest.hexdigest()[:16]
+
+def _track_lengths(frame: object):
+
+    ''' Counts the projections of each tie point track over all aligned cameras of a chunk or frame. '''
+
+    tie_points = frame.tie_points
+    tracks     = len(tie_points.tracks) if tie_points is not None else 0
+    track_ids  = []
+
+    for camera in frame.cameras:
+
+        if tracks == 0 or camera.transform is None: continue
+
+        projections = tie_points.projections[camera]
+        if not projections: continue
+
+        track_ids.append(np.fromiter((projection.track_id for projection in projections),
+                                     dtype=np.int64, count=len(projections)))
+
+    track_ids = np.concatenate(track_ids) if track_ids else np.empty(0, dtype=np.int64)
+
+    return np.bincount(track_ids, minlength=tracks).astype(np.int32)
+
+def _project_points(crs: object, coords: np.ndarray):
+
+    '''
+    Projects geocentric coordinates into a Metashape coordinate system. Map projections are not linear,
+    hence this is done by Metashape point by point.
+    '''
+
+    return np.array([tuple(crs.project(Metashape.Vector(v)))[:3] for v in coords.tolist()],
+                    dtype=np.float64).reshape(-1, 3)
+
+def _write_precision_grids(savename: str, xy: np.ndarray, sigmas: np.ndarray, cell_size: float,
+                           statistic: str = 'mean', crs: object = None):
+
+    ''' Bins sX, sY and sZ (mm) into grids and writes them as GeoTIFFs *savename*_sX.tif, ... '''
+
+    grids, origin    = pda.grid_statistic(xy[:, 0], xy[:, 1], sigmas, cell_size=cell_size, statistic=statistic)
+    epsg, geographic = pda.crs_to_epsg(crs)
+
+    for name, grid in zip(['sX', 'sY', 'sZ'], grids):
+        pda.write_geotiff(f'{savename}_{name}.tif', grid.astype(np.float32),
+                          origin     = origin,
+                          cell_size  = cell_size,
+                          epsg       = epsg,
+                          geographic = geographic)
+
+class _PrecisionMapWriter():
+
+    '''
+    Buffered writer of precision map rows [X, Y, Z, sX, sY, sZ, covXX, covXY, covXZ, covYY, covYZ, covZZ],
+    which receives the rows batch-wise as arrays.
+
+    Formats:
+        txt (or any other text extension): tab separated text with header, buffered and written per batch\n
+        npy: NumPy structured array; rows are streamed into a temporary file and the header is added on close\n
+        parquet: Parquet table with one row group per batch (requires pyarrow)
+    '''
+
+    HEADER  = ['X(m)', 'Y(m)', 'Z(m)',
+               'sX(mm)', 'sY(mm)', 'sZ(mm)',
+               'covXX(m2)', 'covXY(m2)', 'covXZ(m2)',
+               'covYY(m2)', 'covYZ(m2)', 'covZZ(m2)']
+    COLUMNS = ['X', 'Y', 'Z', 'sX_mm', 'sY_mm', 'sZ_mm', 'covXX', 'covXY', 'covXZ', 'covYY', 'covYZ', 'covZZ']
+    FORMAT  = '\t'.join(['%.5f'] * 3 + ['%.7f'] * 3 + ['%.9f'] * 6)
+
+    def __init__(self, path: str, export_format: str = 'txt', buffer_size: int = 4 * 1024**2):
+
+        self.path          = path
+        self.export_format = export_format
+        self.rows          = 0
+
+        if export_format == 'parquet':
+            try:
+                import pyarrow, pyarrow.parquet
+            except ImportError:
+                raise ImportError('Export: precision map in Parquet format requires pyarrow (pip install pyarrow or PyExpress[parquet])')
+
+            self._pa     = pyarrow
+            self._schema = pyarrow.schema([(name, pyarrow.float64()) for name in self.COLUMNS])
+            self._file   = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+        elif export_format == 'npy':
+            self._dtype = np.dtype([(name, np.float64) for name in self.COLUMNS])
+            self._file  = open(f'{path}.tmp', 'wb', buffering=buffer_size)
+
+        else:
+            self._file = open(path, 'w', buffering=buffer_size)
+            self._file.write('\t'.join(self.HEADER) + '\n')
+
+    def write(self, rows: np.ndarray):
+
+        ''' Writes an array of shape (n, 12). '''
+
+        if self.export_format == 'parquet':
+            self._file.write_table(self._pa.Table.from_arrays(list(rows.T), schema=self._schema))
+        elif self.export_format == 'npy':
+            self._file.write(np.ascontiguousarray(rows, dtype=np.float64).tobytes())
+        elif len(rows):
+            np.savetxt(self._file, rows, fmt=self.FORMAT)
+
+        self.rows += len(rows)
+
+    def close(self):
+
+        ''' Closes the file; for NPY the array header is written in front of the streamed rows. '''
+
+        self._file.close()
+
+        if self.export_format == 'npy':
+            with open(self.path, 'wb') as file, open(f'{self.path}.tmp', 'rb') as rows:
+                np.lib.format.write_array_header_1_0(file, {'descr':         np.lib.format.dtype_to_descr(self._dtype),
+                                                            'fortran_order': False,
+                                                            'shape':         (self.rows,)})
+                shutil.copyfileobj(rows, file, length=16 * 1024**2)
+            os.remove(f'{self.path}.tmp')
 
 ###############################################################################
 # Point cloud and tie point cloud
@@ -607,6 +1506,7 @@ class PointCloud():
     
     class Classification():
         
+        @hlp.instrument
         def classify_point_cloud(project:      object,
                                  class_param:  tuple,
                                  save_project: tuple = (False, ''),
@@ -673,6 +1573,7 @@ class PointCloud():
     
             return project
 
+        @hlp.instrument
         def prepare_classification(project:     object, 
                                    config_data: dict):
             
@@ -723,6 +1624,7 @@ class PointCloud():
 
     class Filter():
         
+        @hlp.instrument
         def filter_from_list(project:           object,
                              filter_unclass:    bool  = False,
                              filter_high_noise: bool  = False,
@@ -765,6 +1667,7 @@ class PointCloud():
                 
             return project    
 
+        @hlp.instrument
         def delete_point_class(project:        object,
                                point_class:    object = Metashape.PointClass.Ground,
                                render_preview: tuple  = (False, ''),
@@ -816,6 +1719,136 @@ class PointCloud():
 
 
 class TiePointCloud():
+
+    def extract(project:       object,
+                frame:         object = None,
+                covariances:   bool   = True,
+                track_lengths: bool   = True,
+                cache_dir:     str    = None,
+                refresh:       bool   = False,
+                batch_size:    int    = 250000):
+
+        '''
+        Extracts the tie points of the active chunk or of a frame into a structured NumPy array
+        (TIE_POINT_DTYPE: coord, cov, track_id, track_length, valid) stored as .npy file.
+        coord holds the Euclidean internal coordinates (homogeneous point.coord divided by w).
+        The file is cached per alignment state (number of points and tracks, validity flags, camera poses), so
+        coordinates, covariances and tracks of the Metashape point objects are read only once (the validity
+        flags are compared on every call); all consumers get a read-only memory map.
+        A cached file is reused as long as it contains the requested fields.
+
+        Use:
+            points = ppp.TiePointCloud.extract(project, frame=frame)
+            coords = points['coord'][points['valid']]
+
+        *args:
+            project: your Metashape project\n
+            frame: frame of a multiframe chunk; default: active chunk\n
+            covariances: whether to read the covariance matrices; otherwise cov is NaN\n
+            track_lengths: whether to count the projections per track (one pass over all camera projections);
+                           otherwise track_length is -1\n
+            cache_dir: cache directory; default: *save_dir*/tie_point_cache\n
+            refresh: whether to extract again even if a cached file exists\n
+            batch_size: number of points read and written at once
+
+        Returns:
+            Read-only memory-mapped structured array with one entry per tie point
+        '''
+
+        frame      = frame if frame is not None else project.chunk
+        cache_dir  = cache_dir or os.path.join(project.save_dir, 'tie_point_cache')
+        tie_points = frame.tie_points
+        valid      = _tie_point_validity(frame)
+        prefix     = f'{project.chunk.label}_{frame.key}_{_tie_point_fingerprint(frame, valid)}'
+        fields     = ('c' if covariances else '') + ('t' if track_lengths else '')
+
+        # cached files are named *prefix*_*fields*.npy
+        if not refresh:
+            for path in glob.glob(os.path.join(cache_dir, f'{prefix}_*.npy')):
+                if set(fields) <= set(os.path.basename(path)[len(prefix) + 1:-4]):
+                    return np.load(path, mmap_mode='r')
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+        path    = os.path.join(cache_dir, f'{prefix}_{fields}.npy')
+        points  = tie_points.points if tie_points is not None else []
+        count   = len(points)
+
+        # fill a temporary memory map batch-wise and replace the cache file when complete;
+        # the attributes of a batch of point objects are read in one pass each by np.fromiter
+        temp     = f'{path}.{os.getpid()}.tmp'
+        array    = np.lib.format.open_memmap(temp, mode='w+', dtype=TIE_POINT_DTYPE, shape=(count,))
+        iterator = iter(points)
+        start    = 0
+
+        while start < count:
+
+            batch  = list(itertools.islice(iterator, batch_size))
+            n      = len(batch)
+            width  = len(batch[0].coord)
+            coords = np.fromiter(itertools.chain.from_iterable(point.coord for point in batch),
+                                 dtype=np.float64, count=n * width).reshape(n, width)
+
+            # homogeneous internal coordinates (x, y, z, w) to Euclidean coordinates
+            if width > 3:
+                coords = coords[:, :3] / coords[:, 3:4]
+
+            covs = np.full((n, 3, 3), np.nan)
+
+            if covariances:
+                for i, point in enumerate(batch):
+                    cov     = point.cov
+                    covs[i] = ((cov[0, 0], cov[0, 1], cov[0, 2]),
+                               (cov[1, 0], cov[1, 1], cov[1, 2]),
+                               (cov[2, 0], cov[2, 1], cov[2, 2]))
+
+            part                 = array[start:start + n]
+            part['coord']        = coords
+            part['cov']          = covs
+            part['track_id']     = np.fromiter((point.track_id for point in batch), dtype=np.int64, count=n)
+            part['track_length'] = -1
+            part['valid']        = valid[start:start + n]
+            start               += n
+
+        if track_lengths and count:
+            array['track_length'] = _track_lengths(frame)[array['track_id']]
+
+        array.flush()
+        del array
+        os.replace(temp, path)
+
+        # remove files of previous alignment states of this chunk or frame and files with fewer fields
+        for old in glob.glob(os.path.join(cache_dir, f'{project.chunk.label}_{frame.key}_*.npy')):
+            if old != path and (not old.startswith(os.path.join(cache_dir, prefix)) or
+                                set(os.path.basename(old)[len(prefix) + 1:-4]) <= set(fields)):
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+
+        project.logging(f'Tie points: {count} points of {project.chunk.label} (frame {frame.key}) extracted '
+                        f'to {os.path.basename(path)}')
+
+        return np.load(path, mmap_mode='r')
+
+    def clear_cache(project: object, cache_dir: str = None):
+
+        '''
+        Removes cached tie point extractions of the active chunk, e.g. after tie points were removed.
+
+        *args:
+            project: your Metashape project\n
+            cache_dir: cache directory; default: *save_dir*/tie_point_cache
+        '''
+
+        cache_dir = cache_dir or os.path.join(project.save_dir, 'tie_point_cache')
+
+        for path in glob.glob(os.path.join(cache_dir, f'{project.chunk.label}_*.npy')):
+            try:
+                os.remove(path)
+            except OSError:
+                # still mapped by a consumer (Windows); replaced on the next extraction
+                pass
     
     class Filter():
         
@@ -846,6 +1879,7 @@ class TiePointCloud():
             return f.min_value, f.max_value
 
 
+        @hlp.instrument
         def gradual_selection(project:      object,
                               criterion:    object,
                               threshold:    float,
@@ -885,6 +1919,7 @@ class TiePointCloud():
             return project
 
 
+        @hlp.instrument
         def gradual_removal(project:          object,
                             criterion:        object,
                             threshold:        float,
@@ -917,6 +1952,8 @@ class TiePointCloud():
 
             f.init(project.chunk, criterion=criterion)
             f.removePoints(threshold)
+            
+            TiePointCloud.clear_cache(project)
 
             if save_project[0] == True:
                 project.saveMetashapeProject(active_chunk=save_project[1])
@@ -954,6 +1991,7 @@ class BBox():
         if return_type == list:
             return M
     
+    @hlp.instrument
     def rotate_region(project:      object,
                       input_matrix: object,
                       input_type:   type  = Metashape.Matrix,
@@ -1009,6 +2047,7 @@ class BBox():
         if return_type == tuple:
             return tuple(project.chunk.region.size)
         
+    @hlp.instrument
     def resize_xyz_extent(project:      object,
                           xyz_extent:   tuple,
                           xyz_type:     str   = Metashape.Vector,
@@ -1065,6 +2104,7 @@ class BBox():
         if return_type == tuple:
             return tuple(project.chunk.region.center)        
         
+    @hlp.instrument
     def redefine_center(project:      object,
                         xyz_coord:    tuple,
                         xyz_type:     str   = Metashape.Vector,
@@ -1100,18 +2140,28 @@ class BBox():
             
         return project
 
-    def redefine_auto_multiframe(project:      object,
-                                 reference_ID: int   = 0,
-                                 save_project: tuple = (False, '')):
+    @hlp.instrument
+    def redefine_auto_multiframe(project:         object,
+                                 reference_ID:    int   = 0,
+                                 clip_percentile: float = None,
+                                 valid_only:      bool  = False,
+                                 save_project:    tuple = (False, '')):
         
         '''
         Resizes the bounding box in a multiframe project based on the maximum extent
         in the x, y, or z direction from the different frame tie point clouds.
         The center of the region is moved to match to the center of the image defined by the reference ID.
         
+        Tie point coordinates are taken from TiePointCloud.extract(); the frame extents are computed
+        vectorized. With clip_percentile, the extent is taken from percentiles instead of min/max,
+        so single outliers (e.g. mismatches in the sky or far background) do not inflate the region.
+        
         *args:
             project: your Metashape project\n
             reference_ID: ID of the reference frame\n
+            clip_percentile: percentage of points clipped on each side per axis, e.g. 1 -> 1st to 99th percentile;
+                             None: min/max\n
+            valid_only: whether to ignore invalid (removed) tie points\n
             save_project: (True/False, active_chunk.label)
 
         Returns:
@@ -1125,42 +2175,36 @@ class BBox():
         # resize BBox
         ID = reference_ID
         
-        regionSize   = {'x':[], 'y':[], 'z':[]}
-        regionCenter = {'x':[], 'y':[], 'z':[]}
+        regionSize   = []
+        regionCenter = []
                 
         for j, frame in enumerate(project.chunk.frames):
             
-            for i, p in enumerate(frame.tie_points.points):
-                if i==0: 
-                    a = {'x':[], 'y':[], 'z':[]}
-                
-                a['x'].append(p.coord[0])
-                a['y'].append(p.coord[1])
-                a['z'].append(p.coord[2])
-            
-                if i == len(frame.tie_points.points)-1:
-                    x1 = np.mean([np.min(a['x']),np.max(a['x'])])                    
-                    x2 = np.abs(np.min(a['x']))+np.abs(np.max(a['x']))                    
-                    y1 = np.mean([np.min(a['y']),np.max(a['y'])])                    
-                    y2 = np.abs(np.min(a['y']))+np.abs(np.max(a['y']))                    
-                    z1 = np.mean([np.min(a['z']),np.max(a['z'])])                    
-                    z2 = np.abs(np.diff((np.min(a['z']),np.max(a['z']))))
-                    
-                    regionCenter['x'].append(x1)
-                    regionCenter['y'].append(y1)
-                    regionCenter['z'].append(z1)
-                    
-                    regionSize['x'].append(x2)
-                    regionSize['y'].append(y2)
-                    regionSize['z'].append(z2)
+            points = TiePointCloud.extract(project, frame=frame, covariances=False, track_lengths=False)
+            coords = points['coord'][points['valid']] if valid_only else points['coord']
+            
+            if len(coords) == 0: continue
+            
+            if clip_percentile:
+                lower, upper = np.percentile(coords, [clip_percentile, 100 - clip_percentile], axis=0)
+            else:
+                lower, upper = coords.min(axis=0), coords.max(axis=0)
+            
+            # x, y: extent by absolute bounds; z: height difference
+            size    = np.abs(lower) + np.abs(upper)
+            size[2] = upper[2] - lower[2]
+            
+            regionCenter.append((lower + upper) / 2)
+            regionSize.append(size)
+        
+        regionCenter = np.array(regionCenter)
+        regionSize   = np.max(regionSize, axis=0)
         
-        project.chunk.region.center = Metashape.Vector((regionCenter['x'][ID],
-                                                        regionCenter['y'][ID],
-                                                        regionCenter['z'][ID] + np.max(regionSize['z'])/2))
+        project.chunk.region.center = Metashape.Vector((regionCenter[ID, 0],
+                                                        regionCenter[ID, 1],
+                                                        regionCenter[ID, 2] + regionSize[2]/2))
 
-        project.chunk.region.size   = Metashape.Vector((np.max(regionSize['x'])+np.max(regionSize['x'])/2,
-                                                        np.max(regionSize['y'])+np.max(regionSize['y'])/2,
-                                                        np.max(regionSize['z'])+np.max(regionSize['z'])/2))                    
+        project.chunk.region.size   = Metashape.Vector(tuple(regionSize + regionSize/2))
 
         # save project and redefine the working chunk   
         if save_project[0] == True:
@@ -1174,6 +2218,7 @@ class BBox():
 
 class Reference():
 
+    @hlp.instrument
     def set_marker_manually(project:      object,
                             config_data:  dict,
                             save_project: tuple = (False, '')):
@@ -1199,8 +2244,21 @@ class Reference():
         # manually set and then enable markers + re-open the existing project
         active_chunk = [a.label for a in project.doc.chunks].index(save_project[1])
 
+        # markers can only be set in the GUI; headless runs skip this step ('skip') or stop here
+        if hlp.is_headless():
+            ask = hlp.ask('\nMarkers must be set in the Metashape GUI. Skip adding markers [skip,stop]?: ',
+                          key='set_marker_manually')
+            
+            if ask != 'skip':
+                raise hlp.HeadlessPromptError(f'Headless mode: processing stopped, markers must be set in the '
+                                              f'Metashape GUI (set_marker_manually: {ask}).')
+            
+            print('\n--> No markers were added to your project.')
+            return project
+
         if config_data['metashape']['document']['read_only'] == True:
-            ask = input('\nSaving is disabled in read-only mode. Change to editing mode [y,n]?: ')
+            ask = hlp.ask('\nSaving is disabled in read-only mode. Change to editing mode [y,n]?: ',
+                          key='disable_read_only')
             
             if ask == 'y':
                 config_data['metashape']['document']['read_only'] = False
@@ -1237,6 +2295,7 @@ class Reference():
 
         return project
     
+    @hlp.instrument
     def import_marker_proj(project:      object,
                            coord_system: object,
                            optimize_cam: bool  = False,
@@ -1265,28 +2324,32 @@ class Reference():
         file_type       = os.path.splitext(os.path.basename(project.marker_proj_path))[1].lower()
         
         if file_type == '.csv':
+            import pandas as pd
+
             marker_list  = pd.read_csv(project.marker_proj_path, sep=',', 
                                        on_bad_lines='skip', low_memory=False,
-                                       names=['GCP','IMG','x_proj','y_proj'])
+                                       names=['GCP','IMG','x_proj','y_proj'],
+                                       dtype={'GCP': str, 'IMG': str})
+            
+            # label -> object indexes (first object per label); skip rows of unknown images or without coordinates
+            cameras      = {c.label: c for c in reversed(project.chunk.cameras)}
+            markers      = {m.label: m for m in reversed(project.chunk.markers)}
+            
+            marker_list['x_proj'] = pd.to_numeric(marker_list['x_proj'], errors='coerce')
+            marker_list['y_proj'] = pd.to_numeric(marker_list['y_proj'], errors='coerce')
+            marker_list  = marker_list[marker_list['IMG'].isin(cameras.keys()) & 
+                                       marker_list[['x_proj', 'y_proj']].notna().all(axis=1)]
     
-            for ind, row in marker_list.iterrows():            
-                GCPLabel = row['GCP']            
-                camLabel = row['IMG']
-                x, y     = row['x_proj'], row['y_proj']
-                if not camLabel in [c.label for c in project.chunk.cameras]:
-                    continue
-                if GCPLabel in [m.label for m in project.chunk.markers]:
-                    markerIndex   = [a.label for a in project.chunk.markers].index(GCPLabel)
-                    _marker       = project.chunk.markers[markerIndex]
-                if not GCPLabel in [m.label for m in project.chunk.markers]:
+            # add projections marker by marker; new markers are created in order of their first occurrence
+            for GCPLabel, rows in marker_list.groupby('GCP', sort=False):
+                _marker = markers.get(GCPLabel)
+                if _marker is None:
                     _marker       = project.chunk.addMarker()
                     _marker.label = GCPLabel
-                if camLabel in [c.label for c in project.chunk.cameras]:
-                    camIndex      = [a.label for a in project.chunk.cameras].index(camLabel)
-                    camera        = project.chunk.cameras[camIndex]
-                    _pixelCoords  = Metashape.Marker.Projection(Metashape.Vector([x,y]), True)
-                    _marker.projections[camera]        = _pixelCoords
-                    _marker.projections[camera].pinned = True  
+                    markers[GCPLabel] = _marker
+                    
+                for camLabel, x, y in zip(rows['IMG'].tolist(), rows['x_proj'].tolist(), rows['y_proj'].tolist()):
+                    _marker.projections[cameras[camLabel]] = Metashape.Marker.Projection(Metashape.Vector([x,y]), True)
         
         if file_type == '.xml':
             project.chunk.importMarkers(path=project.marker_proj_path)
@@ -1306,6 +2369,7 @@ class Reference():
         
         return project
 
+    @hlp.instrument
     def import_marker_coord(project:      object,
                             coord_system: object,
                             optimize_cam: bool  = False,
@@ -1357,6 +2421,7 @@ class Reference():
         
         return project
 
+    @hlp.instrument
     def add_scalebar(project:      object,
                      distance:     float,
                      accuracy:     float,
@@ -1408,6 +2473,7 @@ class Reference():
             
         return project
 
+    @hlp.instrument
     def set_reference_param(project:      object,
                             config_data:  dict,
                             optimize_cam: bool  = False,
@@ -1483,6 +2549,7 @@ class Reference():
            
         return project
 
+    @hlp.instrument
     def set_camera_param(project:      object,
                          config_data:  dict,
                          optimize_cam: bool  = False,
@@ -1525,6 +2592,7 @@ class Reference():
            
         return project
 
+    @hlp.instrument
     def optimize_cameras(project:          object,
                          update_transform: bool  = True,
                          save_project:     tuple = (False, ''),
@@ -1570,6 +2638,7 @@ class Reference():
 
         return project        
 
+    @hlp.instrument
     def update_transform(project:      object,
                          save_project: tuple = (False, '')):
 
@@ -1600,8 +2669,48 @@ class Reference():
 ###############################################################################
 # CAMERA CALIBRATION
 
+def _photo_meta(cameras: list, keys: list):
+
+    ''' First value of the given image metadata keys (e.g. 'Exif/Model') found in the photos of the cameras. '''
+
+    for camera in cameras:
+        meta = getattr(camera.photo, 'meta', None) or {}
+        for key in keys:
+            try:
+                value = meta[key]
+            except (KeyError, TypeError):
+                continue
+            if value:
+                return str(value).strip()
+
+    return None
+
+def _sensor_key(sensor: object, cameras: list):
+
+    ''' Calibration cache key of a sensor from the image metadata of its cameras, see adm.sensor_key. '''
+
+    make  = _photo_meta(cameras, ['Exif/Make'])
+    model = _photo_meta(cameras, ['Exif/Model'])
+
+    return adm.sensor_key(model        = ' '.join(item for item in [make, model] if item) or sensor.label,
+                          serial       = _photo_meta(cameras, ['Exif/BodySerialNumber', 'Exif/SerialNumber']),
+                          lens         = _photo_meta(cameras, ['Exif/LensModel', 'Exif/LensSpecification']),
+                          sensor       = sensor.label,
+                          width        = sensor.width,
+                          height       = sensor.height,
+                          focal_length = sensor.focal_length)
+
+def _calibration_cache(project: object, cache_dir: str = None):
+
+    ''' Calibration cache of the project configuration (metashape.calibration.cache) or of cache_dir; None if unset. '''
+
+    cache_dir = cache_dir or getattr(getattr(project.config.metashape, 'calibration', None), 'cache', None)
+
+    return adm.CalibrationCache(cache_dir) if cache_dir else None
+
 class Calibration():
-    
+
+    @hlp.instrument
     def import_from_file(project:      object,
                          save_project: tuple = (False, ''), 
                          **kwargs):
@@ -1639,6 +2748,7 @@ class Calibration():
 
         return project
 
+    @hlp.instrument
     def set_sensor_param_stereo(project:      object,
                                 config_data:  dict,
                                 save_project: tuple = (False, '')):
@@ -1729,4 +2839,143 @@ class Calibration():
         if save_project[0] == True:
            project.saveMetashapeProject(active_chunk=save_project[1])
 
-        return project
\ No newline at end of file
+        return project
+
+    @hlp.instrument
+    def warm_start(project:      object,
+                   cache_dir:    str   = None,
+                   save_project: tuple = (False, '')):
+
+        '''
+        Seeds the initial calibration (sensor.user_calib) of all sensors with the calibration optimized in a previous
+        project with the same camera model, serial number and lens (see adm.CalibrationCache). The calibration
+        is not fixed and is refined by alignCameras/optimize_cameras. Sensors with a fixed calibration, e.g. from
+        set_sensor_param_stereo or import_from_file, are not changed. Call it after adding the photos.
+
+        *args:
+            project: your Metashape project\n
+            cache_dir: calibration cache directory; default: metashape.calibration.cache of the configuration\n
+            save_project: (True/False, active_chunk.label)
+
+        Returns:
+            Updated Metashape project
+        '''
+
+        cache = _calibration_cache(project, cache_dir)
+
+        project.calibration_warm_start = dict()
+
+        if cache is None:
+            return project
+
+        for sensor in project.chunk.sensors:
+            cameras = [camera for camera in project.chunk.cameras if camera.sensor == sensor]
+            key     = _sensor_key(sensor, cameras)
+            path    = cache.lookup(key)
+
+            if path is None or sensor.fixed or sensor.fixed_calibration:
+                continue
+
+            cal               = Metashape.Calibration()
+            cal.load(path)
+            sensor.user_calib = cal
+
+            project.calibration_warm_start[adm.key_id(key)] = path
+
+        # process logging and console output
+        print(f'Metashape workflow: (OPT) warm start of {len(project.calibration_warm_start)}/{len(project.chunk.sensors)} '
+              f'sensor calibrations from cache')
+
+        seeded = '\n'.join(f'    {item}' for item in project.calibration_warm_start) or '    none'
+        project.logging(f'Calibration: initial sensor calibration from cache {cache.cache_dir}\n{seeded}')
+
+        # save project and redefine the working chunk
+        if save_project[0] == True:
+           project.saveMetashapeProject(active_chunk=save_project[1])
+
+        return project
+
+    @hlp.instrument
+    def save_to_cache(project:     object,
+                      cache_dir:   str   = None,
+                      min_aligned: float = None):
+
+        '''
+        Stores the optimized calibration (sensor.calibration) of all sensors in the calibration cache after a
+        successful alignment, records the alignCameras/optimize_cameras times of the current run and reports
+        the time saved per camera by warm started runs (see Calibration.warm_start) compared to cold started runs.
+        Call it after the last camera optimization (alignCameras, Reference.optimize_cameras), as the example
+        workflows do; the calibration is not changed by the later processing steps.
+
+        *args:
+            project: your Metashape project\n
+            cache_dir: calibration cache directory; default: metashape.calibration.cache of the configuration\n
+            min_aligned: minimum fraction of aligned cameras of a sensor to store its calibration;
+                         default: metashape.calibration.min_aligned of the configuration or 0.9
+
+        Returns:
+            Updated Metashape project
+        '''
+
+        cache = _calibration_cache(project, cache_dir)
+
+        if cache is None:
+            return project
+
+        min_aligned = min_aligned if min_aligned is not None else \
+                      getattr(getattr(project.config.metashape, 'calibration', None), 'min_aligned', None) or 0.9
+
+        # execution times of the current run (alignment/optimization of the whole chunk)
+        record_file = os.path.join(project.export_dir, hlp.RUN_RECORD_FILE)
+        records     = hlp.load_run_records(record_file) if os.path.exists(record_file) else []
+        timings     = dict()
+
+        for record in records:
+            if (record['run_id'] == hlp.run_id() and record['project_ID'] == project.project_ID and
+                record['status'] == 'done' and record['stage'] in adm.CALIBRATION_STAGES):
+                timings[record['stage']] = timings.get(record['stage'], 0) + record['wall_s']
+
+        warm_start = getattr(project, 'calibration_warm_start', dict())
+        stored     = []
+        report     = []
+
+        for sensor in project.chunk.sensors:
+            cameras = [camera for camera in project.chunk.cameras if camera.sensor == sensor]
+            key     = _sensor_key(sensor, cameras)
+
+            if not cameras:
+                continue
+
+            aligned = sum(camera.transform is not None for camera in cameras) / len(cameras)
+
+            if timings:
+                cache.add_run(key        = key,
+                              project_ID = project.project_ID,
+                              run_id     = hlp.run_id(),
+                              warm_start = adm.key_id(key) in warm_start,
+                              cameras    = len(project.chunk.cameras),
+                              timings    = timings)
+
+            if sensor.calibration is not None and aligned >= min_aligned:
+                cache.store(key, sensor.calibration.save, project_ID=project.project_ID, aligned=round(aligned, 4))
+                stored.append(adm.key_id(key))
+
+            for stage, saving in cache.savings(key).items():
+                if saving['cold_s_per_camera'] is None or saving['warm_s_per_camera'] is None:
+                    continue
+                report.append(f"    {adm.key_id(key)} - {stage}: {saving['warm_s_per_camera']:.3f} s/camera warm "
+                              f"({saving['warm_runs']} runs) vs. {saving['cold_s_per_camera']:.3f} s/camera cold "
+                              f"({saving['cold_runs']} runs), {saving['saved_percent']:.1f} % saved")
+
+        # process logging and console output
+        print(f'Metashape workflow: (OPT) storing {len(stored)}/{len(project.chunk.sensors)} sensor calibrations in cache')
+
+        stored_string = '\n'.join(f'    {item}' for item in stored) or '    none'
+        report_string = '\n'.join(report) or '    no warm and cold started runs to compare yet'
+        project.logging(f'Calibration: optimized sensor calibration stored in cache {cache.cache_dir}\n{stored_string}\n'
+                        f'Calibration: alignment/optimization time of warm started runs\n{report_string}')
+
+        for line in report:
+            print(f'Metashape workflow: (OPT) {line.strip()}')
+
+        return project
@@ -0,0 +1,151 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+try:
+    import os, copy, time, shutil
+    import multiprocessing         as mp
+    import Metashape
+    import PyExpress.UtilityTools  as hlp
+    from   concurrent.futures      import ProcessPoolExecutor
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
+__all__ = ['Parallel']
+
+
+###############################################################################
+# Parallel processing of chunks in worker processes
+
+def _process_chunk_copy(project_class: type,
+                        config_data:   dict,
+                        project_dir:   str,
+                        image_dir:     str,
+                        config_name:   str,
+                        chunk_index:   int,
+                        part_path:     str,
+                        chunk_func:    object,
+                        chunk_param:   object):
+
+    '''
+    Worker process: opens the saved main document read-only, stores the designated chunk
+    as a separate document, processes it with the chunk function and saves it.
+
+    Returns:
+        Path of the processed single-chunk document
+    '''
+
+    # the read-only prompt of the project class must not block the worker
+    os.environ['PYEXPRESS_HEADLESS']                = '1'
+    os.environ['PYEXPRESS_ANSWER_DISABLE_READ_ONLY'] = 'n'
+
+    # log lines go into the log files of the main process, which alone rotates them
+    os.environ[hlp.WORKER_LOG_ENV] = '1'
+
+    config_data = copy.deepcopy(config_data)
+    config_data['input']['general']['new_project']      = False
+    config_data['metashape']['document']['read_only']   = True
+    config_data['metashape']['document']['ignore_lock'] = True
+    config_data['metashape']['chunk']['ID_active']      = chunk_index
+
+    project = project_class(config_data = config_data,
+                            project_dir = project_dir,
+                            image_dir   = image_dir,
+                            config_name = config_name)
+
+    # continue with an own document containing the designated chunk only
+    project.doc.save(path=part_path, chunks=[project.chunk])
+    project.doc.open(path=part_path, read_only=False, ignore_lock=True)
+
+    project.chunk       = project.doc.chunks[0]
+    project.chunk_ID    = 0
+    project.read_only   = False
+    project._save_count = 1
+
+    print(f'\nActive chunk for next MS workflow steps: {project.chunk.label} (worker {os.getpid()})\n')
+
+    project = chunk_func(project, config_data, chunk_param)
+    project.doc.save()
+    project.doc.clear()
+
+    return part_path
+
+
+class Parallel():
+
+    @hlp.instrument
+    def process_chunks(project:      object,
+                       config_data:  dict,
+                       chunk_func:   object,
+                       chunk_params: list,
+                       workers:      int = 2):
+
+        '''
+        Processes the chunks from the active chunk ID onwards (e.g. point cloud classification variants)
+        in worker processes. Each worker opens its own copy of the saved document, applies the chunk
+        function to one chunk and saves it as a separate document. Afterwards, the processed chunks
+        replace the original chunks in the main project, keeping the chunk order.
+
+        *args:
+            project: your Metashape project\n
+            config_data: content of the project configuration file\n
+            chunk_func: module level function (project, config_data, chunk_param) -> project,
+                        executing the workflow steps for a single chunk\n
+            chunk_params: one parameter per chunk, passed to chunk_func; e.g. classification parameters\n
+            workers: number of worker processes
+
+        Returns:
+            Updated Metashape project
+        '''
+
+        # time tracking
+        start_time = time.time()
+
+        chunks      = project.doc.chunks[project.chunk_ID:]
+        labels      = [chunk.label for chunk in chunks]
+        first_index = project.chunk_ID
+
+        if len(chunk_params) != len(chunks):
+            raise ValueError(f'{len(chunk_params)} chunk parameters given for {len(chunks)} chunks.')
+
+        # process logging and console output
+        print(f'Metashape workflow: (OPT) processing {len(chunks)} chunks with {workers} worker processes')
+        project.logging(f'Parallel chunk processing: {labels} with {workers} workers')
+
+        # workers start from the saved state of the main document
+        project.saveMetashapeProject(active_chunk=project.chunk.label)
+
+        part_dir   = os.path.join(project.save_dir, f'{project.project_ID}_parallel')
+        os.makedirs(part_dir, exist_ok=True)
+        part_paths = [os.path.join(part_dir, f'chunk{first_index + i}.psx') for i in range(len(chunks))]
+
+        ctx = mp.get_context('spawn')
+
+        # worker records are written under the run ID of the main process
+        with hlp.environment_variables(PYEXPRESS_RUN_ID=hlp.run_id()), \
+             ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as executor:
+            futures = [executor.submit(_process_chunk_copy,
+                                       type(project), config_data,
+                                       project.project_dir, project.image_dir, project.config_name,
+                                       first_index + i, part_paths[i],
+                                       chunk_func, chunk_params[i])
+                       for i in range(len(chunks))]
+
+            # re-raises the first worker exception; the main document stays untouched in that case
+            results = [future.result() for future in futures]
+
+        # merge: replace the original chunks by their processed copies in the same order
+        project.doc.remove(chunks)
+
+        for part_path in results:
+            project.doc.append(path=part_path)
+
+        # chunk functions may rename their chunk
+        project.chunk = project.doc.chunks[first_index]
+        project.saveMetashapeProject(active_chunk=project.chunk.label)
+
+        shutil.rmtree(part_dir, ignore_errors=True)
+
+        project.logging(f'Parallel chunk processing: merged {labels} into main project')
+        hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
+
+        return project
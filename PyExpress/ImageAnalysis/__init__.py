@@ -1,12 +1,17 @@
 # SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from .drone_project  import DroneProject
-from .stereo_project import StereoProject
-from ._project       import _MetashapeProject
+from PyExpress import _lazy
 
-from .MetashapeMethods.main_workflow    import *
-from .MetashapeMethods.optional_methods import *
-from .MetashapeInitialCheck.checkup     import *
-
-from PyExpress.WorkflowExamples.UserSettings.pointcloud_classification_parameters import Parameters as classPM
\ No newline at end of file
+__getattr__, __dir__, __all__ = _lazy.attach(__name__,
+                                             submodules = ['MetashapeMethods', 'MetashapeInitialCheck'],
+                                             attributes = ['drone_project', 'stereo_project', '_project',
+                                                           'MetashapeMethods.main_workflow',
+                                                           'MetashapeMethods.optional_methods',
+                                                           'MetashapeMethods.parallel_methods',
+                                                           'MetashapeInitialCheck.checkup'],
+                                             aliases    = {'classPM': ('PyExpress.WorkflowExamples.UserSettings.pointcloud_classification_parameters',
+                                                                       'Parameters')},
+                                             legacy     = ['MetashapeMethods.main_workflow',
+                                                           'MetashapeMethods.optional_methods',
+                                                           'MetashapeInitialCheck.checkup'])
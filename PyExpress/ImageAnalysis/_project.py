@@ -9,6 +9,7 @@ try:
     import os
     import re
     import sys
+    import json
     import shutil
     import time
     import Metashape
@@ -16,6 +17,8 @@ try:
 except Exception as e:
     print("Some modules are missing {}".format(e))
 
+__all__ = ['_MetashapeProject']
+
 class _MetashapeProject(ABC):
     def __init__(self, 
                  config_data:        dict,
@@ -25,6 +28,9 @@ class _MetashapeProject(ABC):
 
         # config to class object
         self._config_to_object(config_data=config_data)
+
+        # headless mode: answer prompts from the configuration file or fail fast
+        hlp.configure_headless(config_data=config_data)
         
         # check Metashape program version
         # enable/disable GPU memory support; as well as CPU support for GPU usage
@@ -54,6 +60,8 @@ class _MetashapeProject(ABC):
 
         # define some empty parameter types to fill with content later
         self.extensive_logging   = self.config.metashape.document.logging
+        self.log_format          = getattr(self.config.metashape.document, 'log_format', 'txt')
+        self._log_options        = {'max_bytes': int(getattr(self.config.metashape.document, 'log_max_MB', 50) * 1024**2)}
         self.vegetation_index    = 'B1'
         self.image_format_raw    = self.config.input.image.format.raw
         self.image_format_conv   = ''
@@ -77,8 +85,8 @@ class _MetashapeProject(ABC):
             self.logging(f'Created projectID: {self.project_ID}')
 
         elif self.project_status == 'existing':
-            self.export_dir = f'{self.export_dir}\\{self.project_ID}'
-            self.log_dir    = f'{self.log_dir}\\{self.project_ID}'
+            self.export_dir = os.path.join(self.export_dir, self.project_ID)
+            self.log_dir    = os.path.join(self.log_dir, self.project_ID)
 
             self.doc         = Metashape.Document()
             self.read_only   = self.config.metashape.document.read_only
@@ -87,7 +95,8 @@ class _MetashapeProject(ABC):
             new_chunk_label  = self.config.metashape.chunk.label
                 
             if self.read_only == True:
-                ask = input('Saving is disabled in read only mode. Change to editing mode [y,n]?: ')
+                ask = hlp.ask('Saving is disabled in read only mode. Change to editing mode [y,n]?: ',
+                              key='disable_read_only')
                 if ask == 'y': self.read_only = False
             try:
                 path = os.path.join(self.save_dir, self.project_ID+'.psx')
@@ -118,6 +127,8 @@ class _MetashapeProject(ABC):
         
         '''
         Generates a terminal log and saves it with an additional timestamp in the project log file.
+        The line is handed to the buffered process logger, which writes, rotates and compresses
+        the log file on a background thread (see hlp.ProcessLogger).
 
         *args:
             msg: message to be logged in the protocol file
@@ -125,13 +136,20 @@ class _MetashapeProject(ABC):
 
         if self.extensive_logging == False:
             return
-        
-        if not os.path.exists(self.log_dir):
-            os.mkdir(self.log_dir)
 
-        logfile = open(self.log_dir + "/process_log.txt", "a")
-        logfile.write(time.strftime("%d.%m.%Y %H:%M:%S ") + msg + "\n")
-        logfile.close()
+        timestamp = time.localtime()
+
+        if self.log_format == 'json':
+            path = os.path.join(self.log_dir, 'process_log.jsonl')
+            line = json.dumps({'time':       time.strftime('%Y-%m-%dT%H:%M:%S', timestamp),
+                               'project_ID': getattr(self, 'project_ID', None),
+                               'chunk':      getattr(getattr(self, 'chunk', None), 'label', None),
+                               'msg':        msg})
+        else:
+            path = self.log_dir + "/process_log.txt"
+            line = time.strftime("%d.%m.%Y %H:%M:%S ", timestamp) + msg
+
+        hlp.get_process_logger(**self._log_options).write(path=path, line=line)
 
 
     # INITIAL DIRECTORY CHECK AND CREATION
@@ -151,7 +169,7 @@ class _MetashapeProject(ABC):
         if os.path.dirname(path) == self.export_dir:
             dirname         = os.path.dirname(path)
             basename        = os.path.basename(path).split('.')[0]            
-            makeDir         = f'{dirname}\\{basename}'
+            makeDir         = os.path.join(dirname, basename)
             self.export_dir = makeDir
             self.log_dir    = makeDir
         
@@ -200,11 +218,11 @@ class _MetashapeProject(ABC):
         '''
 
         if path == self.save_dir:
-            _path  = f'{path}\\{projectID}.psx'
+            _path  = os.path.join(path, f'{projectID}.psx')
             exists = self._create_directory(_path)
         
         if path == self.export_dir:
-            _path  = f'{path}\\{projectID}'
+            _path  = os.path.join(path, projectID)
             exists = self._create_directory(_path)
 
         if exists == True:
@@ -308,6 +326,7 @@ class _MetashapeProject(ABC):
 
     # SAVE METASHAPE DOCUMENT
 
+    @hlp.instrument
     def saveMetashapeProject(self, active_chunk: str='unclassified'):
         
         '''
@@ -322,12 +341,12 @@ class _MetashapeProject(ABC):
 
         if self._save_count==0:
             if hasattr(self, 'project_ID'):
-                self.doc.save(f'{self.save_dir}\\{self.project_ID}.psx')
+                self.doc.save(os.path.join(self.save_dir, f'{self.project_ID}.psx'))
                 self.chunk = self.doc.chunks[active_chunk]
 
             elif not hasattr(self, 'project_ID'):
                 timestring = time.strftime('%d.%m.%Y_%Hhh%Mmm', time.localtime(time.time()))
-                self.doc.save(f'{self.save_dir}\\{timestring}.psx')
+                self.doc.save(os.path.join(self.save_dir, f'{timestring}.psx'))
                 self.chunk = self.doc.chunks[active_chunk]
 
             self._save_count += 1
@@ -361,7 +380,7 @@ class _MetashapeProject(ABC):
         for (dirpath, dirnames, filenames) in os.walk(image_dir):
             for filename in filenames:
                 if filename.lower().endswith(file_format.lower()):
-                    listOfFiles.append(os.path.normpath(f'{image_dir}\\{filename}'))
+                    listOfFiles.append(os.path.normpath(os.path.join(image_dir, filename)))
 
         if not listOfFiles:
             self.logging(f'ERROR: No {file_format} files found in image_dir directory.')
@@ -372,6 +391,7 @@ class _MetashapeProject(ABC):
 
     # ADD PHOTOS TO ACTIVE PROJECT CHUNK
     
+    @hlp.instrument
     def addPhotosToChunk(self,
                          image_dir:    str, 
                          file_format:  str,
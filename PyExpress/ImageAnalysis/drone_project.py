@@ -1,8 +1,19 @@
 # SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
 # SPDX-License-Identifier: GPL-3.0-or-later
 
+import PyExpress.UtilityTools  as hlp
+import PyExpress.ImageAnalysis as ppp
+import PyExpress.DataAnalysis  as pda
+
+try:
+    import Metashape
+except Exception as e:
+    print("Some modules are missing {}".format(e))
+
 from ._project import _MetashapeProject
 
+__all__ = ['DroneProject']
+
 class DroneProject(_MetashapeProject):
 
     def __init__(self,
@@ -83,6 +94,47 @@ class DroneProject(_MetashapeProject):
         self.chunk.raster_transform.palette = index_palette
 
 
+    def calibrateVegetationIndexRange(self,
+                                      percentiles:     tuple = (2, 98),
+                                      raster_paths:    list  = None,
+                                      rescale_palette: bool  = True):
+
+        '''
+        Sets the raster transformation range from percentiles of the exported index values, as an alternative
+        to Metashape's calibrateRange(). The percentiles are estimated from a fixed-memory histogram built in
+        one streaming pass over the raster tiles, so the raster is never loaded into memory completely.
+        
+        *args:
+            percentiles: (lower, upper) percentiles of the index values defining the range, e.g. (2, 98)\n
+            raster_paths: exported value rasters of the raster transformation (Metashape.RasterTransformValue);
+                          default: exported as ortho_transform_val, i.e. an additional render of the orthomosaic\n
+            rescale_palette: whether to rescale the palette stops onto the calibrated range
+        
+        Returns:
+            (lowest index value, highest index value)
+        '''
+
+        if raster_paths is None:
+            raster_paths = ppp.Export.raster(project          = self,
+                                             export_type      = 'ortho_transform_val',
+                                             raster_transform = Metashape.RasterTransformValue,
+                                             save_alpha       = False,
+                                             source_data      = Metashape.DataSource.OrthomosaicData,
+                                             image_format     = Metashape.ImageFormatTIFF)
+
+        index_range = tuple(float(value) for value in pda.raster_percentiles(raster_paths, percentiles=percentiles))
+
+        self._setVegetationIndexRange(index_range=index_range, auto_range=False)
+
+        if rescale_palette == True:
+            self._setVegetationIndexPalette(index_palette=pda.rescale_palette(dict(self.chunk.raster_transform.palette), index_range))
+
+        super().logging(f'Raster transformation range calibrated from percentiles {list(percentiles)}: {index_range}')
+
+        return index_range
+
+
+    @hlp.instrument
     def applyVegetationIndex(self,
                              config_data:  dict,
                              save_project: tuple = (False, '')):
@@ -100,6 +152,8 @@ class DroneProject(_MetashapeProject):
         
         col_palette = {a: tuple(b) for a,b in config_data['metashape']['vegetation']['palette'].items()}
         auto_range  = config_data['metashape']['vegetation']['rangeAuto']
+        percentiles = config_data['metashape']['vegetation'].get('rangePercentiles')
+        exports     = [item.lower() for item in (config_data['metashape'].get('export') or {}).get('type') or []]
         
         if self.drone_IR == True:
             item_list   = config_data['metashape']['vegetation']['indexIR']
@@ -116,7 +170,12 @@ class DroneProject(_MetashapeProject):
         self.chunk.raster_transform.formula = self.vegetation_index
         self.chunk.raster_transform.enabled = True        
         
-        if auto_range == True:
+        # the ortho_trafo export calibrates the range from its value rasters, so the orthomosaic is rendered only once
+        if auto_range == True and percentiles and 'ortho_trafo' in exports:
+            super().logging(f'Raster transformation range calibrated from percentiles {list(percentiles)} at the ortho_trafo export')
+        elif auto_range == True and percentiles:
+            self.calibrateVegetationIndexRange(percentiles=tuple(percentiles))
+        elif auto_range == True:
             self.chunk.raster_transform.calibrateRange()
         
         super().logging(f'Raster transformation index (vegetation monitoring): {self.vegetation_index}')
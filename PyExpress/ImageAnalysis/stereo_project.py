@@ -3,6 +3,8 @@
 
 from ._project import _MetashapeProject
 
+__all__ = ['StereoProject']
+
 class StereoProject(_MetashapeProject):
 
     def __init__(self, 
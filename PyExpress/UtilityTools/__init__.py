@@ -1,4 +1,11 @@
 # SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from .helper_tools import *
\ No newline at end of file
+from PyExpress import _lazy
+
+__getattr__, __dir__, __all__ = _lazy.attach(__name__,
+                                             submodules = ['helper_tools', 'batch_scheduler', 'headless',
+                                                           'instrumentation', 'process_logger', 'progress'],
+                                             attributes = ['helper_tools', 'batch_scheduler', 'headless',
+                                                           'instrumentation', 'process_logger', 'progress'],
+                                             legacy     = ['helper_tools'])
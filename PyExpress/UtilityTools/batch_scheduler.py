@@ -0,0 +1,505 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""
+Batch scheduler for processing multiple campaign configuration files with
+worker processes. Jobs are kept in a persistent SQLite queue, so an interrupted
+batch can be resumed and failed campaigns can be retried.
+
+Use:
+    scheduler = BatchScheduler(queue_path = './MSprojects/batch_queue.db',
+                               workflow   = 'M3T_workflow',
+                               workers    = 2)
+    scheduler.add_configs(source='./configs')
+    scheduler.run()
+"""
+
+import os, sys, time, glob, sqlite3, argparse, traceback, importlib
+import multiprocessing          as mp
+import PyExpress.UtilityTools   as hlp
+
+__all__ = ['JobQueue', 'run_campaign', 'BatchScheduler']
+
+###############################################################################
+# persistent job queue
+
+class JobQueue():
+
+    '''
+    SQLite-based job queue. Each job refers to one campaign configuration file
+    and the name of the workflow used to process it.
+
+    Job states: 'pending', 'running', 'done', 'failed'
+    '''
+
+    def __init__(self, queue_path: str):
+
+        '''
+        Opens or creates the job queue database.
+
+        *args:
+            queue_path: full path to the SQLite database file
+        '''
+
+        queue_dir = os.path.dirname(os.path.abspath(queue_path))
+        os.makedirs(queue_dir, exist_ok=True)
+
+        self.queue_path = queue_path
+        self.connection = sqlite3.connect(queue_path, timeout=30)
+        self.connection.row_factory = sqlite3.Row
+
+        with self.connection:
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+                    config_path TEXT    NOT NULL,
+                    workflow    TEXT    NOT NULL,
+                    status      TEXT    NOT NULL DEFAULT 'pending',
+                    attempts    INTEGER NOT NULL DEFAULT 0,
+                    max_retries INTEGER NOT NULL DEFAULT 0,
+                    worker      INTEGER,
+                    log_path    TEXT,
+                    error       TEXT,
+                    created     REAL,
+                    started     REAL,
+                    finished    REAL,
+                    UNIQUE(config_path, workflow))''')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)')
+
+    def add_job(self, config_path: str, workflow: str, max_retries: int = 1):
+
+        '''
+        Adds a campaign configuration to the queue. Configurations which are
+        already queued for the same workflow are not added twice.
+
+        *args:
+            config_path: full path to the project configuration file\n
+            workflow: name of the workflow function, e.g. 'M3T_workflow'\n
+            max_retries: number of retries after a failed attempt
+
+        Returns:
+            True if the job was added, False if it already exists
+        '''
+
+        config_path = os.path.abspath(config_path)
+
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT OR IGNORE INTO jobs (config_path, workflow, max_retries, created) VALUES (?, ?, ?, ?)',
+                (config_path, workflow, max_retries, time.time()))
+
+        return cursor.rowcount == 1
+
+    def claim_next(self, worker: int):
+
+        '''
+        Marks the oldest pending job as running and returns it.
+
+        *args:
+            worker: ID of the worker slot executing the job
+
+        Returns:
+            sqlite3.Row of the claimed job or None if the queue is empty
+        '''
+
+        with self.connection:
+            job = self.connection.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+
+            if job is None:
+                return None
+
+            self.connection.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "started = ?, finished = NULL, error = NULL WHERE id = ?",
+                (worker, time.time(), job['id']))
+
+        return self.get_job(job['id'])
+
+    def get_job(self, job_id: int):
+
+        ''' Returns a single job by its ID. '''
+
+        return self.connection.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+
+    def set_log_path(self, job_id: int, log_path: str):
+
+        ''' Stores the log file path of the current job attempt. '''
+
+        with self.connection:
+            self.connection.execute('UPDATE jobs SET log_path = ? WHERE id = ?', (log_path, job_id))
+
+    def mark_done(self, job_id: int):
+
+        ''' Marks a job as successfully finished. '''
+
+        with self.connection:
+            self.connection.execute(
+                "UPDATE jobs SET status = 'done', finished = ? WHERE id = ?", (time.time(), job_id))
+
+    def mark_failed(self, job_id: int, error: str):
+
+        '''
+        Marks a job as failed. If retries are left, the job is queued again.
+
+        *args:
+            job_id: ID of the failed job\n
+            error: short error description
+        '''
+
+        job    = self.get_job(job_id)
+        status = 'pending' if job['attempts'] <= job['max_retries'] else 'failed'
+
+        with self.connection:
+            self.connection.execute(
+                'UPDATE jobs SET status = ?, finished = ?, error = ? WHERE id = ?',
+                (status, time.time(), error, job_id))
+
+    def reset_stale(self):
+
+        '''
+        Requeues jobs left in running state by an interrupted scheduler.
+        The interrupted attempt is not counted.
+        '''
+
+        with self.connection:
+            self.connection.execute(
+                "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0) WHERE status = 'running'")
+
+    def retry_failed(self, max_retries: int = 1):
+
+        '''
+        Requeues all failed jobs with a new retry budget.
+
+        *args:
+            max_retries: number of additional retries per failed job
+        '''
+
+        with self.connection:
+            self.connection.execute(
+                "UPDATE jobs SET status = 'pending', max_retries = attempts + ? - 1 WHERE status = 'failed'",
+                (max_retries,))
+
+    def summary(self):
+
+        '''
+        Returns:
+            Dictionary with the number of jobs per state
+        '''
+
+        rows = self.connection.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall()
+
+        return {status: count for status, count in rows}
+
+    def list_jobs(self, status: str = None):
+
+        '''
+        Returns all jobs, optionally filtered by state.
+
+        *args:
+            status: ['pending', 'running', 'done', 'failed'] or None for all jobs
+        '''
+
+        if status is None:
+            return self.connection.execute('SELECT * FROM jobs ORDER BY id').fetchall()
+
+        return self.connection.execute('SELECT * FROM jobs WHERE status = ? ORDER BY id', (status,)).fetchall()
+
+    def close(self):
+
+        self.connection.close()
+
+
+###############################################################################
+# job execution inside a worker process
+
+_THREAD_ENV_VARS = ['OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS']
+
+def _budget_threads(threads: int):
+
+    '''
+    Limits the number of CPU threads Metashape uses in the current worker process.
+    Thread limits of numerical libraries are inherited from the scheduler environment.
+
+    *args:
+        threads: number of CPU threads for this worker
+    '''
+
+    try:
+        import Metashape
+        # Metashape does not offer a thread count, but reserves inactive cores
+        Metashape.app.cpu_cores_inactive = max((os.cpu_count() or 1) - threads, 0)
+    except Exception as e:
+        print(f'Batch processing:       CPU budget not applied to Metashape ({e})')
+
+def _resolve_workflow(workflow: str):
+
+    '''
+    Returns the workflow function by name. Either a function from
+    PyExpress.WorkflowExamples (e.g. 'M3T_workflow') or a full path 'module:function'.
+    '''
+
+    if ':' in workflow:
+        module_name, func_name = workflow.split(':')
+        return getattr(importlib.import_module(module_name), func_name)
+
+    import PyExpress.WorkflowExamples as wfe
+
+    return getattr(wfe, workflow)
+
+def run_campaign(config_path: str, workflow: str):
+
+    '''
+    Processes a single campaign configuration like the main control script
+    TestPipeline/TestWorkflowMAIN.py, but without interactive prompts.
+
+    *args:
+        config_path: full path to the project configuration file\n
+        workflow: name of the workflow function, e.g. 'M3T_workflow'
+
+    Returns:
+        Final project instance of the workflow
+    '''
+
+    config_dir   = os.path.dirname(config_path)
+    config_file  = os.path.basename(config_path)
+
+    # relative paths in configuration files refer to the config directory
+    os.chdir(config_dir)
+
+    config_data  = hlp.open_parameters(config_path)
+    new_project  = config_data['input']['general']['new_project']
+    transfer_img = config_data['input']['image']['preproc']['transfer']
+    proj_type    = config_data['input']['project']['type']
+
+    if new_project == True:
+        if proj_type == 'stereo':
+            img_dir, prj_dir = hlp.create_stereo_project(config_data=config_data, config_path=config_path)
+        else:
+            img_dir, prj_dir = hlp.create_UAV_project(config_data=config_data, config_path=config_path)
+
+        if transfer_img == True:
+            hlp.transfer_images(config_data=config_data, dest_dir=img_dir, recursive=True)
+    else:
+        img_dir, prj_dir = hlp.open_project(config_data=config_data, config_path=config_path)
+
+    workflow_func = _resolve_workflow(workflow)
+    project       = workflow_func(config_data = config_data,
+                                  prj_dir     = prj_dir,
+                                  img_dir     = img_dir,
+                                  config_name = config_file)
+
+    # release the document lock of the finished project
+    if hasattr(project, 'doc'):
+        project.doc.clear()
+
+    return project
+
+def _job_process(config_path: str, workflow: str, log_path: str, threads: int):
+
+    ''' Entry point of a worker process; runs one job and redirects its console output to the job log. '''
+
+    _budget_threads(threads)
+
+    log_file   = open(log_path, 'a', buffering=1)
+    sys.stdout = log_file
+    sys.stderr = log_file
+
+    # interactive prompts must not block unattended batch runs
+    os.environ['PYEXPRESS_HEADLESS'] = '1'
+    sys.stdin  = open(os.devnull, 'r')
+
+    print(f'{time.strftime("%d.%m.%Y %H:%M:%S")} job started: {config_path} ({workflow}, {threads} threads)')
+
+    try:
+        run_campaign(config_path=config_path, workflow=workflow)
+    except BaseException:
+        traceback.print_exc()
+        hlp.flush_process_logs()
+        log_file.flush()
+        os._exit(1)
+
+    print(f'{time.strftime("%d.%m.%Y %H:%M:%S")} job finished')
+    hlp.flush_process_logs()
+    log_file.flush()
+    os._exit(0)
+
+
+###############################################################################
+# scheduler
+
+class BatchScheduler():
+
+    def __init__(self,
+                 queue_path:  str,
+                 workflow:    str,
+                 workers:     int = 1,
+                 threads:     int = None,
+                 max_retries: int = 1,
+                 log_dir:     str = None):
+
+        '''
+        Is called when an instance of the BatchScheduler class is being created.
+
+        *args:
+            queue_path: full path to the SQLite job queue (created if missing)\n
+            workflow: default workflow for added configs, e.g. 'M3T_workflow' or 'module:function'\n
+            workers: number of campaigns processed at the same time\n
+            threads: CPU threads per worker; default: CPU cores divided by workers\n
+            max_retries: number of retries for a failed job\n
+            log_dir: directory for per-job logs; default: 'batch_logs' next to the queue
+        '''
+
+        cpu_count        = os.cpu_count() or 1
+
+        self.queue       = JobQueue(queue_path)
+        self.workflow    = workflow
+        self.workers     = max(int(workers), 1)
+        self.threads     = threads if threads else max(cpu_count // self.workers, 1)
+        self.max_retries = max_retries
+        self.log_dir     = log_dir if log_dir else os.path.join(os.path.dirname(os.path.abspath(queue_path)), 'batch_logs')
+
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        if self.threads * self.workers > cpu_count:
+            print(f'Batch processing:       {self.workers} workers x {self.threads} threads '
+                  f'oversubscribe {cpu_count} CPU cores')
+
+    def add_configs(self, source, workflow: str = None, recursive: bool = False):
+
+        '''
+        Adds campaign configuration files to the job queue.
+
+        *args:
+            source: directory with YAML/JSON configuration files or list of file paths\n
+            workflow: workflow for these configs; default: workflow of the scheduler\n
+            recursive: also search subdirectories if source is a directory
+
+        Returns:
+            Number of newly queued jobs
+        '''
+
+        workflow = workflow if workflow else self.workflow
+
+        if isinstance(source, str) and os.path.isdir(source):
+            pattern = os.path.join(source, '**', '*') if recursive else os.path.join(source, '*')
+            files   = sorted(f for f in glob.glob(pattern, recursive=recursive)
+                             if f.lower().endswith(('.yaml', '.yml', '.json')))
+        elif isinstance(source, str):
+            files   = [source]
+        else:
+            files   = list(source)
+
+        added = sum(self.queue.add_job(config_path = f,
+                                       workflow    = workflow,
+                                       max_retries = self.max_retries) for f in files)
+
+        print(f'Batch processing:       {added} of {len(files)} configs queued')
+
+        return added
+
+    def _start_job(self, ctx, job, slot: int):
+
+        config_name = os.path.splitext(os.path.basename(job['config_path']))[0]
+        log_path    = os.path.join(self.log_dir, f'job{job["id"]:04d}_{config_name}_attempt{job["attempts"]}.log')
+        self.queue.set_log_path(job['id'], log_path)
+
+        process = ctx.Process(target = _job_process,
+                              args   = (job['config_path'], job['workflow'], log_path, self.threads),
+                              name   = f'PyExpress-batch-{slot}')
+        process.start()
+
+        print(f'Batch processing:       worker {slot} started job {job["id"]} '
+              f'({os.path.basename(job["config_path"])}, attempt {job["attempts"]})')
+
+        return process
+
+    def run(self, poll_interval: float = 2.0):
+
+        '''
+        Processes all pending jobs with the configured number of worker processes.
+        Every job is executed in a fresh process with its own Metashape document.
+
+        *args:
+            poll_interval: seconds between checks of running worker processes
+
+        Returns:
+            Dictionary with the number of jobs per state
+        '''
+
+        start_time = time.time()
+
+        self.queue.reset_stale()
+
+        ctx     = mp.get_context('spawn')
+        running = dict()
+
+        # spawned processes inherit the environment, so numerical libraries are limited
+        # to the thread budget before they are imported; the scheduler environment is restored afterwards
+        with hlp.environment_variables(**{var: self.threads for var in _THREAD_ENV_VARS}):
+            while True:
+
+                for slot in range(self.workers):
+                    if slot in running:
+                        continue
+                    job = self.queue.claim_next(worker=slot)
+                    if job is None:
+                        break
+                    running[slot] = (job['id'], self._start_job(ctx, job, slot))
+
+                if not running:
+                    break
+
+                time.sleep(poll_interval)
+
+                for slot, (job_id, process) in list(running.items()):
+                    if process.is_alive():
+                        continue
+
+                    process.join()
+
+                    if process.exitcode == 0:
+                        self.queue.mark_done(job_id)
+                        print(f'Batch processing:       job {job_id} done')
+                    else:
+                        self.queue.mark_failed(job_id, error=f'exit code {process.exitcode}; see job log')
+                        print(f'Batch processing:       job {job_id} failed (exit code {process.exitcode})')
+
+                    del running[slot]
+
+        summary = self.queue.summary()
+        print(f'Batch processing:       finished {summary}')
+
+        hlp.log(start_time=start_time, string=f"{' ' * 24}execution time", dim='HMS')
+
+        return summary
+
+
+###############################################################################
+# command line interface
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description='Process multiple campaign configs with PyExpress workflows.')
+    parser.add_argument('configs', nargs='+', help='config directory or list of config files')
+    parser.add_argument('--workflow', required=True, help="workflow name, e.g. 'M3T_workflow' or 'module:function'")
+    parser.add_argument('--queue', default='batch_queue.db', help='path to the SQLite job queue')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    parser.add_argument('--threads', type=int, default=None, help='CPU threads per worker')
+    parser.add_argument('--retries', type=int, default=1, help='retries per failed job')
+    parser.add_argument('--retry-failed', action='store_true', help='requeue failed jobs from earlier runs')
+    args = parser.parse_args()
+
+    scheduler = BatchScheduler(queue_path  = args.queue,
+                               workflow    = args.workflow,
+                               workers     = args.workers,
+                               threads     = args.threads,
+                               max_retries = args.retries)
+
+    if args.retry_failed:
+        scheduler.queue.retry_failed(max_retries=args.retries)
+
+    for source in args.configs:
+        scheduler.add_configs(source=source)
+
+    scheduler.run()
@@ -0,0 +1,90 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+
+__all__ = ['HEADLESS_ENV', 'HeadlessPromptError', 'configure_headless', 'is_headless', 'ask']
+
+###############################################################################
+# headless (non-interactive) execution
+
+HEADLESS_ENV = 'PYEXPRESS_HEADLESS'
+
+_headless_config = {'use': False, 'answers': {}}
+
+class HeadlessPromptError(RuntimeError):
+
+    ''' Raised if a prompt is reached in headless mode without a configured answer. '''
+
+
+def configure_headless(config_data: dict):
+
+    '''
+    Reads the headless settings from the project configuration file.
+    Configuration section (all keys optional):
+
+        metashape:
+          document:
+            headless:
+              use: bool        # answer prompts without user interaction
+              answers:         # answers per prompt key, e.g. {disable_read_only: 'n'}
+
+    *args:
+        config_data: content of the project configuration file
+    '''
+
+    settings = config_data.get('metashape', {}).get('document', {}).get('headless', {}) or {}
+
+    _headless_config['use']     = bool(settings.get('use', False))
+    _headless_config['answers'] = dict(settings.get('answers', {}) or {})
+
+def is_headless():
+
+    '''
+    Returns:
+        True if headless mode is enabled by the environment variable PYEXPRESS_HEADLESS
+        or by the configuration file
+    '''
+
+    env_value = os.environ.get(HEADLESS_ENV, '').strip().lower()
+
+    if env_value in ['1', 'true', 'yes', 'y']:
+        return True
+    if env_value in ['0', 'false', 'no', 'n']:
+        return False
+
+    return _headless_config['use']
+
+def ask(question: str, key: str, default: str = None):
+
+    '''
+    Asks the user for input. In headless mode, the answer is taken from
+    (a) the environment variable PYEXPRESS_ANSWER_<KEY>, (b) the configuration file
+    or (c) the given default. Without any answer a HeadlessPromptError is raised.
+
+    *args:
+        question: prompt displayed in interactive mode\n
+        key: unique prompt key used to look up the headless answer\n
+        default: answer used in headless mode if nothing is configured
+
+    Returns:
+        Answer string
+    '''
+
+    if not is_headless():
+        return input(question)
+
+    answer = os.environ.get(f'PYEXPRESS_ANSWER_{key.upper()}')
+
+    if answer is None:
+        answer = _headless_config['answers'].get(key, default)
+
+    if answer is None:
+        raise HeadlessPromptError(f'Headless mode: no answer configured for prompt "{key}" ({question.strip()}). '
+                                  f'Set metashape.document.headless.answers.{key} in the configuration file '
+                                  f'or the environment variable PYEXPRESS_ANSWER_{key.upper()}.')
+
+    answer = str(answer)
+    print(f'{question.strip()} {answer} (headless)')
+
+    return answer
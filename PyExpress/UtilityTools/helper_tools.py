@@ -6,6 +6,11 @@ import json, yaml, os, re, glob, sys, time
 from   io                       import StringIO
 import PyExpress.DataManagement as     adm
 
+__all__ = ['convert_JSON_to_YAML', 'convert_YAML_to_JSON', 'open_parameters', 'get_filelist',
+           'filter_filelist_by_string', 'filter_filelist_by_stringlist', 'extract_date_stamps',
+           'transfer_images', 'create_UAV_project', 'create_stereo_project', 'open_project',
+           'copy_marker_ref', 'log', 'suppress_stdout', 'environment_variables']
+
 ###############################################################################
 # parameter file handling: format conversion, open, save, ...    
 def convert_JSON_to_YAML(source_path: str, save_path: str, directory=False, recursive=False):
@@ -531,4 +536,31 @@ class suppress_stdout():
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        sys.stdout = self.old_stdout
\ No newline at end of file
+        sys.stdout = self.old_stdout
+
+
+class environment_variables():
+    
+    '''
+    Sets environment variables temporarily and restores the previous values afterwards.
+    Spawned worker processes inherit the environment when they are started.
+    
+    Use:
+        with environment_variables(OMP_NUM_THREADS=4):
+            process.start()
+    '''
+    
+    def __init__(self, **variables):
+        self.variables = {name: str(value) for name, value in variables.items()}
+    
+    def __enter__(self):
+        self.previous = {name: os.environ.get(name) for name in self.variables}
+        os.environ.update(self.variables)
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for name, value in self.previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
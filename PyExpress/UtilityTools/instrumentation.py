@@ -0,0 +1,233 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, sys, json, time, glob, inspect, functools
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+__all__ = ['RUN_RECORD_FILE', 'run_id', 'instrument', 'load_run_records', 'compare_runs']
+
+###############################################################################
+# per-stage timing and resource instrumentation
+
+RUN_RECORD_FILE = 'run_record.jsonl'
+
+_run_id      = os.environ.get('PYEXPRESS_RUN_ID', f'{time.strftime("%Y%m%d_%H%M%S")}_{os.getpid()}')
+_stage_stack = []
+
+def run_id():
+
+    '''
+    Returns:
+        ID of the current run; shared with worker processes via the environment variable PYEXPRESS_RUN_ID
+    '''
+
+    return _run_id
+
+def _resource_usage():
+
+    '''
+    Returns:
+        Dictionary with CPU time, peak resident memory and disk read/write bytes of the current process
+    '''
+
+    usage = {'cpu_s': time.process_time(), 'peak_rss_bytes': None, 'read_bytes': None, 'write_bytes': None}
+
+    if psutil is not None:
+        process = psutil.Process()
+        # peak working set on Windows; psutil has no peak value on POSIX systems (see ru_maxrss below)
+        if sys.platform == 'win32':
+            usage['peak_rss_bytes'] = getattr(process.memory_info(), 'peak_wset', None)
+        try:
+            io_counters          = process.io_counters()
+            usage['read_bytes']  = io_counters.read_bytes
+            usage['write_bytes'] = io_counters.write_bytes
+        except (AttributeError, psutil.Error):
+            pass
+
+    if usage['peak_rss_bytes'] is None and sys.platform != 'win32':
+        import resource
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage['peak_rss_bytes'] = max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+    if usage['read_bytes'] is None and os.path.exists('/proc/self/io'):
+        with open('/proc/self/io') as file:
+            counters = dict(line.split(':') for line in file if ':' in line)
+        usage['read_bytes']  = int(counters['read_bytes'])
+        usage['write_bytes'] = int(counters['write_bytes'])
+
+    return usage
+
+def _json_value(value):
+
+    ''' Converts keyword argument values (e.g. Metashape enums) into JSON compatible values. '''
+
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_value(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _json_value(v) for k, v in value.items()}
+
+    return repr(value)
+
+def _write_record(project: object, record: dict):
+
+    export_dir = getattr(project, 'export_dir', None)
+
+    if not export_dir:
+        return
+
+    os.makedirs(export_dir, exist_ok=True)
+
+    with open(os.path.join(export_dir, RUN_RECORD_FILE), 'a') as file:
+        file.write(json.dumps(record) + '\n')
+
+def instrument(func):
+
+    '''
+    Decorator recording wall time, CPU time, peak RSS, disk read/write bytes and the arguments
+    (positional and keyword, by parameter name) of a workflow step. The record is appended as one JSON line to *export_dir*/run_record.jsonl
+    of the project passed as first argument (or as keyword argument 'project').
+
+    Use:
+        @hlp.instrument
+        def buildDem(project, save_project=(False, ''), **kwargs): ...
+    '''
+
+    stage     = func.__qualname__
+    signature = inspect.signature(func)
+
+    def arguments(args, kwargs):
+
+        ''' Arguments of a call by parameter name (positional arguments bound to their names, **kwargs flattened). '''
+
+        try:
+            bound = signature.bind_partial(*args, **kwargs).arguments
+        except TypeError:
+            return dict(kwargs)
+
+        result = dict()
+        for name, value in bound.items():
+            if signature.parameters[name].kind == inspect.Parameter.VAR_KEYWORD:
+                result.update(value)
+            else:
+                result[name] = value
+
+        return result
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+
+        parameters = arguments(args, kwargs)
+        project    = parameters.get('project', args[0] if args else None)
+        chunk      = getattr(getattr(project, 'chunk', None), 'label', None)
+        start      = _resource_usage()
+        start_wall = time.time()
+        start_perf = time.perf_counter()
+        status     = 'done'
+
+        _stage_stack.append(stage)
+
+        try:
+            return func(*args, **kwargs)
+        except BaseException:
+            status = 'failed'
+            raise
+        finally:
+            _stage_stack.pop()
+            end = _resource_usage()
+
+            def delta(key):
+                if start[key] is None or end[key] is None:
+                    return None
+                return end[key] - start[key]
+
+            record = {'run_id':         _run_id,
+                      'project_ID':     getattr(project, 'project_ID', None),
+                      'stage':          stage,
+                      'parent':         _stage_stack[-1] if _stage_stack else None,
+                      'chunk':          chunk,
+                      'status':         status,
+                      'start':          time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(start_wall)),
+                      'wall_s':         round(time.perf_counter() - start_perf, 4),
+                      'cpu_s':          round(delta('cpu_s'), 4),
+                      'peak_rss_bytes': end['peak_rss_bytes'],
+                      'read_bytes':     delta('read_bytes'),
+                      'write_bytes':    delta('write_bytes'),
+                      'pid':            os.getpid(),
+                      'kwargs':         {k: _json_value(v) for k, v in parameters.items() if k != 'project'}}
+
+            try:
+                _write_record(project, record)
+            except OSError as e:
+                print(f'Instrumentation: run record not written ({e})')
+
+    return wrapper
+
+
+###############################################################################
+# loading and comparing run records
+
+def load_run_records(source):
+
+    '''
+    Loads run records from a run_record.jsonl file, a directory (searched recursively)
+    or a list of files.
+
+    *args:
+        source: file path, directory or list of file paths
+
+    Returns:
+        List of record dictionaries
+    '''
+
+    if isinstance(source, str) and os.path.isdir(source):
+        files = glob.glob(os.path.join(source, '**', RUN_RECORD_FILE), recursive=True)
+    elif isinstance(source, str):
+        files = [source]
+    else:
+        files = list(source)
+
+    records = []
+
+    for path in files:
+        with open(path, 'r') as file:
+            records.extend(json.loads(line) for line in file if line.strip())
+
+    return records
+
+def compare_runs(records: list, metric: str = 'wall_s', run_ids: list = None, top_level: bool = True):
+
+    '''
+    Compares a metric per workflow stage across runs.
+
+    *args:
+        records: list of run records, see load_run_records()\n
+        metric: ['wall_s', 'cpu_s', 'peak_rss_bytes', 'read_bytes', 'write_bytes']\n
+        run_ids: runs to compare; default: all runs in the records\n
+        top_level: only use stages which are not called from another instrumented stage
+
+    Returns:
+        pandas.DataFrame with stages as rows and run IDs as columns
+    '''
+
+    import pandas as pd
+
+    frame = pd.DataFrame(records)
+
+    if frame.empty:
+        return frame
+
+    if run_ids is not None:
+        frame = frame[frame['run_id'].isin(run_ids)]
+    if top_level:
+        frame = frame[frame['parent'].isna()]
+
+    # peak memory is a maximum over the process lifetime; all other metrics add up
+    aggfunc = 'max' if metric == 'peak_rss_bytes' else 'sum'
+
+    return frame.pivot_table(index='stage', columns='run_id', values=metric, aggfunc=aggfunc, sort=False)
@@ -0,0 +1,260 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, gzip, time, queue, shutil, atexit, threading
+
+__all__ = ['WORKER_LOG_ENV', 'ProcessLogger', 'get_process_logger', 'flush_process_logs']
+
+###############################################################################
+# buffered process logging on a background thread
+
+_WRITE, _FLUSH, _STOP = 0, 1, 2
+
+# set in worker processes writing into the log files of their parent process (e.g. Parallel.process_chunks)
+WORKER_LOG_ENV = 'PYEXPRESS_WORKER_LOG'
+
+_BUFFER_SIZE = 64 * 1024
+_OPEN_FLAGS  = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+
+class ProcessLogger():
+
+    '''
+    Writes log lines of all projects in the current process on a background thread.
+    Calls of write() only enqueue the line, so slow (network) drives do not stall processing.
+    Files are kept open, flushed periodically, rotated by size and compressed with gzip.
+    Lines are appended (O_APPEND) in blocks of complete lines, so the lines of several processes
+    writing into the same file are never split. Worker processes (see WORKER_LOG_ENV) write every line
+    at once without keeping the file open and never rotate it; rotation is left to the parent process.
+
+    Use:
+        logger = hlp.get_process_logger()
+        logger.write(path='.../process_log.txt', line='01.01.2025 12:00:00 message')
+    '''
+
+    def __init__(self,
+                 flush_interval: float = 2.0,
+                 max_bytes:      int   = 50 * 1024**2,
+                 backup_count:   int   = 5,
+                 compress:       bool  = True,
+                 worker:         bool  = None):
+
+        '''
+        Is called when an instance of the ProcessLogger class is being created.
+
+        *args:
+            flush_interval: maximum time in seconds until written lines reach the file\n
+            max_bytes: file size in bytes which triggers a rotation; 0 disables rotation\n
+            backup_count: number of rotated files kept per log file\n
+            compress: compress rotated files with gzip (*.1.gz, *.2.gz, ...)\n
+            worker: whether the files are shared with a parent process (unbuffered, no rotation);
+                    default: environment variable PYEXPRESS_WORKER_LOG
+        '''
+
+        self.flush_interval = flush_interval
+        self.max_bytes      = max_bytes
+        self.backup_count   = backup_count
+        self.compress       = compress
+        self.worker         = worker if worker is not None else os.environ.get(WORKER_LOG_ENV) == '1'
+
+        self._queue  = queue.SimpleQueue()
+        self._files  = dict()              # path: [file descriptor, file size in bytes, pending lines, pending bytes]
+        self._failed = set()
+        self._thread = threading.Thread(target=self._run, name='PyExpress-process-logger', daemon=True)
+        self._thread.start()
+
+    def write(self, path: str, line: str):
+
+        '''
+        Enqueues a log line for the specified file; returns immediately.
+
+        *args:
+            path: full path of the log file\n
+            line: log line without line break
+        '''
+
+        self._queue.put((_WRITE, path, line))
+
+    def flush(self, timeout: float = None):
+
+        '''
+        Blocks until all enqueued lines are written and flushed to disk.
+
+        *args:
+            timeout: maximum waiting time in seconds
+        '''
+
+        if not self._thread.is_alive():
+            return
+
+        done = threading.Event()
+        self._queue.put((_FLUSH, None, done))
+        done.wait(timeout)
+
+    def close(self, timeout: float = 30):
+
+        ''' Writes all pending lines, closes the log files and stops the background thread. '''
+
+        if not self._thread.is_alive():
+            return
+
+        done = threading.Event()
+        self._queue.put((_STOP, None, done))
+        done.wait(timeout)
+
+    # background thread
+
+    def _run(self):
+
+        last_flush = time.monotonic()
+
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                batch = []
+
+            while len(batch) < 10000:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for kind, path, item in batch:
+                if kind == _WRITE:
+                    self._write(path, item)
+                elif kind == _FLUSH:
+                    self._flush_all()
+                    item.set()
+                elif kind == _STOP:
+                    self._flush_all(close=True)
+                    item.set()
+                    return
+
+            if time.monotonic() - last_flush >= self.flush_interval:
+                self._flush_all()
+                last_flush = time.monotonic()
+
+    def _open(self, path: str):
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        descriptor        = os.open(path, _OPEN_FLAGS, 0o644)
+        self._files[path] = [descriptor, os.fstat(descriptor).st_size, [], 0]
+
+        return self._files[path]
+
+    def _write(self, path: str, line: str):
+
+        try:
+            data = (line + os.linesep).encode('utf-8')
+
+            # workers: one write per line, the parent may rotate the file at any time
+            if self.worker:
+                os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+                descriptor = os.open(path, _OPEN_FLAGS, 0o644)
+                try:
+                    os.write(descriptor, data)
+                finally:
+                    os.close(descriptor)
+                return
+
+            entry     = self._files.get(path) or self._open(path)
+            entry[1] += len(data)
+            entry[3] += len(data)
+            entry[2].append(data)
+
+            if entry[3] >= _BUFFER_SIZE:
+                self._flush(path)
+
+            if self.max_bytes and entry[1] >= self.max_bytes:
+                self._flush(path)
+                self._rotate(path)
+
+        except OSError as e:
+            # report a broken log location once, but keep processing
+            if path not in self._failed:
+                self._failed.add(path)
+                print(f'Process logging: writing to {path} failed ({e})')
+
+    def _flush(self, path: str):
+
+        ''' Appends the pending lines of a file in one write; the size includes the lines of other processes. '''
+
+        entry = self._files[path]
+
+        if entry[2]:
+            os.write(entry[0], b''.join(entry[2]))
+            entry[1]   = os.fstat(entry[0]).st_size
+            entry[2:4] = [[], 0]
+
+    def _rotate(self, path: str):
+
+        descriptor = self._files.pop(path)[0]
+        os.close(descriptor)
+
+        suffix   = '.gz' if self.compress else ''
+        rotating = f'{path}.rotating'
+
+        # fails on Windows while another process writes into the file; rotated at the next write instead
+        try:
+            os.replace(path, rotating)
+        except PermissionError:
+            return
+
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f'{path}.{i}{suffix}'
+            if os.path.exists(source):
+                os.replace(source, f'{path}.{i+1}{suffix}')
+
+        if self.backup_count < 1:
+            os.remove(rotating)
+            return
+
+        if self.compress:
+            with open(rotating, 'rb') as source, gzip.open(f'{path}.1.gz', 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(rotating)
+        else:
+            os.replace(rotating, f'{path}.1')
+
+    def _flush_all(self, close: bool = False):
+
+        for path in list(self._files):
+            try:
+                self._flush(path)
+                if close:
+                    os.close(self._files[path][0])
+            except OSError as e:
+                print(f'Process logging: flushing {path} failed ({e})')
+
+        if close:
+            self._files.clear()
+
+
+_process_logger = None
+_logger_lock    = threading.Lock()
+
+def get_process_logger(**kwargs):
+
+    '''
+    Returns the process-wide logger; it is created with the given settings on first use.
+
+    **kwargs:
+        see ProcessLogger.__init__
+    '''
+
+    global _process_logger
+
+    with _logger_lock:
+        if _process_logger is None:
+            _process_logger = ProcessLogger(**kwargs)
+            atexit.register(_process_logger.close)
+
+    return _process_logger
+
+def flush_process_logs():
+
+    ''' Writes all pending log lines of the process-wide logger to disk. '''
+
+    if _process_logger is not None:
+        _process_logger.flush()
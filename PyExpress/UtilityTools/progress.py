@@ -0,0 +1,310 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, glob, json, time, threading
+
+__all__ = ['PROGRESS_STATUS_FILE', 'progress_status_file', 'ProgressTracker', 'read_progress_status']
+
+###############################################################################
+# progress callbacks for long Metashape processing steps
+
+# status file of each process: progress_status_<process ID>.json
+PROGRESS_STATUS_FILE = 'progress_status.json'
+
+def progress_status_file(directory: str, pid: int = None):
+
+    ''' Status file of a process in a directory (concurrent processes do not overwrite each other's status). '''
+
+    name, extension = os.path.splitext(PROGRESS_STATUS_FILE)
+
+    return os.path.join(directory, f'{name}_{pid or os.getpid()}{extension}')
+
+class ProgressTracker():
+
+    '''
+    Progress callback for Metashape processing methods (progress=...). Computes the processing rate
+    and the remaining time, publishes them to a JSON status file and detects stalls, i.e. no progress
+    for a defined time. Every process writes its own status file, so concurrent exports and chunk
+    processes do not overwrite each other; the file is removed when the step has finished. A supervisor
+    (e.g. a batch scheduler or a monitoring script) can read the status files of the running steps,
+    see read_progress_status().
+
+    Use:
+        with hlp.ProgressTracker(project, stage='buildDepthMaps') as progress:
+            project.chunk.buildDepthMaps(progress=progress, **kwargs)
+
+        # frame loops: one part per frame
+        with hlp.ProgressTracker(project, stage='matchPhotos') as progress:
+            for i, frame in enumerate(project.chunk.frames):
+                frame.matchPhotos(progress=progress.part(i, len(project.chunk.frames)))
+    '''
+
+    def __init__(self,
+                 project:        object,
+                 stage:          str,
+                 status_file:    str   = None,
+                 stall_minutes:  float = None,
+                 write_interval: float = 5.0,
+                 on_stall:       object = None):
+
+        '''
+        Is called when an instance of the ProgressTracker class is being created.
+
+        *args:
+            project: your Metashape project\n
+            stage: name of the processing step\n
+            status_file: path of the status file; default: *export_dir*/progress_status_<process ID>.json\n
+            stall_minutes: time without progress until the step counts as stalled;
+                           default: metashape.document.progress_stall_min or 30\n
+            write_interval: minimum time in seconds between two status file updates\n
+            on_stall: function (tracker) called once per detected stall
+        '''
+
+        if stall_minutes is None:
+            document      = getattr(getattr(getattr(project, 'config', None), 'metashape', None), 'document', None)
+            stall_minutes = getattr(document, 'progress_stall_min', None) or 30
+
+        if status_file is None:
+            status_file = progress_status_file(getattr(project, 'export_dir', '.'))
+
+        self.project        = project
+        self.stage          = stage
+        self.status_file    = status_file
+        self.stall_seconds  = stall_minutes * 60
+        self.write_interval = write_interval
+        self.on_stall       = on_stall
+
+        self.percent        = 0.0
+        self.rate           = None    # percent per second, exponentially smoothed
+        self.state          = 'pending'
+
+        self._lock          = threading.Lock()
+        self._write_lock    = threading.Lock()
+        self._stop          = threading.Event()
+        self._watchdog      = None
+
+    # context management
+
+    def __enter__(self):
+
+        self.start()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.finish(failed=exc_type is not None)
+
+        return False
+
+    def start(self):
+
+        ''' Starts the time tracking and the stall watchdog. '''
+
+        now = time.time()
+
+        self._start         = now
+        self._last_progress = now
+        self._last_sample   = (now, 0.0)
+        self._last_write    = 0.0
+        self.state          = 'running'
+
+        self._write_status(force=True)
+
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name=f'PyExpress-progress-{self.stage}', daemon=True)
+        self._watchdog.start()
+
+    def finish(self, failed: bool = False):
+
+        ''' Stops the stall watchdog, marks the step as done or failed and removes the status file. '''
+
+        self._stop.set()
+
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+        with self._lock:
+            if not failed:
+                self.percent = 100.0
+            self.state = 'failed' if failed else 'done'
+
+        with self._write_lock:
+            try:
+                os.remove(self.status_file)
+            except OSError:
+                pass
+
+    # callbacks
+
+    def __call__(self, percent: float):
+
+        ''' Progress callback; Metashape passes the progress of the running step in percent. '''
+
+        self.update(percent)
+
+    def part(self, index: int, count: int):
+
+        '''
+        Returns a progress callback for one of several consecutive calls, e.g. one per frame.
+
+        *args:
+            index: index of the call (0 ... count-1)\n
+            count: total number of calls
+        '''
+
+        return lambda percent: self.update((index + percent / 100) / count * 100)
+
+    def update(self, percent: float):
+
+        '''
+        Updates progress, rate and stall state; writes the status file at most every write_interval seconds.
+
+        *args:
+            percent: overall progress of the step in percent
+        '''
+
+        now = time.time()
+
+        with self._lock:
+            if percent > self.percent:
+                self._last_progress = now
+
+                if self.state == 'stalled':
+                    self.state = 'running'
+                    self._report(f'Progress: {self.stage} resumed at {percent:.1f} %')
+
+            self.percent = percent
+
+            # smoothed rate over samples at least one second apart
+            sample_time, sample_percent = self._last_sample
+            if now - sample_time >= 1.0:
+                rate = (percent - sample_percent) / (now - sample_time)
+                self.rate = rate if self.rate is None else 0.3 * rate + 0.7 * self.rate
+                self._last_sample = (now, percent)
+
+        self._write_status()
+
+    # status
+
+    def eta(self):
+
+        '''
+        Returns:
+            Estimated remaining time in seconds or None if no rate is available yet
+        '''
+
+        rate = self.rate
+
+        if not rate or rate <= 0:
+            elapsed = time.time() - self._start
+            rate    = self.percent / elapsed if elapsed > 0 else 0
+
+        if rate <= 0:
+            return None
+
+        return (100 - self.percent) / rate
+
+    def status(self):
+
+        '''
+        Returns:
+            Dictionary with the current progress status
+        '''
+
+        now = time.time()
+        eta = self.eta()
+
+        return {'project_ID':       getattr(self.project, 'project_ID', None),
+                'chunk':            getattr(getattr(self.project, 'chunk', None), 'label', None),
+                'stage':            self.stage,
+                'state':            self.state,
+                'percent':          round(self.percent, 2),
+                'rate_pct_per_min': None if self.rate is None else round(self.rate * 60, 4),
+                'eta_s':            None if eta is None else round(eta),
+                'elapsed_s':        round(now - self._start),
+                'since_progress_s': round(now - self._last_progress),
+                'stall_s':          self.stall_seconds,
+                'pid':              os.getpid(),
+                'updated':          time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now))}
+
+    def _write_status(self, force: bool = False):
+
+        now = time.time()
+
+        if not force and now - self._last_write < self.write_interval:
+            return
+
+        # write to a temporary file and replace, so readers never see a partial file
+        temp_file = f'{self.status_file}.{os.getpid()}.tmp'
+
+        with self._write_lock:
+            self._last_write = now
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.status_file)), exist_ok=True)
+                with open(temp_file, 'w') as file:
+                    json.dump(self.status(), file, indent=2)
+                os.replace(temp_file, self.status_file)
+            except OSError as e:
+                print(f'Progress: status file not written ({e})')
+
+    def _watch(self):
+
+        while not self._stop.wait(min(30, self.stall_seconds / 4)):
+
+            with self._lock:
+                stalled = (self.state == 'running' and
+                           time.time() - self._last_progress >= self.stall_seconds)
+                if stalled:
+                    self.state = 'stalled'
+
+            if stalled:
+                self._report(f'Progress: {self.stage} stalled at {self.percent:.1f} % '
+                             f'(no progress for {self.stall_seconds / 60:.0f} min)')
+                self._write_status(force=True)
+
+                if self.on_stall is not None:
+                    self.on_stall(self)
+            else:
+                # heartbeat, also without progress callbacks
+                self._write_status()
+
+    def _report(self, msg: str):
+
+        print(msg)
+
+        if hasattr(self.project, 'logging'):
+            self.project.logging(msg)
+
+
+def read_progress_status(path: str):
+
+    '''
+    Reads progress status files written by ProgressTracker instances.
+
+    *args:
+        path: path of a status file or the export directory containing the status files of all processes
+
+    Returns:
+        Dictionary with the progress status of a file, list of dictionaries (one per process, latest update last)
+        of a directory, or None if no status file exists
+    '''
+
+    if os.path.isdir(path):
+        name, extension = os.path.splitext(PROGRESS_STATUS_FILE)
+        statuses        = []
+
+        for status_file in glob.glob(os.path.join(path, f'{name}_*{extension}')):
+            try:
+                with open(status_file, 'r') as file:
+                    statuses.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+
+        return sorted(statuses, key=lambda status: status['updated']) or None
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path, 'r') as file:
+        return json.load(file)
@@ -32,6 +32,8 @@ try:
 except Exception as e:
     print("Some modules are missing {}".format(e))
 
+__all__ = ['M2EA_workflow', 'M2EA_chunk_workflow']
+
 
 ###############################################################################
 # Main function for a fully automated photogrammetric workflow for image 
@@ -66,12 +68,6 @@ def M2EA_workflow(config_data: dict,
     GCP_coord_system     = config_data['metashape']['reference']['measurement']['marker_crs']
     set_reference        = config_data['metashape']['reference']['general']['use_ref']
     data_type            = config_data['metashape']['general']['type']
-    output_coord_system  = config_data['metashape']['export']['ortho_crs']
-    export_list          = config_data['metashape']['export']['type']
-    filter_noise         = config_data['metashape']['point_cloud']['filter']['noise']
-    filter_ground        = config_data['metashape']['point_cloud']['filter']['ground']
-    filter_unclass       = config_data['metashape']['point_cloud']['filter']['unclass']
-    render_preview       = config_data['metashape']['point_cloud']['filter']['preview']
 
     if config_data['input']['image']['format']['conv'][0] == True:
         image_format = config_data['input']['image']['format']['conv'][1]
@@ -95,6 +91,10 @@ def M2EA_workflow(config_data: dict,
                                   layout       = ms.UndefinedLayout,
                                   save_project = (True, MultiProject.chunk.label))
 
+##### (OPTIONAL) seed the sensor calibration from the calibration cache (metashape.calibration.cache)
+    MultiProject = ppp.Calibration.warm_start(project      = MultiProject,
+                                              save_project = (True, MultiProject.chunk.label))
+
 ##### (2) match photos
     if data_type == "RGB":
         detail_level = 1; key_points = 40000; tie_points = 4000
@@ -152,6 +152,9 @@ def M2EA_workflow(config_data: dict,
                                                         optimize_cam = True,
                                                         save_project = (True, MultiProject.chunk.label))
 
+##### (OPTIONAL) store the optimized sensor calibration in the calibration cache
+    MultiProject = ppp.Calibration.save_to_cache(project = MultiProject)
+
 ##### (4) build Depth Map
     MultiProject = ppp.buildDepthMaps(project       = MultiProject, 
                                       downscale     = 1,
@@ -181,53 +184,87 @@ def M2EA_workflow(config_data: dict,
         MultiProject.doc.chunks[-1].label = chunk_name
         classPC = [classPC]
 
-    for i, active_chunk in enumerate(MultiProject.doc.chunks[MultiProject.chunk_ID:]):
+##### (OPTIONAL) process the chunks in parallel worker processes
+    parallel_workers = config_data['metashape']['point_cloud']['classification'].get('parallel', 1)
+    chunk_params     = [classPC[i-1] if i-1 < len(classPC) else None 
+                        for i in range(len(MultiProject.doc.chunks[MultiProject.chunk_ID:]))]
+
+    if parallel_workers and parallel_workers > 1:
+        MultiProject = ppp.Parallel.process_chunks(project      = MultiProject,
+                                                   config_data  = config_data,
+                                                   chunk_func   = M2EA_chunk_workflow,
+                                                   chunk_params = chunk_params,
+                                                   workers      = parallel_workers)
+    else:
+        for i, active_chunk in enumerate(MultiProject.doc.chunks[MultiProject.chunk_ID:]):
+            MultiProject.chunk = active_chunk
+            MultiProject       = M2EA_chunk_workflow(MultiProject, config_data, chunk_params[i])
+
+##### (Finally): return the final project instance
+    return MultiProject
+
+###############################################################################
+# Workflow steps for a single (classification) chunk; executed either 
+# sequentially or in parallel worker processes (see ppp.Parallel.process_chunks).
+
+def M2EA_chunk_workflow(MultiProject: object,
+                        config_data:  dict,
+                        class_param:  tuple):
 
-        MultiProject.chunk = active_chunk
+##### parameters for the chunk-wise workflow steps
+    output_coord_system  = config_data['metashape']['export']['ortho_crs']
+    export_list          = config_data['metashape']['export']['type']
+    filter_noise         = config_data['metashape']['point_cloud']['filter']['noise']
+    filter_ground        = config_data['metashape']['point_cloud']['filter']['ground']
+    filter_unclass       = config_data['metashape']['point_cloud']['filter']['unclass']
+    render_preview       = config_data['metashape']['point_cloud']['filter']['preview']
+
+    active_chunk         = MultiProject.chunk
+    
+    print(f'\nActive chunk for next MS workflow steps: {active_chunk.label}\n')
+    
+    if not 'unclassified' in active_chunk.label:
         
-        print(f'\nActive chunk for next MS workflow steps: {active_chunk.label}\n')
+        MultiProject = ppp.PointCloud.Classification.classify_point_cloud(project      = MultiProject,
+                                                                          class_param  = class_param,
+                                                                          save_project = (True, active_chunk.label))
         
-        if not 'unclassified' in active_chunk.label:
-            
-            MultiProject = ppp.PointCloud.Classification.classify_point_cloud(project      = MultiProject,
-                                                                              class_param  = classPC[i-1],
-                                                                              save_project = (True, active_chunk.label))
-            
-            MultiProject = ppp.PointCloud.Filter.filter_from_list(project           = MultiProject,
-                                                                  filter_unclass    = filter_unclass,
-                                                                  filter_high_noise = filter_noise,
-                                                                  filter_ground     = filter_ground,
-                                                                  render_preview    = render_preview,
-                                                                  save_project      = (True, active_chunk.label))
+        MultiProject = ppp.PointCloud.Filter.filter_from_list(project           = MultiProject,
+                                                              filter_unclass    = filter_unclass,
+                                                              filter_high_noise = filter_noise,
+                                                              filter_ground     = filter_ground,
+                                                              render_preview    = render_preview,
+                                                              save_project      = (True, active_chunk.label))
 
 ##### (6) generate 3D model
-        MultiProject = ppp.buildModel(project       = MultiProject,
-                                      interpolation = ms.Interpolation.DisabledInterpolation,
-                                      surface_type  = ms.SurfaceType.HeightField,
-                                      save_project  = (True, active_chunk.label))
+    MultiProject = ppp.buildModel(project       = MultiProject,
+                                  interpolation = ms.Interpolation.DisabledInterpolation,
+                                  surface_type  = ms.SurfaceType.HeightField,
+                                  save_project  = (True, active_chunk.label))
     
 ##### (7) generate digital elevation model (DEM)
-        MultiProject = ppp.buildDem(project       = MultiProject,
-                                    interpolation = ms.Interpolation.DisabledInterpolation,
-                                    save_project  = (True, active_chunk.label))
+    MultiProject = ppp.buildDem(project       = MultiProject,
+                                interpolation = ms.Interpolation.DisabledInterpolation,
+                                save_project  = (True, active_chunk.label))
 
 ##### (8) build UV mapping for the model
-        MultiProject = ppp.buildUV(project      = MultiProject,
-                                   save_project = (True, active_chunk.label))
+    MultiProject = ppp.buildUV(project      = MultiProject,
+                               save_project = (True, active_chunk.label))
 
 ##### (9) create orthomosaic (orthorectified projection)
-        MultiProject = ppp.buildOrthoProjection(project      = MultiProject, 
-                                                coord_system = ms.CoordinateSystem(output_coord_system),
-                                                fill_holes   = False,
-                                                save_project = (True, active_chunk.label))
+    MultiProject = ppp.buildOrthoProjection(project      = MultiProject, 
+                                            coord_system = ms.CoordinateSystem(output_coord_system),
+                                            fill_holes   = False,
+                                            save_project = (True, active_chunk.label))
 
 ##### (OPTIONAL) apply raster transformation specifications
-        MultiProject.applyVegetationIndex(config_data  = config_data,
-                                          save_project = (True, active_chunk.label))
+    MultiProject.applyVegetationIndex(config_data  = config_data,
+                                      save_project = (True, active_chunk.label))
    
 ##### (OPTIONAL): export project results
-        ppp.Export.export_from_list(project     = MultiProject, 
-                                    export_list = export_list)
+    ppp.Export.export_from_list(project     = MultiProject, 
+                                export_list = export_list,
+                                config_data = config_data)
 
-##### (Finally): return the final project instance
+##### (Finally): return the updated project instance
     return MultiProject
\ No newline at end of file
@@ -32,6 +32,8 @@ try:
 except Exception as e:
     print("Some modules are missing {}".format(e))
 
+__all__ = ['TEST_workflow']
+
 
 ###############################################################################
 # Main function for a fully automated photogrammetric workflow for image 
@@ -81,6 +83,10 @@ def TEST_workflow(config_data: dict,
                                   layout       = ms.UndefinedLayout,
                                   save_project = (True, MultiProject.chunk.label))
 
+##### (OPTIONAL) seed the sensor calibration from the calibration cache (metashape.calibration.cache)
+    MultiProject = ppp.Calibration.warm_start(project      = MultiProject,
+                                              save_project = (True, MultiProject.chunk.label))
+
 ##### (2) match photos
     if data_type == "RGB":
         detail_level = 1; key_points = 40000; tie_points = 4000
@@ -133,6 +139,9 @@ def TEST_workflow(config_data: dict,
                                                          optimize_cam = True,
                                                          save_project = (True, MultiProject.chunk.label))
 
+##### (OPTIONAL) store the optimized sensor calibration in the calibration cache
+    MultiProject = ppp.Calibration.save_to_cache(project = MultiProject)
+
 ##### (4) build Depth Map
     MultiProject = ppp.buildDepthMaps(project       = MultiProject, 
                                       downscale     = 1,
@@ -197,7 +206,8 @@ def TEST_workflow(config_data: dict,
    
 ##### (OPTIONAL): export project results
         ppp.Export.export_from_list(project     = MultiProject, 
-                                    export_list = export_list)
+                                    export_list = export_list,
+                                    config_data = config_data)
 
 ##### (Finally): return the final project instance
     return MultiProject
\ No newline at end of file
@@ -31,6 +31,8 @@ try:
 
 except Exception as e:
     print("Some modules are missing {}".format(e))
+
+__all__ = ['MakoG319_workflow']
     
 
 ###############################################################################
@@ -178,6 +180,15 @@ def MakoG319_workflow(config_data: dict,
                            format                = ms.PointCloudFormatPLY, # MS vs > 2.0.0
                            crs                   = StereoProject.chunk.crs)
 
+##### (OPTIONAL) change detection between consecutive epochs with precision maps as level of detection
+    change_detection = config_data['metashape']['export'].get('change_detection') or {}
+
+    if change_detection.get('use', False) == True:
+        ppp.Export.change_detection(project        = StereoProject,
+                                    tile_size      = change_detection.get('tile_size') or 10.0,
+                                    core_spacing   = change_detection.get('core_spacing'),
+                                    grid_cell_size = change_detection.get('grid_cell_size'))
+
 
 ##### (Finally): return the final project instance
     return StereoProject
\ No newline at end of file
@@ -1,11 +1,15 @@
 # SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-try:
-    from .StereoProject.MakoG319_workflow import *
-    from .DroneProject.M2EA_workflow      import *
-    from .DroneProject.M3T_workflow       import *
-except:
-    pass
+from PyExpress import _lazy
 
-from .DroneProject.TEST_workflow import *
\ No newline at end of file
+__getattr__, __dir__, __all__ = _lazy.attach(__name__,
+                                             submodules = ['DroneProject', 'StereoProject', 'UserSettings'],
+                                             attributes = ['StereoProject.MakoG319_workflow',
+                                                           'DroneProject.M2EA_workflow',
+                                                           'DroneProject.M3T_workflow',
+                                                           'DroneProject.TEST_workflow'],
+                                             legacy     = ['StereoProject.MakoG319_workflow',
+                                                           'DroneProject.M2EA_workflow',
+                                                           'DroneProject.M3T_workflow',
+                                                           'DroneProject.TEST_workflow'])
@@ -1,7 +1,12 @@
 # SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
 # SPDX-License-Identifier: GPL-3.0-or-later
 
-from PyExpress import DataManagement
-from PyExpress import ImageAnalysis
-from PyExpress import UtilityTools
-from PyExpress import WorkflowExamples
\ No newline at end of file
+# subpackages are imported on first access, e.g. PyExpress.UtilityTools does not load Metashape
+from PyExpress import _lazy
+
+__getattr__, __dir__, __all__ = _lazy.attach(__name__,
+                                             submodules = ['DataAnalysis',
+                                                           'DataManagement',
+                                                           'ImageAnalysis',
+                                                           'UtilityTools',
+                                                           'WorkflowExamples'])
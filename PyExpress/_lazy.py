@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import ast
+import sys
+import warnings
+import importlib
+
+###############################################################################
+# lazy loading of package content (PEP 562)
+
+def module_all(package_name: str, module: str):
+
+    '''
+    Reads __all__ of a submodule from its source without importing it.
+
+    *args:
+        package_name: __name__ of the package\n
+        module: submodule name relative to the package, e.g. 'MetashapeMethods.main_workflow'
+
+    Returns:
+        List of the names in __all__
+    '''
+
+    base = os.path.join(os.path.dirname(sys.modules[package_name].__file__), *module.split('.'))
+    path = base + '.py' if os.path.exists(base + '.py') else os.path.join(base, '__init__.py')
+
+    with open(path, 'r', encoding='utf-8') as file:
+        tree = ast.parse(file.read(), path)
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == '__all__' for target in node.targets):
+            return list(ast.literal_eval(node.value))
+
+    raise ImportError(f'{package_name}.{module} does not define a literal __all__')
+
+def attach(package_name: str,
+           submodules:   list = (),
+           attributes:   list = None,
+           aliases:      dict = None,
+           legacy:       list = ()):
+
+    '''
+    Creates module level __getattr__ and __dir__ functions for a package, which import
+    submodules and their content on first access instead of at package import.
+    Loaded attributes are stored in the package, so the import happens only once.
+    The re-exported attributes are the __all__ lists of the submodules, read from their source.
+
+    Use (in a package __init__.py):
+        __getattr__, __dir__, __all__ = _lazy.attach(__name__,
+                                                     submodules = ['local'],
+                                                     attributes = ['local'])
+
+    *args:
+        package_name: __name__ of the package\n
+        submodules: names of submodules available as package attributes\n
+        attributes: submodules whose __all__ is re-exported, or {submodule: [attribute names]}\n
+        aliases: {name: (absolute module name, attribute name)} - renamed or external attributes\n
+        legacy: submodules formerly imported with *, whose other module level names
+                (e.g. imported modules) still resolve with a DeprecationWarning
+
+    Returns:
+        __getattr__, __dir__ and __all__ of the package
+    '''
+
+    if not isinstance(attributes or {}, dict):
+        attributes = {module: module_all(package_name, module) for module in attributes}
+
+    attributes = attributes or {}
+    aliases    = aliases or {}
+    origins    = {name: (f'{package_name}.{module}', name) for module, names in attributes.items() for name in names}
+    origins.update(aliases)
+    submodules = set(submodules)
+    names      = sorted(submodules | set(origins))
+
+    def __getattr__(name: str):
+
+        if name in origins:
+            module_name, attribute = origins[name]
+            value = getattr(importlib.import_module(module_name), attribute)
+        elif name in submodules:
+            value = importlib.import_module(f'{package_name}.{name}')
+        else:
+            value = legacy_attribute(name)
+
+        setattr(sys.modules[package_name], name, value)
+
+        return value
+
+    def legacy_attribute(name: str):
+
+        if not name.startswith('_'):
+            for module in legacy:
+                module = importlib.import_module(f'{package_name}.{module}')
+                if hasattr(module, name):
+                    warnings.warn(f'{package_name}.{name} is no longer re-exported, import it from '
+                                  f'{module.__name__} or its origin instead', DeprecationWarning, stacklevel=3)
+                    return getattr(module, name)
+
+        raise AttributeError(f'module {package_name!r} has no attribute {name!r}')
+
+    def __dir__():
+
+        return names
+
+    return __getattr__, __dir__, [name for name in names if not name.startswith('_')]
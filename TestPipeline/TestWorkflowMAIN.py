@@ -48,6 +48,10 @@ config_dir   = os.path.normpath(config_dir)
 config_path  = os.path.join(config_dir, config_file)
 config_data  = hlp.open_parameters(config_path)
 
+# Answer prompts without user interaction if headless mode is enabled
+# (config: metashape.document.headless or environment variable PYEXPRESS_HEADLESS=1)
+hlp.configure_headless(config_data)
+
 # Extract processing steps to be performed beforehand
 new_project  = config_data['input']['general']['new_project']
 transfer_img = config_data['input']['image']['preproc']['transfer']
@@ -90,7 +94,7 @@ if new_project == True:
                                                             config_name = config_file)     
 
 # e) Optionally delete log file after processing
-    if input('Delete lock file [y,n]?: ') == 'y': MultiProject.doc.clear()
+    if hlp.ask('Delete lock file [y,n]?: ', key='delete_lock_file') == 'y': MultiProject.doc.clear()
 
 ###############################################################################
 # EXISTING PROJECT: Resume or recalculate photogrammetric data analysis
@@ -108,7 +112,7 @@ if new_project == False:
                                                             config_name = config_file)          
 
 # c) Optionally delete log file after processing
-    if input('Delete lock file [y,n]?: ') == 'y': MultiProject.doc.clear()
+    if hlp.ask('Delete lock file [y,n]?: ', key='delete_lock_file') == 'y': MultiProject.doc.clear()
     
 ###############################################################################
 # Execution time log
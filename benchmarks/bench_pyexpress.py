@@ -0,0 +1,232 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+'''
+Benchmark suite for the Python side of PyExpress on top of the offline Metashape stand-in
+(fake_metashape.py). Measures export loops, palette rasters, marker import, precision maps, region fitting,
+saving and logging; Metashape processing itself takes no time here.
+
+Results are compared with the stored baselines in benchmarks/baselines.json. Baselines are
+machine dependent: store them once per machine/runner before comparing changes.
+
+Use:
+    python benchmarks/bench_pyexpress.py                          # small sizes, compare with baselines
+    python benchmarks/bench_pyexpress.py --size large             # e.g. 1M tie points, 5k cameras
+    python benchmarks/bench_pyexpress.py --case precision_map     # single case
+    python benchmarks/bench_pyexpress.py --save-baseline          # store results as new baselines
+    python benchmarks/bench_pyexpress.py --check 1.25             # exit code 1 if a case is >25 % slower
+'''
+
+import os, io, sys, copy, json, time, shutil, argparse, tempfile, statistics, contextlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR  = os.path.dirname(BENCH_DIR)
+
+sys.path[:0] = [BENCH_DIR, REPO_DIR]
+
+import fake_metashape
+fake_metashape.install()
+
+import yaml
+import PyExpress.ImageAnalysis as ppp
+import PyExpress.UtilityTools  as hlp
+
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baselines.json')
+CONFIG_FILE   = os.path.join(REPO_DIR, 'TestPipeline', 'TEST_config_NEW.yaml')
+
+SIZES = {'small': {'frames': 4,  'cameras': 20,   'tie_points': 20000,   'markers': 10, 'projections': 10},
+         'large': {'frames': 10, 'cameras': 5000, 'tie_points': 1000000, 'markers': 40, 'projections': 50}}
+
+###############################################################################
+# project setup
+
+def make_project(workdir: str, project_type: str = 'stereo', **sizes):
+
+    '''
+    Creates a new PyExpress project in workdir and fills its chunk with synthetic content.
+
+    *args:
+        workdir: empty working directory\n
+        project_type: ['stereo', 'drone']
+
+    **kwargs:
+        sizes, see fake_metashape.populate()
+
+    Returns:
+        PyExpress project
+    '''
+
+    with open(CONFIG_FILE, 'r') as file:
+        config_data = yaml.safe_load(file)
+
+    config_data['input']['general']['new_project']                  = True
+    config_data['input']['general']['ID_source']                    = 'string'
+    config_data['input']['general']['ID_string']                    = 'BENCH'
+    config_data['input']['marker_reference']['projections_path']    = os.path.join(workdir, 'marker_projections.csv')
+    config_data['metashape']['general']['type']                     = 'RGB' if project_type == 'stereo' else 'IR'
+    config_data['metashape']['initialization']['GUIversion']        = fake_metashape.version
+    config_data['metashape']['document']['headless']['use']         = True
+
+    project_class = ppp.StereoProject if project_type == 'stereo' else ppp.DroneProject
+
+    project = project_class(config_data = config_data,
+                            project_dir = workdir,
+                            image_dir   = os.path.join(workdir, 'images'),
+                            config_name = 'bench.yaml')
+
+    fake_metashape.populate(project.chunk, **sizes)
+
+    return project
+
+def write_marker_csv(project: object, path: str):
+
+    ''' Writes the marker projections of the chunk as CSV (GCP, IMG, x, y) and removes the markers. '''
+
+    with open(path, 'w') as file:
+        for marker in project.chunk.markers:
+            for camera, projection in marker.projections.items():
+                file.write(f'{marker.label},{camera.label},{projection.coord[0]:.3f},{projection.coord[1]:.3f}\n')
+
+    project.chunk.markers = []
+
+###############################################################################
+# benchmark cases: setup(workdir, sizes) -> state, run(state)
+
+def _setup_export(workdir, sizes):
+    return make_project(workdir, 'stereo', **dict(sizes, tie_points=100))
+
+def _run_export(project):
+    ppp.Export.export_from_list(project, ['dem', 'ortho', 'dem_trafo', 'ortho_trafo', 'model', 'tiled_model',
+                                          'camera', 'point_cloud', 'report', 'marker'])
+
+def _setup_raster_transform(workdir, sizes):
+    fake_metashape.raster_size = (4096, 4096) if sizes['cameras'] > 100 else (1024, 1024)
+    project = make_project(workdir, 'stereo', **dict(sizes, frames=1, tie_points=100))
+    project.chunk.raster_transform.palette = {-1: (0, 0, 255), 20: (0, 255, 0), 40: (255, 0, 0)}
+    return project
+
+def _run_raster_transform(project):
+    try:
+        ppp.Export.raster_transform(project, export_type='ortho', source_data=fake_metashape.DataSource.OrthomosaicData)
+    finally:
+        fake_metashape.raster_size = None
+
+def _setup_precision_map(workdir, sizes):
+    return make_project(workdir, 'stereo', **dict(sizes, frames=1))
+
+def _run_precision_map(project):
+    ppp.Export.precision_map(project)
+
+def _setup_region(workdir, sizes):
+    return make_project(workdir, 'stereo', **sizes)
+
+def _run_region(project):
+    ppp.BBox.redefine_auto_multiframe(project, reference_ID=0)
+
+def _setup_marker_import(workdir, sizes):
+    project = make_project(workdir, 'drone', **dict(sizes, frames=1, tie_points=100))
+    write_marker_csv(project, project.marker_proj_path)
+    return project
+
+def _run_marker_import(project):
+    ppp.Reference.import_marker_proj(project, coord_system='local')
+
+def _setup_save(workdir, sizes):
+    return make_project(workdir, 'drone', **dict(sizes, frames=1, tie_points=100))
+
+def _run_save(project):
+    for _ in range(20):
+        project.saveMetashapeProject(active_chunk=project.chunk.label)
+
+def _setup_logging(workdir, sizes):
+    return make_project(workdir, 'drone', **dict(sizes, frames=1, tie_points=100))
+
+def _run_logging(project):
+    for i in range(10000):
+        project.logging(f'benchmark message {i}')
+    hlp.flush_process_logs()
+
+CASES = {'export_from_list':         (_setup_export,        _run_export),
+         'raster_transform':         (_setup_raster_transform, _run_raster_transform),
+         'precision_map':            (_setup_precision_map, _run_precision_map),
+         'redefine_auto_multiframe': (_setup_region,        _run_region),
+         'import_marker_proj':       (_setup_marker_import, _run_marker_import),
+         'save_project':             (_setup_save,          _run_save),
+         'logging':                  (_setup_logging,       _run_logging)}
+
+###############################################################################
+# execution
+
+def run_case(name: str, sizes: dict, repeat: int):
+
+    '''
+    Runs a benchmark case in fresh temporary directories.
+
+    Returns:
+        List of run times in seconds
+    '''
+
+    setup, run = CASES[name]
+    timings    = []
+
+    for _ in range(repeat):
+        workdir = tempfile.mkdtemp(prefix=f'pyexpress_bench_{name}_')
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                state = setup(workdir, sizes)
+                start = time.perf_counter()
+                run(state)
+                timings.append(time.perf_counter() - start)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return timings
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Benchmarks of PyExpress on a fake Metashape backend.')
+    parser.add_argument('--size',          default='small', choices=list(SIZES))
+    parser.add_argument('--case',          action='append', choices=list(CASES), help='run selected cases only')
+    parser.add_argument('--repeat',        type=int, default=3)
+    parser.add_argument('--save-baseline', action='store_true', help='store the results in baselines.json')
+    parser.add_argument('--check',         type=float, help='allowed slowdown factor against the baseline')
+    args = parser.parse_args()
+
+    baselines = dict()
+
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, 'r') as file:
+            baselines = json.load(file)
+
+    baseline = baselines.get(args.size, {})
+    sizes    = SIZES[args.size]
+    results  = dict()
+    failed   = []
+
+    print(f'PyExpress benchmarks ({args.size}: {sizes})\n')
+    print(f'{"case":<28}{"median [s]":>12}{"baseline [s]":>14}{"ratio":>8}')
+
+    for name in args.case or list(CASES):
+        median        = statistics.median(run_case(name, sizes, args.repeat))
+        results[name] = round(median, 4)
+        reference     = baseline.get(name)
+        ratio         = median / reference if reference else None
+
+        if args.check and ratio and ratio > args.check:
+            failed.append(name)
+
+        print(f'{name:<28}{median:>12.4f}{reference if reference else "-":>14}'
+              f'{f"{ratio:.2f}" if ratio else "-":>8}')
+
+    if args.save_baseline:
+        baselines[args.size] = dict(baseline, **results)
+        with open(BASELINE_FILE, 'w') as file:
+            json.dump(baselines, file, indent=2)
+        print(f'\nBaselines stored in {BASELINE_FILE}')
+
+    if failed:
+        print(f'\nSlower than {args.check} x baseline: {", ".join(failed)}')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,993 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+'''
+Offline stand-in for the Metashape Python API, used to benchmark and test the Python side of
+PyExpress without a licensed Metashape installation.
+
+The module implements the subset of the API used by PyExpress: documents, chunks, frames,
+cameras, sensors, markers, tie points, regions, transforms and coordinate systems. Processing
+and export methods do not compute anything; they report progress and write small placeholder
+files. If raster_size is set, raster exports to TIFF write synthetic tiled GeoTIFFs of that size. Tie points are stored as NumPy arrays and wrapped into point objects on access, similar
+to the real API, so synthetic chunks with millions of tie points remain cheap to create.
+
+Use:
+    import fake_metashape
+    fake_metashape.install()                 # registers the module as 'Metashape'
+
+    import PyExpress.ImageAnalysis as ppp
+    project = ppp.StereoProject(...)
+    fake_metashape.populate(project.chunk, frames=10, cameras=2, tie_points=100000, markers=8)
+'''
+
+import os, sys, copy, json, math, random
+
+import numpy as np
+
+version = '2.1.2'
+
+# (rows, cols) of synthetic raster exports; None: placeholder files
+raster_size = None
+
+###############################################################################
+# enumerations
+
+class _Enum():
+
+    ''' Named constant; str() matches the Metashape representation, e.g. Metashape.ImageFormatTIFF. '''
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return f'Metashape.{self.name}'
+
+    __str__ = __repr__
+
+    def __eq__(self, other):
+        return isinstance(other, _Enum) and other.name == self.name
+
+    def __hash__(self):
+        return hash(self.name)
+
+
+class _EnumNamespace():
+
+    ''' Namespace returning a constant for every attribute, e.g. Metashape.DataSource.ElevationData. '''
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, name: str):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        value = _Enum(f'{self._name}.{name}')
+        setattr(self, name, value)
+        return value
+
+
+DataSource = _EnumNamespace('DataSource')
+PointClass = _EnumNamespace('PointClass')
+
+def __getattr__(name: str):
+
+    # remaining module level constants, e.g. Metashape.ImageFormatTIFF or Metashape.RasterTransformPalette
+    if name[:1].isupper():
+        value = _Enum(name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module 'Metashape' has no attribute {name!r}")
+
+###############################################################################
+# geometry
+
+class Vector():
+
+    def __init__(self, values):
+        self._v = [float(v) for v in values]
+
+    def __getitem__(self, i):
+        return self._v[i]
+
+    def __setitem__(self, i, value):
+        self._v[i] = float(value)
+
+    def __len__(self):
+        return len(self._v)
+
+    def __iter__(self):
+        return iter(self._v)
+
+    def __repr__(self):
+        return f'Vector({self._v})'
+
+    def __add__(self, other):
+        return Vector([a + b for a, b in zip(self._v, other)])
+
+    def __sub__(self, other):
+        return Vector([a - b for a, b in zip(self._v, other)])
+
+    def __mul__(self, other):
+        if isinstance(other, Vector):
+            return sum(a * b for a, b in zip(self._v, other))
+        return Vector([a * other for a in self._v])
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        return Vector([a / other for a in self._v])
+
+    @property
+    def size(self):
+        return len(self._v)
+
+    @size.setter
+    def size(self, value):
+        self._v = (self._v + [1.0] * value)[:value]
+
+    @property
+    def x(self):
+        return self._v[0]
+
+    @property
+    def y(self):
+        return self._v[1]
+
+    @property
+    def z(self):
+        return self._v[2]
+
+    @property
+    def norm(self):
+        return math.sqrt(sum(a * a for a in self._v))
+
+    def normalized(self):
+        return self / self.norm
+
+    def copy(self):
+        return Vector(self._v)
+
+
+class Matrix():
+
+    def __init__(self, rows):
+        self._m = [[float(v) for v in row] for row in rows]
+
+    @staticmethod
+    def Diag(values):
+        n = len(values)
+        return Matrix([[values[i] if i == j else 0 for j in range(n)] for i in range(n)])
+
+    @staticmethod
+    def Translation(vector):
+        m = Matrix.Diag((1, 1, 1, 1))
+        for i in range(3):
+            m._m[i][3] = vector[i]
+        return m
+
+    @staticmethod
+    def Rotation(rotation):
+        m = Matrix.Diag((1, 1, 1, 1))
+        for i in range(3):
+            for j in range(3):
+                m._m[i][j] = rotation[i, j]
+        return m
+
+    @staticmethod
+    def Scale(vector):
+        return Matrix.Diag((vector[0], vector[1], vector[2], 1))
+
+    def __getitem__(self, index):
+        i, j = index
+        return self._m[i][j]
+
+    def __setitem__(self, index, value):
+        i, j = index
+        self._m[i][j] = float(value)
+
+    def __repr__(self):
+        return f'Matrix({self._m})'
+
+    @property
+    def size(self):
+        return (len(self._m), len(self._m[0]))
+
+    def __mul__(self, other):
+        if isinstance(other, Matrix):
+            cols = list(zip(*other._m))
+            return Matrix([[sum(a * b for a, b in zip(row, col)) for col in cols] for row in self._m])
+        if isinstance(other, Vector):
+            return Vector([sum(a * b for a, b in zip(row, other)) for row in self._m])
+        return Matrix([[a * other for a in row] for row in self._m])
+
+    __rmul__ = __mul__
+
+    def mulp(self, point):
+        return self * Vector(list(point)[:3] + [1.0]) if len(self._m) == 4 else self * point
+
+    def mulv(self, vector):
+        return Vector([sum(self._m[i][j] * vector[j] for j in range(3)) for i in range(3)])
+
+    def t(self):
+        return Matrix(list(zip(*self._m)))
+
+    def inv(self):
+        return Matrix(np.linalg.inv(np.array(self._m)).tolist())
+
+    def rotation(self):
+        return Matrix([row[:3] for row in self._m[:3]])
+
+    def translation(self):
+        return Vector([row[3] for row in self._m[:3]])
+
+    def scale(self):
+        return Vector(self.rotation() * Vector((1, 0, 0))).norm
+
+
+class CoordinateSystem():
+
+    ''' Coordinate system with an identity projection; localframe() returns the identity matrix. '''
+
+    def __init__(self, wkt: str = 'EPSG::4326'):
+        self.wkt  = wkt
+        self.name = wkt
+
+    def __repr__(self):
+        return f"CoordinateSystem('{self.wkt}')"
+
+    def __bool__(self):
+        return True
+
+    def project(self, point):
+        return Vector(list(point)[:3])
+
+    def unproject(self, point):
+        return Vector(list(point)[:3])
+
+    def localframe(self, point):
+        return Matrix.Diag((1, 1, 1, 1))
+
+    @staticmethod
+    def transform(point, source, target):
+        return Vector(list(point)[:3])
+
+
+class OrthoProjection():
+
+    def __init__(self):
+        self.crs  = None
+        self.type = _Enum('OrthoProjection.Type.Planar')
+
+
+class ChunkTransform():
+
+    def __init__(self, scale: float = 1.0):
+        self.scale       = scale
+        self.rotation    = Matrix.Diag((1, 1, 1))
+        self.translation = Vector((0, 0, 0))
+
+    @property
+    def matrix(self):
+        return Matrix.Translation(self.translation) * Matrix.Rotation(self.rotation) * Matrix.Scale((self.scale,) * 3)
+
+
+class Region():
+
+    def __init__(self):
+        self.center = Vector((0, 0, 0))
+        self.size   = Vector((1, 1, 1))
+        self.rot    = Matrix.Diag((1, 1, 1))
+
+###############################################################################
+# tie points
+
+class _TiePoint():
+
+    __slots__ = ('_points', '_index')
+
+    def __init__(self, points, index):
+        self._points = points
+        self._index  = index
+
+    @property
+    def coord(self):
+        return Vector(self._points._coords[self._index].tolist() + [1.0])
+
+    @property
+    def cov(self):
+        return Matrix(self._points._covs[self._index].tolist())
+
+    @property
+    def valid(self):
+        return bool(self._points._valid[self._index])
+
+    @valid.setter
+    def valid(self, value):
+        self._points._valid[self._index] = value
+
+    @property
+    def selected(self):
+        return bool(self._points._selected[self._index])
+
+    @selected.setter
+    def selected(self, value):
+        self._points._selected[self._index] = value
+
+    @property
+    def track_id(self):
+        return self._index
+
+
+class _TiePointList():
+
+    ''' Sequence view on the tie point arrays; point objects are created on access. '''
+
+    def __init__(self, tie_points):
+        self._coords   = tie_points._coords
+        self._covs     = tie_points._covs
+        self._valid    = tie_points._valid
+        self._selected = tie_points._selected
+
+    def __len__(self):
+        return len(self._coords)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return _TiePoint(self, index)
+
+    def __iter__(self):
+        for index in range(len(self._coords)):
+            yield _TiePoint(self, index)
+
+
+class _TrackProjection():
+
+    __slots__ = ('coord', 'size', 'track_id')
+
+    def __init__(self, coord, track_id):
+        self.coord    = coord
+        self.size     = 1.0
+        self.track_id = track_id
+
+
+class _TiePointProjections():
+
+    ''' projections[camera]: tie point projections of a camera, PROJECTIONS_PER_CAMERA random tracks. '''
+
+    PROJECTIONS_PER_CAMERA = 100
+
+    def __init__(self, tie_points):
+        self._count = len(tie_points._coords)
+
+    def __getitem__(self, camera):
+        if not self._count:
+            return []
+        rng = np.random.default_rng(camera.key)
+        ids = np.unique(rng.integers(0, self._count, size=min(self._count, self.PROJECTIONS_PER_CAMERA)))
+        return [_TrackProjection(Vector((0.0, 0.0)), int(i)) for i in ids]
+
+
+class TiePoints():
+
+    class Filter():
+
+        Criterion = _EnumNamespace('TiePoints.Filter.Criterion')
+
+        def init(self, chunk, criterion):
+            tie_points     = chunk.tie_points
+            self._points   = tie_points
+            self._values   = tie_points._error
+            self.min_value = float(self._values.min()) if len(self._values) else 0.0
+            self.max_value = float(self._values.max()) if len(self._values) else 0.0
+
+        def selectPoints(self, threshold):
+            self._points._selected[:] = self._values > threshold
+
+        def removePoints(self, threshold):
+            self._points._valid[self._values > threshold] = False
+
+    def __init__(self, count: int = 0, seed: int = 0, center=(0, 0, 0), extent: float = 10.0):
+
+        rng            = np.random.default_rng(seed)
+        self._coords   = rng.normal(center, extent / 4, size=(count, 3))
+        sigma          = rng.uniform(1e-4, 1e-2, size=(count, 3))
+        self._covs     = np.einsum('ni,ij->nij', sigma ** 2, np.eye(3))
+        self._valid    = rng.random(count) > 0.02
+        self._selected = np.zeros(count, dtype=bool)
+        self._error    = rng.gamma(2.0, 0.25, size=count)
+
+    @property
+    def points(self):
+        return _TiePointList(self)
+
+    @property
+    def tracks(self):
+        return [None] * len(self._coords)
+
+    @property
+    def projections(self):
+        return _TiePointProjections(self)
+
+    def copy(self):
+        return copy.deepcopy(self)
+
+###############################################################################
+# cameras, sensors, markers
+
+class Calibration():
+
+    def __init__(self):
+        self.f, self.cx, self.cy = 0.0, 0.0, 0.0
+        self.k1, self.k2, self.k3, self.k4 = 0.0, 0.0, 0.0, 0.0
+        self.p1, self.p2, self.b1, self.b2 = 0.0, 0.0, 0.0, 0.0
+        self.width, self.height = 0, 0
+        self.type = _Enum('Sensor.Type.Frame')
+
+    def load(self, path: str, format=None):
+        with open(path, 'r') as file:
+            self.__dict__.update(json.load(file))
+
+    def save(self, path: str, format=None):
+        with open(path, 'w') as file:
+            json.dump({k: v for k, v in self.__dict__.items() if k != 'type'}, file)
+
+
+class Sensor():
+
+    class Type():
+        Frame       = _Enum('Sensor.Type.Frame')
+        Fisheye     = _Enum('Sensor.Type.Fisheye')
+        Spherical   = _Enum('Sensor.Type.Spherical')
+        Cylindrical = _Enum('Sensor.Type.Cylindrical')
+        RPC         = _Enum('Sensor.Type.RPC')
+
+    def __init__(self, label: str = 'sensor'):
+        self.label             = label
+        self.type              = Sensor.Type.Frame
+        self.width, self.height = 4000, 3000
+        self.pixel_width       = 0.0015
+        self.pixel_height      = 0.0015
+        self.focal_length      = 8.0
+        self.calibration       = Calibration()
+        self.user_calib        = None
+        self.fixed             = False
+        self.fixed_calibration = False
+        self.fixed_params      = []
+        self.bands             = ['Red', 'Green', 'Blue']
+        self.black_level       = []
+        self.sensitivity       = []
+        self.key               = id(self)
+        self.master            = self
+        self.photo_params      = {'Make': 'FAKE', 'Model': 'FAKE-CAM', 'SerialNumber': '0001'}
+
+
+class Photo():
+
+    def __init__(self, path: str):
+        self.path = path
+        self.meta = {}
+
+
+class Camera():
+
+    class Reference():
+        def __init__(self):
+            self.location, self.rotation = None, None
+            self.enabled                 = True
+
+    def __init__(self, label: str, path: str, sensor: Sensor, key: int):
+        self.label     = label
+        self.key       = key
+        self.photo     = Photo(path)
+        self.sensor    = sensor
+        self.enabled   = True
+        self.reference = Camera.Reference()
+        self.transform = Matrix.Diag((1, 1, 1, 1))
+        self.center    = Vector((0, 0, 0))
+        self.frames    = [self]
+
+
+class Marker():
+
+    class Projection():
+        def __init__(self, coord, pinned: bool = False):
+            self.coord  = coord
+            self.pinned = pinned
+            self.valid  = True
+
+    class Reference():
+        enabled  = True
+        location = None
+        accuracy = None
+
+    def __init__(self, label: str, key: int):
+        self.label       = label
+        self.key         = key
+        self.projections = dict()
+        self.reference   = Marker.Reference()
+        self.position    = Vector((0, 0, 0))
+        self.enabled     = True
+
+
+class Scalebar():
+
+    class Reference():
+        def __init__(self):
+            self.distance, self.accuracy, self.enabled = None, None, True
+
+    def __init__(self, point0, point1):
+        self.point0, self.point1 = point0, point1
+        self.reference           = Scalebar.Reference()
+        self.label               = f'{point0.label}_{point1.label}'
+
+###############################################################################
+# data products
+
+class PointCloud():
+
+    class Filter():
+        def init(self, chunk, criterion):
+            TiePoints.Filter.init(self, chunk, criterion)
+        selectPoints = TiePoints.Filter.selectPoints
+        removePoints = TiePoints.Filter.removePoints
+
+    def __init__(self, label: str = 'point cloud', meta: dict = None):
+        self.label = label
+        self.key   = random.randint(0, 2**31)
+        self.meta  = dict(meta or {})
+        self.point_count = 0
+
+    def classifyGroundPoints(self, progress=None, **kwargs):
+        _report(progress)
+
+    def setClassesFilter(self, *args, **kwargs):
+        pass
+
+    def resetFilters(self):
+        pass
+
+    def assignClass(self, *args, **kwargs):
+        pass
+
+    def removePoints(self, *args, **kwargs):
+        pass
+
+    def renderPreview(self, *args, **kwargs):
+        return None
+
+    def copy(self):
+        return copy.copy(self)
+
+
+class RasterTransform():
+
+    def __init__(self):
+        self.formula    = []
+        self.range      = (0.0, 1.0)
+        self.palette    = {}
+        self.enabled    = False
+        self.false_color = []
+
+    def calibrateRange(self):
+        self.range = (-1.0, 1.0)
+
+
+class _Product():
+
+    def __init__(self, label: str, meta: dict = None):
+        self.label = label
+        self.key   = random.randint(0, 2**31)
+        self.meta  = dict(meta or {})
+
+def _meta(method: str, kwargs: dict):
+
+    ''' Processing parameters of a product like the product metadata of Metashape, e.g. 'BuildDem/interpolation'. '''
+
+    return {f'{method}/{key}': str(value) for key, value in kwargs.items()}
+
+###############################################################################
+# chunk and document
+
+def _report(progress, steps: int = 5):
+
+    ''' Reports progress like a processing method; returns immediately. '''
+
+    if progress is None:
+        return
+
+    for i in range(1, steps + 1):
+        progress(100 * i / steps)
+
+
+def _write_raster(path: str, raster_transform=None, source_data=None, bands: int = 1):
+
+    ''' Writes a synthetic tiled GeoTIFF: values/DEM as float32 with a nodata corner, otherwise RGB. '''
+
+    import tifffile
+
+    rows, cols = raster_size
+    transform  = getattr(raster_transform, 'name', '')
+    as_values  = transform == 'RasterTransformValue' or 'Elevation' in getattr(source_data, 'name', '')
+    samples    = bands if as_values else 3
+    tile       = 256
+
+    def tiles():
+        for y in range(0, rows, tile):
+            for x in range(0, cols, tile):
+                yy, xx = np.mgrid[y:y + tile, x:x + tile]
+                values = 20 + 20 * np.sin(yy / 97.0) * np.cos(xx / 131.0)
+                values[(yy < rows // 8) & (xx < cols // 8)] = -32767
+                if not as_values:
+                    yield np.repeat(np.clip(values * 6, 0, 255)[..., None], 3, axis=2).astype(np.uint8)
+                elif samples == 1:
+                    yield values.astype(np.float32)
+                else:
+                    yield np.repeat(values[..., None], samples, axis=2).astype(np.float32)
+
+    tifffile.imwrite(path, tiles(),
+                     shape        = (rows, cols, samples) if samples > 1 else (rows, cols),
+                     dtype        = np.float32 if as_values else np.uint8,
+                     tile         = (tile, tile),
+                     compression  = 'zlib',
+                     photometric  = 'rgb' if not as_values else 'minisblack',
+                     planarconfig = 'contig' if samples > 1 else None,
+                     metadata     = None,
+                     extratags    = [(33550, 'd', 3, (0.05, 0.05, 0.0), True),
+                                     (33922, 'd', 6, (0.0, 0.0, 0.0, 500000.0, 5700000.0, 0.0), True),
+                                     (34735, 'H', 16, (1, 1, 0, 3, 1024, 0, 1, 1, 1025, 0, 1, 1, 3072, 0, 1, 32632), True)])
+
+def _write_placeholder(path: str, content: str = ''):
+
+    with open(path, 'w') as file:
+        file.write(content or f'fake Metashape export: {os.path.basename(path)}\n')
+
+
+class Chunk():
+
+    def __init__(self, label: str = 'Chunk 1', document=None):
+        self.label                        = label
+        self.key                          = random.randint(0, 2**31)
+        self.enabled                      = True
+        self.cameras                      = []
+        self.markers                      = []
+        self.sensors                      = []
+        self.scalebars                    = []
+        self.tie_points                   = None
+        self.point_cloud                  = None
+        self.dense_cloud                  = None
+        self.model                        = None
+        self.tiled_model                  = None
+        self.elevation                    = None
+        self.orthomosaic                  = None
+        self.crs                          = CoordinateSystem('EPSG::32632')
+        self.world_crs                    = CoordinateSystem('EPSG::4978')
+        self.marker_crs                   = CoordinateSystem('EPSG::4326')
+        self.camera_crs                   = CoordinateSystem('EPSG::4326')
+        self.transform                    = ChunkTransform()
+        self.region                       = Region()
+        self.raster_transform             = RasterTransform()
+        self.marker_location_accuracy     = Vector((0.005, 0.005, 0.005))
+        self.marker_projection_accuracy   = 0.5
+        self.tiepoint_accuracy            = 1.0
+        self.scalebar_accuracy            = 0.001
+        self.camera_location_accuracy     = Vector((10, 10, 10))
+        self.camera_rotation_accuracy     = Vector((10, 10, 10))
+        self._frames                      = None
+        self._document                    = document
+
+    @property
+    def frames(self):
+        return self._frames if self._frames else [self]
+
+    @property
+    def frame(self):
+        return 0
+
+    def addCamera(self, sensor=None):
+        sensor = sensor or (self.sensors[0] if self.sensors else self.addSensor())
+        camera = Camera(f'IMG_{len(self.cameras):05d}', '', sensor, len(self.cameras))
+        self.cameras.append(camera)
+        return camera
+
+    def addSensor(self, source=None):
+        sensor = Sensor(f'sensor {len(self.sensors)}')
+        self.sensors.append(sensor)
+        return sensor
+
+    def addMarker(self, point=None, visibility=False):
+        marker = Marker(f'point {len(self.markers) + 1}', len(self.markers))
+        self.markers.append(marker)
+        return marker
+
+    def addScalebar(self, point0, point1):
+        scalebar = Scalebar(point0, point1)
+        self.scalebars.append(scalebar)
+        return scalebar
+
+    def addPhotos(self, filenames=None, progress=None, **kwargs):
+        for path in filenames or []:
+            camera             = self.addCamera()
+            camera.label       = os.path.splitext(os.path.basename(path))[0]
+            camera.photo.path  = path
+        _report(progress)
+
+    def copy(self, items=None, keypoints=True):
+        duplicate           = copy.deepcopy(self, {id(self._document): self._document})
+        duplicate.label     = f'{self.label} Copy'
+        if self._document is not None:
+            self._document.chunks.append(duplicate)
+        return duplicate
+
+    def remove(self, items):
+        for item in items:
+            for collection in (self.cameras, self.markers, self.sensors, self.scalebars):
+                if item in collection:
+                    collection.remove(item)
+
+    # processing
+
+    def matchPhotos(self, progress=None, **kwargs):
+        if self.tie_points is None:
+            self.tie_points = TiePoints(0)
+        _report(progress)
+
+    def alignCameras(self, progress=None, **kwargs):
+        _report(progress)
+
+    def buildDepthMaps(self, progress=None, **kwargs):
+        _report(progress)
+
+    def buildPointCloud(self, progress=None, **kwargs):
+        self.point_cloud = PointCloud(meta=_meta('BuildPointCloud', kwargs))
+        _report(progress)
+
+    def buildDenseCloud(self, progress=None, **kwargs):
+        self.dense_cloud = PointCloud('dense cloud', _meta('BuildDenseCloud', kwargs))
+        _report(progress)
+
+    def buildModel(self, progress=None, **kwargs):
+        self.model = _Product('model', _meta('BuildModel', kwargs))
+        _report(progress)
+
+    def buildUV(self, progress=None, **kwargs):
+        _report(progress)
+
+    def buildTexture(self, progress=None, **kwargs):
+        _report(progress)
+
+    def buildTiledModel(self, progress=None, **kwargs):
+        self.tiled_model = _Product('tiled model', _meta('BuildTiledModel', kwargs))
+        _report(progress)
+
+    def buildDem(self, progress=None, **kwargs):
+        self.elevation = _Product('DEM', _meta('BuildDem', kwargs))
+        _report(progress)
+
+    def buildOrthomosaic(self, progress=None, **kwargs):
+        self.orthomosaic = _Product('orthomosaic', _meta('BuildOrthomosaic', kwargs))
+        _report(progress)
+
+    def optimizeCameras(self, progress=None, **kwargs):
+        _report(progress)
+
+    def updateTransform(self, progress=None):
+        _report(progress)
+
+    def calibrateReflectance(self, progress=None, **kwargs):
+        _report(progress)
+
+    def locateReflectancePanels(self, progress=None, **kwargs):
+        _report(progress)
+
+    # import
+
+    def importMarkers(self, path: str, progress=None):
+        _report(progress)
+
+    def importReference(self, path: str = '', progress=None, **kwargs):
+        _report(progress)
+
+    # export
+
+    def exportRaster(self, path: str, progress=None, **kwargs):
+        if raster_size and path.lower().endswith(('.tif', '.tiff')):
+            _write_raster(path, kwargs.get('raster_transform'), kwargs.get('source_data'),
+                          bands=max(len(self.raster_transform.formula), 1))
+        else:
+            _write_placeholder(path)
+        _report(progress)
+
+    def exportModel(self, path: str, progress=None, **kwargs):
+        _write_placeholder(path)
+        _report(progress)
+
+    def exportTiledModel(self, path: str, progress=None, **kwargs):
+        _write_placeholder(path)
+        _report(progress)
+
+    def exportPointCloud(self, path: str, progress=None, **kwargs):
+        _write_placeholder(path)
+        _report(progress)
+
+    exportPoints = exportPointCloud
+
+    def exportCameras(self, path: str, progress=None, **kwargs):
+        _write_placeholder(path)
+        _report(progress)
+
+    def exportMarkers(self, path: str, progress=None, **kwargs):
+        _write_placeholder(path)
+        _report(progress)
+
+    def exportReport(self, path: str, progress=None, **kwargs):
+        _write_placeholder(path)
+        _report(progress)
+
+
+# documents saved in this process, by path: chunks are restored on open()
+_saved_documents = dict()
+
+class Document():
+
+    def __init__(self):
+        self.chunks    = []
+        self.path      = ''
+        self.read_only = False
+
+    @property
+    def chunk(self):
+        return self.chunks[0] if self.chunks else None
+
+    def addChunk(self):
+        chunk = Chunk(f'Chunk {len(self.chunks) + 1}', document=self)
+        self.chunks.append(chunk)
+        return chunk
+
+    def save(self, path: str = None, chunks: list = None, compression: int = 6, absolute_paths: bool = False,
+             version: str = None, archive: bool = True):
+
+        if path is None:
+            if self.read_only:
+                raise OSError('Document is opened in read-only mode')
+            path = self.path
+        else:
+            self.path = path if chunks is None else self.path
+
+        chunks = list(chunks) if chunks is not None else self.chunks
+
+        _saved_documents[os.path.abspath(path)] = chunks
+        _write_placeholder(path, json.dumps({'chunks': [chunk.label for chunk in chunks]}))
+
+    def open(self, path: str, read_only: bool = False, ignore_lock: bool = False, archive: bool = True):
+
+        key = os.path.abspath(path)
+
+        if key in _saved_documents:
+            self.chunks = copy.deepcopy(_saved_documents[key])
+        elif os.path.exists(path):
+            # documents of another process: synthetic chunks with the default sizes
+            self.chunks = []
+            for label in json.load(open(path))['chunks']:
+                chunk       = self.addChunk()
+                chunk.label = label
+                populate(chunk, **_default_sizes)
+        else:
+            raise OSError(f"Can't open file: {path}")
+
+        for chunk in self.chunks:
+            chunk._document = self
+
+        self.path      = path
+        self.read_only = read_only
+
+    def append(self, path: str, progress=None):
+
+        other = Document()
+        other.open(path)
+
+        for chunk in other.chunks:
+            chunk._document = self
+            self.chunks.append(chunk)
+
+    def remove(self, items):
+
+        for item in list(items):
+            if item in self.chunks:
+                self.chunks.remove(item)
+
+    def clear(self):
+
+        self.chunks = []
+        self.path   = ''
+
+
+class Application():
+
+    def __init__(self):
+        self.version            = version
+        self.activated          = True
+        self.cpu_enable         = True
+        self.gpu_mask           = 0
+        self.cpu_cores_inactive = 0
+        self.document           = Document()
+
+    def enumGPUDevices(self):
+        return []
+
+app = Application()
+
+###############################################################################
+# synthetic content and installation
+
+_default_sizes = {'frames': 1, 'cameras': 10, 'tie_points': 10000, 'markers': 8, 'projections': 4}
+
+def populate(chunk:       Chunk,
+             frames:      int = None,
+             cameras:     int = None,
+             tie_points:  int = None,
+             markers:     int = None,
+             projections: int = None,
+             seed:        int = 0):
+
+    '''
+    Fills a chunk with synthetic cameras, tie points and markers.
+
+    *args:
+        chunk: chunk to fill\n
+        frames: number of frames (multiframe/stereo chunks); each frame gets its own tie points\n
+        cameras: number of cameras per frame\n
+        tie_points: number of tie points per frame\n
+        markers: number of markers\n
+        projections: number of pinned image projections per marker\n
+        seed: random seed
+
+    Returns:
+        The populated chunk
+    '''
+
+    sizes = dict(_default_sizes)
+    sizes.update({k: v for k, v in dict(frames=frames, cameras=cameras, tie_points=tie_points,
+                                        markers=markers, projections=projections).items() if v is not None})
+
+    sensor = chunk.sensors[0] if chunk.sensors else chunk.addSensor()
+
+    frame_list = []
+
+    for f in range(sizes['frames']):
+        frame            = chunk if f == 0 else Chunk(chunk.label, document=chunk._document)
+        frame.sensors    = chunk.sensors
+        frame.cameras    = [Camera(f'IMG_{f:04d}_{c:04d}', f'/data/images/IMG_{f:04d}_{c:04d}.tif', sensor,
+                                   f * sizes['cameras'] + c)
+                            for c in range(sizes['cameras'])]
+        frame.tie_points = TiePoints(sizes['tie_points'], seed=seed + f, center=(f * 0.01, 0, 0))
+        frame_list.append(frame)
+
+    rng = random.Random(seed)
+
+    for m in range(sizes['markers']):
+        marker = chunk.addMarker()
+        for camera in rng.sample(chunk.cameras, min(sizes['projections'], len(chunk.cameras))):
+            marker.projections[camera] = Marker.Projection(Vector((rng.uniform(0, 4000), rng.uniform(0, 3000))), True)
+
+    chunk._frames = frame_list if sizes['frames'] > 1 else None
+
+    return chunk
+
+def install(**sizes):
+
+    '''
+    Registers this module as 'Metashape' in sys.modules, so that "import Metashape" returns it.
+
+    **kwargs:
+        default sizes of synthetic chunks restored by Document.open() in other processes:
+        frames, cameras, tie_points, markers, projections
+    '''
+
+    _default_sizes.update(sizes)
+    sys.modules['Metashape'] = sys.modules[__name__]
+
+    return sys.modules[__name__]
@@ -0,0 +1,130 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+'''
+Import time benchmark of the PyExpress packages.
+
+Each target is imported in a fresh interpreter and the time of the import statement is measured.
+Additionally, the heavy dependencies loaded on the way are reported. Use --repo to measure another
+checkout (e.g. a git worktree of an older revision) with this script and --detail to list the most
+expensive modules of a target from "python -X importtime".
+
+Use:
+    python benchmarks/import_time.py                                   # print results
+    python benchmarks/import_time.py --repo ../old --save before.json  # store results of another checkout
+    python benchmarks/import_time.py --compare before.json             # compare the current tree with stored results
+    python benchmarks/import_time.py --detail hlp.open_parameters      # importtime breakdown of one target
+'''
+
+import os, sys, json, argparse, subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# statement executed in a fresh interpreter per target
+TARGETS = {'PyExpress':                      'import PyExpress',
+           'PyExpress.UtilityTools':         'import PyExpress.UtilityTools',
+           'hlp.open_parameters':            'import PyExpress.UtilityTools as hlp; hlp.open_parameters',
+           'PyExpress.DataManagement.Local': 'import PyExpress.DataManagement as adm; adm.Local',
+           'PyExpress.DataManagement.MinIO': 'import PyExpress.DataManagement as adm; adm.MinIO',
+           'PyExpress.ImageAnalysis':        'import PyExpress.ImageAnalysis',
+           'ppp.Export':                     'import PyExpress.ImageAnalysis as ppp; ppp.Export'}
+
+HEAVY_MODULES = ['Metashape', 'minio', 'pandas', 'numpy', 'yaml', 'sklearn', 'tifffile']
+
+def measure(statement: str, repo_dir: str = REPO_DIR, repeat: int = 5):
+
+    '''
+    Executes an import statement in fresh interpreters.
+
+    *args:
+        statement: python statement to execute\n
+        repo_dir: directory containing the PyExpress package\n
+        repeat: number of interpreter runs; the fastest run is reported
+
+    Returns:
+        Dictionary with the import time in ms, loaded heavy modules and an error message if the import failed
+    '''
+
+    probe   = ('import sys, time; start = time.perf_counter()\n'
+               f'{statement}\n'
+               'print(time.perf_counter() - start)\n'
+               f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))')
+    timings = []
+
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', probe], cwd=repo_dir, capture_output=True, text=True)
+
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()
+            return {'ms': None, 'heavy': [], 'error': error[-1] if error else 'import failed'}
+
+        seconds, heavy = result.stdout.splitlines()[-2:]
+        timings.append(float(seconds))
+
+    return {'ms': round(min(timings) * 1000, 1), 'heavy': [m for m in heavy.split(',') if m], 'error': None}
+
+def importtime_detail(statement: str, repo_dir: str = REPO_DIR, top: int = 15):
+
+    '''
+    Prints the modules with the highest self import time from "python -X importtime".
+
+    *args:
+        statement: python statement to execute\n
+        repo_dir: directory containing the PyExpress package\n
+        top: number of listed modules
+    '''
+
+    result  = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                             cwd=repo_dir, capture_output=True, text=True)
+    entries = []
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        entries.append((int(own), int(cumulative), name.strip()))
+
+    print(f'{"self [ms]":>10}{"cumulative [ms]":>17}  module')
+
+    for own, cumulative, name in sorted(entries, reverse=True)[:top]:
+        print(f'{own / 1000:>10.1f}{cumulative / 1000:>17.1f}  {name}')
+
+def main():
+
+    parser = argparse.ArgumentParser(description='Import time benchmark of PyExpress.')
+    parser.add_argument('--repo',    default=REPO_DIR, help='directory containing the PyExpress package')
+    parser.add_argument('--repeat',  type=int, default=5, help='interpreter runs per target')
+    parser.add_argument('--save',    help='store the results in a JSON file')
+    parser.add_argument('--compare', help='JSON file with stored results to compare with')
+    parser.add_argument('--detail',  choices=list(TARGETS), help='importtime breakdown of one target')
+    args = parser.parse_args()
+
+    if args.detail:
+        importtime_detail(TARGETS[args.detail], repo_dir=args.repo)
+        return
+
+    results = {target: measure(statement, repo_dir=args.repo, repeat=args.repeat)
+               for target, statement in TARGETS.items()}
+
+    baseline = dict()
+
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            baseline = json.load(file)
+
+    print(f'{"target":<34}{"before [ms]":>12}{"after [ms]":>12}  heavy modules loaded')
+
+    for target, result in results.items():
+        before = baseline.get(target, {}).get('ms')
+        after  = result['ms']
+        before = '-' if before is None else f'{before:.1f}'
+        after  = 'failed' if after is None else f'{after:.1f}'
+        info   = result['error'] if result['error'] else ', '.join(result['heavy'])
+        print(f'{target:<34}{before:>12}{after:>12}  {info}')
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == '__main__':
+    main()
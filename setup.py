@@ -41,6 +41,12 @@ setup(
         'numpy',
         'astral',
     ],
+    extras_require={
+        'compression':     ['zstandard', 'laspy[lazrs]'],   # point cloud compression (metashape.export.compression)
+        'parquet':         ['pyarrow'],                     # precision maps in Parquet format
+        'instrumentation': ['psutil'],                      # disk I/O and Windows peak memory in run records
+        'all':             ['zstandard', 'laspy[lazrs]', 'pyarrow', 'psutil'],
+    },
     python_requires='>=3.9',
     license_files=("LICENSE.md", "LICENSES/GPL-3.0-or-later.txt"),
     include_package_data=True,
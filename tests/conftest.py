@@ -0,0 +1,21 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+'''
+Tests of the Python side of PyExpress; Metashape is replaced by the offline stand-in
+benchmarks/fake_metashape.py.
+
+Use:
+    python -m pytest tests
+'''
+
+import os, sys
+
+TEST_DIR  = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR  = os.path.dirname(TEST_DIR)
+BENCH_DIR = os.path.join(REPO_DIR, 'benchmarks')
+
+sys.path[:0] = [BENCH_DIR, REPO_DIR]
+
+import fake_metashape
+fake_metashape.install()
@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import PyExpress.UtilityTools as hlp
+from   PyExpress.UtilityTools import batch_scheduler
+
+def write_thread_budget(config_path, workflow, log_path, threads):
+
+    ''' Job process of the workers: logs the thread limit of its environment, configs named fail* fail. '''
+
+    with open(log_path, 'a') as file:
+        file.write(os.environ.get('OMP_NUM_THREADS', ''))
+
+    os._exit(1 if os.path.basename(config_path).startswith('fail') else 0)
+
+def test_queue_states(tmp_path):
+
+    queue = hlp.JobQueue(str(tmp_path / 'queue.db'))
+
+    assert queue.add_job(str(tmp_path / 'a.yaml'), 'M3T_workflow', max_retries=1)
+    assert queue.add_job(str(tmp_path / 'b.yaml'), 'M3T_workflow', max_retries=0)
+    assert not queue.add_job(str(tmp_path / 'a.yaml'), 'M3T_workflow')
+
+    # oldest job first; a failed job with retries left is queued again
+    first = queue.claim_next(worker=0)
+    assert first['config_path'] == str(tmp_path / 'a.yaml') and first['attempts'] == 1
+    queue.mark_failed(first['id'], error='exit code 1')
+    assert queue.get_job(first['id'])['status'] == 'pending'
+
+    second = queue.claim_next(worker=1)
+    assert second['id'] == first['id'] and second['attempts'] == 2 and second['error'] is None
+    queue.mark_failed(second['id'], error='exit code 1')
+
+    # an interrupted run is requeued without counting the attempt
+    third = queue.claim_next(worker=0)
+    queue.reset_stale()
+    assert queue.get_job(third['id'])['attempts'] == 0
+
+    third = queue.claim_next(worker=0)
+    queue.mark_done(third['id'])
+
+    assert queue.summary() == {'failed': 1, 'done': 1}
+    assert queue.claim_next(worker=0) is None
+
+    queue.retry_failed(max_retries=1)
+    assert [job['id'] for job in queue.list_jobs('pending')] == [first['id']]
+
+    queue.close()
+
+def test_run_restores_environment(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(batch_scheduler, '_job_process', write_thread_budget)
+    monkeypatch.setenv('OMP_NUM_THREADS', '7')
+    monkeypatch.delenv('MKL_NUM_THREADS', raising=False)
+
+    for name in ['ok.yaml', 'fail.yaml']:
+        (tmp_path / name).write_text('')
+
+    scheduler = hlp.BatchScheduler(queue_path=str(tmp_path / 'queue.db'), workflow='M3T_workflow',
+                                   workers=2, threads=3, max_retries=1)
+
+    assert scheduler.add_configs(str(tmp_path)) == 2
+    assert scheduler.run(poll_interval=0.1) == {'done': 1, 'failed': 1}
+
+    jobs = {os.path.basename(job['config_path']): job for job in scheduler.queue.list_jobs()}
+
+    assert jobs['fail.yaml']['attempts'] == 2
+    with open(jobs['ok.yaml']['log_path'], 'r') as file:
+        assert file.read() == '3'
+
+    assert os.environ['OMP_NUM_THREADS'] == '7'
+    assert 'MKL_NUM_THREADS' not in os.environ
+
+    scheduler.queue.close()
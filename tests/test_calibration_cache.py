@@ -0,0 +1,84 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, json
+import pytest
+import bench_pyexpress
+import PyExpress.ImageAnalysis  as ppp
+import PyExpress.DataManagement as adm
+
+KEY = adm.sensor_key('DJI M3T', serial='0001', sensor='RGB', width=4000, height=3000, focal_length=12.29)
+
+def _write(values: dict):
+
+    def write(path: str):
+        with open(path, 'w') as file:
+            json.dump(values, file)
+
+    return write
+
+def test_store_and_lookup(tmp_path):
+
+    cache = adm.CalibrationCache(str(tmp_path))
+
+    assert cache.lookup(KEY) is None
+
+    path = cache.store(KEY, _write({'f': 1}), project_ID='A', aligned=1.0)
+    cache.store(KEY, _write({'f': 2}), project_ID='B', aligned=0.95)
+
+    # one calibration file per key, replaced by the newer calibration and found by a new cache instance
+    reloaded = adm.CalibrationCache(str(tmp_path))
+
+    assert reloaded.lookup(KEY) == path
+    assert reloaded.data['entries'][adm.key_id(KEY)]['project_ID'] == 'B'
+    assert sorted(os.listdir(str(tmp_path))) == sorted([adm.CALIBRATION_INDEX, os.path.basename(path)])
+
+    with open(path, 'r') as file:
+        assert json.load(file) == {'f': 2}
+
+    assert reloaded.lookup(adm.sensor_key('DJI M3T', serial='0002', sensor='RGB')) is None
+
+def test_savings_per_camera(tmp_path):
+
+    cache = adm.CalibrationCache(str(tmp_path))
+
+    cache.add_run(KEY, 'A', 'run1', warm_start=False, cameras=100, timings={'alignCameras': 200})
+    cache.add_run(KEY, 'B', 'run2', warm_start=False, cameras=50,  timings={'alignCameras': 100})
+    cache.add_run(KEY, 'C', 'run3', warm_start=True,  cameras=100, timings={'alignCameras': 999})
+
+    # a repeated record of the same run replaces the previous one
+    cache.add_run(KEY, 'C', 'run3', warm_start=True,  cameras=100, timings={'alignCameras': 150})
+
+    saving = cache.savings(KEY)['alignCameras']
+
+    assert saving['cold_s_per_camera'] == pytest.approx(2.0)
+    assert saving['warm_s_per_camera'] == pytest.approx(1.5)
+    assert saving['saved_percent']     == pytest.approx(25.0)
+    assert (saving['cold_runs'], saving['warm_runs']) == (2, 1)
+
+    assert cache.savings(adm.sensor_key('other')) == {}
+
+def test_warm_start_from_stored_calibration(tmp_path):
+
+    cache_dir = str(tmp_path / 'cache')
+    first     = bench_pyexpress.make_project(str(tmp_path / 'first'), 'drone', frames=1, cameras=5, tie_points=100,
+                                             markers=2, projections=2)
+
+    first.chunk.sensors[0].calibration.f = 1234.5
+    ppp.Calibration.save_to_cache(first, cache_dir=cache_dir)
+
+    second = bench_pyexpress.make_project(str(tmp_path / 'second'), 'drone', frames=1, cameras=5, tie_points=100,
+                                          markers=2, projections=2)
+    sensor = second.chunk.sensors[0]
+
+    # a fixed calibration, e.g. from import_from_file, is kept
+    sensor.fixed_calibration = True
+    ppp.Calibration.warm_start(second, cache_dir=cache_dir)
+
+    assert sensor.user_calib is None and second.calibration_warm_start == {}
+
+    sensor.fixed_calibration = False
+    ppp.Calibration.warm_start(second, cache_dir=cache_dir)
+
+    assert sensor.user_calib.f == 1234.5
+    assert len(second.calibration_warm_start) == 1
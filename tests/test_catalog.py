@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import PyExpress.DataManagement as adm
+
+CONFIG = '''input:
+  project:
+    type: UAV
+  campaign:
+    date: 20240501
+    location: site_A
+    drone: M3T
+    sensor: RGB
+'''
+
+def write(path, content):
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(content)
+
+def test_import_tree(tmp_path):
+
+    directory  = tmp_path / 'site_A' / 'metashape_prj'
+    export_dir = directory / 'export_data' / 'P1'
+    write(str(directory / 'config.yaml'), CONFIG)
+    write(str(directory / 'project_data' / 'P1.psx'), '')
+    write(str(export_dir / 'chunk' / 'ortho.tif'), 'ortho')
+
+    with adm.Catalog(str(tmp_path / 'catalog.sqlite')) as catalog:
+        assert catalog.import_tree(str(tmp_path)) == {'imported': 1, 'skipped': 0}
+
+        project, = catalog.projects(location='site_A', start='2024-05-01', end='2024-05-01')
+        assert (project['project_id'], project['platform'], project['sensor']) == ('P1', 'M3T', 'RGB')
+
+        product, = catalog.products('ortho')
+        assert (product['chunk'], product['size']) == ('chunk', 5)
+
+        # unchanged trees are skipped, added files are imported
+        assert catalog.import_tree(str(tmp_path)) == {'imported': 0, 'skipped': 1}
+
+        write(str(export_dir / 'chunk' / 'dem.tif'), 'dem')
+        os.utime(export_dir / 'chunk', (1e9, 2e9))
+        assert catalog.import_tree(str(tmp_path)) == {'imported': 1, 'skipped': 0}
+        assert len(catalog.products('dem')) == 1
+
+        assert catalog.import_tree(str(tmp_path), full=True) == {'imported': 1, 'skipped': 0}
@@ -0,0 +1,31 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import PyExpress.DataAnalysis as pda
+
+def plane(path, z, seed):
+
+    xy     = np.random.default_rng(seed).uniform(0.0, 4.0, (4000, 2))
+    points = np.zeros(len(xy), dtype=[('x', 'f8'), ('y', 'f8'), ('z', 'f8')])
+    points['x'], points['y'], points['z'] = xy[:, 0], xy[:, 1], z
+    pda.write_ply(str(path), [points])
+
+    return str(path)
+
+def test_detect_changes(tmp_path):
+
+    clouds = [plane(tmp_path / 'epoch_1.ply', 0.0, 1), plane(tmp_path / 'epoch_2.ply', 0.2, 2)]
+    paths  = pda.detect_changes(clouds, str(tmp_path / 'changes'), tile_size=2.0, core_spacing=0.5,
+                                cylinder_radius=0.2, max_depth=0.5, grid_cell_size=1.0, workers=1)
+
+    changes = np.load(paths[('epoch_1', 'epoch_2')])
+    inner   = (changes['x'] > 0.5) & (changes['x'] < 3.5) & (changes['y'] > 0.5) & (changes['y'] < 3.5)
+
+    assert len(changes) > 0
+    assert (changes['n1'] > 0).all()
+    np.testing.assert_allclose(np.abs(changes['m3c2'][inner]), 0.2, atol=1e-6)
+    np.testing.assert_allclose(np.abs(changes['c2c'][inner]), 0.2, atol=0.05)
+    assert changes['significant'][inner].all()
+    assert (tmp_path / 'changes' / 'epoch_1__epoch_2_m3c2.tif').exists()
+    assert not (tmp_path / 'changes' / 'tiles').exists()
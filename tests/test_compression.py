@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import numpy as np
+import pytest
+import PyExpress.DataAnalysis   as pda
+import PyExpress.DataManagement as adm
+
+def cloud(path, n=5000):
+
+    rng    = np.random.default_rng(1)
+    points = np.zeros(n, dtype=[('x', 'f8'), ('y', 'f8'), ('z', 'f8'),
+                                ('red', 'u1'), ('green', 'u1'), ('blue', 'u1'), ('confidence', 'f4')])
+    points['x'], points['y'], points['z'] = (rng.uniform(0.0, 100.0, (3, n)) + [[500000.0], [5700000.0], [100.0]])
+    points['red'], points['green'], points['blue'] = rng.integers(0, 256, (3, n))
+    points['confidence'] = rng.integers(1, 10, n)
+    pda.write_ply(str(path), [points])
+
+    return str(path), points
+
+def test_zstd_round_trip(tmp_path):
+
+    zstandard    = pytest.importorskip('zstandard')
+    path, _      = cloud(tmp_path / 'cloud.ply')
+    results      = adm.Compression.compress_and_upload([path], fmt='zstd', chunk_size=1000)
+
+    with open(results[0]['path'], 'rb') as file:
+        data = zstandard.ZstdDecompressor().stream_reader(file).read()
+    with open(path, 'rb') as file:
+        assert data == file.read()
+
+    assert results[0]['path'] == path + '.zst'
+    assert results[0]['size_in'] == os.path.getsize(path)
+
+def test_laz_keeps_points_colors_and_properties(tmp_path):
+
+    laspy        = pytest.importorskip('laspy')
+    path, points = cloud(tmp_path / 'cloud.ply')
+    out_path     = adm.Compression.laz(path, scale=0.001, chunk_size=1000)
+    las          = laspy.read(out_path)
+
+    assert out_path == str(tmp_path / 'cloud.laz')
+    assert len(las.points) == len(points)
+    np.testing.assert_allclose(las.x, points['x'], atol=0.0005)
+    np.testing.assert_allclose(las.z, points['z'], atol=0.0005)
+    np.testing.assert_array_equal(las.red, points['red'].astype(np.uint16) * 257)
+    np.testing.assert_array_equal(las['confidence'], points['confidence'])
+
+def test_uploads_in_file_order(tmp_path):
+
+    pytest.importorskip('zstandard')
+    paths    = [cloud(tmp_path / f'cloud_{i}.ply', n=100 * (i + 1))[0] for i in range(3)]
+    uploaded = []
+    results  = adm.Compression.compress_and_upload(paths, upload=uploaded.append, workers=3, remove=True)
+
+    assert [stats['source'] for stats in results] == paths
+    assert sorted(uploaded) == sorted(path + '.zst' for path in paths)
+    assert all('upload_seconds' in stats and not os.path.exists(stats['path']) for stats in results)
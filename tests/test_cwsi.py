@@ -0,0 +1,22 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import types
+import numpy as np
+import pytest
+import PyExpress.DataAnalysis as pda
+
+def test_cwsi_names():
+
+    from PyExpress.DataAnalysis import cwsi
+
+    assert isinstance(cwsi, types.ModuleType)
+    assert pda.cwsi.cwsi_index is pda.cwsi_index
+
+def test_cwsi_index():
+
+    np.testing.assert_allclose(pda.cwsi_index([20.0, 25.0, 30.0, 35.0], t_wet=20.0, t_dry=30.0), [0.0, 0.5, 1.0, 1.0])
+    np.testing.assert_allclose(pda.cwsi_index([35.0], t_wet=20.0, t_dry=30.0, clip=False), [1.5])
+
+    with pytest.raises(ValueError):
+        pda.cwsi_index([25.0], t_wet=30.0, t_dry=20.0)
@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import numpy    as np
+import tifffile
+import pytest
+import PyExpress.DataAnalysis as pda
+
+def plane(path, origin, shape, cell_size=1.0, offset=0.0):
+
+    ''' Writes a DEM with z = x + y + offset (pixel centers). '''
+
+    rows, cols = np.mgrid[0:shape[0], 0:shape[1]]
+    x          = origin[0] + (cols + 0.5) * cell_size
+    y          = origin[1] - (rows + 0.5) * cell_size
+    pda.write_geotiff(path, (x + y + offset).astype(np.float32), origin=origin, cell_size=cell_size, tile=(16, 16))
+
+    return path
+
+@pytest.fixture
+def cube(tmp_path):
+
+    reference = plane(str(tmp_path / 'dem_1.tif'), (0.0, 64.0), (64, 48))
+    cube      = pda.DemCube.create(str(tmp_path / 'cube'), reference, tile=(16, 16))
+    cube.append(reference, '2024-01-01')
+
+    return cube
+
+def test_values_and_difference(cube, tmp_path):
+
+    cube.append(plane(str(tmp_path / 'dem_2.tif'), (0.0, 64.0), (64, 48), offset=2.0), '2024-02-01')
+    row, col = cube.pixel(10.5, 40.5)
+
+    np.testing.assert_allclose(cube.series(row, col), [51.0, 53.0], rtol=1e-6)
+    assert cube.timestamps == ['2024-01-01', '2024-02-01']
+
+    path = cube.difference('2024-01-01', '2024-02-01', str(tmp_path / 'diff.tif'))
+    diff = tifffile.imread(path)
+    np.testing.assert_allclose(diff[np.isfinite(diff)], 2.0, rtol=1e-6)
+
+def test_append_partial_extent(cube, tmp_path):
+
+    # DEM covering only the lower part of the grid: the first tile bands lie above its top edge
+    lower = plane(str(tmp_path / 'dem_lower.tif'), (0.0, 20.0), (20, 48))
+
+    assert cube.append(lower, '2024-03-01')
+
+    series_top = cube.series(*cube.pixel(10.5, 60.5))
+    series_low = cube.series(*cube.pixel(10.5, 10.5))
+
+    assert np.isnan(series_top[-1])
+    np.testing.assert_allclose(series_low[-1], 21.0, rtol=1e-6)
+
+def test_append_skip_and_replace(cube, tmp_path):
+
+    size  = os.path.getsize(os.path.join(cube.path, 'cube.dat'))
+    other = plane(str(tmp_path / 'dem_3.tif'), (0.0, 64.0), (64, 48), offset=5.0)
+
+    assert not cube.append(other, '2024-01-01')
+    assert cube.append(other, '2024-01-01', replace=True)
+    assert os.path.getsize(os.path.join(cube.path, 'cube.dat')) == size
+    np.testing.assert_allclose(cube.series(*cube.pixel(10.5, 40.5)), [56.0], rtol=1e-6)
+
+def test_failed_append_leaves_cube_unchanged(cube, tmp_path):
+
+    size    = os.path.getsize(os.path.join(cube.path, 'cube.dat'))
+    invalid = str(tmp_path / 'invalid.tif')
+
+    with open(invalid, 'wb') as file:
+        file.write(b'no raster')
+
+    with pytest.raises(Exception):
+        cube.append(invalid, '2024-04-01')
+
+    assert os.path.getsize(os.path.join(cube.path, 'cube.dat')) == size
+    assert pda.DemCube(cube.path).timestamps == ['2024-01-01']
@@ -0,0 +1,62 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import bench_pyexpress
+import PyExpress.ImageAnalysis as ppp
+from   PyExpress.ImageAnalysis.MetashapeMethods import optional_methods
+
+def test_read_only_document_exports_sequentially(tmp_path):
+
+    project = bench_pyexpress.make_project(str(tmp_path), 'drone', frames=1, cameras=5, tie_points=100,
+                                           markers=2, projections=2)
+    project.export_dir = os.path.join(project.export_dir, '.')
+    project.read_only  = True
+    project.chunk.buildDem()
+    project.chunk.buildOrthomosaic()
+
+    # concurrent exports would need config_data and raise a ValueError without it
+    ppp.Export.export_from_list(project=project, export_list=['dem', 'ortho'], workers=2)
+
+    assert project._save_count == 0
+
+def test_point_cloud_export_is_downsampled(tmp_path, monkeypatch):
+
+    project = bench_pyexpress.make_project(str(tmp_path), 'drone', frames=1, cameras=5, tie_points=100,
+                                           markers=2, projections=2)
+    project.export_dir = os.path.join(project.export_dir, '.')
+    project.chunk.buildPointCloud()
+    calls   = []
+
+    monkeypatch.setattr(project.config.metashape.export, 'voxel_size', 0.05, raising=False)
+    monkeypatch.setattr(project.config.metashape.export, 'compression', None, raising=False)
+    monkeypatch.setattr(ppp.Export, 'downsample_point_cloud', lambda **kwargs: calls.append(kwargs))
+
+    ppp.Export.export_from_list(project=project, export_list=['point_cloud'])
+
+    assert calls == [{'project': project, 'voxel_size': 0.05}]
+
+def test_percentile_range_from_ortho_trafo_export(tmp_path, monkeypatch):
+
+    project = bench_pyexpress.make_project(str(tmp_path), 'drone', frames=1, cameras=5, tie_points=100,
+                                           markers=2, projections=2)
+    config  = optional_methods._config_dict(project.config)
+    exports = []
+    calls   = []
+
+    config['metashape']['vegetation'].update({'rangeAuto': True, 'rangePercentiles': [2, 98]})
+    config['metashape']['export'].update({'type': ['ortho_trafo'], 'trafo_single_pass': False})
+    monkeypatch.setattr(project.config.metashape.vegetation, 'rangeAuto', True)
+    monkeypatch.setattr(project.config.metashape.vegetation, 'rangePercentiles', [2, 98], raising=False)
+    monkeypatch.setattr(project.config.metashape.export, 'trafo_single_pass', False, raising=False)
+    monkeypatch.setattr(ppp.Export, 'raster', lambda **kwargs: exports.append(kwargs['export_type']) or [kwargs['export_type']])
+    monkeypatch.setattr(project, 'calibrateVegetationIndexRange', lambda **kwargs: calls.append(kwargs), raising=False)
+
+    # the range is calibrated from the value raster of the export, the orthomosaic is rendered once per raster
+    project.applyVegetationIndex(config_data=config)
+    assert calls == []
+
+    ppp.Export.export_from_list(project=project, export_list=['ortho_trafo'])
+
+    assert exports == ['ortho_transform_val', 'ortho_transform_pal']
+    assert calls   == [{'percentiles': (2, 98), 'raster_paths': ['ortho_transform_val']}]
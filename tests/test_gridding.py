@@ -0,0 +1,46 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import PyExpress.DataAnalysis as pda
+
+def test_cell_placement_on_diagonal():
+
+    grid, origin = pda.grid_statistic([0, 1, 2], [0, 1, 2], [1.0, 2.0, 3.0], cell_size=1, statistic='count')
+
+    assert origin == (0, 2)
+    assert grid.shape == (3, 3)
+    np.testing.assert_array_equal(grid, [[0, 0, 1],
+                                         [0, 1, 0],
+                                         [1, 0, 0]])
+
+def test_all_points_counted():
+
+    rng    = np.random.default_rng(0)
+    x, y   = rng.uniform(0, 10, (2, 5000))
+    x[0], y[0] = x.min(), y.min()
+    grid, _ = pda.grid_statistic(x, y, np.ones(len(x)), cell_size=0.5, statistic='count')
+
+    assert grid.sum() == len(x)
+
+def test_statistics_per_cell():
+
+    x      = [0.2, 0.4, 0.6, 1.5]
+    y      = [0.2, 0.3, 0.1, 0.5]
+    values = [3.0, 1.0, 2.0, 7.0]
+    bounds = (0, 0, 1.5, 0.5)
+
+    for statistic, expected in [('mean', 2.0), ('median', 2.0), ('min', 1.0), ('max', 3.0), ('count', 3)]:
+        grid, origin = pda.grid_statistic(x, y, values, cell_size=1, statistic=statistic, bounds=bounds)
+        assert origin == (0, 0.5)
+        assert grid.shape == (1, 2)
+        assert grid[0, 0] == expected
+
+    grid, _ = pda.grid_statistic(x, y, values, cell_size=1, statistic='max', bounds=bounds)
+    assert grid[0, 1] == 7.0
+
+def test_points_outside_bounds_dropped():
+
+    grid, _ = pda.grid_statistic([0.5, 5.0], [0.5, 0.5], [1.0, 1.0], cell_size=1, statistic='count', bounds=(0, 0, 1, 1))
+
+    assert grid.sum() == 1
@@ -0,0 +1,58 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+import Metashape
+import bench_pyexpress
+import PyExpress.ImageAnalysis as ppp
+import PyExpress.UtilityTools  as hlp
+from   PyExpress.ImageAnalysis.MetashapeMethods import optional_methods
+
+@pytest.fixture
+def headless(monkeypatch):
+
+    monkeypatch.setenv(hlp.HEADLESS_ENV, '1')
+    monkeypatch.delenv('PYEXPRESS_ANSWER_SET_MARKER_MANUALLY', raising=False)
+
+def test_ask_sources(headless, monkeypatch):
+
+    monkeypatch.setattr(hlp.headless, '_headless_config', {'use': False, 'answers': {}})
+    hlp.configure_headless({'metashape': {'document': {'headless': {'answers': {'disable_read_only': 'y'}}}}})
+
+    assert hlp.ask('Question?', key='disable_read_only') == 'y'
+    assert hlp.ask('Question?', key='other', default='n') == 'n'
+
+    monkeypatch.setenv('PYEXPRESS_ANSWER_DISABLE_READ_ONLY', 'n')
+    assert hlp.ask('Question?', key='disable_read_only') == 'n'
+
+    with pytest.raises(hlp.HeadlessPromptError):
+        hlp.ask('Question?', key='other')
+
+def test_set_marker_manually_honours_answer(tmp_path, headless, monkeypatch):
+
+    project = bench_pyexpress.make_project(str(tmp_path), 'drone', frames=1, cameras=5, tie_points=100,
+                                           markers=2, projections=2)
+    config  = optional_methods._config_dict(project.config)
+
+    monkeypatch.setenv('PYEXPRESS_ANSWER_SET_MARKER_MANUALLY', 'skip')
+    assert ppp.Reference.set_marker_manually(project, config, (False, project.chunk.label)) is project
+
+    monkeypatch.setenv('PYEXPRESS_ANSWER_SET_MARKER_MANUALLY', 'stop')
+    with pytest.raises(hlp.HeadlessPromptError):
+        ppp.Reference.set_marker_manually(project, config, (False, project.chunk.label))
+
+def test_initial_check_prompts(monkeypatch):
+
+    monkeypatch.setattr(Metashape.app, 'activated', False)
+    monkeypatch.setenv(hlp.HEADLESS_ENV, '0')
+    monkeypatch.setattr('builtins.input', lambda question: 'n')
+
+    # interactive runs continue whatever the answer
+    with pytest.warns(UserWarning):
+        ppp.metashape_initial_check(Metashape.app.version, enable_GPU=False, enable_CPU=True)
+
+    monkeypatch.setenv(hlp.HEADLESS_ENV, '1')
+    monkeypatch.setenv('PYEXPRESS_ANSWER_CONTINUE_UNACTIVATED', 'n')
+
+    with pytest.warns(UserWarning), pytest.raises(SystemExit):
+        ppp.metashape_initial_check(Metashape.app.version, enable_GPU=False, enable_CPU=True)
@@ -0,0 +1,31 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import PyExpress.DataAnalysis as pda
+
+def test_streaming_percentiles():
+
+    values    = np.random.default_rng(0).normal(10.0, 3.0, 100000)
+    histogram = pda.StreamingHistogram(bins=1024)
+
+    # chunks with growing ranges on both sides force the bins to expand
+    for chunk in np.array_split(values[np.argsort(np.abs(values - 10.0))], 20):
+        histogram.update(chunk)
+
+    resolution = (values.max() - values.min()) / (histogram.bins / 2)
+
+    assert histogram.count == len(values)
+    np.testing.assert_allclose(histogram.percentiles([2, 50, 98]), np.percentile(values, [2, 50, 98]), atol=resolution)
+    assert histogram.percentiles(0) == values.min()
+    assert histogram.percentiles(100) == values.max()
+
+def test_ignores_invalid_values():
+
+    histogram = pda.StreamingHistogram(bins=16)
+    assert np.isnan(histogram.percentiles(50))
+
+    histogram.update([np.nan, np.inf, 5.0, 5.0])
+
+    assert histogram.count == 2
+    assert histogram.percentiles(50) == 5.0
@@ -0,0 +1,81 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import inspect
+import importlib
+import types
+import pytest
+from PyExpress import _lazy
+
+# package: (submodules, modules whose __all__ is re-exported, aliases)
+PACKAGES = {'PyExpress.DataAnalysis':   (['raster_io', 'gridding', 'palette', 'indices', 'zonal', 'cwsi',
+                                          'histogram', 'pointcloud', 'change_detection', 'dem_cube'],
+                                         ['raster_io', 'gridding', 'palette', 'indices', 'zonal', 'cwsi',
+                                          'histogram', 'pointcloud', 'change_detection', 'dem_cube'],
+                                         []),
+            'PyExpress.DataManagement': (['local', 'minIO', 'compression', 'manifest', 'catalog', 'calibration_cache'],
+                                         ['local', 'minIO', 'compression', 'manifest', 'catalog', 'calibration_cache'],
+                                         []),
+            'PyExpress.UtilityTools':   (['helper_tools', 'batch_scheduler', 'headless',
+                                          'instrumentation', 'process_logger', 'progress'],
+                                         ['helper_tools', 'batch_scheduler', 'headless',
+                                          'instrumentation', 'process_logger', 'progress'],
+                                         []),
+            'PyExpress.ImageAnalysis':  (['MetashapeMethods', 'MetashapeInitialCheck'],
+                                         ['drone_project', 'stereo_project', '_project',
+                                          'MetashapeMethods.main_workflow', 'MetashapeMethods.optional_methods',
+                                          'MetashapeMethods.parallel_methods', 'MetashapeInitialCheck.checkup'],
+                                         ['classPM']),
+            'PyExpress.ImageAnalysis.MetashapeMethods':      (['main_workflow', 'optional_methods', 'parallel_methods'],
+                                                              ['main_workflow', 'optional_methods', 'parallel_methods'],
+                                                              []),
+            'PyExpress.ImageAnalysis.MetashapeInitialCheck': (['checkup'], ['checkup'], [])}
+
+@pytest.mark.parametrize('package_name', sorted(PACKAGES))
+def test_package_exports(package_name):
+
+    submodules, modules, aliases = PACKAGES[package_name]
+    package  = importlib.import_module(package_name)
+    expected = set(submodules) | set(aliases)
+
+    for module in modules:
+        module = importlib.import_module(f'{package_name}.{module}')
+        expected.update(module.__all__)
+
+        # every name in __all__ exists and every public function/class defined in the module is listed
+        defined = {name for name, value in vars(module).items()
+                   if not name.startswith('_') and (inspect.isfunction(value) or inspect.isclass(value))
+                   and value.__module__ == module.__name__}
+        assert set(module.__all__) >= defined
+        assert all(hasattr(module, name) for name in module.__all__)
+
+    public = {name for name in expected if not name.startswith('_')}
+
+    assert set(package.__all__) == public
+    assert set(dir(package))    == expected
+
+    for name in expected:
+        assert getattr(package, name) is not None
+
+def test_module_all_matches_import():
+
+    from PyExpress.DataAnalysis import gridding
+
+    assert _lazy.module_all('PyExpress.DataAnalysis', 'gridding') == gridding.__all__
+
+def test_legacy_names():
+
+    import os
+    import PyExpress.UtilityTools as hlp
+
+    with pytest.warns(DeprecationWarning):
+        assert hlp.__getattr__('os') is os
+
+    with pytest.raises(AttributeError):
+        hlp.__getattr__('no_such_name')
+
+def test_submodule_not_shadowed():
+
+    from PyExpress.DataAnalysis import cwsi
+
+    assert isinstance(cwsi, types.ModuleType)
@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import pytest
+import tifffile
+import PyExpress.DataAnalysis as pda
+
+def test_formulas():
+
+    code, bands = pda.compile_index('(B3 - B1) / (B3 + B1) + sqrt(abs(B2))')
+    values      = pda.evaluate_index(code, {1: np.array([1.0, 0.0]), 2: np.array([4.0, 9.0]), 3: np.array([3.0, 0.0])})
+
+    assert bands == [1, 2, 3]
+    np.testing.assert_allclose(values[0], 2.5)
+    assert not np.isfinite(values[1])
+    assert pda.index_name('(B5-B3)/(B5+B3)') == 'B5mB3dB5pB3'
+
+    for formula in ['B0 + B1', 'B1.real', '__import__("os")', 'B1 if B2 else B3', 'max(B1, B2, key=B3)']:
+        with pytest.raises(ValueError):
+            pda.compile_index(formula)
+
+def test_compute_indices(tmp_path):
+
+    rng   = np.random.default_rng(0)
+    data  = rng.integers(1, 1000, (40, 56, 4)).astype(np.uint16)
+    data[..., 3]   = 65535
+    data[:8, :, 3] = 0
+    path  = str(tmp_path / 'ortho_bands.tif')
+    tifffile.imwrite(path, data, photometric='rgb', extrasamples=['unassalpha'], tile=(16, 16))
+
+    paths = pda.compute_indices(path, ['(B2-B1)/(B2+B1)', 'B3'], tile=(16, 16), workers=2)
+    ndvi  = tifffile.imread(paths['B2mB1dB2pB1'])
+    bands = data.astype(np.float32)
+
+    assert set(paths) == {'B2mB1dB2pB1', 'B3'} and paths['B3'].endswith('ortho_bands_B3.tif')
+    assert (ndvi[:8] == pda.METASHAPE_NODATA).all()
+    np.testing.assert_allclose(ndvi[8:], ((bands[..., 1] - bands[..., 0]) / (bands[..., 1] + bands[..., 0]))[8:], rtol=1e-6)
+    np.testing.assert_array_equal(tifffile.imread(paths['B3'])[8:], bands[8:, :, 2])
+
+    with pytest.raises(ValueError):
+        pda.compute_indices(path, ['B4'])
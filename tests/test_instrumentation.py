@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import types
+import PyExpress.UtilityTools as hlp
+
+def test_record_arguments_by_name(tmp_path):
+
+    @hlp.instrument
+    def step(project, downscale, save_project=(False, ''), **kwargs):
+        return project
+
+    project = types.SimpleNamespace(export_dir=str(tmp_path), project_ID='P1', chunk=None)
+    step(project, 2, filter_mode='mild')
+
+    record = hlp.load_run_records(str(tmp_path))[-1]
+
+    assert record['project_ID'] == 'P1'
+    assert record['status'] == 'done'
+    assert record['kwargs'] == {'downscale': 2, 'filter_mode': 'mild'}
+    assert record['peak_rss_bytes'] > 0
+
+def test_failed_step_recorded(tmp_path):
+
+    @hlp.instrument
+    def step(project):
+        raise RuntimeError('failed')
+
+    project = types.SimpleNamespace(export_dir=str(tmp_path), project_ID='P1', chunk=None)
+
+    try:
+        step(project=project)
+    except RuntimeError:
+        pass
+
+    assert hlp.load_run_records(str(tmp_path))[-1]['status'] == 'failed'
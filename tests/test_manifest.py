@@ -0,0 +1,138 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import bench_pyexpress
+import PyExpress.ImageAnalysis  as ppp
+import PyExpress.DataManagement as adm
+from   PyExpress.ImageAnalysis.MetashapeMethods import optional_methods
+
+def write(path, content):
+
+    with open(path, 'w') as file:
+        file.write(content)
+
+def test_is_current(tmp_path):
+
+    manifest = adm.Manifest(str(tmp_path))
+    before   = manifest.snapshot()
+    write(tmp_path / 'dem.tif', 'dem')
+    manifest.register('chunk/dem', 'f1', manifest.changed(before))
+
+    assert manifest.data['products']['chunk/dem']['files'] == ['dem.tif']
+    assert adm.Manifest(str(tmp_path)).is_current('chunk/dem', 'f1')
+    assert not manifest.is_current('chunk/dem', 'f2')
+
+    # same content with a new modification time is still current, other content is not
+    write(tmp_path / 'dem.tif', 'dem')
+    os.utime(tmp_path / 'dem.tif', ns=(1, 1))
+    assert manifest.is_current('chunk/dem', 'f1')
+
+    write(tmp_path / 'dem.tif', 'DEM')
+    assert not manifest.is_current('chunk/dem', 'f1')
+
+def test_uploads(tmp_path):
+
+    write(tmp_path / 'cloud.ply', 'points')
+    manifest = adm.Manifest(str(tmp_path))
+
+    assert manifest.needs_upload(str(tmp_path / 'cloud.ply'), 'bucket/cloud.ply')
+    manifest.uploaded(str(tmp_path / 'cloud.ply'), 'bucket/cloud.ply')
+    assert not adm.Manifest(str(tmp_path)).needs_upload(str(tmp_path / 'cloud.ply'), 'bucket/cloud.ply')
+
+def test_export_fingerprint_follows_chunk_state(tmp_path):
+
+    project = bench_pyexpress.make_project(str(tmp_path), 'drone', frames=1, cameras=5, tie_points=100,
+                                           markers=2, projections=2)
+    project.chunk.buildDem(interpolation='Enabled')
+    initial = optional_methods._export_fingerprint(project, 'dem')
+
+    assert optional_methods._export_fingerprint(project, 'dem') == initial
+
+    # processing parameters changed in a workflow script
+    project.chunk.buildDem(interpolation='Disabled')
+    rebuilt = optional_methods._export_fingerprint(project, 'dem')
+    assert rebuilt != initial
+
+    # edited marker projection
+    marker = project.chunk.markers[0]
+    camera = list(marker.projections.keys())[0]
+    marker.projections[camera].coord = type(marker.projections[camera].coord)((1.0, 2.0))
+    assert optional_methods._export_fingerprint(project, 'dem') != rebuilt
+
+def test_skip_unchanged_is_opt_in(tmp_path, monkeypatch):
+
+    project = bench_pyexpress.make_project(str(tmp_path), 'drone', frames=1, cameras=5, tie_points=100,
+                                           markers=2, projections=2)
+    project.export_dir = os.path.join(project.export_dir, '.')
+    project.chunk.buildDem()
+
+    if hasattr(project.config.metashape.export, 'skip_unchanged'):
+        delattr(project.config.metashape.export, 'skip_unchanged')
+
+    calls  = []
+    raster = ppp.Export.raster
+
+    def count(project, **kwargs):
+        calls.append(kwargs['export_type'])
+        return raster(project=project, **kwargs)
+
+    monkeypatch.setattr(ppp.Export, 'raster', count)
+
+    # without skip_unchanged, neither the chunk state nor fingerprints are computed
+    chunk_state = optional_methods._chunk_state
+
+    def unexpected(chunk):
+        raise AssertionError('chunk state computed without skip_unchanged')
+
+    monkeypatch.setattr(optional_methods, '_chunk_state', unexpected)
+    ppp.Export.export_from_list(project=project, export_list=['dem'], workers=1)
+    ppp.Export.export_from_list(project=project, export_list=['dem'], workers=1)
+    assert len(calls) == 2
+    assert adm.Manifest(project.export_dir).data['products'] == {}
+    monkeypatch.setattr(optional_methods, '_chunk_state', chunk_state)
+
+    project.config.metashape.export.skip_unchanged = True
+    ppp.Export.export_from_list(project=project, export_list=['dem'], workers=1)
+    ppp.Export.export_from_list(project=project, export_list=['dem'], workers=1)
+    assert len(calls) == 3
+
+    project.chunk.buildDem(resolution=0.5)
+    ppp.Export.export_from_list(project=project, export_list=['dem'], workers=1)
+    assert len(calls) == 4
+
+def test_concurrent_saves_keep_entries(tmp_path):
+
+    write(tmp_path / 'a.tif', 'a')
+    write(tmp_path / 'b.tif', 'b')
+
+    # two processes read the manifest before either of them writes it
+    first, second = adm.Manifest(str(tmp_path)), adm.Manifest(str(tmp_path))
+    first.register('chunk_1/dem', 'f1', ['a.tif'])
+    second.register('chunk_2/dem', 'f2', ['b.tif'])
+
+    manifest = adm.Manifest(str(tmp_path))
+    assert set(manifest.data['products']) == {'chunk_1/dem', 'chunk_2/dem'}
+    assert set(manifest.data['files']) == {'a.tif', 'b.tif'}
+    assert sorted(os.listdir(tmp_path)) == ['a.tif', 'b.tif', adm.MANIFEST_FILE]
+
+def test_snapshot_of_chunk_outputs(tmp_path):
+
+    os.makedirs(tmp_path / 'chunk_1')
+    os.makedirs(tmp_path / 'chunk_10')
+    write(tmp_path / 'chunk_1' / 'dem.tif', 'dem')
+    write(tmp_path / 'chunk_10' / 'dem.tif', 'dem')
+
+    manifest = adm.Manifest(str(tmp_path))
+
+    assert list(manifest.snapshot([str(tmp_path / 'chunk_1')])) == [os.path.join('chunk_1', 'dem.tif')]
+
+def test_concurrent_exports_are_assigned_by_type():
+
+    names = ['dem', 'ortho', 'ortho_trafo', 'precision_map', 'report']
+
+    assert optional_methods._export_owner('chunk\\ortho.tiff', names)                == 'ortho'
+    assert optional_methods._export_owner('chunk\\ortho_transform_pal.tiff', names)  == 'ortho_trafo'
+    assert optional_methods._export_owner('chunk\\precision_map_sX.tif', names)      == 'precision_map'
+    assert optional_methods._export_owner('chunk\\report.pdf', names)                == 'report'
+    assert optional_methods._export_owner('chunk\\3DModel.obj', names)               is None
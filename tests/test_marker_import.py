@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import pytest
+import bench_pyexpress
+import PyExpress.ImageAnalysis as ppp
+
+def projections(marker):
+
+    return {camera.label: (projection.coord[0], projection.coord[1]) for camera, projection in marker.projections.items()}
+
+def test_import_marker_projections(tmp_path):
+
+    pytest.importorskip('pandas')
+
+    project = bench_pyexpress.make_project(str(tmp_path), 'drone', frames=1, cameras=5, tie_points=100,
+                                           markers=1, projections=2)
+    marker  = project.chunk.markers[0]
+    before  = projections(marker)
+    camera  = [camera.label for camera in project.chunk.cameras if camera.label not in before][0]
+
+    # rows of unknown images, without coordinates and broken lines are skipped
+    with open(project.marker_proj_path, 'w') as file:
+        file.write(f'{marker.label},{camera},10.5,20.5\n'
+                   f'GCP_new,IMG_0000_0000,1.0,2.0\n'
+                   f'GCP_new,IMG_missing,3.0,4.0\n'
+                   f'GCP_new,IMG_0000_0001,x,4.0\n'
+                   f'GCP_new,IMG_0000_0002,5.0,6.0,7.0\n'
+                   f'GCP_other,IMG_0000_0001,7.0,8.0\n')
+
+    ppp.Reference.import_marker_proj(project, coord_system='local')
+
+    markers = {marker.label: marker for marker in project.chunk.markers}
+
+    assert list(markers) == [marker.label, 'GCP_new', 'GCP_other']
+    assert projections(markers[marker.label]) == dict(before, **{camera: (10.5, 20.5)})
+    assert projections(markers['GCP_new'])    == {'IMG_0000_0000': (1.0, 2.0)}
+    assert projections(markers['GCP_other'])  == {'IMG_0000_0001': (7.0, 8.0)}
+    assert all(projection.pinned for projection in markers['GCP_new'].projections.values())
+    assert project.chunk.marker_crs.startswith('LOCAL_CS')
@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import numpy as np
+import tifffile
+import fake_metashape
+import bench_pyexpress
+import PyExpress.ImageAnalysis as ppp
+import PyExpress.DataAnalysis  as pda
+
+PALETTE = {40: (255, 0, 0), -1: (0, 0, 255), 20: (0, 255, 0)}
+
+def test_apply_palette():
+
+    stops, colors = pda.palette_lut(PALETTE)
+    values        = np.array([[-5.0, -1.0, 9.5, 20.0], [30.0, 99.0, np.nan, pda.METASHAPE_NODATA]])
+
+    assert stops.tolist() == [-1.0, 20.0, 40.0]
+
+    rgb = pda.apply_palette(values, stops, colors, nodata=pda.METASHAPE_NODATA, alpha=True)
+
+    assert rgb[0, :, :3].tolist() == [[0, 0, 255], [0, 0, 255], [0, 128, 128], [0, 255, 0]]
+    assert rgb[1, :2, :3].tolist() == [[128, 128, 0], [255, 0, 0]]
+    assert rgb[1, 2:].tolist() == [[0, 0, 0, 0], [0, 0, 0, 0]]
+    assert (rgb[0, :, 3] == 255).all()
+
+    steps = pda.apply_palette(values[:1], stops, colors, interpolate=False)
+    assert steps[0].tolist() == [[0, 0, 255], [0, 0, 255], [0, 0, 255], [0, 255, 0]]
+
+def test_rescale_palette():
+
+    assert pda.rescale_palette(PALETTE, (0.0, 0.82)) == {0.82: (255, 0, 0), 0.0: (0, 0, 255), 0.42: (0, 255, 0)}
+    assert pda.rescale_palette({5: (1, 2, 3)}, (0, 1)) == {0.0: (1, 2, 3)}
+
+def test_palette_raster_from_value_raster(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(fake_metashape, 'raster_size', (300, 520))
+
+    project = bench_pyexpress.make_project(str(tmp_path), 'stereo', frames=1, cameras=2, tie_points=100,
+                                           markers=2, projections=2)
+    project.export_dir = os.path.join(project.export_dir, '.')
+    project.chunk.raster_transform.palette = PALETTE
+
+    [(value_path, palette_path)] = ppp.Export.raster_transform(project, export_type='ortho', alpha=True,
+                                                               source_data=fake_metashape.DataSource.OrthomosaicData)
+
+    values        = tifffile.imread(value_path)
+    values        = values[..., 0] if values.ndim == 3 else values
+    stops, colors = pda.palette_lut(PALETTE)
+
+    assert palette_path == f'{os.path.splitext(value_path)[0]}_pal.tiff'
+    np.testing.assert_array_equal(tifffile.imread(palette_path),
+                                  pda.apply_palette(values, stops, colors, nodata=pda.METASHAPE_NODATA, alpha=True))
+    assert pda.read_geotiff_tags(palette_path) == pda.read_geotiff_tags(value_path)
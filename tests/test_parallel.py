@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os
+import bench_pyexpress
+import PyExpress.ImageAnalysis as ppp
+from   PyExpress.ImageAnalysis.MetashapeMethods import optional_methods
+
+def rename_chunk(project, config_data, chunk_param):
+
+    ''' Chunk function of the workers: marks the chunk with its parameter and the worker process ID. '''
+
+    project.chunk.label = f'{project.chunk.label}_{chunk_param}_{os.getpid()}'
+
+    return project
+
+def test_process_chunks(tmp_path, monkeypatch):
+
+    # spawned workers import Metashape from this directory (offline stand-in)
+    (tmp_path / 'metashape_stub').mkdir()
+    (tmp_path / 'metashape_stub' / 'Metashape.py').write_text('import fake_metashape\nfake_metashape.install()\n')
+    monkeypatch.syspath_prepend(str(tmp_path / 'metashape_stub'))
+    monkeypatch.delenv('PYEXPRESS_RUN_ID', raising=False)
+
+    project = bench_pyexpress.make_project(str(tmp_path / 'project'), 'drone', frames=1, cameras=5, tie_points=100,
+                                           markers=2, projections=2)
+    project.doc.addChunk().label = 'variant'
+
+    project = ppp.Parallel.process_chunks(project, config_data=optional_methods._config_dict(project.config),
+                                          chunk_func=rename_chunk, chunk_params=['a', 'b'], workers=2)
+
+    labels = [chunk.label for chunk in project.doc.chunks]
+
+    assert [label.rsplit('_', 2)[:2] for label in labels] == [[labels[0].rsplit('_', 2)[0], 'a'], ['variant', 'b']]
+    assert all(int(label.rsplit('_', 1)[1]) != os.getpid() for label in labels)
+    assert 'PYEXPRESS_RUN_ID' not in os.environ
@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import PyExpress.DataAnalysis as pda
+
+def cloud(x, confidence=None):
+
+    fields = [('x', 'f8'), ('y', 'f8'), ('z', 'f8')] + ([('confidence', 'f4')] if confidence is not None else [])
+    points = np.zeros(len(x), dtype=fields)
+    points['x'], points['y'], points['z'] = x, 0.05, 0.05
+
+    if confidence is not None:
+        points['confidence'] = confidence
+
+    return points
+
+def test_voxel_not_split_at_tile_edges(tmp_path):
+
+    # 31 * 0.30000000000000004 falls into tile 30 by its coordinate but into voxel 93, i.e. tile 31
+    edge   = 31 * (0.1 * 3)
+    x      = np.array([edge, 9.35, 0.01, 0.02, 0.15])
+    source = str(tmp_path / 'cloud.ply')
+    pda.write_ply(source, [cloud(x)])
+
+    counts = pda.downsample_cloud(source, str(tmp_path / 'voxel.ply'), 0.1, tile_size=0.3, chunk_size=2)
+    result = pda.read_ply(str(tmp_path / 'voxel.ply'))
+
+    assert counts == {'read': 5, 'written': 3}
+    np.testing.assert_allclose(np.sort(result['x']), [0.015, 0.15, (edge + 9.35) / 2])
+    assert not list(tmp_path.glob('tiles_*'))
+
+def test_confidence_filter(tmp_path):
+
+    source = str(tmp_path / 'cloud.ply')
+    pda.write_ply(source, [cloud(np.array([0.01, 0.02, 0.5]), confidence=np.array([1, 5, 5]))])
+
+    counts = pda.downsample_cloud(source, str(tmp_path / 'voxel.ply'), 0.1, min_confidence=2)
+    result = pda.read_ply(str(tmp_path / 'voxel.ply'))
+
+    assert counts == {'read': 2, 'written': 2}
+    np.testing.assert_allclose(np.sort(result['x']), [0.02, 0.5])
+
+def test_obj_points_in_chunks(tmp_path):
+
+    path = tmp_path / 'cloud.obj'
+    path.write_text('# point cloud\n' + ''.join(f'v {i} {2 * i} {3 * i} 1 0 0.5\n' for i in range(10)) + 'f 1 2 3\n')
+
+    chunks = list(pda.iter_obj_points(str(path), chunk_size=4, block_size=16))
+    points = np.concatenate(chunks)
+
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    np.testing.assert_allclose(pda.coordinates(points), [[i, 2 * i, 3 * i] for i in range(10)])
+    assert (points['red'] == 255).all() and (points['blue'] == 128).all()
@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, gzip
+import PyExpress.UtilityTools as hlp
+
+def test_rotation_counts_bytes(tmp_path):
+
+    path   = str(tmp_path / 'process_log.txt')
+    logger = hlp.ProcessLogger(max_bytes=1000, backup_count=2, worker=False)
+
+    # 50 lines of 30 characters, 59 bytes each in UTF-8
+    for i in range(50):
+        logger.write(path, f'{i:02d} ' + 'ü' * 27)
+    logger.close()
+
+    with gzip.open(path + '.1.gz', 'rb') as file:
+        rotated = file.read()
+
+    assert 1000 <= len(rotated) < 1000 + 59
+    assert not os.path.exists(path + '.rotating')
+
+    lines = []
+    for name in [path + '.2.gz', path + '.1.gz']:
+        if os.path.exists(name):
+            with gzip.open(name, 'rt', encoding='utf-8') as file:
+                lines += file.read().splitlines()
+    with open(path, 'r', encoding='utf-8') as file:
+        lines += file.read().splitlines()
+
+    assert lines[-1].startswith('49 ')
+    assert all(len(line) == 30 for line in lines)
+
+def test_worker_writes_lines_at_once(tmp_path):
+
+    path   = str(tmp_path / 'process_log.txt')
+    parent = hlp.ProcessLogger(flush_interval=60, max_bytes=10, worker=False)
+    worker = hlp.ProcessLogger(flush_interval=60, max_bytes=10, worker=True)
+
+    parent.write(path, 'parent')
+    worker.write(path, 'worker')
+    worker.flush()
+
+    # the worker line is on disk before the buffered parent line, and the worker never rotates
+    with open(path, 'r') as file:
+        assert file.read().splitlines() == ['worker']
+
+    # the parent rotates the shared file, including the worker lines
+    parent.write(path, 'parent 2')
+    parent.close()
+    worker.close()
+
+    with gzip.open(path + '.1.gz', 'rt') as file:
+        assert file.read().splitlines() == ['worker', 'parent', 'parent 2']
@@ -0,0 +1,40 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import os, json, types
+import PyExpress.UtilityTools as hlp
+
+def test_status_file_per_process(tmp_path):
+
+    project = types.SimpleNamespace(export_dir=str(tmp_path), project_ID='P1', chunk=None)
+
+    # status of another process, e.g. a concurrent export worker
+    with open(hlp.progress_status_file(str(tmp_path), pid=1), 'w') as file:
+        json.dump({'stage': 'Export.raster', 'state': 'running', 'pid': 1, 'updated': '2000-01-01T00:00:00'}, file)
+
+    with hlp.ProgressTracker(project, stage='buildDepthMaps') as progress:
+        progress(50.0)
+        progress._write_status(force=True)
+
+        assert progress.status_file == os.path.join(str(tmp_path), f'progress_status_{os.getpid()}.json')
+
+        statuses = hlp.read_progress_status(str(tmp_path))
+
+        assert [status['stage'] for status in statuses] == ['Export.raster', 'buildDepthMaps']
+        assert statuses[-1]['percent'] == 50.0
+
+    # the status file of a finished step is removed
+    assert not os.path.exists(progress.status_file)
+    assert [status['stage'] for status in hlp.read_progress_status(str(tmp_path))] == ['Export.raster']
+
+def test_empty_stall_setting(tmp_path):
+
+    document = types.SimpleNamespace(progress_stall_min=None)
+    config   = types.SimpleNamespace(metashape=types.SimpleNamespace(document=document))
+    project  = types.SimpleNamespace(export_dir=str(tmp_path), project_ID='P1', chunk=None, config=config)
+
+    assert hlp.ProgressTracker(project, stage='buildDepthMaps').stall_seconds == 30 * 60
+
+def test_no_status(tmp_path):
+
+    assert hlp.read_progress_status(str(tmp_path)) is None
@@ -0,0 +1,46 @@
+# SPDX-FileCopyrightText: 2025 Helmholtz-Zentrum für Umweltforschung GmbH - UFZ
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+import numpy as np
+import bench_pyexpress
+import PyExpress.ImageAnalysis as ppp
+
+def make_project(tmp_path):
+
+    return bench_pyexpress.make_project(str(tmp_path), 'drone', frames=1, cameras=5, tie_points=200,
+                                        markers=2, projections=2)
+
+def test_homogeneous_coordinates(tmp_path, monkeypatch):
+
+    project   = make_project(tmp_path)
+    points    = project.chunk.tie_points.points
+    expected  = np.array([list(point.coord)[:3] for point in points])
+    extracted = ppp.TiePointCloud.extract(project, track_lengths=False)
+
+    np.testing.assert_allclose(extracted['coord'], expected)
+
+    # the same points with w = 2: coordinates are divided by w
+    point_type = type(points[0])
+    vector     = type(points[0].coord)
+    original   = point_type.coord.fget
+
+    monkeypatch.setattr(point_type, 'coord', property(lambda point: vector([2 * value for value in original(point)[:3]] + [2.0])))
+    extracted = ppp.TiePointCloud.extract(project, track_lengths=False, refresh=True)
+
+    np.testing.assert_allclose(extracted['coord'], expected)
+
+def test_cache_follows_validity(tmp_path):
+
+    project = make_project(tmp_path)
+    first   = ppp.TiePointCloud.extract(project, track_lengths=False)
+    index   = int(first['valid'].nonzero()[0][0])
+
+    assert ppp.TiePointCloud.extract(project, track_lengths=False).filename == first.filename
+
+    # removing a tie point only invalidates it, the number of points is unchanged
+    project.chunk.tie_points.points[index].valid = False
+    second = ppp.TiePointCloud.extract(project, track_lengths=False)
+
+    assert len(second) == len(first)
+    assert not second['valid'][index]
+    assert second['valid'].sum() == first['valid'].sum() - 1